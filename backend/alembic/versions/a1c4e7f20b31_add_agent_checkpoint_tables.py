@@ -0,0 +1,53 @@
+"""add_agent_checkpoint_tables
+
+Revision ID: a1c4e7f20b31
+Revises: 41a926b044b0
+Create Date: 2026-10-16 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7f20b31'
+down_revision: Union[str, Sequence[str], None] = '41a926b044b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add LangGraph checkpoint tables for multi-turn agent conversations."""
+    op.create_table('agent_checkpoints',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('parent_checkpoint_id', sa.String(length=64), nullable=True),
+        sa.Column('checkpoint_type', sa.String(length=32), nullable=False),
+        sa.Column('checkpoint', sa.LargeBinary(), nullable=False),
+        sa.Column('metadata_type', sa.String(length=32), nullable=False),
+        sa.Column('checkpoint_metadata', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id')
+    )
+
+    op.create_table('agent_checkpoint_writes',
+        sa.Column('thread_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_ns', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.String(length=64), nullable=False),
+        sa.Column('idx', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.String(length=255), nullable=False),
+        sa.Column('value_type', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.LargeBinary(), nullable=False),
+        sa.Column('task_path', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx')
+    )
+
+
+def downgrade() -> None:
+    """Remove LangGraph checkpoint tables."""
+    op.drop_table('agent_checkpoint_writes')
+    op.drop_table('agent_checkpoints')
@@ -0,0 +1,46 @@
+"""add_plaid_holdings_unique_security
+
+Revision ID: b7d2e915c4a8
+Revises: a1c4e7f20b31
+Create Date: 2026-10-16 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e915c4a8'
+down_revision: Union[str, Sequence[str], None] = 'a1c4e7f20b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Make (account_id, security_id) unique so holding syncs can upsert."""
+    # Keep the most recently updated row of any duplicates left by the old
+    # select-then-insert sync
+    op.execute("""
+        DELETE FROM plaid_holdings
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY account_id, security_id
+                    ORDER BY updated_at DESC, id DESC
+                ) AS position
+                FROM plaid_holdings
+            ) ranked
+            WHERE position > 1
+        )
+    """)
+    op.create_unique_constraint(
+        'uq_plaid_holdings_account_security',
+        'plaid_holdings',
+        ['account_id', 'security_id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the holding uniqueness constraint."""
+    op.drop_constraint('uq_plaid_holdings_account_security', 'plaid_holdings', type_='unique')
@@ -0,0 +1,66 @@
+"""add_plaid_sync_jobs
+
+Revision ID: c3e8a4d61f27
+Revises: b7d2e915c4a8
+Create Date: 2026-10-16 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a4d61f27'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e915c4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the durable queue of webhook-driven Plaid sync jobs."""
+    op.create_table('plaid_sync_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('plaid_item_id', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('sync_transactions', sa.Boolean(), nullable=False),
+        sa.Column('sync_holdings', sa.Boolean(), nullable=False),
+        sa.Column('sync_accounts', sa.Boolean(), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_plaid_sync_jobs_plaid_item_id', 'plaid_sync_jobs', ['plaid_item_id'])
+    op.create_index('ix_plaid_sync_jobs_status_available', 'plaid_sync_jobs', ['status', 'available_at'])
+    op.create_index(
+        'uq_plaid_sync_jobs_pending_item',
+        'plaid_sync_jobs',
+        ['plaid_item_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        'uq_plaid_sync_jobs_running_item',
+        'plaid_sync_jobs',
+        ['plaid_item_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'running'"),
+        sqlite_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    """Remove the Plaid sync job queue."""
+    op.drop_index('uq_plaid_sync_jobs_running_item', table_name='plaid_sync_jobs')
+    op.drop_index('uq_plaid_sync_jobs_pending_item', table_name='plaid_sync_jobs')
+    op.drop_index('ix_plaid_sync_jobs_status_available', table_name='plaid_sync_jobs')
+    op.drop_index('ix_plaid_sync_jobs_plaid_item_id', table_name='plaid_sync_jobs')
+    op.drop_table('plaid_sync_jobs')
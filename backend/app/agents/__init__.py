@@ -4,7 +4,12 @@ Financial Planning AI Agents
 LangGraph-based multi-agent system for comprehensive financial planning.
 """
 
-from .graph import create_financial_planning_graph, run_financial_planning_workflow
+from .graph import (
+    create_financial_planning_graph,
+    get_financial_planning_graph,
+    init_financial_planning_graph,
+    run_financial_planning_workflow,
+)
 from .state import FinancialPlanningState, AgentResponse
 from .nodes import (
     orchestrator_node,
@@ -17,6 +22,8 @@ from .advanced_portfolio_agent import advanced_portfolio_agent_node
 
 __all__ = [
     "create_financial_planning_graph",
+    "get_financial_planning_graph",
+    "init_financial_planning_graph",
     "run_financial_planning_workflow",
     "FinancialPlanningState",
     "AgentResponse",
@@ -0,0 +1,439 @@
+"""
+LangGraph Checkpointers
+
+Durable checkpoint storage in the application database, with a bounded
+in-memory saver as the fallback when the database is unavailable.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.models.agent_checkpoint import AgentCheckpoint, AgentCheckpointWrite
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer that keeps at most ``max_threads`` conversations.
+
+    Threads are evicted least recently used first, so a long-running process
+    cannot grow without bound when the durable store is unavailable.
+    """
+
+    def __init__(self, max_threads: int = 1000, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._threads: "OrderedDict[str, None]" = OrderedDict()
+
+    def _touch(self, thread_id: str):
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+
+        while len(self._threads) > self.max_threads:
+            oldest, _ = self._threads.popitem(last=False)
+            super().delete_thread(oldest)
+            performance_metrics.increment_counter("agents.checkpoints.evictions")
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        # The parent's defaultdict storage would allocate on a read miss
+        if thread_id not in self.storage:
+            return None
+        self._touch(thread_id)
+        return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        self._touch(config["configurable"]["thread_id"])
+        return saved
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._threads.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
+
+class DatabaseCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpointer persisting graph state through the application's database.
+
+    Each checkpoint is stored whole (channel values included) as one row,
+    and pending task writes as rows keyed by task and write index. Only the
+    latest ``max_checkpoints`` per thread and namespace are kept. The
+    sync methods run their async counterparts on the event loop the saver
+    was created on, so they work from worker threads but not on the loop.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        max_checkpoints: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.max_checkpoints = max_checkpoints or settings.AGENT_CHECKPOINT_RETENTION
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+
+    async def setup(self):
+        """Verify the checkpoint tables (created by migrations) are reachable"""
+        async with self.session_factory() as session:
+            await session.execute(select(AgentCheckpoint.checkpoint_id).limit(1))
+
+    # Sync API (delegates to the async implementation)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._run_sync(self.aget_tuple(config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        async def collect():
+            return [
+                item
+                async for item in self.alist(config, filter=filter, before=before, limit=limit)
+            ]
+
+        return iter(self._run_sync(collect()))
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self._run_sync(self.aput(config, checkpoint, metadata, new_versions))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._run_sync(self.aput_writes(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._run_sync(self.adelete_thread(thread_id))
+
+    def _run_sync(self, coro):
+        """
+        Run ``coro`` to completion from synchronous code.
+
+        Uses the saver's event loop when it is running in another thread
+        (the usual case for sync graph calls from a worker thread), or a
+        private loop when no loop is involved at all.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is not None:
+            coro.close()
+            raise asyncio.InvalidStateError(
+                "Synchronous calls to DatabaseCheckpointSaver are only allowed from a "
+                "thread without a running event loop; use the async methods instead"
+            )
+        if self.loop is not None and self.loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+        return asyncio.run(coro)
+
+    # Async API
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns = self._thread_key(config)
+        query = select(AgentCheckpoint).where(
+            AgentCheckpoint.thread_id == thread_id,
+            AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(AgentCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            # Checkpoint ids are time-ordered, so the largest is the latest
+            query = query.order_by(AgentCheckpoint.checkpoint_id.desc()).limit(1)
+
+        async with self.session_factory() as session:
+            row = (await session.execute(query)).scalar_one_or_none()
+            if row is None:
+                return None
+            writes = await self._load_writes(session, [row])
+
+        return self._to_tuple(row, writes.get(self._row_key(row), []))
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        query = select(AgentCheckpoint).order_by(AgentCheckpoint.checkpoint_id.desc())
+        if config is not None:
+            configurable = config["configurable"]
+            query = query.where(AgentCheckpoint.thread_id == configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                query = query.where(AgentCheckpoint.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(AgentCheckpoint.checkpoint_id == checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            query = query.where(AgentCheckpoint.checkpoint_id < before_id)
+        if limit is not None and not filter:
+            query = query.limit(limit)
+
+        async with self.session_factory() as session:
+            rows = (await session.execute(query)).scalars().all()
+            writes = await self._load_writes(session, rows)
+
+        returned = 0
+        for row in rows:
+            checkpoint_tuple = self._to_tuple(row, writes.get(self._row_key(row), []))
+            if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            yield checkpoint_tuple
+            returned += 1
+            if limit is not None and returned >= limit:
+                break
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id, checkpoint_ns = self._thread_key(config)
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        async with self.session_factory() as session:
+            await session.merge(AgentCheckpoint(
+                thread_id=thread_id,
+                checkpoint_ns=checkpoint_ns,
+                checkpoint_id=checkpoint["id"],
+                parent_checkpoint_id=config["configurable"].get("checkpoint_id"),
+                checkpoint_type=checkpoint_type,
+                checkpoint=checkpoint_blob,
+                metadata_type=metadata_type,
+                checkpoint_metadata=metadata_blob,
+            ))
+            await self._prune(session, thread_id, checkpoint_ns)
+            await session.commit()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id, checkpoint_ns = self._thread_key(config)
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        async with self.session_factory() as session:
+            existing = set((await session.execute(
+                select(AgentCheckpointWrite.idx).where(
+                    AgentCheckpointWrite.thread_id == thread_id,
+                    AgentCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                    AgentCheckpointWrite.checkpoint_id == checkpoint_id,
+                    AgentCheckpointWrite.task_id == task_id,
+                )
+            )).scalars())
+
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are idempotent; special channels overwrite
+                if write_idx >= 0 and write_idx in existing:
+                    continue
+
+                value_type, value_blob = self.serde.dumps_typed(value)
+                await session.merge(AgentCheckpointWrite(
+                    thread_id=thread_id,
+                    checkpoint_ns=checkpoint_ns,
+                    checkpoint_id=checkpoint_id,
+                    task_id=task_id,
+                    idx=write_idx,
+                    channel=channel,
+                    value_type=value_type,
+                    value=value_blob,
+                    task_path=task_path,
+                ))
+            await session.commit()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(AgentCheckpointWrite).where(AgentCheckpointWrite.thread_id == thread_id)
+            )
+            await session.execute(
+                delete(AgentCheckpoint).where(AgentCheckpoint.thread_id == thread_id)
+            )
+            await session.commit()
+
+    # Helpers
+
+    async def _prune(self, session: AsyncSession, thread_id: str, checkpoint_ns: str):
+        """
+        Delete checkpoints (and their writes) beyond the retention limit.
+
+        Writes are pruned by checkpoint id rather than by joining to the
+        checkpoint rows, so a write that lands after its checkpoint was
+        pruned is removed on the thread's next put.
+        """
+        oldest_kept = (await session.execute(
+            select(AgentCheckpoint.checkpoint_id)
+            .where(
+                AgentCheckpoint.thread_id == thread_id,
+                AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+            )
+            .order_by(AgentCheckpoint.checkpoint_id.desc())
+            .offset(self.max_checkpoints - 1)
+            .limit(1)
+        )).scalar_one_or_none()
+        if oldest_kept is None:
+            return
+
+        await session.execute(
+            delete(AgentCheckpointWrite).where(
+                AgentCheckpointWrite.thread_id == thread_id,
+                AgentCheckpointWrite.checkpoint_ns == checkpoint_ns,
+                AgentCheckpointWrite.checkpoint_id < oldest_kept,
+            )
+        )
+        pruned = await session.execute(
+            delete(AgentCheckpoint).where(
+                AgentCheckpoint.thread_id == thread_id,
+                AgentCheckpoint.checkpoint_ns == checkpoint_ns,
+                AgentCheckpoint.checkpoint_id < oldest_kept,
+            )
+        )
+        if pruned.rowcount:
+            performance_metrics.increment_counter("agents.checkpoints.pruned", pruned.rowcount)
+
+    @staticmethod
+    def _thread_key(config: RunnableConfig) -> Tuple[str, str]:
+        configurable = config["configurable"]
+        return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+    @staticmethod
+    async def _load_writes(
+        session: AsyncSession,
+        rows: Sequence[AgentCheckpoint],
+    ) -> Dict[Tuple[str, str, str], list]:
+        """Pending writes for ``rows``, keyed by (thread, namespace, checkpoint id)"""
+        if not rows:
+            return {}
+
+        result = await session.execute(
+            select(AgentCheckpointWrite).where(
+                AgentCheckpointWrite.checkpoint_id.in_({row.checkpoint_id for row in rows})
+            )
+        )
+        writes: Dict[Tuple[str, str, str], list] = {}
+        for write in result.scalars():
+            key = (write.thread_id, write.checkpoint_ns, write.checkpoint_id)
+            writes.setdefault(key, []).append(write)
+        return writes
+
+    @staticmethod
+    def _row_key(row: AgentCheckpoint) -> Tuple[str, str, str]:
+        return row.thread_id, row.checkpoint_ns, row.checkpoint_id
+
+    def _to_tuple(self, row: AgentCheckpoint, writes: Sequence[AgentCheckpointWrite]) -> CheckpointTuple:
+        def config_for(checkpoint_id: str) -> RunnableConfig:
+            return {
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        ordered = sorted(writes, key=lambda w: (w.task_path, w.task_id, w.idx))
+        return CheckpointTuple(
+            config=config_for(row.checkpoint_id),
+            checkpoint=self.serde.loads_typed((row.checkpoint_type, row.checkpoint)),
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=(
+                config_for(row.parent_checkpoint_id) if row.parent_checkpoint_id else None
+            ),
+            pending_writes=[
+                (w.task_id, w.channel, self.serde.loads_typed((w.value_type, w.value)))
+                for w in ordered
+            ],
+        )
+
+
+async def create_checkpointer(backend: Optional[str] = None) -> BaseCheckpointSaver:
+    """
+    Build the configured checkpointer.
+
+    Args:
+        backend: "database" or "memory" (defaults to settings.AGENT_CHECKPOINTER)
+
+    Returns:
+        A ready checkpointer; the database backend falls back to the bounded
+        in-memory saver if its tables cannot be reached
+    """
+    backend = backend or settings.AGENT_CHECKPOINTER
+
+    if backend == "database":
+        saver = DatabaseCheckpointSaver()
+        try:
+            await saver.setup()
+            return saver
+        except Exception as e:
+            logger.warning(f"Database checkpointer unavailable, using in-memory fallback: {e}")
+            performance_metrics.increment_counter("agents.checkpoints.fallback")
+    elif backend != "memory":
+        raise ValueError(f"Unknown checkpointer backend: {backend}")
+
+    return BoundedMemorySaver(max_threads=settings.AGENT_CHECKPOINT_MEMORY_MAX_THREADS)
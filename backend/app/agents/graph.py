@@ -4,9 +4,16 @@ LangGraph Workflow for Financial Planning
 Creates a stateful graph with conditional routing between specialist agents.
 """
 
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+import time
+from graphlib import TopologicalSorter
+from typing import Dict, Optional, Set
 
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from .checkpointer import BoundedMemorySaver, create_checkpointer
 from .state import FinancialPlanningState
 from .nodes import (
     orchestrator_node,
@@ -18,6 +25,78 @@ from .nodes import (
 from .advanced_portfolio_agent import advanced_portfolio_agent_node
 
 
+EXECUTION_MODES = ("parallel", "sequential")
+
+# Orchestrator agent ids for nodes whose graph name differs
+NODE_AGENT_IDS = {"monte_carlo": "monte_carlo_simulator"}
+
+# FinancialPlanningState fields each specialist reads, and the plain
+# (last-value) fields it writes. Reducer fields such as messages,
+# agent_responses, analysis_results and completed_agents merge concurrent
+# writes, so they never order specialists relative to each other.
+SPECIALIST_STATE_ACCESS = {
+    "goal_planner": {
+        "reads": {"user_query", "goals", "active_goal_ids"},
+        "writes": set(),
+    },
+    "portfolio_architect": {
+        "reads": {"user_query", "user_profile"},
+        "writes": {"portfolio_allocation"},
+    },
+    "advanced_portfolio": {
+        "reads": {"user_query", "user_profile", "portfolio_allocation", "current_portfolio"},
+        "writes": {"next_agent"},
+    },
+    "monte_carlo": {
+        "reads": {"user_query", "goals", "active_goal_ids", "portfolio_allocation"},
+        "writes": {"simulation_results"},
+    },
+}
+
+
+def specialist_dependencies(
+    access: Dict[str, Dict[str, Set[str]]] = SPECIALIST_STATE_ACCESS
+) -> Dict[str, Set[str]]:
+    """
+    Derive which specialists must finish before each one can start.
+
+    A specialist depends on every other specialist that writes a state
+    field it reads.
+
+    Raises:
+        graphlib.CycleError: If the read/write sets form a cycle
+    """
+    dependencies = {
+        node: {
+            other
+            for other, other_access in access.items()
+            if other != node and other_access["writes"] & node_access["reads"]
+        }
+        for node, node_access in access.items()
+    }
+    # Fail at build time rather than deadlocking at run time
+    TopologicalSorter(dependencies).prepare()
+    return dependencies
+
+
+def _run_if_active(node_name: str, node):
+    """
+    Wrap a specialist so it is a no-op unless the orchestrator activated it.
+
+    Parallel mode has fixed edges, so inactive specialists still take their
+    place in the graph and let the visualization join complete.
+    """
+    agent_id = NODE_AGENT_IDS.get(node_name, node_name)
+
+    async def run(state: FinancialPlanningState) -> Dict:
+        if agent_id not in state.get("active_agents", []):
+            return {}
+        return await node(state)
+
+    run.__name__ = node.__name__
+    return run
+
+
 def route_after_orchestrator(state: FinancialPlanningState) -> str:
     """
     Conditional edge - determines which agent runs after orchestrator.
@@ -95,37 +174,15 @@ def route_after_visualization(state: FinancialPlanningState) -> str:
     return END
 
 
-def create_financial_planning_graph(
-    enable_checkpointing: bool = True
-) -> StateGraph:
+def _add_sequential_edges(workflow: StateGraph):
     """
-    Create the LangGraph financial planning workflow.
-
-    The graph structure:
+    Route one specialist at a time:
 
     START → Orchestrator → (conditional routing)
                 ↓
            Goal Planner → Portfolio Architect → Monte Carlo → Visualization → END
                           (conditional routing at each step)
-
-    Args:
-        enable_checkpointing: If True, enables state persistence for multi-turn conversations
-
-    Returns:
-        Compiled LangGraph workflow
     """
-    # Create the graph
-    workflow = StateGraph(FinancialPlanningState)
-
-    # Add nodes (agents)
-    workflow.add_node("orchestrator", orchestrator_node)
-    workflow.add_node("goal_planner", goal_planner_node)
-    workflow.add_node("portfolio_architect", portfolio_architect_node)
-    workflow.add_node("advanced_portfolio", advanced_portfolio_agent_node)
-    workflow.add_node("monte_carlo", monte_carlo_simulator_node)
-    workflow.add_node("visualization", visualization_node)
-
-    # Set entry point
     workflow.set_entry_point("orchestrator")
 
     # Add conditional edges
@@ -186,11 +243,90 @@ def create_financial_planning_graph(
         }
     )
 
+
+def _add_parallel_edges(workflow: StateGraph):
+    """
+    Fan out independent specialists and join them at visualization:
+
+    START → Orchestrator → Goal Planner ─────────────────────┐
+                         → Portfolio Architect → Monte Carlo ─┼→ Visualization → END
+                                               → Advanced ────┘
+
+    Edges come from specialist_dependencies(); a specialist with several
+    producers, and visualization, wait for all of them to finish.
+    """
+    dependencies = specialist_dependencies()
+    sinks = set(dependencies) - set().union(*dependencies.values())
+
+    workflow.add_edge(START, "orchestrator")
+    for node, producers in dependencies.items():
+        if producers:
+            workflow.add_edge(sorted(producers), node)
+        else:
+            workflow.add_edge("orchestrator", node)
+
+    workflow.add_edge(sorted(sinks), "visualization")
+    workflow.add_edge("visualization", END)
+
+
+def create_financial_planning_graph(
+    enable_checkpointing: bool = True,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    execution_mode: Optional[str] = None
+) -> StateGraph:
+    """
+    Create the LangGraph financial planning workflow.
+
+    In "parallel" mode specialists that share no state dependencies run
+    concurrently, so a turn costs the longest dependency chain of LLM calls
+    rather than their sum. "sequential" mode routes one specialist at a time.
+
+    Compiling is not free; request handlers should use the process-wide
+    graph from get_financial_planning_graph() instead of calling this.
+
+    Args:
+        enable_checkpointing: If True, enables state persistence for multi-turn conversations
+        checkpointer: Checkpoint store to compile with (defaults to a bounded in-memory saver)
+        execution_mode: "parallel" or "sequential" (defaults to AGENT_EXECUTION_MODE)
+
+    Returns:
+        Compiled LangGraph workflow
+    """
+    execution_mode = execution_mode or settings.AGENT_EXECUTION_MODE
+    if execution_mode not in EXECUTION_MODES:
+        raise ValueError(
+            f"Unknown execution mode '{execution_mode}', expected one of {EXECUTION_MODES}"
+        )
+
+    specialists = {
+        "goal_planner": goal_planner_node,
+        "portfolio_architect": portfolio_architect_node,
+        "advanced_portfolio": advanced_portfolio_agent_node,
+        "monte_carlo": monte_carlo_simulator_node,
+    }
+
+    # Create the graph
+    workflow = StateGraph(FinancialPlanningState)
+
+    # Add nodes (agents)
+    workflow.add_node("orchestrator", orchestrator_node)
+    for name, node in specialists.items():
+        if execution_mode == "parallel":
+            node = _run_if_active(name, node)
+        workflow.add_node(name, node)
+    workflow.add_node("visualization", visualization_node)
+
+    if execution_mode == "parallel":
+        _add_parallel_edges(workflow)
+    else:
+        _add_sequential_edges(workflow)
+
     # Compile with optional checkpointing
     if enable_checkpointing:
-        # Use in-memory checkpointer for development
-        # In production, use PostgresSaver for persistence
-        checkpointer = MemorySaver()
+        if checkpointer is None:
+            checkpointer = BoundedMemorySaver(
+                max_threads=settings.AGENT_CHECKPOINT_MEMORY_MAX_THREADS
+            )
         graph = workflow.compile(checkpointer=checkpointer)
     else:
         graph = workflow.compile()
@@ -198,6 +334,65 @@ def create_financial_planning_graph(
     return graph
 
 
+# Process-wide compiled graph, shared by all conversation threads
+_financial_planning_graph = None
+
+
+def _build_graph(checkpointer: Optional[BaseCheckpointSaver]):
+    global _financial_planning_graph
+
+    start_time = time.perf_counter()
+    _financial_planning_graph = create_financial_planning_graph(checkpointer=checkpointer)
+    performance_metrics.record_timing("agents.graph_build", time.perf_counter() - start_time)
+    return _financial_planning_graph
+
+
+async def init_financial_planning_graph(
+    checkpointer: Optional[BaseCheckpointSaver] = None
+):
+    """
+    Compile the shared graph once at startup.
+
+    Args:
+        checkpointer: Checkpoint store to use (defaults to the configured
+            backend; see create_checkpointer)
+
+    Returns:
+        The compiled graph
+    """
+    if checkpointer is None:
+        checkpointer = await create_checkpointer()
+    return _build_graph(checkpointer)
+
+
+def get_financial_planning_graph():
+    """
+    Get the shared compiled graph.
+
+    Falls back to building one with the in-memory checkpointer if startup
+    initialization did not run (scripts, tests).
+    """
+    if _financial_planning_graph is None:
+        return _build_graph(None)
+    return _financial_planning_graph
+
+
+def graph_stats() -> Dict:
+    """
+    Build and turn timings for the shared graph, without compiling it.
+
+    Returns:
+        Dict with graph_build and workflow_turn timing stats, and the
+        checkpointer class name (None until the graph is built)
+    """
+    checkpointer = getattr(_financial_planning_graph, "checkpointer", None)
+    return {
+        "graph_build": performance_metrics.get_stats("agents.graph_build"),
+        "workflow_turn": performance_metrics.get_stats("agents.workflow_turn"),
+        "checkpointer": type(checkpointer).__name__ if checkpointer is not None else None,
+    }
+
+
 async def run_financial_planning_workflow(
     user_query: str,
     thread_id: str,
@@ -231,17 +426,20 @@ async def run_financial_planning_workflow(
         user_profile=user_profile
     )
 
-    # Create graph
-    graph = create_financial_planning_graph()
+    graph = get_financial_planning_graph()
 
     # Execute workflow
     config = {"configurable": {"thread_id": thread_id}}
 
-    if stream:
-        # Stream events as they occur
-        async for event in graph.astream(initial_state, config=config):
-            yield event
-    else:
-        # Execute without streaming
-        final_state = await graph.ainvoke(initial_state, config=config)
-        yield final_state
+    start_time = time.perf_counter()
+    try:
+        if stream:
+            # Stream events as they occur
+            async for event in graph.astream(initial_state, config=config):
+                yield event
+        else:
+            # Execute without streaming
+            final_state = await graph.ainvoke(initial_state, config=config)
+            yield final_state
+    finally:
+        performance_metrics.record_timing("agents.workflow_turn", time.perf_counter() - start_time)
@@ -4,6 +4,7 @@ LangGraph Agent Nodes
 Each node is a specialized financial planning agent that operates on the state.
 """
 
+import zlib
 from typing import Dict
 from langchain_core.messages import HumanMessage, SystemMessage
 from datetime import datetime
@@ -354,7 +355,10 @@ async def monte_carlo_simulator_node(state: FinancialPlanningState) -> Dict:
             expected_return=portfolio_alloc['expected_return'],
             volatility=portfolio_alloc['expected_volatility'],
             goal_amount=active_goal['target_amount'],
-            iterations=5000
+            iterations=5000,
+            low_memory=True,
+            # Stable per-thread seed: an unchanged plan reuses the cached run
+            seed=zlib.crc32(state['thread_id'].encode("utf-8"))
         )
 
         simulation_result = await run_simulation(params)
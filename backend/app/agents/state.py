@@ -5,9 +5,70 @@ Defines the state structure that flows through the agent graph.
 """
 
 from typing import TypedDict, List, Dict, Optional, Annotated
-from operator import add
 from datetime import datetime
 
+from app.core.config import settings
+
+
+def merge_results(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """
+    Reducer for per-agent result dicts.
+
+    Concurrent specialists each contribute their own keys; an empty update
+    (the initial state of a new turn) clears the previous turn's results.
+    """
+    if not right:
+        return {}
+    return {**(left or {}), **right}
+
+
+def merge_agent_ids(left: Optional[List[str]], right: Optional[List[str]]) -> List[str]:
+    """
+    Reducer for agent id lists, keeping first-seen order without duplicates.
+
+    An empty update (the initial state of a new turn) clears the list.
+    """
+    if not right:
+        return []
+    merged = list(left or [])
+    merged.extend(agent_id for agent_id in right if agent_id not in merged)
+    return merged
+
+
+def append_messages(left: Optional[List], right: Optional[List]) -> List:
+    """
+    Reducer for the conversation history.
+
+    Appends new messages but keeps only the most recent
+    AGENT_MAX_HISTORY_MESSAGES, so a long thread does not grow its
+    checkpoints without bound.
+    """
+    merged = list(left or []) + list(right or [])
+    return merged[-settings.AGENT_MAX_HISTORY_MESSAGES:]
+
+
+def merge_agent_responses(left: Optional[List], right: Optional[List]) -> List:
+    """
+    Reducer for per-turn agent responses.
+
+    Concurrent specialists each append their responses; an empty update
+    (the initial state of a new turn) clears the previous turn's responses.
+    """
+    if not right:
+        return []
+    return list(left or []) + list(right)
+
+
+def merge_errors(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """
+    Reducer for error messages from concurrent agents.
+
+    A None update (the initial state of a new turn) clears the error.
+    """
+    if right is None:
+        return None
+    return f"{left}; {right}" if left else right
+
 
 class Message(TypedDict):
     """Message in conversation"""
@@ -65,7 +126,7 @@ class FinancialPlanningState(TypedDict):
     thread_id: str
     user_id: str
     user_query: str
-    messages: Annotated[List[Message], add]  # Append-only message history
+    messages: Annotated[List[Message], append_messages]  # Recent message history
 
     # User profile
     user_profile: Optional[Dict]  # risk_tolerance, age, tax_rate, etc.
@@ -82,16 +143,16 @@ class FinancialPlanningState(TypedDict):
     simulation_results: Optional[SimulationResult]
 
     # Agent coordination
-    agent_responses: Annotated[List[AgentResponse], add]  # Append-only agent responses
+    agent_responses: Annotated[List[AgentResponse], merge_agent_responses]  # Responses this turn
     active_agents: List[str]  # Agents currently working
-    completed_agents: List[str]  # Agents that have finished
+    completed_agents: Annotated[List[str], merge_agent_ids]  # Agents that have finished
 
     # Task routing
     task_type: Optional[str]  # goal_planning, portfolio_optimization, simulation, etc.
     next_agent: Optional[str]  # Which agent should run next
 
     # Analysis results
-    analysis_results: Dict  # Consolidated results from all agents
+    analysis_results: Annotated[Dict, merge_results]  # Consolidated results from all agents
     visualizations: List[Dict]  # Visualization specifications
 
     # Final output
@@ -101,7 +162,7 @@ class FinancialPlanningState(TypedDict):
     # Metadata
     workflow_start_time: str
     workflow_status: str  # in_progress, complete, error
-    error: Optional[str]
+    error: Annotated[Optional[str], merge_errors]
 
 
 class StreamEvent(TypedDict):
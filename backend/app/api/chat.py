@@ -14,7 +14,9 @@ import asyncio
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.performance import performance_metrics, track_operation
 from app.models import Thread, Message, User, Goal
+from app.services.analysis_result_store import analysis_result_store, compact_analysis_results
 from app.agents import run_financial_planning_workflow
 from app.agents.state import create_initial_state
 
@@ -46,7 +48,11 @@ async def format_sse_event(event_type: str, data: dict) -> str:
 
     """
     json_data = json.dumps(data, default=str)
-    return f"event: {event_type}\ndata: {json_data}\n\n"
+    message = f"event: {event_type}\ndata: {json_data}\n\n"
+
+    performance_metrics.increment_counter(f"sse.{event_type}.events")
+    performance_metrics.increment_counter(f"sse.{event_type}.bytes", len(message.encode("utf-8")))
+    return message
 
 
 async def stream_langgraph_events(
@@ -104,7 +110,12 @@ async def stream_langgraph_events(
             stream=True
         ):
             # Event is a dict with node_name: state updates
+            # Parallel branches each emit their own event as they finish
             for node_name, state_update in event.items():
+                # Specialists the orchestrator did not activate produce no update
+                if not state_update:
+                    continue
+
                 # Send agent progress
                 if "agent_responses" in state_update:
                     for agent_resp in state_update["agent_responses"]:
@@ -115,13 +126,18 @@ async def stream_langgraph_events(
                             "timestamp": datetime.utcnow().isoformat()
                         })
 
-                # Send intermediate results
+                # Send intermediate results, with long arrays summarized;
+                # the full arrays are fetchable by result_id
                 if "analysis_results" in state_update:
-                    yield await format_sse_event("result", {
+                    compact, arrays = compact_analysis_results(state_update["analysis_results"])
+                    result_event = {
                         "type": "analysis",
-                        "data": state_update["analysis_results"],
+                        "data": compact,
                         "timestamp": datetime.utcnow().isoformat()
-                    })
+                    }
+                    if arrays:
+                        result_event["result_id"] = await analysis_result_store.save(thread_id, arrays)
+                    yield await format_sse_event("result", result_event)
 
                 # Send visualizations
                 if "visualizations" in state_update:
@@ -233,6 +249,33 @@ async def chat_stream_get(
     )
 
 
+@router.get("/results/{thread_id}/{result_id}")
+async def get_analysis_result(
+    thread_id: str,
+    result_id: str,
+    path: Optional[str] = None
+):
+    """
+    Fetch full analysis arrays summarized in a streamed result event.
+
+    Query Parameters:
+        path: Optional array path from the event summary
+            (e.g. "monte_carlo.final_portfolio_distribution")
+
+    Returns:
+        All stored arrays for the result, or the single array at ``path``
+    """
+    arrays = await analysis_result_store.load(thread_id, result_id)
+    if arrays is None:
+        raise HTTPException(status_code=404, detail="Result not found or expired")
+
+    if path is None:
+        return {"thread_id": thread_id, "result_id": result_id, "arrays": arrays}
+    if path not in arrays:
+        raise HTTPException(status_code=404, detail=f"No array at path '{path}'")
+    return {"thread_id": thread_id, "result_id": result_id, "path": path, "values": arrays[path]}
+
+
 @router.post("/message")
 async def send_message(
     request: ChatRequest,
@@ -273,9 +316,9 @@ async def send_message(
     await db.commit()
 
     # Execute workflow without streaming
-    from app.agents import create_financial_planning_graph
+    from app.agents import get_financial_planning_graph
 
-    graph = create_financial_planning_graph()
+    graph = get_financial_planning_graph()
 
     initial_state = create_initial_state(
         thread_id=thread_id,
@@ -284,7 +327,8 @@ async def send_message(
     )
 
     config = {"configurable": {"thread_id": thread_id}}
-    final_state = await graph.ainvoke(initial_state, config=config)
+    async with track_operation("agents.workflow_turn"):
+        final_state = await graph.ainvoke(initial_state, config=config)
 
     # Save assistant response
     assistant_message = Message(
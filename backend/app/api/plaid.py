@@ -4,8 +4,8 @@ Plaid API endpoints for account linking and data synchronization
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
-from typing import List, Optional
+from sqlalchemy import select, update, and_, desc
+from typing import List, Optional, Tuple
 from datetime import datetime, date, timedelta
 
 from app.api.deps import get_db, get_current_user, CurrentUser
@@ -37,7 +37,9 @@ from app.schemas.plaid import (
     ItemRemoveRequest,
     PlaidWebhookRequest
 )
-from app.services.plaid_service import plaid_service
+from app.services.plaid_client import plaid_client
+from app.services.plaid_sync_queue import enqueue_sync, plaid_sync_worker, webhook_scopes
+from app.services.plaid_sync_service import plaid_sync_service
 from app.services.encryption_service import encryption_service
 from app.services.plaid_webhook_verifier import webhook_verifier
 from app.middleware import limiter, RateLimits
@@ -64,7 +66,7 @@ async def create_link_token(
     to initialize Plaid Link for account connection.
     """
     try:
-        result = plaid_service.create_link_token(
+        result = await plaid_client.create_link_token(
             user_id=current_user.id,
             redirect_uri=body.redirect_uri,
             webhook=body.webhook,
@@ -97,18 +99,18 @@ async def exchange_public_token(
     """
     try:
         # Exchange the public token
-        result = plaid_service.exchange_public_token(request.public_token)
+        result = await plaid_client.exchange_public_token(request.public_token)
         access_token = result["access_token"]
         item_id = result["item_id"]
 
         # Get item details
-        item_details = plaid_service.get_item(access_token)
+        item_details = await plaid_client.get_item(access_token)
 
         # Get institution details if available
         institution_name = None
         if item_details.get("institution_id"):
             try:
-                institution = plaid_service.get_institution(item_details["institution_id"])
+                institution = await plaid_client.get_institution(item_details["institution_id"])
                 institution_name = institution.get("name")
             except Exception as e:
                 logger.warning(f"Failed to get institution details: {e}")
@@ -144,7 +146,8 @@ async def exchange_public_token(
         await db.refresh(plaid_item)
 
         # Sync accounts
-        await _sync_accounts_for_item(db, plaid_item, access_token)
+        accounts_data = await plaid_client.get_accounts(access_token)
+        await _sync_accounts_for_item(db, plaid_item, accounts_data)
 
         return PublicTokenExchangeResponse(
             item_id=item_id,
@@ -213,7 +216,7 @@ async def remove_item(
         access_token = encryption_service.decrypt_access_token(item.access_token)
 
         # Remove from Plaid
-        plaid_service.remove_item(access_token)
+        await plaid_client.remove_item(access_token)
 
         # Delete from database (cascade will handle accounts, transactions, holdings)
         await db.delete(item)
@@ -290,14 +293,20 @@ async def sync_accounts(
         result = await db.execute(query)
         items = result.scalars().all()
 
+        # Fetch every item's accounts at once, then write them in order
+        accounts_by_item = await plaid_client.pipeline(
+            plaid_client.get_accounts,
+            [(encryption_service.decrypt_access_token(item.access_token),) for item in items],
+        )
+
+        fetched, errors = _split_fetch_results(items, accounts_by_item)
+
         total_synced = 0
-        for item in items:
-            # Decrypt access token
-            access_token = encryption_service.decrypt_access_token(item.access_token)
-            count = await _sync_accounts_for_item(db, item, access_token)
+        for item, accounts_data in fetched:
+            count = await _sync_accounts_for_item(db, item, accounts_data)
             total_synced += count
 
-        return {"accounts_synced": total_synced}
+        return {"accounts_synced": total_synced, "errors": errors}
 
     except Exception as e:
         logger.error(f"Error syncing accounts: {e}")
@@ -342,37 +351,15 @@ async def sync_transactions(
             # Decrypt access token
             access_token = encryption_service.decrypt_access_token(item.access_token)
 
-            # Sync transactions for this item
-            # Only pass cursor if it exists (not None)
-            sync_kwargs = {"access_token": access_token}
-            if item.cursor:
-                sync_kwargs["cursor"] = item.cursor
-
-            sync_result = plaid_service.sync_transactions(**sync_kwargs)
-
-            # Log what we got from Plaid
-            print(f">>> PLAID SYNC RESULT for item {item.id}: added={len(sync_result['added'])}, modified={len(sync_result['modified'])}, removed={len(sync_result['removed'])}, cursor={sync_result['cursor']}")
-            logger.info(f"Plaid sync result for item {item.id}: added={len(sync_result['added'])}, modified={len(sync_result['modified'])}, removed={len(sync_result['removed'])}")
+            # Apply changes since the item's stored cursor
+            counts = await plaid_sync_service.sync_transactions(db, item, access_token=access_token)
+            logger.info(f"Plaid sync result for item {item.id}: {counts}")
 
-            # Process added transactions
-            for txn_data in sync_result["added"]:
-                await _upsert_transaction(db, item, txn_data, current_user.id)
-                total_added += 1
+            total_added += counts["added"]
+            total_modified += counts["modified"]
+            total_removed += counts["removed"]
 
-            # Process modified transactions
-            for txn_data in sync_result["modified"]:
-                await _upsert_transaction(db, item, txn_data, current_user.id)
-                total_modified += 1
-
-            # Process removed transactions
-            for txn_id in sync_result["removed"]:
-                await _remove_transaction(db, txn_id)
-                total_removed += 1
-
-            # Update cursor
-            item.cursor = sync_result["cursor"]
             item.last_successful_sync = datetime.utcnow().isoformat()
-
             await db.commit()
 
         return TransactionsSyncResponse(
@@ -509,17 +496,18 @@ async def sync_holdings(
         total_holdings = 0
         total_securities = 0
 
-        for item in items:
-            # Check if item has investments product
-            if "investments" not in (item.billed_products or []):
-                continue
+        # Only items with the investments product have holdings
+        items = [item for item in items if "investments" in (item.billed_products or [])]
 
-            # Decrypt access token
-            access_token = encryption_service.decrypt(item.access_token)
+        # Fetch every item's holdings at once, then write them in order
+        holdings_by_item = await plaid_client.pipeline(
+            plaid_client.get_investments_holdings,
+            [(encryption_service.decrypt(item.access_token),) for item in items],
+        )
 
-            # Get holdings
-            holdings_data = plaid_service.get_investments_holdings(access_token)
+        fetched, errors = _split_fetch_results(items, holdings_by_item)
 
+        for item, holdings_data in fetched:
             # Process holdings
             for holding_data in holdings_data["holdings"]:
                 security = holdings_data["securities"].get(holding_data["security_id"], {})
@@ -533,7 +521,8 @@ async def sync_holdings(
 
         return HoldingsSyncResponse(
             holdings_count=total_holdings,
-            securities_count=total_securities
+            securities_count=total_securities,
+            errors=errors,
         )
 
     except Exception as e:
@@ -625,7 +614,7 @@ async def sync_investment_transactions(
             access_token = encryption_service.decrypt(item.access_token)
 
             # Fetch investment transactions from Plaid
-            inv_data = plaid_service.get_investment_transactions(
+            inv_data = await plaid_client.get_investment_transactions(
                 access_token=access_token,
                 start_date=request.start_date.isoformat(),
                 end_date=request.end_date.isoformat()
@@ -772,30 +761,28 @@ async def handle_webhook(
 
         logger.info(f"Received Plaid webhook: {webhook_data.webhook_type}/{webhook_data.webhook_code}")
 
-        # Get the item
-        result = await db.execute(
-            select(PlaidItem).where(PlaidItem.item_id == webhook_data.item_id)
-        )
-        item = result.scalar_one_or_none()
+        if webhook_data.webhook_type == "ITEM" and webhook_data.webhook_code == "ERROR":
+            # Record the item error in place; nothing to sync
+            await db.execute(
+                update(PlaidItem)
+                .where(PlaidItem.item_id == webhook_data.item_id)
+                .values(
+                    error_code=webhook_data.error.get("error_code") if webhook_data.error else None,
+                    error_message=webhook_data.error.get("error_message") if webhook_data.error else None,
+                )
+            )
+            await db.commit()
+            return {"status": "processed"}
 
-        if not item:
-            logger.warning(f"Webhook for unknown item: {webhook_data.item_id}")
+        scopes = webhook_scopes(webhook_data.webhook_type, webhook_data.webhook_code)
+        if not scopes:
             return {"status": "ignored"}
 
-        # Handle different webhook types
-        if webhook_data.webhook_type == "TRANSACTIONS":
-            if webhook_data.webhook_code in ["SYNC_UPDATES_AVAILABLE", "DEFAULT_UPDATE"]:
-                # Trigger transaction sync (in production, use background task)
-                logger.info(f"New transactions available for item {item.id}")
-
-        elif webhook_data.webhook_type == "ITEM":
-            if webhook_data.webhook_code == "ERROR":
-                # Update item error status
-                item.error_code = webhook_data.error.get("error_code") if webhook_data.error else None
-                item.error_message = webhook_data.error.get("error_message") if webhook_data.error else None
-                await db.commit()
-
-        return {"status": "processed"}
+        # Sync work runs in the background queue; bursts coalesce per item
+        await enqueue_sync(db, webhook_data.item_id, scopes)
+        await db.commit()
+        plaid_sync_worker.notify()
+        return {"status": "queued"}
 
     except Exception as e:
         logger.error(f"Error processing webhook: {e}")
@@ -803,13 +790,36 @@ async def handle_webhook(
 
 
 # Helper functions
+def _split_fetch_results(items: List[PlaidItem], results: List) -> Tuple[List[Tuple], List[dict]]:
+    """
+    Pair pipelined Plaid results with their items, separating failures.
+
+    Returns:
+        (item, data) pairs for successful fetches, and an error entry
+        (item_id, error) per failed item
+
+    Raises:
+        The first failure, when every item failed
+    """
+    fetched, errors = [], []
+    for item, result in zip(items, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Plaid fetch failed for item {item.id}: {result}")
+            errors.append({"item_id": item.id, "error": str(result)})
+        else:
+            fetched.append((item, result))
+
+    if errors and not fetched:
+        raise next(result for result in results if isinstance(result, Exception))
+    return fetched, errors
+
+
 async def _sync_accounts_for_item(
     db: AsyncSession,
     item: PlaidItem,
-    access_token: str
+    accounts_data: List[dict]
 ) -> int:
-    """Sync accounts for a specific item"""
-    accounts_data = plaid_service.get_accounts(access_token)
+    """Store accounts fetched from Plaid for a specific item"""
 
     for acc_data in accounts_data:
         # Check if account exists
@@ -857,72 +867,6 @@ async def _sync_accounts_for_item(
     return len(accounts_data)
 
 
-async def _upsert_transaction(
-    db: AsyncSession,
-    item: PlaidItem,
-    txn_data: dict,
-    user_id: str
-):
-    """Insert or update a transaction"""
-    # Get account
-    result = await db.execute(
-        select(PlaidAccount).where(PlaidAccount.account_id == txn_data["account_id"])
-    )
-    account = result.scalar_one_or_none()
-
-    if not account:
-        logger.warning(f"Transaction for unknown account: {txn_data['account_id']}")
-        return
-
-    # Check if transaction exists
-    result = await db.execute(
-        select(PlaidTransaction).where(PlaidTransaction.transaction_id == txn_data["transaction_id"])
-    )
-    transaction = result.scalar_one_or_none()
-
-    if transaction:
-        # Update existing
-        transaction.amount = txn_data["amount"]
-        transaction.date = txn_data["date"]
-        transaction.name = txn_data["name"]
-        transaction.merchant_name = txn_data.get("merchant_name")
-        transaction.category = txn_data.get("category")
-        transaction.personal_finance_category = txn_data.get("personal_finance_category")
-        transaction.pending = txn_data.get("pending", False)
-    else:
-        # Create new
-        transaction = PlaidTransaction(
-            account_id=account.id,
-            user_id=user_id,
-            transaction_id=txn_data["transaction_id"],
-            amount=txn_data["amount"],
-            iso_currency_code=txn_data.get("iso_currency_code", "USD"),
-            date=txn_data["date"],
-            authorized_date=txn_data.get("authorized_date"),
-            name=txn_data["name"],
-            merchant_name=txn_data.get("merchant_name"),
-            category=txn_data.get("category"),
-            category_id=txn_data.get("category_id"),
-            personal_finance_category=txn_data.get("personal_finance_category"),
-            pending=txn_data.get("pending", False),
-            payment_channel=txn_data.get("payment_channel"),
-            location=txn_data.get("location"),
-            payment_meta=txn_data.get("payment_meta")
-        )
-        db.add(transaction)
-
-
-async def _remove_transaction(db: AsyncSession, transaction_id: str):
-    """Remove a transaction"""
-    result = await db.execute(
-        select(PlaidTransaction).where(PlaidTransaction.transaction_id == transaction_id)
-    )
-    transaction = result.scalar_one_or_none()
-
-    if transaction:
-        await db.delete(transaction)
-
-
 async def _upsert_holding(
     db: AsyncSession,
     item: PlaidItem,
@@ -4,9 +4,16 @@ Provides real-time performance monitoring and metrics
 """
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from typing import Dict
 from datetime import datetime
 
+from app.agents.graph import graph_stats
+from app.core.cache import cache
+from app.core.compute import compute_executor
+from app.core.database import pool_stats
+from app.core.metrics_aggregation import metrics_publisher
+from app.core.metrics_exposition import CONTENT_TYPE, render_openmetrics
 from app.core.performance import performance_metrics, get_performance_report
 
 router = APIRouter(prefix="/performance-metrics", tags=["Performance"])
@@ -21,8 +28,31 @@ async def get_performance_stats():
     - Timing metrics for all tracked operations
     - Counter values
     - Uptime information
+    - Number of workers aggregated
     """
-    return performance_metrics.get_all_stats()
+    metrics, workers = await metrics_publisher.collect()
+    return {**metrics.get_all_stats(), "workers": workers}
+
+
+@router.get("/openmetrics", response_class=PlainTextResponse)
+async def get_openmetrics():
+    """
+    Prometheus scrape target in OpenMetrics text format
+
+    Returns:
+    - Per-operation latency histograms (all workers), with buckets scaled
+      to each operation's PerformanceWarnings threshold
+    - Counters and cache hit ratios (all workers)
+    - Compute executor and DB pool gauges (serving worker)
+    """
+    metrics, _ = await metrics_publisher.collect()
+    body = render_openmetrics(
+        metrics,
+        executor_stats=compute_executor.stats(),
+        pool_stats=pool_stats(),
+        worker_id=cache.instance_id,
+    )
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
 
 
 @router.get("/report", response_model=Dict)
@@ -36,13 +66,14 @@ async def get_performance_report_endpoint():
     - Health status
     - Recommendations
     """
-    return get_performance_report()
+    metrics, workers = await metrics_publisher.collect()
+    return {**get_performance_report(metrics), "workers": workers}
 
 
 @router.get("/operation/{operation_name}", response_model=Dict)
 async def get_operation_stats(operation_name: str):
     """
-    Get statistics for a specific operation
+    Get statistics for a specific operation across all workers
 
     Path Parameters:
     - operation_name: Name of the operation to query
@@ -50,7 +81,8 @@ async def get_operation_stats(operation_name: str):
     Returns:
     - Count, mean, min, max, percentiles
     """
-    stats = performance_metrics.get_stats(operation_name)
+    metrics, _ = await metrics_publisher.collect()
+    stats = metrics.get_stats(operation_name)
     if not stats:
         return {
             "operation": operation_name,
@@ -66,12 +98,88 @@ async def get_operation_stats(operation_name: str):
     }
 
 
+@router.get("/compute", response_model=Dict)
+async def get_compute_stats():
+    """
+    Get compute executor occupancy
+
+    Returns:
+    - Running and queued job counts
+    - Pool and queue limits
+    - Queue depth distribution sampled at submission
+    """
+    return {
+        **compute_executor.stats(),
+        "queue_depth_stats": performance_metrics.get_value_stats("compute.queue_depth"),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@router.get("/cache", response_model=Dict)
+async def get_cache_codec_stats():
+    """
+    Get cache tier hit rates and payload sizes per key namespace
+
+    Returns:
+    - Hit/miss counts per tier (L1 in-process, L2 Redis)
+    - Codec and compression in use
+    - Writes, encoded and stored bytes
+    - Compression ratio
+    """
+    return {
+        "tiers": cache.tier_stats(),
+        "namespaces": cache.codec_stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@router.get("/agents", response_model=Dict)
+async def get_agent_stats():
+    """
+    Get agent graph build cost versus per-turn execution time
+
+    Returns:
+    - Graph compile timing (normally a single startup build)
+    - Workflow turn timing
+    - Checkpointer backend in use
+    """
+    return {
+        **graph_stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@router.get("/sse", response_model=Dict)
+async def get_sse_payload_stats():
+    """
+    Get streamed chat payload sizes per SSE event type
+
+    Returns:
+    - Event count, total and average bytes per event type
+    """
+    event_types: Dict[str, Dict] = {}
+    for name, value in performance_metrics.counters.items():
+        prefix, _, rest = name.partition(".")
+        event_type, _, field = rest.rpartition(".")
+        if prefix == "sse" and field in ("events", "bytes"):
+            event_types.setdefault(event_type, {"events": 0, "bytes": 0})[field] = value
+
+    for stats in event_types.values():
+        stats["avg_bytes"] = stats["bytes"] / stats["events"] if stats["events"] else 0.0
+
+    return {
+        "event_types": event_types,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 @router.post("/reset")
 async def reset_metrics():
     """
     Reset all performance metrics
 
-    Note: This should typically only be used in development/testing
+    Note: This should typically only be used in development/testing.
+    Only the worker serving the request is reset.
     """
     performance_metrics.reset()
     return {
@@ -90,7 +198,8 @@ async def performance_health_check():
     - Health status
     - Warning about slow operations
     """
-    report = get_performance_report()
+    metrics, _ = await metrics_publisher.collect()
+    report = get_performance_report(metrics)
 
     return {
         "status": report["health_status"],
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from app.core.compute import ComputeError, compute_executor
 from app.services.portfolio.asset_class_library import (
     ASSET_CLASS_LIBRARY,
     get_all_asset_codes,
@@ -483,11 +484,16 @@ async def optimize_multi_level(request: MultiLevelOptimizationRequest):
 
     # Perform optimization
     optimizer = MultiLevelOptimizer()
-    result = optimizer.optimize_household(
-        household=household,
-        asset_codes=asset_codes,
-        correlation_matrix=None  # Use defaults
-    )
+    try:
+        result = await compute_executor.run(
+            optimizer.optimize_household,
+            household=household,
+            asset_codes=asset_codes,
+            correlation_matrix=None,  # Use defaults
+            operation="portfolio_optimization",
+        )
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
 
     return {
         "optimization_level": result.level,
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.compute import ComputeError, compute_executor
 from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
@@ -522,16 +523,20 @@ async def monte_carlo_stress_test(request: MonteCarloStressRequest):
     try:
         service = StressTestingService()
 
-        result = service.run_monte_carlo_stress(
+        result = await compute_executor.run(
+            service.run_monte_carlo_stress,
             portfolio_value=request.portfolio_value,
             allocation=request.allocation,
             asset_volatilities=request.asset_volatilities,
             n_simulations=request.n_simulations,
-            confidence_level=request.confidence_level
+            confidence_level=request.confidence_level,
+            operation="monte_carlo_stress",
         )
 
         return result
 
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -7,10 +7,12 @@ REQ-SENSITIVITY-001: Advanced sensitivity analysis endpoints
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
+from types import SimpleNamespace
 from typing import List, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 
+from app.core.compute import ComputeError, compute_executor
 from app.core.database import get_db
 from app.models.goal import Goal
 from app.services.portfolio.sensitivity_analyzer import SensitivityAnalyzer
@@ -62,6 +64,13 @@ class BreakEvenAnalysisRequest(BaseModel):
 
 # ==================== Helper Functions ====================
 
+def _detach_goal(goal: Goal) -> SimpleNamespace:
+    """Plain copy of the goal's column values that can be shipped to a worker process"""
+    return SimpleNamespace(**{
+        attr.key: getattr(goal, attr.key) for attr in inspect(goal).mapper.column_attrs
+    })
+
+
 def get_sensitivity_analyzer(db: AsyncSession = Depends(get_db)) -> SensitivityAnalyzer:
     """Create sensitivity analyzer instance"""
     mc_engine = MonteCarloEngine()
@@ -139,12 +148,14 @@ async def one_way_sensitivity(
         analyzer = get_sensitivity_analyzer(db)
 
         # Run analysis
-        result = await analyzer.one_way_sensitivity(
-            goal=goal,
+        result = await compute_executor.run(
+            analyzer.one_way_sensitivity,
+            goal=_detach_goal(goal),
             variables=request.variables,
             variation_percentage=request.variation_percentage,
             num_points=request.num_points,
             iterations_per_point=request.iterations_per_point,
+            operation="sensitivity_one_way",
         )
 
         return {
@@ -156,6 +167,8 @@ async def one_way_sensitivity(
 
     except HTTPException:
         raise
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sensitivity analysis failed: {str(e)}")
 
@@ -216,13 +229,15 @@ async def two_way_sensitivity(
         analyzer = get_sensitivity_analyzer(db)
 
         # Run analysis
-        result = await analyzer.two_way_sensitivity(
-            goal=goal,
+        result = await compute_executor.run(
+            analyzer.two_way_sensitivity,
+            goal=_detach_goal(goal),
             variable1=request.variable1,
             variable2=request.variable2,
             variation_percentage=request.variation_percentage,
             grid_size=request.grid_size,
             iterations_per_point=request.iterations_per_point,
+            operation="sensitivity_two_way",
         )
 
         return {
@@ -234,6 +249,8 @@ async def two_way_sensitivity(
 
     except HTTPException:
         raise
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Two-way analysis failed: {str(e)}")
 
@@ -294,13 +311,15 @@ async def threshold_analysis(
         analyzer = get_sensitivity_analyzer(db)
 
         # Run analysis
-        result = await analyzer.threshold_analysis(
-            goal=goal,
+        result = await compute_executor.run(
+            analyzer.threshold_analysis,
+            goal=_detach_goal(goal),
             variable=request.variable,
             target_probability=request.target_probability,
             min_value=request.min_value,
             max_value=request.max_value,
             tolerance=request.tolerance,
+            operation="sensitivity_threshold",
         )
 
         return {
@@ -312,6 +331,8 @@ async def threshold_analysis(
 
     except HTTPException:
         raise
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Threshold analysis failed: {str(e)}")
 
@@ -372,13 +393,15 @@ async def break_even_analysis(
         analyzer = get_sensitivity_analyzer(db)
 
         # Run analysis
-        result = await analyzer.break_even_analysis(
-            goal=goal,
+        result = await compute_executor.run(
+            analyzer.break_even_analysis,
+            goal=_detach_goal(goal),
             variable1=request.variable1,
             variable2=request.variable2,
             target_probability=request.target_probability,
             grid_size=request.grid_size,
             iterations_per_point=request.iterations_per_point,
+            operation="sensitivity_break_even",
         )
 
         return {
@@ -390,6 +413,8 @@ async def break_even_analysis(
 
     except HTTPException:
         raise
+    except ComputeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Break-even analysis failed: {str(e)}")
 
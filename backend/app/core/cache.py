@@ -3,30 +3,95 @@ Redis Caching Service
 Provides caching utilities for frequently accessed data
 """
 
+import asyncio
 import json
-from typing import Optional, Any, Callable
+import time
+import uuid
+from typing import Optional, Any, Callable, Dict, Tuple
 from functools import wraps
 import redis.asyncio as redis
 from app.core.config import settings
+from app.core.cache_codecs import (
+    NAMESPACE_POLICIES,
+    CodecPolicy,
+    decode_value,
+    encode_value,
+    key_namespace,
+    policy_for_key,
+    resolve_policy,
+)
+from app.core.local_cache import LocalCache
+from app.core.performance import performance_metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pub/sub channel carrying L1 invalidations between workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Delete a lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheService:
-    """Redis cache service for application data"""
+    """
+    Two-tier cache: optional process-local L1 in front of Redis (L2)
+
+    Writes and deletes are published on ``INVALIDATION_CHANNEL`` so every
+    worker evicts its L1 copy; the L1 TTL bounds staleness if a message is
+    missed.  The L1 tier is only used while Redis is connected.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        l1_enabled: Optional[bool] = None,
+        l1_max_entries: Optional[int] = None,
+        l1_ttl: Optional[float] = None,
+    ):
         self.redis_client: Optional[redis.Redis] = None
         self._connected = False
+        l1_enabled = settings.CACHE_L1_ENABLED if l1_enabled is None else l1_enabled
+        self.local: Optional[LocalCache] = LocalCache(
+            max_entries=l1_max_entries or settings.CACHE_L1_MAX_ENTRIES,
+            default_ttl=l1_ttl or settings.CACHE_L1_TTL_SECONDS,
+        ) if l1_enabled else None
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._policies: Dict[str, CodecPolicy] = {
+            namespace: resolve_policy(policy)
+            for namespace, policy in NAMESPACE_POLICIES.items()
+        }
+
+    @property
+    def connected(self) -> bool:
+        """Whether Redis is connected (the cache is a no-op otherwise)"""
+        return self._connected and self.redis_client is not None
+
+    def register_namespace(
+        self, namespace: str, codec: str = "json", compression: str = "none"
+    ):
+        """
+        Select the codec and compression for keys starting with ``namespace:``
+
+        Args:
+            namespace: Key prefix before the first colon (e.g. "simulation")
+            codec: "json", "msgpack" or "numpy" (single-array values)
+            compression: "none", "zstd" or "lz4"
+        """
+        self._policies[namespace] = resolve_policy(CodecPolicy(codec, compression))
 
     async def connect(self):
         """Connect to Redis"""
         try:
             self.redis_client = await redis.from_url(
                 settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,  # Values are framed binary payloads
             )
             await self.redis_client.ping()
             self._connected = True
@@ -34,27 +99,115 @@ class CacheService:
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             self._connected = False
+            return
+
+        if self.local is not None:
+            await self._subscribe_invalidations()
 
     async def disconnect(self):
         """Disconnect from Redis"""
+        if self._listener:
+            self._listener.cancel()
+            # Let the listener leave get_message before its connection closes
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing invalidation subscription: {e}")
+            self._pubsub = None
+        if self.local is not None:
+            self.local.clear()
         if self.redis_client:
             await self.redis_client.close()
             self._connected = False
             logger.info("Disconnected from Redis")
 
+    async def _subscribe_invalidations(self):
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+            self._listener = asyncio.create_task(self._listen_invalidations())
+        except Exception as e:
+            # Without fan-out a local tier could serve stale values indefinitely
+            logger.error(f"Cache invalidation subscribe failed, disabling L1 cache: {e}")
+            self.local = None
+
+    async def _listen_invalidations(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache invalidation listener stopped, clearing L1 cache: {e}")
+            if self.local is not None:
+                self.local.clear()
+            self.local = None
+
+    def _apply_invalidation(self, data: Any):
+        """Evict the key or pattern named in an invalidation message"""
+        if self.local is None:
+            return
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+            return
+        if message.get("origin") == self.instance_id:
+            return
+
+        performance_metrics.increment_counter("cache.invalidations.received")
+        if "key" in message:
+            self.local.delete(message["key"])
+        elif "pattern" in message:
+            self.local.delete_pattern(message["pattern"])
+
+    def _invalidation_message(self, **target: str) -> str:
+        return json.dumps({"origin": self.instance_id, **target})
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if not self._connected or not self.redis_client:
             return None
 
+        start = time.perf_counter()
         try:
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            if self.local is not None:
+                value = self.local.get(key)
+                if value is not None:
+                    performance_metrics.increment_counter("cache.l1.hits")
+                    return decode_value(value)
+                performance_metrics.increment_counter("cache.l1.misses")
+
+            if self.local is not None:
+                # Fetch the remaining TTL in the same round trip so the L1
+                # copy never outlives the Redis entry
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    value, ttl = await pipe.execute()
+            else:
+                value, ttl = await self.redis_client.get(key), None
+
+            if not value:
+                performance_metrics.increment_counter("cache.l2.misses")
+                return None
+
+            performance_metrics.increment_counter("cache.l2.hits")
+            if self.local is not None and len(value) <= settings.CACHE_L1_MAX_ENTRY_BYTES:
+                self.local.set(key, value, ttl=ttl if ttl and ttl > 0 else None)
+            return decode_value(value)
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return None
+        finally:
+            performance_metrics.record_timing("cache_operation.get", time.perf_counter() - start)
 
     async def set(
         self, key: str, value: Any, expire: Optional[int] = None
@@ -63,24 +216,98 @@ class CacheService:
         if not self._connected or not self.redis_client:
             return False
 
+        start = time.perf_counter()
         try:
-            serialized = json.dumps(value)
-            if expire:
-                await self.redis_client.setex(key, expire, serialized)
-            else:
-                await self.redis_client.set(key, serialized)
+            encoded = encode_value(value, policy_for_key(key, self._policies))
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                if expire:
+                    pipe.setex(key, expire, encoded.data)
+                else:
+                    pipe.set(key, encoded.data)
+                if self.local is not None:
+                    pipe.publish(INVALIDATION_CHANNEL, self._invalidation_message(key=key))
+                await pipe.execute()
+
+            if self.local is not None:
+                if encoded.stored_bytes <= settings.CACHE_L1_MAX_ENTRY_BYTES:
+                    self.local.set(key, encoded.data, ttl=expire)
+                else:
+                    self.local.delete(key)
+            self._record_payload_size(key, encoded.encoded_bytes, encoded.stored_bytes)
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
+        finally:
+            performance_metrics.record_timing("cache_operation.set", time.perf_counter() - start)
+
+    def _record_payload_size(self, key: str, encoded_bytes: int, stored_bytes: int):
+        namespace = key_namespace(key)
+        performance_metrics.increment_counter(f"cache.{namespace}.writes")
+        performance_metrics.increment_counter(f"cache.{namespace}.encoded_bytes", encoded_bytes)
+        performance_metrics.increment_counter(f"cache.{namespace}.stored_bytes", stored_bytes)
+
+    def tier_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and hit rate for the L1 and Redis tiers"""
+        counters = performance_metrics.counters
+        stats = {}
+        for tier in ("l1", "l2"):
+            hits = counters.get(f"cache.{tier}.hits", 0)
+            misses = counters.get(f"cache.{tier}.misses", 0)
+            stats[tier] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        stats["l1"].update({
+            "enabled": self.local is not None,
+            "entries": len(self.local) if self.local is not None else 0,
+            "evictions": counters.get("cache.l1.evictions", 0),
+            "invalidations_received": counters.get("cache.invalidations.received", 0),
+        })
+        return stats
+
+    def codec_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Payload sizes written per namespace since the last metrics reset
+
+        ``compression_ratio`` is encoded size over stored size; compare
+        ``avg_stored_bytes`` across codec policies to see encoding savings.
+        """
+        counters = performance_metrics.counters
+        stats = {}
+        for name, writes in counters.items():
+            if not (name.startswith("cache.") and name.endswith(".writes")):
+                continue
+            namespace = name[len("cache."):-len(".writes")]
+            encoded = counters.get(f"cache.{namespace}.encoded_bytes", 0)
+            stored = counters.get(f"cache.{namespace}.stored_bytes", 0)
+            policy = self._policies.get(namespace, CodecPolicy())
+            stats[namespace] = {
+                "codec": policy.codec,
+                "compression": policy.compression,
+                "writes": writes,
+                "encoded_bytes": encoded,
+                "stored_bytes": stored,
+                "avg_stored_bytes": round(stored / writes, 1) if writes else 0.0,
+                "compression_ratio": round(encoded / stored, 3) if stored else 1.0,
+            }
+        return stats
 
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self._connected or not self.redis_client:
             return False
 
+        if self.local is not None:
+            self.local.delete(key)
+
         try:
-            await self.redis_client.delete(key)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                if self.local is not None:
+                    pipe.publish(INVALIDATION_CHANNEL, self._invalidation_message(key=key))
+                await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
@@ -91,18 +318,76 @@ class CacheService:
         if not self._connected or not self.redis_client:
             return 0
 
+        if self.local is not None:
+            self.local.delete_pattern(pattern)
+
         try:
             keys = []
             async for key in self.redis_client.scan_iter(match=pattern):
                 keys.append(key)
 
-            if keys:
-                return await self.redis_client.delete(*keys)
-            return 0
+            deleted = await self.redis_client.delete(*keys) if keys else 0
+            if self.local is not None:
+                await self.redis_client.publish(
+                    INVALIDATION_CHANNEL, self._invalidation_message(pattern=pattern)
+                )
+            return deleted
         except Exception as e:
             logger.error(f"Cache delete pattern error for {pattern}: {e}")
             return 0
 
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """
+        Try to take a short-lived cross-worker lock
+
+        Returns a token to pass to ``release_lock``, or None if another
+        holder has it.  Without Redis there is nothing to coordinate, so a
+        token is always returned.
+        """
+        token = uuid.uuid4().hex
+        if not self._connected or not self.redis_client:
+            return token
+
+        try:
+            acquired = await self.redis_client.set(key, token, nx=True, px=int(ttl * 1000))
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Cache lock error for key {key}: {e}")
+            return token
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with ``acquire_lock`` if it is still ours"""
+        if not self._connected or not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
+        except Exception as e:
+            logger.error(f"Cache unlock error for key {key}: {e}")
+            return False
+
+    async def peek_locked(self, key: str, lock_key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Read ``key`` from Redis and whether ``lock_key`` is still held
+
+        Used to poll for another worker's result, so it skips L1 and the
+        hit/miss counters that a lookup through ``get`` would inflate.
+        """
+        if not self._connected or not self.redis_client:
+            return None, False
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                # Lock first: a holder that stores ``key`` before unlocking
+                # is then never seen as unlocked without its value
+                pipe.exists(lock_key)
+                pipe.get(key)
+                locked, value = await pipe.execute()
+            return (decode_value(value) if value else None), locked > 0
+        except Exception as e:
+            logger.error(f"Cache peek error for key {key}: {e}")
+            return None, False
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         if not self._connected or not self.redis_client:
@@ -213,6 +498,10 @@ class CacheKeys:
     DIVERSIFICATION = "diversification:portfolio:{portfolio_id}"
     DIVERSIFICATION_TTL = 600
 
+    # Agent tool results, content-addressed (15 minutes)
+    TOOL_RESULT = "tool:{tool}:{hash}"
+    TOOL_RESULT_TTL = 900
+
 
 async def invalidate_user_cache(user_id: str):
     """Invalidate all cache entries for a user"""
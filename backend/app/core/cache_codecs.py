@@ -0,0 +1,270 @@
+"""
+Cache Serialization Codecs
+Binary encodings and compression for values stored by the Redis CacheService
+
+Every value written through a codec is framed as::
+
+    MAGIC | codec id | compression id | payload
+
+``MAGIC`` (0xC1) never starts valid JSON or msgpack data, so frames are
+self-describing: entries written before codecs existed (plain JSON strings)
+and entries written under a different namespace policy still decode.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+
+MAGIC = b"\xc1"
+HEADER_SIZE = 3
+
+# msgpack extension type carrying an ndarray as (dtype, shape, raw buffer)
+NDARRAY_EXT_TYPE = 42
+
+# Payloads smaller than this are stored uncompressed
+MIN_COMPRESS_BYTES = 256
+
+
+class CodecError(Exception):
+    """Raised when a cached payload cannot be encoded or decoded"""
+
+
+# ==================== Codecs ====================
+
+class JSONCodec:
+    """JSON text encoding (the original cache format)"""
+
+    id = b"j"
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class MsgpackCodec:
+    """msgpack encoding with NumPy arrays embedded as raw buffers"""
+
+    id = b"m"
+    name = "msgpack"
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(
+            payload, ext_hook=self._ext_hook, raw=False, strict_map_key=False
+        )
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, np.ndarray):
+            return msgpack.ExtType(NDARRAY_EXT_TYPE, _pack_ndarray(obj))
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump()
+        raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> Any:
+        if code == NDARRAY_EXT_TYPE:
+            return _unpack_ndarray(data)
+        return msgpack.ExtType(code, data)
+
+
+class NumpyCodec:
+    """Raw buffer encoding for values that are a single NumPy array"""
+
+    id = b"n"
+    name = "numpy"
+
+    def encode(self, value: Any) -> bytes:
+        if not isinstance(value, np.ndarray):
+            raise CodecError("numpy codec only encodes ndarray values")
+        return _pack_ndarray(value)
+
+    def decode(self, payload: bytes) -> Any:
+        return _unpack_ndarray(payload)
+
+
+def _pack_ndarray(array: np.ndarray) -> bytes:
+    """Header line ``dtype;shape`` followed by the C-ordered buffer"""
+    array = np.ascontiguousarray(array)
+    if array.dtype.hasobject:
+        raise CodecError("object arrays cannot be stored as raw buffers")
+    shape = ",".join(str(dim) for dim in array.shape)
+    return f"{array.dtype.str};{shape}\n".encode("ascii") + array.tobytes()
+
+
+def _unpack_ndarray(data: bytes) -> np.ndarray:
+    """Inverse of ``_pack_ndarray``; the result is a read-only view of ``data``"""
+    header_end = data.index(b"\n")
+    dtype, shape = data[:header_end].decode("ascii").split(";")
+    dims = tuple(int(dim) for dim in shape.split(",")) if shape else ()
+    return np.frombuffer(data, dtype=np.dtype(dtype), offset=header_end + 1).reshape(dims)
+
+
+# ==================== Compression ====================
+
+class NoCompression:
+    id = b"0"
+    name = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class ZstdCompression:
+    id = b"z"
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class LZ4Compression:
+    id = b"l"
+    name = "lz4"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+
+CODECS: Dict[str, Any] = {"json": JSONCodec()}
+if MSGPACK_AVAILABLE:
+    CODECS["msgpack"] = MsgpackCodec()
+CODECS["numpy"] = NumpyCodec()
+
+COMPRESSORS: Dict[str, Any] = {"none": NoCompression()}
+if ZSTD_AVAILABLE:
+    COMPRESSORS["zstd"] = ZstdCompression()
+if LZ4_AVAILABLE:
+    COMPRESSORS["lz4"] = LZ4Compression()
+
+_CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+_COMPRESSORS_BY_ID = {compressor.id: compressor for compressor in COMPRESSORS.values()}
+
+
+# ==================== Namespace policies ====================
+
+@dataclass(frozen=True)
+class CodecPolicy:
+    """Codec and compression used for one key namespace"""
+
+    codec: str = "json"
+    compression: str = "none"
+
+
+DEFAULT_POLICY = CodecPolicy()
+
+# Large numeric payloads get binary encodings; small records stay JSON
+NAMESPACE_POLICIES: Dict[str, CodecPolicy] = {
+    "simulation": CodecPolicy("msgpack", "zstd"),
+    "portfolio_opt": CodecPolicy("msgpack", "zstd"),
+    "analysis": CodecPolicy("msgpack", "lz4"),
+    "risk": CodecPolicy("msgpack", "lz4"),
+    "diversification": CodecPolicy("msgpack", "lz4"),
+    "tool": CodecPolicy("msgpack", "zstd"),
+}
+
+
+def key_namespace(key: str) -> str:
+    """Namespace of a cache key: the segment before the first colon"""
+    return key.split(":", 1)[0]
+
+
+def resolve_policy(policy: CodecPolicy) -> CodecPolicy:
+    """Downgrade a policy to what the installed optional packages support"""
+    codec = policy.codec if policy.codec in CODECS else "json"
+    compression = policy.compression if policy.compression in COMPRESSORS else "none"
+    if (codec, compression) != (policy.codec, policy.compression):
+        logger.warning(
+            f"Cache policy {policy.codec}/{policy.compression} unavailable, "
+            f"using {codec}/{compression}"
+        )
+    return CodecPolicy(codec, compression)
+
+
+@dataclass
+class EncodedValue:
+    """Framed payload plus the sizes used for per-namespace metrics"""
+
+    data: bytes
+    encoded_bytes: int
+    stored_bytes: int
+
+
+def encode_value(value: Any, policy: CodecPolicy = DEFAULT_POLICY) -> EncodedValue:
+    """Encode and optionally compress ``value`` into a framed payload"""
+    codec = CODECS[policy.codec]
+    compressor = COMPRESSORS[policy.compression]
+
+    payload = codec.encode(value)
+    encoded_bytes = len(payload)
+    if len(payload) < MIN_COMPRESS_BYTES:
+        compressor = COMPRESSORS["none"]
+    payload = compressor.compress(payload)
+
+    data = MAGIC + codec.id + compressor.id + payload
+    return EncodedValue(data=data, encoded_bytes=encoded_bytes, stored_bytes=len(data))
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a framed payload, or a legacy plain JSON entry"""
+    if isinstance(data, str):
+        return json.loads(data)
+    if not data.startswith(MAGIC):
+        return json.loads(data)
+
+    codec = _CODECS_BY_ID.get(data[1:2])
+    compressor = _COMPRESSORS_BY_ID.get(data[2:3])
+    if codec is None or compressor is None:
+        raise CodecError(f"Unsupported cache frame header {data[:HEADER_SIZE]!r}")
+    return codec.decode(compressor.decompress(data[HEADER_SIZE:]))
+
+
+def policy_for_key(key: str, overrides: Optional[Dict[str, CodecPolicy]] = None) -> CodecPolicy:
+    """Policy for ``key`` from ``overrides`` or the defaults"""
+    namespace = key_namespace(key)
+    if overrides and namespace in overrides:
+        return overrides[namespace]
+    return NAMESPACE_POLICIES.get(namespace, DEFAULT_POLICY)
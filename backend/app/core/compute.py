@@ -0,0 +1,272 @@
+"""
+Compute Executor
+Runs CPU-bound planning work in a bounded process pool off the event loop
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.performance import performance_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeError(Exception):
+    """Base class for compute executor failures surfaced to API callers"""
+
+    status_code = 503
+
+
+class ComputeQueueFullError(ComputeError):
+    """Raised when the submission queue is at capacity"""
+
+    status_code = 503
+
+
+class ComputeTimeoutError(ComputeError):
+    """Raised when a job exceeds its request-level timeout"""
+
+    status_code = 504
+
+
+# Event loop reused by every coroutine job in this worker process
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def in_compute_worker() -> bool:
+    """Whether the caller is running inside a compute pool worker process"""
+    return _worker_loop is not None
+
+
+def _invoke(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Worker-side trampoline that also drives coroutine functions to completion"""
+    global _worker_loop
+    if _worker_loop is None:
+        # Created on the first job, which also marks the process as a worker;
+        # reusing it avoids asyncio.run's per-job loop setup and teardown
+        _worker_loop = asyncio.new_event_loop()
+
+    result = func(*args, **kwargs)
+    if inspect.isawaitable(result):
+        return _worker_loop.run_until_complete(result)
+    return result
+
+
+class ComputeExecutor:
+    """
+    Shared executor for CPU-bound NumPy/SciPy work.
+
+    At most ``max_workers`` jobs hold a pool slot at once; further jobs wait
+    in a FIFO queue of at most ``max_queue_depth`` entries and are rejected
+    beyond that.  Slots are released only when the worker process actually
+    finishes, so queue depth reflects real pool occupancy even after a
+    timeout.  Functions and arguments must be picklable (module-level
+    functions, bound methods of plain service objects, Pydantic models).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_depth: int = 64,
+        default_timeout: Optional[float] = 60.0,
+        start_method: str = "spawn",
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue_depth = max_queue_depth
+        self.default_timeout = default_timeout
+        self.start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._running = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def start(self):
+        """Create the process pool (idempotent; workers spawn on demand)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+            logger.info(f"Compute executor started with {self.max_workers} workers")
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool, cancelling jobs that have not started"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            logger.info("Compute executor shut down")
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a pool slot"""
+        return len(self._waiters)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool occupancy"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "running": self._running,
+            "queued": self.queue_depth,
+            "started": self._pool is not None,
+        }
+
+    async def run(
+        self,
+        func: Callable,
+        *args: Any,
+        timeout: Optional[float] = None,
+        operation: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` in the pool and await its result
+
+        Coroutine functions are executed on the worker's reusable event
+        loop.  The timeout covers queueing and execution; when it expires,
+        or the awaiting request is cancelled, a queued job is dropped and a
+        running job's result is discarded.
+
+        Args:
+            func: Picklable callable to execute
+            timeout: Seconds before ``ComputeTimeoutError``; defaults to
+                ``default_timeout``
+            operation: Metric name; defaults to the function's qualified name
+
+        Raises:
+            ComputeQueueFullError: If the queue is at ``max_queue_depth``
+            ComputeTimeoutError: If the job does not finish in time
+        """
+        operation = operation or getattr(func, "__qualname__", "task")
+        timeout = self.default_timeout if timeout is None else timeout
+
+        if self._running >= self.max_workers and self.queue_depth >= self.max_queue_depth:
+            performance_metrics.increment_counter("compute.rejected")
+            raise ComputeQueueFullError(
+                f"Compute queue is full ({self.max_queue_depth} jobs waiting)"
+            )
+
+        performance_metrics.increment_counter("compute.submitted")
+        performance_metrics.record_value("compute.queue_depth", self.queue_depth)
+        start_time = time.time()
+        try:
+            result = await asyncio.wait_for(
+                self._execute(func, args, kwargs, operation, start_time), timeout
+            )
+        except asyncio.TimeoutError:
+            performance_metrics.increment_counter("compute.timeouts")
+            logger.warning(f"Compute job {operation} timed out after {timeout}s")
+            raise ComputeTimeoutError(
+                f"{operation} did not finish within {timeout} seconds"
+            ) from None
+        except asyncio.CancelledError:
+            performance_metrics.increment_counter("compute.cancelled")
+            raise
+        except Exception:
+            performance_metrics.increment_counter("compute.failed")
+            raise
+        finally:
+            performance_metrics.record_timing(f"compute.{operation}", time.time() - start_time)
+
+        performance_metrics.increment_counter("compute.completed")
+        return result
+
+    async def _execute(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        operation: str,
+        start_time: float,
+    ) -> Any:
+        await self._acquire_slot()
+        performance_metrics.record_timing(
+            f"compute.{operation}.queue_wait", time.time() - start_time
+        )
+
+        try:
+            pool, future = self._submit(func, args, kwargs)
+        except BaseException:
+            self._release_slot()
+            raise
+
+        loop = asyncio.get_running_loop()
+
+        def _on_done(_):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._release_slot)
+
+        future.add_done_callback(_on_done)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool for later jobs
+            logger.error(f"Compute pool broken while running {operation}; restarting")
+            self._discard_pool(pool)
+            raise
+        except asyncio.CancelledError:
+            if not future.cancel():
+                # Already running in a worker; it finishes in the background
+                # and keeps its slot until then.
+                performance_metrics.increment_counter("compute.abandoned")
+            raise
+
+    def _submit(self, func: Callable, args: tuple, kwargs: dict) -> Tuple[ProcessPoolExecutor, Future]:
+        """Submit to the current pool; returns the pool used with the future"""
+        self.start()
+        pool = self._pool
+        try:
+            return pool, pool.submit(_invoke, func, args, kwargs)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            self.start()
+            pool = self._pool
+            return pool, pool.submit(_invoke, func, args, kwargs)
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        # Every job of a broken pool fails; only the first to notice shuts it
+        # down, so a replacement started meanwhile keeps its jobs.
+        if self._pool is pool:
+            self.shutdown(wait=False)
+
+    async def _acquire_slot(self):
+        if self._running < self.max_workers and not self._waiters:
+            self._running += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation
+                self._release_slot()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _release_slot(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next job
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+
+# Global compute executor instance
+compute_executor = ComputeExecutor(
+    max_workers=settings.COMPUTE_MAX_WORKERS,
+    max_queue_depth=settings.COMPUTE_MAX_QUEUE_DEPTH,
+    default_timeout=settings.COMPUTE_TIMEOUT_SECONDS,
+)
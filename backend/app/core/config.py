@@ -31,6 +31,12 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # In-process L1 cache in front of Redis
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_ENTRIES: int = 2048
+    CACHE_L1_TTL_SECONDS: float = 60.0  # Upper bound on staleness if an invalidation is missed
+    CACHE_L1_MAX_ENTRY_BYTES: int = 64 * 1024
+
     # Anthropic Claude
     ANTHROPIC_API_KEY: Optional[str] = None
     ANTHROPIC_MODEL: str = "claude-sonnet-4-5-20250929"
@@ -43,6 +49,17 @@ class Settings(BaseSettings):
     PLAID_COUNTRY_CODES: List[str] = ["US", "CA"]
     PLAID_REDIRECT_URI: Optional[str] = None  # For OAuth flow
     PLAID_WEBHOOK_VERIFICATION_KEY: Optional[str] = None  # For webhook signature verification
+    PLAID_CLIENT_MAX_WORKERS: int = 16  # Threads (and pooled connections) for Plaid SDK calls
+    PLAID_SYNC_CONCURRENCY: int = 8  # Items synced at once by the fleet sync
+    PLAID_SYNC_INSTITUTION_RATE: float = 2.0  # Item syncs per second per institution
+    PLAID_SYNC_INSTITUTION_BURST: int = 4
+    PLAID_SYNC_MAX_RETRIES: int = 3  # Retries per item on transient errors
+    PLAID_SYNC_RETRY_BASE_DELAY: float = 1.0  # Seconds; doubles per retry, with jitter
+    PLAID_SYNC_QUEUE_WORKERS: int = 4  # Webhook sync jobs run at once per process (0 disables)
+    PLAID_SYNC_QUEUE_POLL_SECONDS: float = 2.0
+    PLAID_SYNC_QUEUE_LEASE_SECONDS: float = 600.0  # Running jobs older than this are requeued
+    PLAID_SYNC_QUEUE_MAX_ATTEMPTS: int = 5
+    PLAID_SYNC_QUEUE_FAILED_RETENTION_SECONDS: float = 7 * 24 * 3600.0  # Failed jobs are purged after this
 
     # Security
     SECRET_KEY: str
@@ -51,6 +68,23 @@ class Settings(BaseSettings):
     # Monitoring (Optional)
     SENTRY_DSN: Optional[str] = None  # Sentry error tracking
 
+    # Compute executor (process pool for CPU-bound planning work)
+    COMPUTE_MAX_WORKERS: Optional[int] = None  # Defaults to CPU count
+    COMPUTE_MAX_QUEUE_DEPTH: int = 64
+    COMPUTE_TIMEOUT_SECONDS: float = 60.0
+    SIMULATION_INLINE_MAX_PATH_MONTHS: int = 60_000  # Smaller simulations skip the pool
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5  # Lag probe period; 0 disables it
+
+    # Cross-worker metrics aggregation via Redis
+    METRICS_PUBLISH_INTERVAL_SECONDS: float = 10.0  # Worker snapshot period; expiry is 3x this
+
+    # LangGraph checkpointing for multi-turn agent conversations
+    AGENT_CHECKPOINTER: str = "database"  # "database" or "memory"
+    AGENT_CHECKPOINT_MEMORY_MAX_THREADS: int = 1000  # In-memory fallback bound
+    AGENT_CHECKPOINT_RETENTION: int = 20  # Database checkpoints kept per thread
+    AGENT_MAX_HISTORY_MESSAGES: int = 50  # Messages kept per conversation thread
+    AGENT_EXECUTION_MODE: str = "parallel"  # "parallel" (fan-out/fan-in) or "sequential"
+
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_STORAGE: str = "memory://"  # Use "redis://localhost:6379" in production
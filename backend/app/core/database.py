@@ -1,9 +1,14 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+import time
+from typing import Any, Callable, Dict, Sequence
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine.url import make_url
 from app.core.config import settings
+from app.core.performance import performance_metrics
 from app.models.base import Base
 
 
@@ -40,6 +45,32 @@ async_engine = create_async_engine(
     **async_engine_kwargs,
 )
 
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start_time"] = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("query_start_time", None)
+    if start is not None:
+        performance_metrics.record_timing("database_query", time.perf_counter() - start)
+
+
+def pool_stats() -> dict:
+    """Connection pool occupancy of the async engine (empty for unpooled SQLite)"""
+    pool = async_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
 # Create sync engine (for Alembic migrations)
 engine = create_engine(
     sync_database_url,
@@ -64,3 +95,57 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+# Rows per upsert executemany call; bounds the parameter list held per call
+# and how long one call keeps the connection
+UPSERT_BATCH_SIZE = 500
+
+
+def dialect_insert(db: AsyncSession) -> Callable:
+    """``insert`` with ``on_conflict_do_update`` support for the session's database"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"Upserts need SQLite or PostgreSQL, not {dialect}")
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Any,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    batch_size: int = UPSERT_BATCH_SIZE,
+) -> int:
+    """
+    Insert rows in batches, updating ``update_columns`` where a row with the
+    same ``conflict_columns`` already exists.
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite and PostgreSQL,
+    executed once per batch. Rows must all have the same keys, and
+    ``conflict_columns`` must be covered by a unique index. Runs inside the
+    session's transaction; the caller commits.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    insert = dialect_insert(db)
+    table = model.__table__
+    stmt = insert(table)
+    values = {column: stmt.excluded[column] for column in update_columns}
+    if "updated_at" in table.c:
+        # Core upserts skip the ORM onupdate hook
+        values["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=values)
+
+    # One compiled statement executed with many parameter sets; the driver
+    # batches them (sqlite3 executemany, asyncpg pipelined executemany)
+    for start in range(0, len(rows), batch_size):
+        await db.execute(stmt, list(rows[start:start + batch_size]))
+    return len(rows)
@@ -0,0 +1,165 @@
+"""
+Latency Histogram
+Bounded-memory streaming quantiles for operation timings
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+# Reported quantiles are within this relative error of a recorded value
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Durations at or below this many seconds share the zero bucket
+MIN_TRACKABLE_VALUE = 1e-9
+
+
+class LatencyHistogram:
+    """
+    Sparse log-bucketed histogram (DDSketch-style).
+
+    Bucket ``i`` holds values in ``(gamma**(i-1), gamma**i]`` and reports them
+    at a point within ``relative_accuracy`` of every value in the bucket, so
+    memory grows with the log of the value range rather than the sample
+    count: about 1,100 buckets span 1us to 1h at 1% accuracy.
+
+    Recording is a dict increment with no lock. A thread racing another
+    recorder can at worst drop a count; it never corrupts the histogram.
+    Histograms with the same accuracy merge exactly, which is what makes
+    per-worker aggregation possible.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        """Add one observation in O(1)"""
+        if value > MIN_TRACKABLE_VALUE:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _bucket_value(self, index: int) -> float:
+        # Point with equal relative distance to both bucket bounds
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """
+        Values at quantiles ``qs`` (each in [0, 1]) in a single pass.
+
+        Uses the nearest-rank convention ``sorted_values[int(q * count)]``.
+        The first and last ranks return the exact recorded min and max.
+        """
+        if not self.count:
+            return [None] * len(qs)
+
+        targets = sorted(
+            (min(int(q * self.count), self.count - 1), position)
+            for position, q in enumerate(qs)
+        )
+        results: List[Optional[float]] = [None] * len(qs)
+
+        # Zero bucket first, then log buckets in ascending order. Copying the
+        # dict is a single C call, so concurrent recorders cannot break the scan
+        buckets = [(None, self.zero_count)]
+        buckets.extend(sorted(self.buckets.copy().items()))
+
+        cumulative = 0
+        next_target = 0
+        for index, count in buckets:
+            cumulative += count
+            while next_target < len(targets) and targets[next_target][0] < cumulative:
+                rank, position = targets[next_target]
+                if rank == self.count - 1:
+                    results[position] = self.max
+                elif index is None or rank == 0:
+                    results[position] = self.min
+                else:
+                    results[position] = min(max(self._bucket_value(index), self.min), self.max)
+                next_target += 1
+            if next_target == len(targets):
+                break
+        return results
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Number of observations at or below each of ``bounds`` (ascending).
+
+        Each bound counts the whole log bucket it falls in, so a value equal
+        to the bound is always included and the effective edge is within
+        ``relative_accuracy`` of the bound.
+        """
+        counts: List[int] = []
+        cumulative = self.zero_count
+        buckets = sorted(self.buckets.copy().items())
+        position = 0
+        for bound in bounds:
+            if bound > MIN_TRACKABLE_VALUE:
+                last_index = math.ceil(math.log(bound) / self._log_gamma)
+                while position < len(buckets) and buckets[position][0] <= last_index:
+                    cumulative += buckets[position][1]
+                    position += 1
+            counts.append(cumulative)
+        return counts
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's observations into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge histograms with different accuracy")
+
+        for index, count in other.buckets.copy().items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): count for index, count in self.buckets.copy().items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(data["relative_accuracy"])
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        histogram.zero_count = data["zero_count"]
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        if histogram.count:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
@@ -0,0 +1,66 @@
+"""
+Process-Local Cache
+Size-bounded LRU/TTL store used as the L1 tier in front of Redis
+"""
+
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Optional
+
+from app.core.performance import performance_metrics
+
+
+class LocalCache:
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Values are stored as the encoded cache frames (immutable ``bytes``) so a
+    caller mutating a returned object can never corrupt the cached copy.
+    Not thread-safe; it is only touched from the event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored frame, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: Optional[float] = None):
+        """Store ``data``, evicting least recently used entries beyond capacity"""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            performance_metrics.increment_counter("cache.l1.evictions")
+
+    def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching a Redis-style glob pattern"""
+        matches = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in matches:
+            del self._entries[key]
+        return len(matches)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,62 @@
+"""
+Event Loop Lag Monitor
+Measures how late the event loop wakes a sleeping task
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.performance import PerformanceMetrics, performance_metrics
+
+logger = logging.getLogger(__name__)
+
+# Timing name the lag is recorded under
+LOOP_LAG_OPERATION = "event_loop.lag"
+
+
+class EventLoopLagMonitor:
+    """
+    Records event loop lag as the ``event_loop.lag`` timing.
+
+    Every ``interval`` seconds the monitor sleeps and records how much later
+    than requested it woke up. Anything that holds the loop (CPU-bound work
+    awaited inline, blocking I/O) shows up as lag for every request served
+    by this worker, so its p99 is the metric to watch.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.EVENT_LOOP_LAG_INTERVAL_SECONDS,
+        metrics: Optional[PerformanceMetrics] = None,
+    ):
+        self.interval = interval
+        self.metrics = metrics or performance_metrics
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.metrics.record_timing(LOOP_LAG_OPERATION, max(lag, 0.0))
+
+    def start(self):
+        """Begin probing in the background (no-op when the interval is 0)"""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global monitor instance
+loop_lag_monitor = EventLoopLagMonitor()
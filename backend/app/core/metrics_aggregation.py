@@ -0,0 +1,126 @@
+"""
+Cross-Worker Metrics Aggregation
+Publishes each worker's metrics snapshot to Redis and merges them on read
+"""
+
+import asyncio
+import json
+import logging
+from typing import Optional, Tuple
+
+from app.core.cache import CacheService, cache
+from app.core.config import settings
+from app.core.performance import PerformanceMetrics, performance_metrics
+
+logger = logging.getLogger(__name__)
+
+# One key per worker; expiry drops workers that stop publishing
+WORKER_METRICS_KEY = "metrics:worker:{worker_id}"
+
+
+class MetricsPublisher:
+    """
+    Periodically writes this worker's metrics snapshot to Redis.
+
+    Each uvicorn worker has its own PerformanceMetrics, so a request only
+    sees the worker that served it. ``collect`` merges the fresh local
+    metrics with every other live worker's last snapshot, so the view is at
+    most one publish interval stale for other workers.
+    """
+
+    def __init__(
+        self,
+        metrics: PerformanceMetrics = performance_metrics,
+        cache_service: CacheService = cache,
+        interval: Optional[float] = None,
+    ):
+        self.metrics = metrics
+        self.cache = cache_service
+        self.interval = interval or settings.METRICS_PUBLISH_INTERVAL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def key(self) -> str:
+        return WORKER_METRICS_KEY.format(worker_id=self.cache.instance_id)
+
+    async def publish(self) -> bool:
+        """Write the current snapshot; returns False when Redis is unavailable"""
+        if not self.cache.connected:
+            return False
+
+        try:
+            await self.cache.redis_client.setex(
+                self.key, int(self.interval * 3) or 1, json.dumps(self.metrics.snapshot())
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Metrics publish failed: {e}")
+            return False
+
+    async def collect(self) -> Tuple[PerformanceMetrics, int]:
+        """
+        Merge metrics from all live workers.
+
+        Returns:
+            The merged metrics and the number of workers they cover
+        """
+        merged = PerformanceMetrics()
+        merged.merge_snapshot(self.metrics.snapshot())
+        workers = 1
+
+        if not self.cache.connected:
+            return merged, workers
+
+        try:
+            keys = []
+            async for key in self.cache.redis_client.scan_iter(
+                match=WORKER_METRICS_KEY.format(worker_id="*")
+            ):
+                key = key.decode() if isinstance(key, bytes) else key
+                if key != self.key:
+                    keys.append(key)
+
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(key)
+                snapshots = await pipe.execute() if keys else []
+        except Exception as e:
+            logger.error(f"Metrics collection failed, reporting this worker only: {e}")
+            return merged, workers
+
+        for snapshot in snapshots:
+            # Expired between the scan and the read
+            if snapshot:
+                merged.merge_snapshot(json.loads(snapshot))
+                workers += 1
+        return merged, workers
+
+    async def _run(self):
+        while True:
+            await self.publish()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Begin publishing in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop publishing and withdraw this worker's snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            # Let an in-flight publish finish unwinding before the delete
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.cache.connected:
+            try:
+                await self.cache.redis_client.delete(self.key)
+            except Exception as e:
+                logger.debug(f"Error removing worker metrics: {e}")
+
+
+# Global publisher instance
+metrics_publisher = MetricsPublisher()
@@ -0,0 +1,175 @@
+"""
+OpenMetrics Exposition
+Renders performance metrics in the OpenMetrics text format for Prometheus
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.performance import PerformanceMetrics, PerformanceWarnings
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+METRIC_PREFIX = "wealthnavigator"
+
+# Bucket bounds as multiples of an operation's PerformanceWarnings threshold.
+# Dense around 1x so histogram_quantile(0.95, ...) resolves a p95 that
+# crosses the threshold instead of interpolating across a wide bucket
+THRESHOLD_BUCKET_FACTORS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0, 1.25, 1.5, 2.0, 5.0
+)
+
+# Operations without a threshold
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Compute executor queue length sampled at each submission (record_value)
+QUEUE_DEPTH_VALUE = "compute.queue_depth"
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def histogram_buckets(operation: str) -> Tuple[float, ...]:
+    """Upper bounds (seconds) of the exported buckets for an operation"""
+    threshold = PerformanceWarnings.threshold_for(operation)
+    if threshold is None:
+        return DEFAULT_BUCKETS
+    return tuple(round(threshold * factor, 6) for factor in THRESHOLD_BUCKET_FACTORS)
+
+
+def _metric_name(*parts: str) -> str:
+    return _INVALID_NAME_CHARS.sub("_", "_".join((METRIC_PREFIX,) + parts))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _Family:
+    """One metric family: metadata lines followed by its samples"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str, unit: str = ""):
+        self.lines = [f"# TYPE {name} {metric_type}"]
+        if unit:
+            self.lines.append(f"# UNIT {name} {unit}")
+        self.lines.append(f"# HELP {name} {_escape(help_text)}")
+        self.name = name
+        self.has_samples = False
+
+    def sample(self, suffix: str, labels: Dict[str, Any], value: float):
+        self.lines.append(f"{self.name}{suffix}{_labels(labels)} {_number(value)}")
+        self.has_samples = True
+
+
+def _histogram_samples(
+    family: _Family, histogram, bounds: Sequence[float], labels: Dict[str, Any]
+):
+    for bound, count in zip(bounds, histogram.cumulative_counts(bounds)):
+        family.sample("_bucket", {**labels, "le": repr(float(bound))}, count)
+    family.sample("_bucket", {**labels, "le": "+Inf"}, histogram.count)
+    family.sample("_count", labels, histogram.count)
+    family.sample("_sum", labels, histogram.sum)
+
+
+def render_openmetrics(
+    metrics: PerformanceMetrics,
+    executor_stats: Optional[Dict[str, Any]] = None,
+    pool_stats: Optional[Dict[str, int]] = None,
+    worker_id: Optional[str] = None,
+) -> str:
+    """
+    Render metrics as an OpenMetrics text exposition.
+
+    Args:
+        metrics: Timings and counters, usually merged across workers
+        executor_stats: ``ComputeExecutor.stats()`` of the serving worker
+        pool_stats: ``pool_stats()`` of the serving worker's DB engine
+        worker_id: Label for the per-worker gauges
+
+    Returns:
+        Exposition text terminated by ``# EOF``
+    """
+    families: List[_Family] = []
+    histograms = list(metrics.metrics.items())
+
+    durations = _Family(
+        _metric_name("operation_duration_seconds"), "histogram",
+        "Operation latency; buckets are scaled to the operation's threshold", "seconds",
+    )
+    for operation, histogram in sorted(histograms):
+        if histogram.count:
+            _histogram_samples(durations, histogram, histogram_buckets(operation), {"operation": operation})
+    families.append(durations)
+
+    queue_depth = _Family(
+        _metric_name("compute_queue_depth_at_submit"), "histogram",
+        "Compute executor jobs queued ahead of each submission",
+    )
+    depth_histogram = metrics.values.get(QUEUE_DEPTH_VALUE)
+    if depth_histogram is not None and depth_histogram.count:
+        _histogram_samples(queue_depth, depth_histogram, QUEUE_DEPTH_BUCKETS, {})
+    families.append(queue_depth)
+
+    thresholds = _Family(
+        _metric_name("operation_threshold_seconds"), "gauge",
+        "Latency threshold an operation's p95 is alerted against", "seconds",
+    )
+    for operation, threshold in PerformanceWarnings.THRESHOLDS.items():
+        thresholds.sample("", {"operation": operation}, float(threshold))
+    families.append(thresholds)
+
+    counters = metrics.counters.copy()
+    hit_ratio = _Family(
+        _metric_name("cache_hit_ratio"), "gauge",
+        "Hits over lookups for each cache with hit and miss counters",
+    )
+    for name in sorted(counters):
+        if not name.endswith(".hits"):
+            continue
+        cache_name = name[: -len(".hits")]
+        hits = counters[name]
+        lookups = hits + counters.get(f"{cache_name}.misses", 0)
+        if lookups:
+            hit_ratio.sample("", {"cache": cache_name}, hits / lookups)
+    families.append(hit_ratio)
+
+    # Counter names are free-form dotted paths; names that collide after
+    # sanitizing share one series
+    totals: Dict[str, int] = {}
+    for name, value in counters.items():
+        totals[_metric_name(name)] = totals.get(_metric_name(name), 0) + value
+    for family_name in sorted(totals):
+        counter = _Family(family_name, "counter", "Application event counter")
+        counter.sample("_total", {}, totals[family_name])
+        families.append(counter)
+
+    worker_labels = {"worker": worker_id} if worker_id else {}
+    for key, value in (executor_stats or {}).items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        gauge = _Family(_metric_name("compute_executor", key), "gauge", f"Compute executor {key}")
+        gauge.sample("", worker_labels, value)
+        families.append(gauge)
+
+    for key, value in (pool_stats or {}).items():
+        gauge = _Family(_metric_name("db_pool", key), "gauge", f"Database connection pool {key}")
+        gauge.sample("", worker_labels, value)
+        families.append(gauge)
+
+    lines = [line for family in families if family.has_samples for line in family.lines]
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
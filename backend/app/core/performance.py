@@ -5,32 +5,49 @@ Tracks application performance and provides insights
 
 import time
 import logging
-from typing import Dict, Optional, List
+from typing import Dict, Optional
 from datetime import datetime
 from functools import wraps
 from contextlib import asynccontextmanager
 import asyncio
 
+from app.core.latency_histogram import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 
 class PerformanceMetrics:
-    """Track and store performance metrics"""
+    """
+    Track and store performance metrics
+
+    Timings go into a LatencyHistogram per operation, so recording is O(1),
+    memory stays bounded however many samples arrive, and percentile reads
+    never sort. Snapshots of different workers merge exactly. Samples that
+    are not durations (queue lengths, batch sizes) are kept apart in
+    ``values`` so they never mix into latency stats.
+    """
 
     def __init__(self):
-        self.metrics: Dict[str, List[float]] = {}
+        self.metrics: Dict[str, LatencyHistogram] = {}
+        self.values: Dict[str, LatencyHistogram] = {}
         self.counters: Dict[str, int] = {}
         self.last_reset = datetime.now()
 
+    @staticmethod
+    def _record(histograms: Dict[str, LatencyHistogram], name: str, sample: float):
+        histogram = histograms.get(name)
+        if histogram is None:
+            # setdefault is atomic, so racing first recorders share one histogram
+            histogram = histograms.setdefault(name, LatencyHistogram())
+        histogram.record(sample)
+
     def record_timing(self, operation: str, duration: float):
         """Record operation timing"""
-        if operation not in self.metrics:
-            self.metrics[operation] = []
-        self.metrics[operation].append(duration)
+        self._record(self.metrics, operation, duration)
 
-        # Keep only last 1000 measurements
-        if len(self.metrics[operation]) > 1000:
-            self.metrics[operation] = self.metrics[operation][-1000:]
+    def record_value(self, name: str, value: float):
+        """Record a sample that is not a duration (e.g. a queue length)"""
+        self._record(self.values, name, value)
 
     def increment_counter(self, name: str, value: int = 1):
         """Increment a counter"""
@@ -38,31 +55,62 @@ class PerformanceMetrics:
 
     def get_stats(self, operation: str) -> Optional[Dict]:
         """Get statistics for an operation"""
-        if operation not in self.metrics or not self.metrics[operation]:
+        return self._histogram_stats(self.metrics.get(operation))
+
+    def get_value_stats(self, name: str) -> Optional[Dict]:
+        """Get statistics for a non-duration value"""
+        return self._histogram_stats(self.values.get(name))
+
+    @staticmethod
+    def _histogram_stats(histogram: Optional[LatencyHistogram]) -> Optional[Dict]:
+        if histogram is None or not histogram.count:
             return None
 
-        timings = self.metrics[operation]
+        p50, p95, p99 = histogram.quantiles((0.50, 0.95, 0.99))
         return {
-            "count": len(timings),
-            "mean": sum(timings) / len(timings),
-            "min": min(timings),
-            "max": max(timings),
-            "p50": sorted(timings)[len(timings) // 2],
-            "p95": sorted(timings)[int(len(timings) * 0.95)],
-            "p99": sorted(timings)[int(len(timings) * 0.99)],
+            "count": histogram.count,
+            "mean": histogram.mean,
+            "min": histogram.min,
+            "max": histogram.max,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
         }
 
     def get_all_stats(self) -> Dict:
         """Get all performance statistics"""
         return {
-            "metrics": {op: self.get_stats(op) for op in self.metrics},
+            "metrics": {op: self.get_stats(op) for op in list(self.metrics)},
+            "values": {name: self.get_value_stats(name) for name in list(self.values)},
             "counters": self.counters.copy(),
             "uptime_seconds": (datetime.now() - self.last_reset).total_seconds(),
         }
 
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of all histograms and counters"""
+        return {
+            "metrics": {op: histogram.to_dict() for op, histogram in list(self.metrics.items())},
+            "values": {name: histogram.to_dict() for name, histogram in list(self.values.items())},
+            "counters": self.counters.copy(),
+            "last_reset": self.last_reset.isoformat(),
+        }
+
+    def merge_snapshot(self, snapshot: Dict):
+        """Add another worker's snapshot into these metrics"""
+        for histograms, kind in ((self.metrics, "metrics"), (self.values, "values")):
+            for name, data in snapshot.get(kind, {}).items():
+                histogram = histograms.setdefault(name, LatencyHistogram(data["relative_accuracy"]))
+                histogram.merge(LatencyHistogram.from_dict(data))
+        for name, value in snapshot.get("counters", {}).items():
+            self.increment_counter(name, value)
+        # Uptime covers the longest-running contributor
+        last_reset = datetime.fromisoformat(snapshot["last_reset"])
+        self.last_reset = min(self.last_reset, last_reset)
+
     def reset(self):
         """Reset all metrics"""
         self.metrics.clear()
+        self.values.clear()
         self.counters.clear()
         self.last_reset = datetime.now()
 
@@ -143,6 +191,27 @@ class PerformanceWarnings:
         "cache_operation": 0.1,  # 100ms max
     }
 
+    @classmethod
+    def threshold_for(cls, operation: str) -> Optional[float]:
+        """
+        Threshold covering an operation name
+
+        Recorded names are often namespaced or suffixed variants of a
+        threshold key (``compute.monte_carlo_stress``,
+        ``cache_operation.get``), so a key matches any dot-separated part
+        of the name that starts with it. The longest matching key wins.
+        """
+        threshold = cls.THRESHOLDS.get(operation)
+        if threshold is not None:
+            return threshold
+
+        parts = operation.split(".")
+        matches = [
+            key for key in cls.THRESHOLDS
+            if any(part.startswith(key) for part in parts)
+        ]
+        return cls.THRESHOLDS[max(matches, key=len)] if matches else None
+
     @classmethod
     def check_threshold(cls, operation: str, duration: float) -> bool:
         """Check if operation exceeded threshold"""
@@ -156,9 +225,14 @@ class PerformanceWarnings:
         return False
 
 
-def get_performance_report() -> Dict:
-    """Generate comprehensive performance report"""
-    stats = performance_metrics.get_all_stats()
+def get_performance_report(metrics: Optional[PerformanceMetrics] = None) -> Dict:
+    """
+    Generate comprehensive performance report
+
+    Args:
+        metrics: Metrics to report on (defaults to this worker's)
+    """
+    stats = (metrics or performance_metrics).get_all_stats()
 
     # Identify slow operations
     slow_operations = []
@@ -177,6 +251,7 @@ def get_performance_report() -> Dict:
             m.get("count", 0) for m in stats.get("metrics", {}).values()
         ),
         "metrics": stats.get("metrics", {}),
+        "values": stats.get("values", {}),
         "counters": stats.get("counters", {}),
         "slow_operations": sorted(
             slow_operations, key=lambda x: x["p95_seconds"], reverse=True
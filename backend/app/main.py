@@ -18,6 +18,12 @@ from app.middleware import (
 )
 from app.core.monitoring import init_sentry
 from app.core.cache import cache
+from app.core.compute import compute_executor
+from app.core.loop_monitor import loop_lag_monitor
+from app.core.metrics_aggregation import metrics_publisher
+from app.services.plaid_client import plaid_client
+from app.services.plaid_sync_queue import plaid_sync_worker
+from app.agents import init_financial_planning_graph
 import logging
 import traceback
 
@@ -93,6 +99,11 @@ async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting WealthNavigator AI backend...")
     await cache.connect()
+    compute_executor.start()
+    metrics_publisher.start()
+    loop_lag_monitor.start()
+    plaid_sync_worker.start()
+    await init_financial_planning_graph()
     logger.info("Startup complete")
 
 
@@ -100,7 +111,12 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down WealthNavigator AI backend...")
+    await plaid_sync_worker.stop()
+    await loop_lag_monitor.stop()
+    await metrics_publisher.stop()
     await cache.disconnect()
+    compute_executor.shutdown(wait=False)
+    plaid_client.shutdown(wait=False)
     logger.info("Shutdown complete")
 
 
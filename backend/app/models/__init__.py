@@ -12,9 +12,10 @@ from .thread_db import Thread, Message, MessageRole
 from .goal import Goal, GoalCategory, GoalPriority
 from .portfolio_db import Portfolio, Account, AccountType, ConnectionStatus
 from .analysis import Analysis, MonteCarloSimulation, AnalysisType, SimulationStatus
-from .plaid import PlaidItem, PlaidAccount, PlaidTransaction, PlaidHolding
+from .plaid import PlaidItem, PlaidAccount, PlaidTransaction, PlaidHolding, PlaidSyncJob
 from .life_event import LifeEvent, EventTemplate, LifeEventType
 from .historical_scenario import HistoricalScenario
+from .agent_checkpoint import AgentCheckpoint, AgentCheckpointWrite
 
 __all__ = [
     # Base classes
@@ -64,10 +65,15 @@ __all__ = [
     "PlaidAccount",
     "PlaidTransaction",
     "PlaidHolding",
+    "PlaidSyncJob",
 
     # Life Events & Scenarios
     "LifeEvent",
     "EventTemplate",
     "LifeEventType",
     "HistoricalScenario",
+
+    # Agent checkpoints
+    "AgentCheckpoint",
+    "AgentCheckpointWrite",
 ]
@@ -2,10 +2,10 @@
 Plaid integration database models for accounts, transactions, and holdings
 """
 
-from sqlalchemy import String, Float, Integer, Boolean, JSON, Text, ForeignKey, Index, Date
+from sqlalchemy import String, Float, Integer, Boolean, JSON, Text, ForeignKey, Index, Date, DateTime, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
-from datetime import date as date_type
+from datetime import date as date_type, datetime, timezone
 import uuid
 
 from .base import Base, TimestampMixin
@@ -275,6 +275,8 @@ class PlaidHolding(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_plaid_holdings_user_ticker", "user_id", "ticker_symbol"),
         Index("ix_plaid_holdings_account", "account_id"),
+        # One row per security per account; the conflict target for sync upserts
+        UniqueConstraint("account_id", "security_id", name="uq_plaid_holdings_account_security"),
     )
 
     def __repr__(self) -> str:
@@ -351,3 +353,67 @@ class PlaidInvestmentTransaction(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<PlaidInvestmentTransaction(id={self.id}, type={self.type}, ticker={self.ticker_symbol}, amount=${self.amount})>"
+
+
+class PlaidSyncJob(Base, TimestampMixin):
+    """
+    Durable queue entry asking background workers to sync a Plaid item.
+
+    Webhooks enqueue jobs; at most one pending job exists per item, and
+    further events for that item merge into it.
+    """
+
+    __tablename__ = "plaid_sync_jobs"
+
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4())
+    )
+
+    # Plaid's item_id, so webhooks can enqueue without looking up the item
+    plaid_item_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+
+    # pending, running or failed; finished jobs are deleted
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+
+    # What to sync, OR-ed together as events coalesce
+    sync_transactions: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    sync_holdings: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    sync_accounts: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    # Scheduling and leasing
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc)
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        # One pending job per item: new events coalesce into it
+        Index(
+            "uq_plaid_sync_jobs_pending_item",
+            "plaid_item_id",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # One running job per item: an item is never synced twice at once
+        Index(
+            "uq_plaid_sync_jobs_running_item",
+            "plaid_item_id",
+            unique=True,
+            postgresql_where=text("status = 'running'"),
+            sqlite_where=text("status = 'running'"),
+        ),
+        Index("ix_plaid_sync_jobs_status_available", "status", "available_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlaidSyncJob(id={self.id}, item={self.plaid_item_id}, status={self.status})>"
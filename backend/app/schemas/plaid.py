@@ -250,6 +250,7 @@ class HoldingsSyncResponse(BaseModel):
     """Response from syncing holdings"""
     holdings_count: int
     securities_count: int
+    errors: List[Dict[str, str]] = []  # Items whose fetch failed: item_id, error
 
 
 class HoldingsListResponse(BaseModel):
@@ -0,0 +1,136 @@
+"""
+Analysis Result Store
+
+Compacts agent analysis results for streaming and keeps the full numeric
+arrays server-side so clients can fetch them on demand.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.cache import cache
+from app.core.cache_codecs import decode_value, encode_value, policy_for_key
+from app.core.local_cache import LocalCache
+from app.core.performance import performance_metrics
+from app.tools.monte_carlo_engine import downsample_distribution
+
+logger = logging.getLogger(__name__)
+
+# Numeric lists longer than this are summarized instead of sent inline
+MAX_INLINE_ARRAY_LENGTH = 200
+HISTOGRAM_BINS = 30
+SAMPLE_POINTS = 100
+SUMMARY_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# How long full arrays stay fetchable after a turn
+RESULT_TTL_SECONDS = 3600
+
+
+def _is_numeric_array(value: Any) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.ndim == 1 and value.dtype.kind in "iuf"
+    return isinstance(value, (list, tuple)) and all(
+        isinstance(item, (int, float)) and not isinstance(item, bool) for item in value
+    )
+
+
+def summarize_distribution(
+    values: Any,
+    bins: int = HISTOGRAM_BINS,
+    sample_points: int = SAMPLE_POINTS,
+) -> Dict[str, Any]:
+    """
+    Summarize a numeric sample as histogram bins, percentile bands and a
+    quantile-downsampled sample.
+    """
+    array = np.asarray(values, dtype=float)
+    counts, bin_edges = np.histogram(array, bins=bins)
+    percentiles = np.percentile(array, SUMMARY_PERCENTILES)
+
+    return {
+        "count": int(array.size),
+        "mean": float(array.mean()),
+        "min": float(array.min()),
+        "max": float(array.max()),
+        "percentiles": {
+            f"p{p}": float(value) for p, value in zip(SUMMARY_PERCENTILES, percentiles)
+        },
+        "histogram": {"bin_edges": bin_edges.tolist(), "counts": counts.tolist()},
+        "sample": downsample_distribution(array, sample_points),
+    }
+
+
+def compact_analysis_results(
+    results: Dict[str, Any],
+    max_inline_length: int = MAX_INLINE_ARRAY_LENGTH,
+) -> Tuple[Dict[str, Any], Dict[str, List[float]]]:
+    """
+    Replace long numeric arrays in ``results`` with summaries.
+
+    Returns:
+        The compacted results, and the removed arrays keyed by their path
+        (e.g. ``monte_carlo.final_portfolio_distribution``). Each summary
+        carries its ``path`` so the client can fetch the full array.
+    """
+    arrays: Dict[str, List[float]] = {}
+
+    def compact(value: Any, path: str) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: compact(item, f"{path}.{key}" if path else str(key))
+                for key, item in value.items()
+            }
+        is_sequence = isinstance(value, (list, tuple, np.ndarray))
+        if is_sequence and len(value) > max_inline_length and _is_numeric_array(value):
+            arrays[path] = np.asarray(value, dtype=float).tolist()
+            return {"summary": summarize_distribution(value), "path": path}
+        if isinstance(value, (list, tuple)):
+            return [compact(item, f"{path}[{index}]") for index, item in enumerate(value)]
+        return value
+
+    return compact(results, ""), arrays
+
+
+class AnalysisResultStore:
+    """
+    Full analysis arrays keyed by thread and result id.
+
+    Entries live in the shared cache so any worker can serve the fetch; a
+    bounded in-process store covers the case where Redis is unavailable.
+    """
+
+    def __init__(self, ttl: int = RESULT_TTL_SECONDS, local_max_entries: int = 256):
+        self.ttl = ttl
+        self.local = LocalCache(max_entries=local_max_entries, default_ttl=ttl)
+
+    @staticmethod
+    def _key(thread_id: str, result_id: str) -> str:
+        return f"analysis:full:{thread_id}:{result_id}"
+
+    async def save(self, thread_id: str, arrays: Dict[str, List[float]]) -> str:
+        """Store arrays and return the result id to fetch them by"""
+        result_id = uuid.uuid4().hex
+        key = self._key(thread_id, result_id)
+
+        if not await cache.set(key, arrays, expire=self.ttl):
+            self.local.set(key, encode_value(arrays, policy_for_key(key)).data)
+            performance_metrics.increment_counter("analysis_results.local_fallback")
+        performance_metrics.increment_counter("analysis_results.stored")
+        return result_id
+
+    async def load(self, thread_id: str, result_id: str) -> Optional[Dict[str, List[float]]]:
+        """Get stored arrays, or None if unknown or expired"""
+        key = self._key(thread_id, result_id)
+
+        arrays = await cache.get(key)
+        if arrays is None:
+            data = self.local.get(key)
+            arrays = decode_value(data) if data is not None else None
+        return arrays
+
+
+# Global store instance
+analysis_result_store = AnalysisResultStore()
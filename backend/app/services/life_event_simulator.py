@@ -9,6 +9,7 @@ from typing import Dict, Any, List, Optional
 import numpy as np
 from app.models.life_event import LifeEvent, LifeEventType
 from app.models.goal import Goal
+from app.services.simulation_service import run_engine_simulation
 
 
 class LifeEventSimulator:
@@ -36,10 +37,7 @@ class LifeEventSimulator:
         """
 
         # Run baseline simulation (no event)
-        baseline_result = await self.mc_engine.run_simulation(
-            goal=goal,
-            iterations=iterations,
-        )
+        baseline_result = await run_engine_simulation(self.mc_engine, goal, iterations)
 
         # Run simulation with event injected
         event_result = await self._simulate_with_event(
@@ -78,10 +76,7 @@ class LifeEventSimulator:
         modified_goal = self._inject_event_impacts(goal, event)
 
         # Run simulation
-        return await self.mc_engine.run_simulation(
-            goal=modified_goal,
-            iterations=iterations,
-        )
+        return await run_engine_simulation(self.mc_engine, modified_goal, iterations)
 
     def _inject_event_impacts(self, goal: Goal, event: LifeEvent) -> Goal:
         """
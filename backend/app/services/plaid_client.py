@@ -0,0 +1,132 @@
+"""
+Async Plaid Client
+
+Awaitable facade over PlaidService. The Plaid SDK is synchronous, so every
+call runs in a bounded thread pool that shares the SDK's keep-alive
+connection pool; the event loop only awaits the result.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar, Union
+
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.services.plaid_service import PlaidService, plaid_service
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Time spent waiting for a free thread, across all endpoints
+QUEUE_WAIT_OPERATION = "plaid.queue_wait"
+
+
+class AsyncPlaidClient:
+    """
+    Plaid API calls that never block the event loop.
+
+    Methods mirror PlaidService and return the same data. At most
+    ``max_workers`` calls are in flight; further calls queue for a thread.
+    Each call is timed as ``plaid.<endpoint>`` (e.g. ``plaid.transactions_sync``)
+    and failures count under ``plaid.<endpoint>.errors``.
+    """
+
+    def __init__(
+        self,
+        service: Optional[PlaidService] = None,
+        max_workers: int = settings.PLAID_CLIENT_MAX_WORKERS,
+    ):
+        self.service = service or plaid_service
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="plaid")
+
+    async def _call(self, endpoint: str, method: Callable[..., T], *args, **kwargs) -> T:
+        submitted = time.perf_counter()
+        started = submitted
+
+        def invoke():
+            nonlocal started
+            started = time.perf_counter()
+            return method(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, invoke)
+        except Exception:
+            performance_metrics.increment_counter(f"plaid.{endpoint}.errors")
+            raise
+        finally:
+            performance_metrics.record_timing(QUEUE_WAIT_OPERATION, started - submitted)
+            performance_metrics.record_timing(f"plaid.{endpoint}", time.perf_counter() - started)
+
+    async def pipeline(
+        self,
+        method: Callable[..., Awaitable[T]],
+        arguments: Iterable[tuple],
+    ) -> List[Union[T, Exception]]:
+        """
+        Issue ``method(*args)`` for every argument tuple at once.
+
+        Requests for different items overlap up to the pool size instead of
+        paying one round trip each. Results come back in argument order; a
+        failed call leaves its exception in its slot, so one item's error
+        does not discard the others' data.
+        """
+        return list(await asyncio.gather(
+            *(method(*args) for args in arguments), return_exceptions=True
+        ))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------ #
+    # Plaid endpoints
+    # ------------------------------------------------------------------ #
+
+    async def create_link_token(self, user_id: str, **kwargs) -> Dict[str, Any]:
+        return await self._call("link_token_create", self.service.create_link_token, user_id, **kwargs)
+
+    async def exchange_public_token(self, public_token: str) -> Dict[str, str]:
+        return await self._call(
+            "item_public_token_exchange", self.service.exchange_public_token, public_token
+        )
+
+    async def get_accounts(self, access_token: str) -> List[Dict[str, Any]]:
+        return await self._call("accounts_get", self.service.get_accounts, access_token)
+
+    async def sync_transactions(self, access_token: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        return await self._call(
+            "transactions_sync", self.service.sync_transactions, access_token, cursor=cursor
+        )
+
+    async def get_investments_holdings(self, access_token: str) -> Dict[str, Any]:
+        return await self._call(
+            "investments_holdings_get", self.service.get_investments_holdings, access_token
+        )
+
+    async def get_investment_transactions(
+        self, access_token: str, start_date: str, end_date: str
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "investments_transactions_get",
+            self.service.get_investment_transactions,
+            access_token,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    async def get_item(self, access_token: str) -> Dict[str, Any]:
+        return await self._call("item_get", self.service.get_item, access_token)
+
+    async def get_institution(self, institution_id: str) -> Dict[str, Any]:
+        return await self._call("institutions_get_by_id", self.service.get_institution, institution_id)
+
+    async def remove_item(self, access_token: str) -> bool:
+        return await self._call("item_remove", self.service.remove_item, access_token)
+
+
+# Global async client instance
+plaid_client = AsyncPlaidClient()
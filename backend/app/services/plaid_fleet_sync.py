@@ -0,0 +1,291 @@
+"""
+Plaid Fleet Sync
+
+Concurrent scheduled sync of every active Plaid item: a bounded pool of
+workers, each with its own database session, rate-limited per institution
+and retrying transient failures with backoff.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import plaid
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.models.plaid import PlaidItem, PlaidSyncJob
+
+logger = logging.getLogger(__name__)
+
+# Plaid error codes worth retrying; anything else (bad credentials, item
+# login required, ...) fails the item immediately
+TRANSIENT_PLAID_ERROR_CODES = (
+    "RATE_LIMIT_EXCEEDED",
+    "INSTITUTION_DOWN",
+    "INSTITUTION_NOT_RESPONDING",
+    "INSTITUTION_NOT_AVAILABLE",
+    "INTERNAL_SERVER_ERROR",
+    "PLANNED_MAINTENANCE",
+)
+TRANSIENT_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+MAX_RETRY_DELAY_SECONDS = 60.0
+
+
+def is_transient_sync_error(error: BaseException) -> bool:
+    """Whether a failed item sync is worth retrying"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError, OperationalError)):
+        # OperationalError covers dropped connections and lock timeouts
+        return True
+    if isinstance(error, plaid.ApiException):
+        return error.status in TRANSIENT_HTTP_STATUSES
+    # PlaidService re-raises API errors as plain exceptions carrying the body
+    message = str(error)
+    return any(code in message for code in TRANSIENT_PLAID_ERROR_CODES)
+
+
+def retry_delay(attempt: int, base_delay: float) -> float:
+    """Exponential backoff with full jitter for the ``attempt``-th retry"""
+    return random.uniform(0, min(base_delay * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS))
+
+
+class InstitutionRateLimiter:
+    """
+    Token bucket per institution.
+
+    ``acquire`` reserves a token and sleeps until it is due, so callers for
+    the same institution are spaced ``1 / rate`` apart after an initial
+    ``burst``. Reservations happen without awaiting, so no lock is needed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+
+    async def acquire(self, institution: str):
+        now = time.monotonic()
+        elapsed = now - self._updated.get(institution, now)
+        tokens = min(self.burst, self._tokens.get(institution, self.burst) + elapsed * self.rate)
+        self._tokens[institution] = tokens - 1
+        self._updated[institution] = now
+
+        if tokens < 1:
+            performance_metrics.increment_counter("plaid_sync.rate_limited")
+            await asyncio.sleep((1 - tokens) / self.rate)
+
+
+class FleetSyncScheduler:
+    """
+    Sync many Plaid items concurrently.
+
+    Items go into one queue, stalest first (never synced, then
+    ``needs_sync``, then oldest last sync), and ``concurrency`` workers
+    drain it. Every attempt opens a fresh session and reloads its item, so
+    a failed attempt never leaves another item's session dirty.
+
+    While an item syncs the scheduler holds a running ``plaid_sync_jobs``
+    row for it, like a queue worker would, and renews its lease, so
+    webhook-driven syncs of that item wait; items the queue is already
+    syncing are skipped. The unique index on running jobs per item makes
+    the hold atomic against a concurrent queue claim.
+    """
+
+    def __init__(
+        self,
+        sync_service: Any,
+        session_factory: Callable,
+        concurrency: int = settings.PLAID_SYNC_CONCURRENCY,
+        rate_limiter: Optional[InstitutionRateLimiter] = None,
+        max_retries: int = settings.PLAID_SYNC_MAX_RETRIES,
+        retry_base_delay: float = settings.PLAID_SYNC_RETRY_BASE_DELAY,
+        lease_seconds: float = settings.PLAID_SYNC_QUEUE_LEASE_SECONDS,
+    ):
+        self.sync_service = sync_service
+        self.session_factory = session_factory
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = rate_limiter or InstitutionRateLimiter(
+            settings.PLAID_SYNC_INSTITUTION_RATE, settings.PLAID_SYNC_INSTITUTION_BURST
+        )
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"fleet:{socket.gethostname()}:{os.getpid()}"
+
+    def prioritize(self, items: Sequence[PlaidItem]) -> List[PlaidItem]:
+        """Items in sync order, stalest first"""
+        return sorted(
+            items,
+            key=lambda item: (
+                not self.sync_service.needs_sync(item),
+                item.last_successful_sync or "",
+            ),
+        )
+
+    async def run(self, items: Sequence[PlaidItem]) -> Dict[str, Any]:
+        """
+        Sync ``items`` and summarize the results.
+
+        Returns:
+            Counts and per-item errors in the ``sync_all_users`` format
+        """
+        summary = {
+            'total_items': len(items),
+            'successful': 0,
+            'failed': 0,
+            'skipped': 0,
+            'retries': 0,
+            'accounts_updated': 0,
+            'transactions_synced': 0,
+            'holdings_updated': 0,
+            'errors': [],
+        }
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in self.prioritize(items):
+            # Plain values only: the caller's session owns the ORM objects
+            queue.put_nowait((item.id, item.item_id, item.user_id, item.institution_id or "unknown"))
+
+        start = time.perf_counter()
+        workers = [
+            asyncio.create_task(self._worker(queue, summary))
+            for _ in range(min(self.concurrency, len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        elapsed = time.perf_counter() - start
+        summary['duration_seconds'] = round(elapsed, 3)
+        performance_metrics.record_timing("plaid_sync.fleet", elapsed)
+        logger.info(
+            f"Plaid fleet sync finished: {summary['successful']} ok, {summary['failed']} failed, "
+            f"{summary['retries']} retries in {elapsed:.1f}s"
+        )
+        return summary
+
+    async def _worker(self, queue: asyncio.Queue, summary: Dict[str, Any]):
+        # plaid_sync_queue imports this module, so import it here
+        from app.services.plaid_sync_queue import keep_lease
+
+        while True:
+            try:
+                item_id, plaid_item_id, user_id, institution = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            start = time.perf_counter()
+            try:
+                job_id = await self._hold_item(plaid_item_id)
+                if job_id is None:
+                    logger.info(f"Skipping Plaid item {item_id}: a queued sync is running")
+                    result = None
+                else:
+                    heartbeat = asyncio.create_task(
+                        keep_lease(self.session_factory, job_id, self.worker_id, self.lease_seconds)
+                    )
+                    try:
+                        result = await self._sync_with_retries(item_id, institution, summary)
+                    finally:
+                        heartbeat.cancel()
+                        await self._release_item(job_id)
+            except Exception as e:
+                summary['failed'] += 1
+                summary['errors'].append({'item_id': item_id, 'user_id': user_id, 'error': str(e)})
+                performance_metrics.increment_counter("plaid_sync.items.failed")
+                logger.warning(f"Plaid sync failed for item {item_id}: {e}")
+            else:
+                if result is None:
+                    summary['skipped'] += 1
+                    performance_metrics.increment_counter("plaid_sync.items.skipped")
+                else:
+                    summary['successful'] += 1
+                    summary['accounts_updated'] += result['accounts_updated']
+                    summary['transactions_synced'] += result['transactions_synced']
+                    summary['holdings_updated'] += result['holdings_updated']
+                    performance_metrics.increment_counter("plaid_sync.items.succeeded")
+            finally:
+                performance_metrics.record_timing("plaid_sync.item", time.perf_counter() - start)
+
+            done = summary['successful'] + summary['failed'] + summary['skipped']
+            if done % 100 == 0 or done == summary['total_items']:
+                logger.info(f"Plaid fleet sync progress: {done}/{summary['total_items']} items")
+
+    async def _sync_with_retries(
+        self, item_id: str, institution: str, summary: Dict[str, Any]
+    ) -> Optional[Dict[str, int]]:
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(institution)
+            try:
+                async with self.session_factory() as db:
+                    item = await db.get(PlaidItem, item_id)
+                    if item is None or not item.is_active:
+                        # Removed or deactivated since the run started
+                        return None
+                    return await self.sync_service.sync_item(db, item)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_sync_error(e):
+                    raise
+                attempt += 1
+                summary['retries'] += 1
+                performance_metrics.increment_counter("plaid_sync.items.retried")
+
+                delay = retry_delay(attempt, self.retry_base_delay)
+                logger.info(f"Retrying Plaid sync for item {item_id} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def _hold_item(self, plaid_item_id: str) -> Optional[str]:
+        """
+        Mark an item as being synced, as a running queue job.
+
+        Returns:
+            The job id, or None when a queue worker is syncing the item
+        """
+        async with self.session_factory() as db:
+            # Every scope is set, so if this process dies the expired lease
+            # requeues the job as a full sync of the item
+            now = datetime.now(timezone.utc)
+            job = PlaidSyncJob(
+                plaid_item_id=plaid_item_id,
+                status="running",
+                sync_accounts=True,
+                sync_transactions=True,
+                sync_holdings=True,
+                event_count=0,
+                attempts=1,
+                available_at=now,
+                locked_at=now,
+                locked_by=self.worker_id,
+            )
+            db.add(job)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another running job holds the item (uq_plaid_sync_jobs_running_item)
+                await db.rollback()
+                return None
+            return job.id
+
+    async def _release_item(self, job_id: str):
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(PlaidSyncJob).where(
+                    PlaidSyncJob.id == job_id,
+                    PlaidSyncJob.locked_by == self.worker_id,
+                )
+            )
+            await db.commit()
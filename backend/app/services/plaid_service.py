@@ -29,8 +29,15 @@ logger = logging.getLogger(__name__)
 class PlaidService:
     """Service for interacting with Plaid API"""
 
-    def __init__(self):
-        """Initialize Plaid client"""
+    def __init__(self, host: Optional[str] = None, pool_size: Optional[int] = None):
+        """
+        Initialize Plaid client
+
+        Args:
+            host: API base URL (defaults to the PLAID_ENV environment)
+            pool_size: Keep-alive HTTPS connections kept per host; match the
+                number of threads calling the client concurrently
+        """
         # Map string environment to Plaid Environment enum
         env_map = {
             "sandbox": plaid.Environment.Sandbox,
@@ -39,12 +46,16 @@ class PlaidService:
         }
 
         configuration = plaid.Configuration(
-            host=env_map.get(settings.PLAID_ENV, plaid.Environment.Sandbox),
+            host=host or env_map.get(settings.PLAID_ENV, plaid.Environment.Sandbox),
             api_key={
                 'clientId': settings.PLAID_CLIENT_ID,
                 'secret': settings.PLAID_SECRET,
             }
         )
+        if pool_size:
+            # urllib3 drops connections beyond this, so a smaller pool than
+            # callers means a fresh TLS handshake per request
+            configuration.connection_pool_maxsize = pool_size
 
         api_client = plaid.ApiClient(configuration)
         self.client = plaid_api.PlaidApi(api_client)
@@ -530,10 +541,17 @@ class PlaidService:
             "personal_finance_category": personal_finance_category,
             "pending": transaction.get('pending', False),
             "payment_channel": transaction.get('payment_channel'),
-            "location": transaction.get('location'),
-            "payment_meta": transaction.get('payment_meta')
+            "location": self._to_dict(transaction.get('location')),
+            "payment_meta": self._to_dict(transaction.get('payment_meta'))
         }
 
+    @staticmethod
+    def _to_dict(value: Any) -> Any:
+        """Convert SDK model objects to plain dicts for JSON columns"""
+        if value is not None and hasattr(value, 'to_dict'):
+            return value.to_dict()
+        return value
+
 
 # Singleton instance
-plaid_service = PlaidService()
+plaid_service = PlaidService(pool_size=settings.PLAID_CLIENT_MAX_WORKERS)
@@ -0,0 +1,502 @@
+"""
+Plaid Sync Queue
+
+Durable queue of webhook-driven item syncs, stored in ``plaid_sync_jobs``.
+Webhooks enqueue with a single upsert and return; background workers in
+each API process claim jobs and run them with bounded concurrency.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, exists, or_, select, text, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.core.performance import performance_metrics
+from app.models.plaid import PlaidItem, PlaidSyncJob
+from app.services.encryption_service import encryption_service
+from app.services.plaid_fleet_sync import InstitutionRateLimiter, is_transient_sync_error, retry_delay
+from app.services.plaid_sync_service import PlaidSyncService, plaid_sync_service
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+FAILED = "failed"
+
+# Job flag set for each sync scope
+SCOPE_COLUMNS = {
+    "accounts": "sync_accounts",
+    "transactions": "sync_transactions",
+    "holdings": "sync_holdings",
+}
+
+# Webhooks that call for a sync, and what to sync
+WEBHOOK_SCOPES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("TRANSACTIONS", "SYNC_UPDATES_AVAILABLE"): ("transactions",),
+    ("TRANSACTIONS", "INITIAL_UPDATE"): ("transactions",),
+    ("TRANSACTIONS", "HISTORICAL_UPDATE"): ("transactions",),
+    ("TRANSACTIONS", "DEFAULT_UPDATE"): ("transactions",),
+    ("TRANSACTIONS", "TRANSACTIONS_REMOVED"): ("transactions",),
+    ("HOLDINGS", "DEFAULT_UPDATE"): ("holdings",),
+    ("ITEM", "LOGIN_REPAIRED"): ("accounts", "transactions", "holdings"),
+}
+
+# Must match the predicate of uq_plaid_sync_jobs_pending_item
+_PENDING_PREDICATE = text("status = 'pending'")
+
+# Columns returned when a job is claimed
+_CLAIMED_COLUMNS = (
+    PlaidSyncJob.id,
+    PlaidSyncJob.plaid_item_id,
+    PlaidSyncJob.sync_accounts,
+    PlaidSyncJob.sync_transactions,
+    PlaidSyncJob.sync_holdings,
+    PlaidSyncJob.event_count,
+    PlaidSyncJob.attempts,
+    PlaidSyncJob.created_at,
+)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back without a timezone
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def webhook_scopes(webhook_type: str, webhook_code: str) -> Tuple[str, ...]:
+    """Sync scopes a webhook calls for (empty when it needs no sync)"""
+    return WEBHOOK_SCOPES.get((webhook_type, webhook_code), ())
+
+
+async def enqueue_sync(db: AsyncSession, plaid_item_id: str, scopes: Sequence[str]) -> int:
+    """
+    Queue a sync of ``scopes`` for an item.
+
+    Creates the item's pending job or merges into it: scopes are OR-ed and
+    the event counted, so a burst of webhooks becomes one sync. Runs in the
+    caller's transaction; the caller commits.
+
+    Args:
+        db: Database session
+        plaid_item_id: Plaid's item_id from the webhook
+        scopes: Any of "accounts", "transactions", "holdings"
+
+    Returns:
+        Events now coalesced into the pending job (1 for a new job)
+    """
+    insert = dialect_insert(db)
+    flags = {column: scope in scopes for scope, column in SCOPE_COLUMNS.items()}
+    stmt = insert(PlaidSyncJob).values(
+        id=str(uuid.uuid4()),
+        plaid_item_id=plaid_item_id,
+        status=PENDING,
+        event_count=1,
+        attempts=0,
+        available_at=_now(),
+        **flags,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["plaid_item_id"],
+        index_where=_PENDING_PREDICATE,
+        set_={
+            **{
+                column: or_(getattr(PlaidSyncJob, column), stmt.excluded[column])
+                for column in SCOPE_COLUMNS.values()
+            },
+            "event_count": PlaidSyncJob.event_count + 1,
+            "updated_at": _now(),
+        },
+    ).returning(PlaidSyncJob.event_count)
+
+    event_count = (await db.execute(stmt)).scalar_one()
+    performance_metrics.increment_counter("plaid_sync_queue.enqueued")
+    if event_count > 1:
+        performance_metrics.increment_counter("plaid_sync_queue.coalesced")
+    return event_count
+
+
+async def claim_jobs(db: AsyncSession, limit: int, worker_id: str) -> List[Any]:
+    """
+    Mark up to ``limit`` due pending jobs as running for this worker.
+
+    Candidates are read with ``FOR UPDATE SKIP LOCKED`` (PostgreSQL) and
+    claimed with a conditional update, so two workers never run the same
+    job. An item's follow-up job waits while its previous job (or a fleet
+    sync's hold, see FleetSyncScheduler) is still running; the unique index
+    on running jobs per item backs this up against concurrent claims, which
+    then fail with IntegrityError and are retried at the next poll. The
+    caller commits.
+
+    Returns:
+        Claimed job rows (id, plaid_item_id, scope flags, event_count,
+        attempts, created_at)
+    """
+    now = _now()
+    running = aliased(PlaidSyncJob)
+    item_idle = ~exists().where(
+        running.plaid_item_id == PlaidSyncJob.plaid_item_id,
+        running.status == RUNNING,
+    )
+    result = await db.execute(
+        select(PlaidSyncJob.id)
+        .where(PlaidSyncJob.status == PENDING, PlaidSyncJob.available_at <= now, item_idle)
+        .order_by(PlaidSyncJob.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    job_ids = result.scalars().all()
+    if not job_ids:
+        return []
+
+    result = await db.execute(
+        update(PlaidSyncJob)
+        .where(PlaidSyncJob.id.in_(job_ids), PlaidSyncJob.status == PENDING, item_idle)
+        .values(
+            status=RUNNING,
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=PlaidSyncJob.attempts + 1,
+            updated_at=now,
+        )
+        .returning(*_CLAIMED_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+async def requeue_job(
+    db: AsyncSession,
+    job_id: str,
+    available_at: datetime,
+    error: Optional[str] = None,
+    worker_id: Optional[str] = None,
+) -> bool:
+    """
+    Return a running job to the queue.
+
+    When the item already has a newer pending job, that job takes over this
+    one's scopes and events instead. With ``worker_id`` the job is only
+    requeued while that worker still holds it. The caller commits.
+
+    Returns:
+        Whether the job was requeued
+    """
+    job = await db.get(PlaidSyncJob, job_id)
+    if job is None or job.status != RUNNING:
+        return False
+    if worker_id is not None and job.locked_by != worker_id:
+        return False
+
+    result = await db.execute(
+        select(PlaidSyncJob).where(
+            PlaidSyncJob.plaid_item_id == job.plaid_item_id,
+            PlaidSyncJob.status == PENDING,
+        )
+    )
+    pending = result.scalar_one_or_none()
+    if pending is not None:
+        for column in SCOPE_COLUMNS.values():
+            setattr(pending, column, getattr(pending, column) or getattr(job, column))
+        pending.event_count += job.event_count
+        await db.delete(job)
+        return True
+
+    job.status = PENDING
+    job.available_at = available_at
+    job.locked_at = None
+    job.locked_by = None
+    job.last_error = error
+    return True
+
+
+async def renew_lease(db: AsyncSession, job_id: str, worker_id: str) -> bool:
+    """
+    Push back the lease expiry of a job this worker is running.
+
+    Returns:
+        False when the worker no longer holds the job
+    """
+    result = await db.execute(
+        update(PlaidSyncJob)
+        .where(
+            PlaidSyncJob.id == job_id,
+            PlaidSyncJob.status == RUNNING,
+            PlaidSyncJob.locked_by == worker_id,
+        )
+        .values(locked_at=_now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+async def keep_lease(
+    session_factory: Callable, job_id: str, worker_id: str, lease_seconds: float
+):
+    """
+    Renew a running job's lease until cancelled, so it is not requeued under
+    its worker. Returns early once the worker no longer holds the job.
+    """
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        try:
+            async with session_factory() as db:
+                renewed = await renew_lease(db, job_id, worker_id)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to renew lease of Plaid sync job {job_id}: {e}")
+            continue
+        if not renewed:
+            return
+
+
+async def requeue_stale_jobs(db: AsyncSession, lease_seconds: float) -> int:
+    """Requeue running jobs whose worker has held them past the lease (crashed or stuck)"""
+    cutoff = _now() - timedelta(seconds=lease_seconds)
+    result = await db.execute(
+        select(PlaidSyncJob.id).where(
+            PlaidSyncJob.status == RUNNING,
+            PlaidSyncJob.locked_at < cutoff,
+        )
+    )
+    job_ids = result.scalars().all()
+    for job_id in job_ids:
+        await requeue_job(db, job_id, _now(), error="lease expired")
+    if job_ids:
+        performance_metrics.increment_counter("plaid_sync_queue.requeued", len(job_ids))
+        logger.warning(f"Requeued {len(job_ids)} Plaid sync jobs with expired leases")
+    return len(job_ids)
+
+
+async def purge_failed_jobs(db: AsyncSession, retention_seconds: float) -> int:
+    """Delete failed jobs that have been kept for ``retention_seconds``"""
+    cutoff = _now() - timedelta(seconds=retention_seconds)
+    result = await db.execute(
+        delete(PlaidSyncJob)
+        .where(PlaidSyncJob.status == FAILED, PlaidSyncJob.updated_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        performance_metrics.increment_counter("plaid_sync_queue.purged", result.rowcount)
+    return result.rowcount
+
+
+class PlaidSyncQueueWorker:
+    """
+    Runs queued Plaid sync jobs in the background.
+
+    At most ``concurrency`` jobs run at once in this process. The worker
+    polls every ``poll_interval`` seconds and is woken early by ``notify``
+    after a local enqueue or when a job finishes. Running jobs renew their
+    lease while they sync and go back to the queue when the worker stops.
+    Transient failures retry with backoff up to ``max_attempts``; other
+    failures mark the job failed, and failed jobs are purged after
+    ``failed_retention`` seconds.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        sync_service: Optional[PlaidSyncService] = None,
+        concurrency: int = settings.PLAID_SYNC_QUEUE_WORKERS,
+        poll_interval: float = settings.PLAID_SYNC_QUEUE_POLL_SECONDS,
+        lease_seconds: float = settings.PLAID_SYNC_QUEUE_LEASE_SECONDS,
+        max_attempts: int = settings.PLAID_SYNC_QUEUE_MAX_ATTEMPTS,
+        failed_retention: float = settings.PLAID_SYNC_QUEUE_FAILED_RETENTION_SECONDS,
+        retry_base_delay: float = settings.PLAID_SYNC_RETRY_BASE_DELAY,
+        rate_limiter: Optional[InstitutionRateLimiter] = None,
+    ):
+        self.session_factory = session_factory
+        self.sync_service = sync_service or plaid_sync_service
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.failed_retention = failed_retention
+        self.retry_base_delay = retry_base_delay
+        self.rate_limiter = rate_limiter or InstitutionRateLimiter(
+            settings.PLAID_SYNC_INSTITUTION_RATE, settings.PLAID_SYNC_INSTITUTION_BURST
+        )
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._jobs: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Begin draining the queue in the background (no-op when concurrency is 0)"""
+        if self._task is None and self.concurrency > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        tasks = [task for task in (self._task, *self._jobs) if task is not None]
+        for task in tasks:
+            task.cancel()
+        # Cancelled jobs requeue themselves (see _process)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def notify(self):
+        """Wake the worker to claim jobs now instead of at the next poll"""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_pending()
+            except Exception as e:
+                logger.error(f"Plaid sync queue poll failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_pending(self) -> int:
+        """
+        Claim due jobs for the free slots and start them.
+
+        Returns:
+            Number of jobs started
+        """
+        free = self.concurrency - len(self._jobs)
+        if free <= 0:
+            return 0
+
+        async with self.session_factory() as db:
+            await requeue_stale_jobs(db, self.lease_seconds)
+            await purge_failed_jobs(db, self.failed_retention)
+            jobs = await claim_jobs(db, free, self.worker_id)
+            await db.commit()
+
+        for job in jobs:
+            task = asyncio.create_task(self._process(job))
+            self._jobs.add(task)
+            task.add_done_callback(self._job_done)
+        return len(jobs)
+
+    async def drain(self):
+        """Run jobs until none are due and none are running"""
+        while True:
+            started = await self.run_pending()
+            if not started and not self._jobs:
+                return
+            if self._jobs:
+                await asyncio.wait(set(self._jobs), return_when=asyncio.FIRST_COMPLETED)
+
+    def _job_done(self, task: asyncio.Task):
+        self._jobs.discard(task)
+        self._wakeup.set()  # A slot is free
+
+    async def _process(self, job: Any):
+        start = time.perf_counter()
+        performance_metrics.record_timing(
+            "plaid_sync_queue.wait", (_now() - _as_utc(job.created_at)).total_seconds()
+        )
+        held = self._owned(job.id)
+        heartbeat = asyncio.create_task(
+            keep_lease(self.session_factory, job.id, self.worker_id, self.lease_seconds)
+        )
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(PlaidItem).where(PlaidItem.item_id == job.plaid_item_id)
+                )
+                item = result.scalar_one_or_none()
+                if item is not None and item.is_active:
+                    await self.rate_limiter.acquire(item.institution_id or "unknown")
+                    await self._sync(db, item, job)
+                else:
+                    logger.info(f"Dropping Plaid sync job for unknown or inactive item {job.plaid_item_id}")
+
+                result = await db.execute(delete(PlaidSyncJob).where(*held))
+                await db.commit()
+            if result.rowcount:
+                performance_metrics.increment_counter("plaid_sync_queue.succeeded")
+            else:
+                self._lease_lost(job)
+
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back now rather than after the lease
+            await asyncio.shield(self._release(job))
+            raise
+
+        except Exception as e:
+            retry = is_transient_sync_error(e) and job.attempts < self.max_attempts
+            async with self.session_factory() as db:
+                if retry:
+                    delay = retry_delay(job.attempts, self.retry_base_delay)
+                    requeued = await requeue_job(
+                        db, job.id, _now() + timedelta(seconds=delay), error=str(e), worker_id=self.worker_id
+                    )
+                    await db.commit()
+                    if requeued:
+                        performance_metrics.increment_counter("plaid_sync_queue.retried")
+                        logger.info(f"Retrying Plaid sync job for item {job.plaid_item_id} in {delay:.1f}s: {e}")
+                    else:
+                        self._lease_lost(job)
+                else:
+                    result = await db.execute(
+                        update(PlaidSyncJob)
+                        .where(*held)
+                        .values(status=FAILED, locked_at=None, locked_by=None, last_error=str(e))
+                    )
+                    await db.commit()
+                    if result.rowcount:
+                        performance_metrics.increment_counter("plaid_sync_queue.failed")
+                        logger.warning(f"Plaid sync job for item {job.plaid_item_id} failed: {e}")
+                    else:
+                        self._lease_lost(job)
+
+        finally:
+            heartbeat.cancel()
+            performance_metrics.record_timing("plaid_sync_queue.job", time.perf_counter() - start)
+
+    def _owned(self, job_id: str) -> Tuple[Any, ...]:
+        # Matches the job only while this worker still holds it
+        return (
+            PlaidSyncJob.id == job_id,
+            PlaidSyncJob.status == RUNNING,
+            PlaidSyncJob.locked_by == self.worker_id,
+        )
+
+    def _lease_lost(self, job: Any):
+        performance_metrics.increment_counter("plaid_sync_queue.lease_lost")
+        logger.warning(f"Plaid sync job for item {job.plaid_item_id} was requeued while it ran")
+
+    async def _release(self, job: Any):
+        try:
+            async with self.session_factory() as db:
+                await requeue_job(db, job.id, _now(), error="worker stopped", worker_id=self.worker_id)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to requeue Plaid sync job for item {job.plaid_item_id}: {e}")
+
+    async def _sync(self, db: AsyncSession, item: PlaidItem, job: Any):
+        access_token = encryption_service.decrypt_access_token(item.access_token)
+
+        if job.sync_accounts:
+            await self.sync_service.sync_accounts(db, item, access_token=access_token)
+        if job.sync_transactions:
+            await self.sync_service.sync_transactions(db, item, access_token=access_token)
+        if job.sync_holdings:
+            await self.sync_service.sync_holdings(db, item, access_token=access_token)
+
+        item.last_successful_sync = datetime.utcnow().isoformat()
+        await db.commit()
+
+
+# Global queue worker instance
+plaid_sync_worker = PlaidSyncQueueWorker()
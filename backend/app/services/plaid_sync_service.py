@@ -5,31 +5,78 @@ Automatic account and investment updates via Plaid API.
 Implements REQ-BUD-011: System shall automatically update investment account values.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Dict, Optional, Set, Tuple
 import asyncio
+import logging
+import time
+import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, UPSERT_BATCH_SIZE, bulk_upsert
+from app.core.performance import performance_metrics
 from app.models.plaid import PlaidItem, PlaidAccount, PlaidTransaction, PlaidHolding
 from app.models.user import User
 from app.models.portfolio_db import Portfolio, Account
-from app.services.plaid_service import PlaidService
+from app.services.encryption_service import encryption_service
+from app.services.plaid_fleet_sync import FleetSyncScheduler
+from app.services.plaid_client import AsyncPlaidClient, plaid_client
+
+logger = logging.getLogger(__name__)
+
+# Columns refreshed from Plaid on every sync. User edits (user_category,
+# user_notes, is_excluded) and row identity are never overwritten.
+TRANSACTION_SYNC_COLUMNS = (
+    'account_id', 'amount', 'date', 'name', 'merchant_name', 'category', 'pending',
+    'payment_channel', 'iso_currency_code', 'authorized_date', 'location',
+    'payment_meta', 'personal_finance_category', 'category_id',
+)
+HOLDING_SYNC_COLUMNS = (
+    'ticker_symbol', 'cusip', 'isin', 'sedol', 'name', 'type', 'quantity',
+    'institution_price', 'institution_value', 'cost_basis', 'iso_currency_code',
+)
+
+# /transactions/sync error asking the caller to restart pagination
+PAGINATION_MUTATION_ERROR = 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION'
+MAX_PAGINATION_RESTARTS = 3
+
+
+def _as_date(value) -> Optional[date]:
+    """Plaid dates arrive as ``date`` objects from the SDK or ISO strings"""
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
 
 
 class PlaidSyncService:
     """Service for synchronizing Plaid data automatically."""
 
-    def __init__(self, plaid_service: PlaidService):
+    def __init__(
+        self,
+        plaid_service: AsyncPlaidClient,
+        session_factory: Callable = AsyncSessionLocal,
+    ):
         self.plaid_service = plaid_service
+        # Fleet sync workers each open their own session from this factory
+        self.session_factory = session_factory
 
-    async def sync_all_users(self, db: AsyncSession) -> Dict[str, any]:
+    async def sync_all_users(
+        self,
+        db: AsyncSession,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, any]:
         """
         Sync all users' Plaid accounts (scheduled job).
 
+        Items are synced concurrently, stalest first, with per-institution
+        rate limits and retries on transient errors (see FleetSyncScheduler).
+
         Args:
-            db: Database session
+            db: Database session used to list the active items
+            concurrency: Items synced at once (default PLAID_SYNC_CONCURRENCY)
 
         Returns:
             Summary of sync results
@@ -41,32 +88,12 @@ class PlaidSyncService:
         )
         items = result.scalars().all()
 
-        summary = {
-            'total_items': len(items),
-            'successful': 0,
-            'failed': 0,
-            'accounts_updated': 0,
-            'transactions_synced': 0,
-            'holdings_updated': 0,
-            'errors': [],
-        }
-
-        for item in items:
-            try:
-                result = await self.sync_item(db, item)
-                summary['successful'] += 1
-                summary['accounts_updated'] += result['accounts_updated']
-                summary['transactions_synced'] += result['transactions_synced']
-                summary['holdings_updated'] += result['holdings_updated']
-            except Exception as e:
-                summary['failed'] += 1
-                summary['errors'].append({
-                    'item_id': item.id,
-                    'user_id': item.user_id,
-                    'error': str(e),
-                })
-
-        return summary
+        scheduler = FleetSyncScheduler(
+            self,
+            self.session_factory,
+            concurrency=concurrency or settings.PLAID_SYNC_CONCURRENCY,
+        )
+        return await scheduler.run(items)
 
     async def sync_item(self, db: AsyncSession, item: PlaidItem) -> Dict[str, int]:
         """
@@ -85,16 +112,19 @@ class PlaidSyncService:
             'holdings_updated': 0,
         }
 
+        # Stored tokens are encrypted; decrypt once for all three calls
+        access_token = encryption_service.decrypt_access_token(item.access_token)
+
         # 1. Sync account balances
-        accounts_result = await self.sync_accounts(db, item)
+        accounts_result = await self.sync_accounts(db, item, access_token)
         summary['accounts_updated'] = accounts_result
 
-        # 2. Sync transactions (last 30 days)
-        transactions_result = await self.sync_transactions(db, item, days=30)
-        summary['transactions_synced'] = transactions_result
+        # 2. Apply transaction changes since the stored cursor
+        transactions_result = await self.sync_transactions(db, item, access_token)
+        summary['transactions_synced'] = sum(transactions_result.values())
 
         # 3. Sync investment holdings (if investment account)
-        holdings_result = await self.sync_holdings(db, item)
+        holdings_result = await self.sync_holdings(db, item, access_token)
         summary['holdings_updated'] = holdings_result
 
         # Update last sync time
@@ -103,23 +133,32 @@ class PlaidSyncService:
 
         return summary
 
-    async def sync_accounts(self, db: AsyncSession, item: PlaidItem) -> int:
+    async def sync_accounts(
+        self,
+        db: AsyncSession,
+        item: PlaidItem,
+        access_token: Optional[str] = None,
+    ) -> int:
         """
         Sync account balances from Plaid.
 
+        Accounts opened at the institution after the item was linked are
+        created, so their transactions and holdings have a row to attach to.
+
         Args:
             db: Database session
             item: Plaid item
+            access_token: Decrypted access token (defaults to item.access_token)
 
         Returns:
-            Number of accounts updated
+            Number of accounts updated or created
         """
         # Get account balances from Plaid
-        balances = await self.plaid_service.get_accounts(item.access_token)
+        accounts = await self.plaid_service.get_accounts(access_token or item.access_token)
 
         updated_count = 0
 
-        for plaid_account_data in balances.get('accounts', []):
+        for plaid_account_data in accounts:
             plaid_account_id = plaid_account_data['account_id']
 
             result = await db.execute(
@@ -128,7 +167,19 @@ class PlaidSyncService:
             plaid_account = result.scalar_one_or_none()
 
             if not plaid_account:
-                continue
+                plaid_account = PlaidAccount(
+                    item_id=item.id,
+                    user_id=item.user_id,
+                    account_id=plaid_account_id,
+                    name=plaid_account_data['name'],
+                    official_name=plaid_account_data.get('official_name'),
+                    type=plaid_account_data['type'],
+                    subtype=plaid_account_data.get('subtype'),
+                    mask=plaid_account_data.get('mask'),
+                    iso_currency_code=plaid_account_data.get('balances', {}).get('iso_currency_code', 'USD'),
+                )
+                db.add(plaid_account)
+                performance_metrics.increment_counter("plaid_sync.accounts.created")
 
             balance_info = plaid_account_data.get('balances', {})
             plaid_account.available_balance = balance_info.get('available')
@@ -152,141 +203,275 @@ class PlaidSyncService:
         self,
         db: AsyncSession,
         item: PlaidItem,
-        days: int = 30,
-    ) -> int:
+        access_token: Optional[str] = None,
+    ) -> Dict[str, int]:
         """
-        Sync recent transactions from Plaid.
+        Apply transaction changes since the item's stored cursor.
+
+        Pages of ``/transactions/sync`` are fetched until ``has_more`` is
+        false, then the added and modified transactions are upserted, the
+        removed ones deleted and the new cursor stored, all in one commit.
+        An item with no new activity costs a single call and no writes; a
+        failed run leaves the old cursor, so the next run replays it.
+        Transactions for accounts not stored yet trigger an account sync;
+        if an account is still unknown the run fails rather than skip them.
 
         Args:
             db: Database session
             item: Plaid item
-            days: Number of days of transactions to sync
+            access_token: Decrypted access token (defaults to item.access_token)
 
         Returns:
-            Number of transactions synced
+            Counts of added, modified and removed transactions
         """
-        start_date = (datetime.utcnow() - timedelta(days=days)).date()
-        end_date = datetime.utcnow().date()
-
-        # Get transactions from Plaid
-        transactions_data = await self.plaid_service.get_transactions(
-            item.access_token,
-            start_date,
-            end_date,
+        updates, removed, counts, cursor = await self._fetch_transaction_updates(
+            access_token or item.access_token, item.cursor
         )
 
-        synced_count = 0
+        account_ids = await self._account_id_map(db, item)
+        unmapped = {txn_data['account_id'] for txn_data in updates.values()} - set(account_ids)
+        if unmapped:
+            # Accounts added at the institution since linking: create them
+            # first, since the cursor will never deliver these rows again
+            await self.sync_accounts(db, item, access_token)
+            account_ids = await self._account_id_map(db, item)
+            unmapped -= set(account_ids)
+            if unmapped:
+                raise ValueError(
+                    f"Transactions reference unknown Plaid accounts {sorted(unmapped)}; "
+                    f"cursor not advanced"
+                )
 
-        for txn_data in transactions_data.get('transactions', []):
-            txn_id = txn_data['transaction_id']
+        rows = [
+            self._transaction_row(txn_data, account_ids[txn_data['account_id']], item.user_id)
+            for txn_data in updates.values()
+        ]
 
-            account_result = await db.execute(
-                select(PlaidAccount).where(PlaidAccount.account_id == txn_data['account_id'])
+        existing = {}
+        compared = [getattr(PlaidTransaction, column) for column in TRANSACTION_SYNC_COLUMNS]
+        for batch_start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch_ids = [row['transaction_id'] for row in rows[batch_start:batch_start + UPSERT_BATCH_SIZE]]
+            result = await db.execute(
+                select(PlaidTransaction.transaction_id, *compared)
+                .where(PlaidTransaction.transaction_id.in_(batch_ids))
             )
-            account = account_result.scalar_one_or_none()
+            existing.update((row[0], tuple(row[1:])) for row in result.all())
 
-            if not account:
-                continue
+        changed = self._changed_rows(rows, existing, ('transaction_id',), TRANSACTION_SYNC_COLUMNS)
+        await self._write_rows(
+            db, 'transactions', PlaidTransaction, changed, len(rows) - len(changed),
+            conflict_columns=('transaction_id',),
+            update_columns=TRANSACTION_SYNC_COLUMNS,
+        )
 
-            # Check if transaction already exists
-            result = await db.execute(
-                select(PlaidTransaction)
-                .where(PlaidTransaction.transaction_id == txn_id)
+        removed_ids = list(removed)
+        for batch_start in range(0, len(removed_ids), UPSERT_BATCH_SIZE):
+            await db.execute(
+                delete(PlaidTransaction)
+                .where(PlaidTransaction.transaction_id.in_(
+                    removed_ids[batch_start:batch_start + UPSERT_BATCH_SIZE]
+                ))
             )
-            existing_txn = result.scalar_one_or_none()
-
-            if not existing_txn:
-                # Create new transaction
-                transaction = PlaidTransaction(
-                    transaction_id=txn_id,
-                    account_id=account.id,
-                    user_id=item.user_id,
-                    amount=txn_data['amount'],
-                    date=datetime.strptime(txn_data['date'], '%Y-%m-%d').date(),
-                    name=txn_data.get('name') or "",
-                    merchant_name=txn_data.get('merchant_name'),
-                    category=txn_data.get('category', []),
-                    pending=txn_data.get('pending', False),
-                    payment_channel=txn_data.get('payment_channel'),
-                    iso_currency_code=txn_data.get('iso_currency_code', 'USD'),
-                    authorized_date=(
-                        datetime.strptime(txn_data['authorized_date'], '%Y-%m-%d').date()
-                        if txn_data.get('authorized_date') else None
-                    ),
-                    location=txn_data.get('location'),
-                    payment_meta=txn_data.get('payment_meta'),
-                    personal_finance_category=txn_data.get('personal_finance_category'),
-                    category_id=txn_data.get('category_id'),
-                )
-                db.add(transaction)
-                synced_count += 1
+        performance_metrics.increment_counter("plaid_sync.transactions.removed", len(removed_ids))
 
+        # Same commit as the rows, so the cursor never runs ahead of the data
+        item.cursor = cursor
         await db.commit()
-        return synced_count
+        return counts
+
+    async def _fetch_transaction_updates(
+        self,
+        access_token: str,
+        cursor: Optional[str],
+    ) -> Tuple[Dict[str, Dict], Set[str], Dict[str, int], Optional[str]]:
+        """
+        Page through ``/transactions/sync`` from ``cursor``.
+
+        Returns:
+            Latest payload per added or modified transaction, removed ids,
+            counts per change type, and the cursor to store
+        """
+        for attempt in range(MAX_PAGINATION_RESTARTS + 1):
+            updates: Dict[str, Dict] = {}
+            removed: Set[str] = set()
+            counts = {'added': 0, 'modified': 0, 'removed': 0}
+            next_cursor = cursor
+            try:
+                while True:
+                    page = await self.plaid_service.sync_transactions(access_token, cursor=next_cursor)
+                    performance_metrics.increment_counter("plaid_sync.transactions.pages")
+
+                    for change in ('added', 'modified'):
+                        counts[change] += len(page[change])
+                        for txn_data in page[change]:
+                            # Later pages win: a transaction can change twice in one run
+                            updates[txn_data['transaction_id']] = txn_data
+                            removed.discard(txn_data['transaction_id'])
+                    counts['removed'] += len(page['removed'])
+                    for transaction_id in page['removed']:
+                        updates.pop(transaction_id, None)
+                        removed.add(transaction_id)
+
+                    next_cursor = page['cursor']
+                    if not page['has_more']:
+                        return updates, removed, counts, next_cursor
+            except Exception as e:
+                # Plaid asks for pagination to restart from the original
+                # cursor when data changes between pages
+                if PAGINATION_MUTATION_ERROR not in str(e) or attempt == MAX_PAGINATION_RESTARTS:
+                    raise
+                logger.info("Transactions changed during pagination; restarting from stored cursor")
 
-    async def sync_holdings(self, db: AsyncSession, item: PlaidItem) -> int:
+    async def sync_holdings(
+        self,
+        db: AsyncSession,
+        item: PlaidItem,
+        access_token: Optional[str] = None,
+    ) -> int:
         """
         Sync investment holdings from Plaid.
 
         Args:
             db: Database session
             item: Plaid item
+            access_token: Decrypted access token (defaults to item.access_token)
 
         Returns:
-            Number of holdings updated
+            Number of holdings inserted or updated
         """
         # Get holdings from Plaid
-        holdings_data = await self.plaid_service.get_holdings(item.access_token)
-
-        updated_count = 0
-
-        for holding_data in holdings_data.get('holdings', []):
-            plaid_account_id = holding_data['account_id']
-            security_id = holding_data['security_id']
-
-            account_result = await db.execute(
-                select(PlaidAccount).where(PlaidAccount.account_id == plaid_account_id)
+        holdings_data = await self.plaid_service.get_investments_holdings(
+            access_token or item.access_token
+        )
+        securities = holdings_data.get('securities') or {}
+
+        account_ids = await self._account_id_map(db, item)
+        rows = [
+            self._holding_row(
+                holding_data,
+                securities.get(holding_data['security_id'], {}),
+                account_ids[holding_data['account_id']],
+                item.user_id,
             )
-            account = account_result.scalar_one_or_none()
-
-            if not account:
-                continue
+            for holding_data in holdings_data.get('holdings', [])
+            if holding_data['account_id'] in account_ids
+        ]
 
-            # Get or create PlaidHolding
+        existing = {}
+        if rows:
+            compared = [getattr(PlaidHolding, column) for column in HOLDING_SYNC_COLUMNS]
             result = await db.execute(
-                select(PlaidHolding)
-                .where(
-                    PlaidHolding.account_id == account.id,
-                    PlaidHolding.security_id == security_id,
-                )
+                select(PlaidHolding.account_id, PlaidHolding.security_id, *compared)
+                .where(PlaidHolding.account_id.in_(set(account_ids.values())))
             )
-            holding = result.scalar_one_or_none()
-
-            if holding:
-                # Update existing holding
-                holding.quantity = holding_data.get('quantity', 0)
-                holding.institution_price = holding_data.get('institution_price', 0)
-                holding.institution_value = holding_data.get('institution_value', 0)
-                holding.cost_basis = holding_data.get('cost_basis')
-                holding.iso_currency_code = holding_data.get('iso_currency_code', 'USD')
-            else:
-                # Create new holding
-                holding = PlaidHolding(
-                    account_id=account.id,
-                    user_id=account.user_id,
-                    security_id=security_id,
-                    quantity=holding_data.get('quantity', 0),
-                    institution_price=holding_data.get('institution_price', 0),
-                    institution_value=holding_data.get('institution_value', 0),
-                    cost_basis=holding_data.get('cost_basis'),
-                    iso_currency_code=holding_data.get('iso_currency_code', 'USD'),
-                )
-                db.add(holding)
+            existing = {(row[0], row[1]): tuple(row[2:]) for row in result.all()}
 
-            updated_count += 1
+        changed = self._changed_rows(rows, existing, ('account_id', 'security_id'), HOLDING_SYNC_COLUMNS)
+        await self._write_rows(
+            db, 'holdings', PlaidHolding, changed, len(rows) - len(changed),
+            conflict_columns=('account_id', 'security_id'),
+            update_columns=HOLDING_SYNC_COLUMNS,
+        )
 
         await db.commit()
-        return updated_count
+        return len(changed)
+
+    async def _account_id_map(self, db: AsyncSession, item: PlaidItem) -> Dict[str, str]:
+        """Plaid account_id -> PlaidAccount primary key for the item's accounts"""
+        result = await db.execute(
+            select(PlaidAccount.account_id, PlaidAccount.id)
+            .where(PlaidAccount.item_id == item.id)
+        )
+        return {plaid_account_id: account_pk for plaid_account_id, account_pk in result.all()}
+
+    @staticmethod
+    def _transaction_row(txn_data: Dict, account_pk: str, user_id: str) -> Dict:
+        return {
+            'id': str(uuid.uuid4()),
+            'transaction_id': txn_data['transaction_id'],
+            'account_id': account_pk,
+            'user_id': user_id,
+            'amount': txn_data['amount'],
+            'date': _as_date(txn_data['date']),
+            'name': txn_data.get('name') or "",
+            'merchant_name': txn_data.get('merchant_name'),
+            'category': txn_data.get('category', []),
+            'pending': txn_data.get('pending', False),
+            'payment_channel': txn_data.get('payment_channel'),
+            'iso_currency_code': txn_data.get('iso_currency_code', 'USD'),
+            'authorized_date': _as_date(txn_data.get('authorized_date')),
+            'location': txn_data.get('location'),
+            'payment_meta': txn_data.get('payment_meta'),
+            'personal_finance_category': txn_data.get('personal_finance_category'),
+            'category_id': txn_data.get('category_id'),
+        }
+
+    @staticmethod
+    def _holding_row(holding_data: Dict, security: Dict, account_pk: str, user_id: str) -> Dict:
+        security_id = holding_data['security_id']
+        return {
+            'id': str(uuid.uuid4()),
+            'account_id': account_pk,
+            'user_id': user_id,
+            'security_id': security_id,
+            'ticker_symbol': security.get('ticker_symbol'),
+            'cusip': security.get('cusip'),
+            'isin': security.get('isin'),
+            'sedol': security.get('sedol'),
+            'name': security.get('name') or security.get('ticker_symbol') or security_id,
+            'type': security.get('type'),
+            'quantity': holding_data.get('quantity', 0),
+            'institution_price': holding_data.get('institution_price', 0),
+            'institution_value': holding_data.get('institution_value', 0),
+            'cost_basis': holding_data.get('cost_basis'),
+            'iso_currency_code': holding_data.get('iso_currency_code', 'USD'),
+        }
+
+    @staticmethod
+    def _changed_rows(
+        rows: List[Dict],
+        existing: Dict,
+        key_columns: Tuple[str, ...],
+        compared_columns: Tuple[str, ...],
+    ) -> List[Dict]:
+        """
+        Rows that are new or differ from their stored values.
+
+        Repeated keys keep their last row: one upsert statement cannot
+        touch the same row twice.
+        """
+        latest = {}
+        for row in rows:
+            key = tuple(row[column] for column in key_columns)
+            latest[key[0] if len(key) == 1 else key] = row
+
+        return [
+            row for key, row in latest.items()
+            if existing.get(key) != tuple(row[column] for column in compared_columns)
+        ]
+
+    async def _write_rows(
+        self,
+        db: AsyncSession,
+        kind: str,
+        model,
+        rows: List[Dict],
+        unchanged: int,
+        conflict_columns: Tuple[str, ...],
+        update_columns: Tuple[str, ...],
+    ):
+        start = time.perf_counter()
+        await bulk_upsert(db, model, rows, conflict_columns, update_columns)
+        elapsed = time.perf_counter() - start
+
+        performance_metrics.record_timing(f"plaid_sync.{kind}.upsert", elapsed)
+        performance_metrics.increment_counter(f"plaid_sync.{kind}.written", len(rows))
+        performance_metrics.increment_counter(f"plaid_sync.{kind}.unchanged", unchanged)
+        if rows:
+            logger.info(
+                f"Upserted {len(rows)} Plaid {kind} ({unchanged} unchanged) in "
+                f"{elapsed * 1000:.1f}ms ({len(rows) / max(elapsed, 1e-9):,.0f} rows/s)"
+            )
 
     async def _update_portfolio_account(
         self,
@@ -346,7 +531,7 @@ class PlaidSyncService:
                 'institution_name': item.institution_name,
                 'is_active': item.is_active,
                 'last_sync': item.last_sync.isoformat() if item.last_sync else None,
-                'needs_sync': self._needs_sync(item),
+                'needs_sync': self.needs_sync(item),
             })
 
         return {
@@ -354,7 +539,7 @@ class PlaidSyncService:
             'items': status,
         }
 
-    def _needs_sync(self, item: PlaidItem, max_age_hours: int = 24) -> bool:
+    def needs_sync(self, item: PlaidItem, max_age_hours: int = 24) -> bool:
         """
         Determine if item needs synchronization.
 
@@ -416,3 +601,7 @@ class PlaidSyncService:
                 print(f"Failed to sync item {item.id}: {e}")
 
         return summary
+
+
+# Singleton instance
+plaid_sync_service = PlaidSyncService(plaid_client)
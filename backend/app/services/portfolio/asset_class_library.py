@@ -39,6 +39,11 @@ class AssetClass(BaseModel):
 # Capital Market Assumptions (CMA) - Updated January 2025
 # Based on Vanguard, BlackRock, JP Morgan 10-year projections
 
+# Version stamp of the figures below; bump it when the CMA are refreshed so
+# cached results keyed on it (see cached_optimizer.py, tool_cache.py) are
+# not reused across the change
+CMA_VERSION = "2025-01"
+
 ASSET_CLASS_LIBRARY: Dict[str, AssetClass] = {
     # ==================== EQUITY ====================
 
@@ -530,6 +535,16 @@ ASSET_CLASS_LIBRARY: Dict[str, AssetClass] = {
 }
 
 
+def get_cma_version() -> str:
+    """
+    Version stamp of the capital market assumptions.
+
+    The library is only changed by a deploy, so every process (API and
+    compute workers alike) reports the same stamp.
+    """
+    return CMA_VERSION
+
+
 # Correlation Matrix Helper Functions
 
 def get_default_correlation_matrix(asset_codes: List[str]) -> List[List[float]]:
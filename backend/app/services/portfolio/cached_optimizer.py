@@ -3,11 +3,16 @@ Cached Portfolio Optimizer
 Wraps portfolio optimization with Redis caching for performance
 """
 
+import asyncio
 import hashlib
 import json
+import time
 from typing import Dict, List, Optional
 from app.core.cache import cache, CacheKeys
-from app.core.performance import track_performance
+from app.core.compute import compute_executor
+from app.core.config import settings
+from app.core.performance import performance_metrics, track_performance
+from app.services.portfolio.asset_class_library import get_cma_version
 from app.services.portfolio.multi_level_optimizer import (
     MultiLevelOptimizer,
     HouseholdPortfolio,
@@ -17,12 +22,24 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Cross-worker single-flight lock; outlasts the longest allowed optimization
+LOCK_TTL_SECONDS = settings.COMPUTE_TIMEOUT_SECONDS + 10.0
+LOCK_POLL_INTERVAL = 0.05
+LOCK_POLL_MAX_INTERVAL = 1.0
+
 
 class CachedPortfolioOptimizer:
-    """Portfolio optimizer with intelligent caching"""
+    """
+    Portfolio optimizer with intelligent caching
+
+    Cache misses are coalesced: concurrent callers in this process await a
+    single in-flight computation, and a short Redis lock elects one leader
+    across workers while followers wait for its cached result.
+    """
 
     def __init__(self):
         self.optimizer = MultiLevelOptimizer()
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     def _generate_cache_key(
         self,
@@ -51,6 +68,8 @@ class CachedPortfolioOptimizer:
                 for goal in household.goals
             ],
             "asset_codes": sorted(asset_codes),
+            # New capital market assumptions must not serve stale results
+            "cma_version": get_cma_version(),
         }
 
         request_json = json.dumps(request_data, sort_keys=True)
@@ -93,11 +112,85 @@ class CachedPortfolioOptimizer:
 
         logger.info(f"Cache MISS for portfolio optimization: {cache_key}")
 
-        # Perform optimization
-        result = self.optimizer.optimize_household(
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(
+                self._optimize_single_flight(cache_key, household, asset_codes, correlation_matrix)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(cache_key, done))
+        else:
+            performance_metrics.increment_counter("portfolio_optimization.coalesced")
+            logger.info(f"Joining in-flight portfolio optimization: {cache_key}")
+
+        # Shield so a caller disconnecting does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, cache_key: str, task: asyncio.Task):
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller went away
+
+    async def _optimize_single_flight(
+        self,
+        cache_key: str,
+        household: HouseholdPortfolio,
+        asset_codes: List[str],
+        correlation_matrix: Optional[Dict],
+    ) -> OptimizationResult:
+        """Compute once across workers, or wait for the worker already computing"""
+        lock_key = f"lock:{cache_key}"
+        token = await cache.acquire_lock(lock_key, LOCK_TTL_SECONDS)
+
+        if token is None:
+            result = await self._wait_for_leader(cache_key, lock_key)
+            if result is not None:
+                performance_metrics.increment_counter("portfolio_optimization.coalesced_remote")
+                return result
+            # Leader finished without caching a result (failed or evicted)
+            token = await cache.acquire_lock(lock_key, LOCK_TTL_SECONDS)
+
+        try:
+            return await self._optimize_and_cache(
+                cache_key, household, asset_codes, correlation_matrix
+            )
+        finally:
+            if token is not None:
+                await cache.release_lock(lock_key, token)
+
+    async def _wait_for_leader(
+        self, cache_key: str, lock_key: str
+    ) -> Optional[OptimizationResult]:
+        """Poll for the leader's result until its lock is released or expires"""
+        deadline = time.monotonic() + LOCK_TTL_SECONDS
+        interval = LOCK_POLL_INTERVAL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, LOCK_POLL_MAX_INTERVAL)
+            cached_result, locked = await cache.peek_locked(cache_key, lock_key)
+            if cached_result:
+                return OptimizationResult(**cached_result)
+            if not locked:
+                return None
+        return None
+
+    async def _optimize_and_cache(
+        self,
+        cache_key: str,
+        household: HouseholdPortfolio,
+        asset_codes: List[str],
+        correlation_matrix: Optional[Dict],
+    ) -> OptimizationResult:
+        performance_metrics.increment_counter("portfolio_optimization.computed")
+
+        # Perform optimization off the event loop
+        result = await compute_executor.run(
+            self.optimizer.optimize_household,
             household=household,
             asset_codes=asset_codes,
-            correlation_matrix=correlation_matrix
+            correlation_matrix=correlation_matrix,
+            operation="portfolio_optimization",
         )
 
         # Cache the result (15 minutes TTL)
@@ -9,12 +9,27 @@ Provides optimization solvers for common financial planning questions:
 
 import asyncio
 import inspect
+from contextvars import ContextVar
 from copy import deepcopy
-from typing import Dict, Any, Optional, Protocol
+from typing import Callable, Dict, Any, Optional, Protocol, Tuple
 import numpy as np
 from scipy.optimize import minimize_scalar, brentq
 from app.models.goal import Goal
-from .monte_carlo_engine import MonteCarloEngine
+from app.tools.monte_carlo_engine import (
+    withdrawal_success_probabilities,
+    withdrawal_survival_limits,
+)
+from .monte_carlo_engine import DEFAULT_TIME_HORIZON_YEARS, MonteCarloEngine
+
+SEARCH_ITERATIONS = 1000
+FINAL_ITERATIONS = 5000
+WITHDRAWAL_SIMULATIONS = 10000
+
+# Loop of the async entry point that started a solve. asyncio.to_thread
+# copies the context, so the solver thread can reach the loop it came from.
+_caller_loop: ContextVar[Optional[asyncio.AbstractEventLoop]] = ContextVar(
+    "goal_solver_caller_loop", default=None
+)
 
 
 class _GoalCloneable(Protocol):
@@ -46,8 +61,27 @@ def _safe_float(value: Any, default: float = 0.0) -> float:
 class GoalSolver:
     """Optimization solvers for goal-based planning"""
 
-    def __init__(self, monte_carlo_engine: MonteCarloEngine):
+    def __init__(
+        self,
+        monte_carlo_engine: MonteCarloEngine,
+        *,
+        common_random_numbers: bool = True,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            monte_carlo_engine: Engine used for every objective evaluation.
+            common_random_numbers: Reuse one shock matrix across all candidate
+                values within a solve so the objective is deterministic and
+                monotone.  Only available with ``MonteCarloEngine``; other
+                engines fall back to independent draws per evaluation.
+            seed: Optional seed for the common shock matrix.
+        """
         self.mc_engine = monte_carlo_engine
+        self.common_random_numbers = common_random_numbers and isinstance(
+            monte_carlo_engine, MonteCarloEngine
+        )
+        self.seed = seed
 
     # ------------------------------------------------------------------ #
     # Public async APIs delegate to sync helpers so callers remain async-friendly
@@ -61,7 +95,7 @@ class GoalSolver:
         tolerance: float = 0.01,
         max_iterations: int = 20,
     ) -> Dict[str, Any]:
-        return await asyncio.to_thread(
+        return await self._in_thread(
             self._solve_contribution_sync,
             goal,
             target_success_probability,
@@ -88,7 +122,7 @@ class GoalSolver:
             current_age + max_years if max_years is not None else max_retirement_age
         )
 
-        return await asyncio.to_thread(
+        return await self._in_thread(
             self._solve_timeline_sync,
             goal,
             target_success_probability,
@@ -104,7 +138,7 @@ class GoalSolver:
         tolerance: float = 0.01,
         max_iterations: int = 20,
     ) -> Dict[str, Any]:
-        return await asyncio.to_thread(
+        return await self._in_thread(
             self._solve_target_amount_sync,
             goal,
             target_success_probability,
@@ -185,7 +219,7 @@ class GoalSolver:
         volatility = volatility if volatility is not None else 0.12
         inflation = inflation if inflation is not None else 0.025
 
-        return await asyncio.to_thread(
+        return await self._in_thread(
             self._solve_withdrawal_rate_sync,
             float(portfolio_value),
             int(years_in_retirement),
@@ -217,44 +251,48 @@ class GoalSolver:
         if min_rate <= 0 or max_rate <= 0 or min_rate >= max_rate:
             raise ValueError("Invalid withdrawal rate bounds supplied.")
 
-        def simulate_withdrawal_rate(rate: float) -> float:
-            simulations = 1000
-            successes = 0
-            base_withdrawal = max(portfolio_value * rate, annual_expenses)
-
-            for _ in range(simulations):
-                portfolio = portfolio_value
-
-                for year in range(years_in_retirement):
-                    annual_return = np.random.normal(expected_return, volatility)
-
-                    withdrawal = base_withdrawal * ((1 + inflation) ** year)
-                    portfolio -= withdrawal
-                    portfolio *= (1 + annual_return)
-
-                    if portfolio <= 0:
-                        break
-
-                if portfolio > 0:
-                    successes += 1
-
-            return successes / simulations
-
-        lower_rate = min_rate
-        upper_rate = max_rate
+        # Per-path survival limits from one set of shocks price every
+        # candidate rate at once; the grid is then interpolated at the target.
+        survival_limits = withdrawal_survival_limits(
+            portfolio_value,
+            years_in_retirement,
+            expected_return,
+            volatility,
+            inflation,
+            simulations=WITHDRAWAL_SIMULATIONS,
+            rng=np.random.default_rng(self.seed),
+        )
 
-        while upper_rate - lower_rate > tolerance:
-            mid_rate = (lower_rate + upper_rate) / 2
-            success_prob = simulate_withdrawal_rate(mid_rate)
+        grid_points = max(int(np.ceil((max_rate - min_rate) / tolerance)), 1) + 1
+        candidate_rates = np.linspace(min_rate, max_rate, grid_points)
+        probabilities = withdrawal_success_probabilities(
+            np.maximum(portfolio_value * candidate_rates, annual_expenses),
+            survival_limits,
+        )
 
-            if success_prob >= target_success_probability:
-                lower_rate = mid_rate
-            else:
-                upper_rate = mid_rate
+        # Probabilities fall as the rate rises, so feasible rates form a prefix
+        feasible = np.flatnonzero(probabilities >= target_success_probability)
+        if feasible.size == 0:
+            safe_rate = min_rate
+        elif feasible[-1] == grid_points - 1:
+            safe_rate = max_rate
+        else:
+            index = feasible[-1]
+            upper_probability = probabilities[index]
+            lower_probability = probabilities[index + 1]
+            fraction = (
+                (upper_probability - target_success_probability)
+                / (upper_probability - lower_probability)
+            )
+            safe_rate = float(
+                candidate_rates[index]
+                + fraction * (candidate_rates[index + 1] - candidate_rates[index])
+            )
 
-        safe_rate = lower_rate
-        achieved_probability = simulate_withdrawal_rate(safe_rate)
         annual_withdrawal = max(portfolio_value * safe_rate, annual_expenses)
+        achieved_probability = float(
+            withdrawal_success_probabilities(annual_withdrawal, survival_limits)
+        )
         effective_tolerance = 0.05
         status = (
             "success"
@@ -287,16 +325,85 @@ class GoalSolver:
 
         return response
 
+    async def _in_thread(self, func: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+        token = _caller_loop.set(asyncio.get_running_loop())
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            _caller_loop.reset(token)
+
     # ------------------------------------------------------------------ #
     # Synchronous implementations used by asyncio.to_thread
     # ------------------------------------------------------------------ #
 
-    def _run_simulation_sync(self, goal: Goal, iterations: int) -> Any:
-        result = self.mc_engine.run_simulation(goal=goal, iterations=iterations)
+    def _run_simulation_sync(
+        self,
+        goal: Goal,
+        iterations: int,
+        shocks: Optional[np.ndarray] = None,
+    ) -> Any:
+        if shocks is not None:
+            result = self.mc_engine.run_simulation(
+                goal=goal, iterations=iterations, shocks=shocks
+            )
+        else:
+            result = self.mc_engine.run_simulation(goal=goal, iterations=iterations)
         if inspect.isawaitable(result):
-            return asyncio.run(result)
+            # Async engines run on the caller's loop, which is idle while it
+            # awaits this solve, instead of a new event loop per evaluation
+            loop = _caller_loop.get()
+            if loop is None:
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise TypeError(
+                    "Async simulation engines are only supported through the async solve APIs"
+                )
+            return asyncio.run_coroutine_threadsafe(result, loop).result()
         return result
 
+    def _common_shocks(self, years: int) -> Optional[np.ndarray]:
+        """Draw the shared shock matrix for one solve, or ``None`` when CRN is off."""
+        if not self.common_random_numbers:
+            return None
+        return self.mc_engine.draw_shocks(
+            years=years, iterations=FINAL_ITERATIONS, seed=self.seed
+        )
+
+    @staticmethod
+    def _bisect_monotone(
+        probability_at: Callable[[float], float],
+        lower: float,
+        upper: float,
+        target_success_probability: float,
+        xtol: float,
+        max_iterations: int,
+        increasing: bool = True,
+    ) -> Tuple[float, int, bool]:
+        """
+        Bisection on a deterministic, monotone success-probability curve.
+
+        The bracket end that meets the target is kept as ``feasible`` and
+        returned, so the answer satisfies the target whenever one exists in
+        ``[lower, upper]``.  Returns ``(value, evaluations, converged)``.
+        """
+        feasible, infeasible = (upper, lower) if increasing else (lower, upper)
+
+        if probability_at(feasible) < target_success_probability:
+            return feasible, 1, False
+        if probability_at(infeasible) >= target_success_probability:
+            return infeasible, 2, True
+
+        evaluations = 2
+        while abs(feasible - infeasible) > xtol and evaluations < max_iterations:
+            midpoint = (feasible + infeasible) / 2
+            if probability_at(midpoint) >= target_success_probability:
+                feasible = midpoint
+            else:
+                infeasible = midpoint
+            evaluations += 1
+
+        return feasible, evaluations, abs(feasible - infeasible) <= xtol
+
     def _solve_contribution_sync(
         self,
         goal: Goal,
@@ -330,8 +437,16 @@ class GoalSolver:
         )
         current_contribution = max(current_contribution, 0.0)
 
+        shocks = (
+            self._common_shocks(self.mc_engine.horizon_years(goal))
+            if self.common_random_numbers
+            else None
+        )
+
         baseline_goal = _clone_goal(goal)
-        baseline_result = self._run_simulation_sync(baseline_goal, iterations=5000)
+        baseline_result = self._run_simulation_sync(
+            baseline_goal, iterations=FINAL_ITERATIONS, shocks=shocks
+        )
         baseline_probability = float(baseline_result.success_probability)
 
         if baseline_probability >= (target_success_probability - max(tolerance, 0.05)):
@@ -351,40 +466,60 @@ class GoalSolver:
             }
             return response
 
-        def objective_function(contribution: float) -> float:
+        def success_at(contribution: float) -> float:
             """Calculate success probability for given contribution"""
             # Update goal with test contribution
             test_goal = _clone_goal(goal)
             test_goal.monthly_contribution = contribution
 
             # Run Monte Carlo simulation
-            result = self._run_simulation_sync(test_goal, iterations=1000)
+            result = self._run_simulation_sync(
+                test_goal, iterations=SEARCH_ITERATIONS, shocks=shocks
+            )
+            return result.success_probability
 
+        def objective_function(contribution: float) -> float:
             # Return difference from target (we want to minimize this)
-            return abs(result.success_probability - target_success_probability)
+            return abs(success_at(contribution) - target_success_probability)
 
         # Initial bounds: 0 to 10x current contribution
         current_contribution = current_contribution or 1000
         lower_bound = 0
         upper_bound = current_contribution * 10
 
-        # Binary search optimization
-        result = minimize_scalar(
-            objective_function,
-            bounds=(lower_bound, upper_bound),
-            method='bounded',
-            options={'maxiter': max_iterations, 'xatol': 50}  # $50 tolerance
-        )
+        if shocks is not None:
+            # Common random numbers: probability is monotone in contribution
+            optimal_contribution, solver_iterations, converged = self._bisect_monotone(
+                success_at,
+                lower_bound,
+                upper_bound,
+                target_success_probability,
+                xtol=50,  # $50 tolerance
+                max_iterations=max_iterations,
+            )
+        else:
+            # Binary search optimization
+            result = minimize_scalar(
+                objective_function,
+                bounds=(lower_bound, upper_bound),
+                method='bounded',
+                options={'maxiter': max_iterations, 'xatol': 50}  # $50 tolerance
+            )
+            optimal_contribution, solver_iterations, converged = (
+                result.x, result.nit, result.success
+            )
 
         # Run final simulation with optimal contribution for accurate result
         final_goal = _clone_goal(goal)
-        final_goal.monthly_contribution = result.x
+        final_goal.monthly_contribution = optimal_contribution
 
-        final_result = self._run_simulation_sync(final_goal, iterations=5000)
+        final_result = self._run_simulation_sync(
+            final_goal, iterations=FINAL_ITERATIONS, shocks=shocks
+        )
 
         achieved_probability = float(final_result.success_probability)
         effective_tolerance = max(tolerance, 0.05)
-        required_contribution = round(result.x, 2)
+        required_contribution = round(optimal_contribution, 2)
         status = (
             "success"
             if achieved_probability >= (target_success_probability - effective_tolerance)
@@ -402,9 +537,9 @@ class GoalSolver:
             'achieved_probability': reported_probability,
             'achieved_success_probability': reported_probability,
             'achieved_probability_raw': achieved_probability,
-            'iterations': result.nit,
-            'converged': result.success,
-            'difference_from_current': round(result.x - current_contribution, 2),
+            'iterations': solver_iterations,
+            'converged': converged,
+            'difference_from_current': round(optimal_contribution - current_contribution, 2),
         }
 
         if status != "success":
@@ -427,15 +562,12 @@ class GoalSolver:
         current_age = int(_safe_float(getattr(goal, "current_age", None), 40))
         current_retirement_age = int(_safe_float(getattr(goal, "retirement_age", None), 65))
 
-        def objective_function(retirement_age: int) -> float:
-            """Calculate success probability for given retirement age"""
-            test_goal = _clone_goal(goal)
-            test_goal.retirement_age = int(retirement_age)
-            test_goal.years_to_goal = int(retirement_age) - current_age
-
-            result = self._run_simulation_sync(test_goal, iterations=1000)
-
-            return abs(result.success_probability - target_success_probability)
+        # One shock matrix covers the longest candidate horizon; shorter
+        # horizons use its leading months so every age sees the same markets.
+        # Zero-year candidates fall back to the engine's default horizon.
+        shocks = self._common_shocks(
+            max(max_retirement_age - current_age, DEFAULT_TIME_HORIZON_YEARS)
+        )
 
         # Binary search through discrete age values
         best_age = max_retirement_age
@@ -446,7 +578,9 @@ class GoalSolver:
             test_goal.retirement_age = age
             test_goal.years_to_goal = age - current_age
 
-            result = self._run_simulation_sync(test_goal, iterations=1000)
+            result = self._run_simulation_sync(
+                test_goal, iterations=SEARCH_ITERATIONS, shocks=shocks
+            )
 
             if result.success_probability >= target_success_probability:
                 if age < best_age:
@@ -459,7 +593,9 @@ class GoalSolver:
         final_goal.retirement_age = best_age
         final_goal.years_to_goal = best_age - current_age
 
-        final_result = self._run_simulation_sync(final_goal, iterations=5000)
+        final_result = self._run_simulation_sync(
+            final_goal, iterations=FINAL_ITERATIONS, shocks=shocks
+        )
 
         years_until_retirement = best_age - current_age
         achieved_probability = float(final_result.success_probability)
@@ -480,7 +616,9 @@ class GoalSolver:
                 final_goal = _clone_goal(goal)
                 final_goal.retirement_age = current_age + adjusted_years
                 final_goal.years_to_goal = adjusted_years
-                final_result = self._run_simulation_sync(final_goal, iterations=5000)
+                final_result = self._run_simulation_sync(
+                    final_goal, iterations=FINAL_ITERATIONS, shocks=shocks
+                )
                 best_age = final_goal.retirement_age
                 years_until_retirement = adjusted_years
                 achieved_probability = float(final_result.success_probability)
@@ -524,36 +662,64 @@ class GoalSolver:
         max_iterations: int = 20,
     ) -> Dict[str, Any]:
         """Synchronous implementation of the target amount solver."""
-        def objective_function(target_amount: float) -> float:
+        shocks = (
+            self._common_shocks(self.mc_engine.horizon_years(goal))
+            if self.common_random_numbers
+            else None
+        )
+
+        def success_at(target_amount: float) -> float:
             """Calculate success probability for given target amount"""
             test_goal = _clone_goal(goal)
             test_goal.target_amount = target_amount
 
-            result = self._run_simulation_sync(test_goal, iterations=1000)
+            result = self._run_simulation_sync(
+                test_goal, iterations=SEARCH_ITERATIONS, shocks=shocks
+            )
+            return result.success_probability
 
-            return abs(result.success_probability - target_success_probability)
+        def objective_function(target_amount: float) -> float:
+            return abs(success_at(target_amount) - target_success_probability)
 
         # Initial bounds: 50% to 200% of current target
         current_target = goal.target_amount or 1000000
         lower_bound = current_target * 0.5
         upper_bound = current_target * 2.0
 
-        result = minimize_scalar(
-            objective_function,
-            bounds=(lower_bound, upper_bound),
-            method='bounded',
-            options={'maxiter': max_iterations, 'xatol': 1000}  # $1000 tolerance
-        )
+        if shocks is not None:
+            # Common random numbers: probability falls monotonically as the
+            # target rises, so find the largest target still meeting it
+            optimal_target, solver_iterations, converged = self._bisect_monotone(
+                success_at,
+                lower_bound,
+                upper_bound,
+                target_success_probability,
+                xtol=1000,  # $1000 tolerance
+                max_iterations=max_iterations,
+                increasing=False,
+            )
+        else:
+            result = minimize_scalar(
+                objective_function,
+                bounds=(lower_bound, upper_bound),
+                method='bounded',
+                options={'maxiter': max_iterations, 'xatol': 1000}  # $1000 tolerance
+            )
+            optimal_target, solver_iterations, converged = (
+                result.x, result.nit, result.success
+            )
 
         # Run final simulation with optimal target
         final_goal = _clone_goal(goal)
-        final_goal.target_amount = result.x
+        final_goal.target_amount = optimal_target
 
-        final_result = self._run_simulation_sync(final_goal, iterations=5000)
+        final_result = self._run_simulation_sync(
+            final_goal, iterations=FINAL_ITERATIONS, shocks=shocks
+        )
 
         current_value = goal.current_amount or 0
 
-        required_amount = round(result.x, 2)
+        required_amount = round(optimal_target, 2)
         achieved_probability = float(final_result.success_probability)
         effective_tolerance = max(tolerance, 0.05)
         status = (
@@ -574,9 +740,9 @@ class GoalSolver:
             'achieved_success_probability': reported_probability,
             'achieved_probability_raw': achieved_probability,
             'current_portfolio_value': current_value,
-            'additional_savings_needed': round(result.x - current_value, 2),
-            'iterations': result.nit,
-            'converged': result.success,
+            'additional_savings_needed': round(optimal_target - current_value, 2),
+            'iterations': solver_iterations,
+            'converged': converged,
         }
 
         if status != "success":
@@ -0,0 +1,166 @@
+"""
+Market Assumption Store
+Memoized NumPy views of the capital market assumptions per asset universe
+
+Optimizers and simulators ask for the same handful of asset universes over
+and over; building the correlation matrix from the category rules, the
+covariance and its Cholesky factor once per universe keeps that work off the
+hot path. Entries are keyed by the sorted asset-code tuple and tagged with the
+CMA version stamp they were built from; an entry from another version is
+rebuilt on its next lookup.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.performance import performance_metrics
+from app.services.portfolio.asset_class_library import (
+    ASSET_CLASS_LIBRARY,
+    get_cma_version,
+    get_default_correlation_matrix,
+)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+def _square_root(matrix: np.ndarray) -> np.ndarray:
+    """Cholesky factor, or the eigen-clipped square root if not positive definite"""
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        # Category-based correlations are not guaranteed to be positive
+        # definite; clip negative eigenvalues to the nearest valid matrix.
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+
+@dataclass(frozen=True)
+class MarketAssumptions:
+    """
+    CMA arrays for one asset universe, indexed in ``asset_codes`` order.
+
+    Arrays are shared between callers and therefore read-only. The Cholesky
+    factors are lower triangular in sorted-code order; for any other order
+    they are the same factor with permuted rows, which is still a valid
+    square root (``L @ L.T`` reproduces the matrix) for drawing shocks.
+    """
+    asset_codes: Tuple[str, ...]
+    version: str
+    expected_returns: np.ndarray
+    volatilities: np.ndarray
+    min_weights: np.ndarray
+    max_weights: np.ndarray
+    correlation: np.ndarray
+    covariance: np.ndarray
+    correlation_cholesky: np.ndarray
+    covariance_cholesky: np.ndarray
+
+    @property
+    def bounds(self) -> List[Tuple[float, float]]:
+        """Per-asset (min_weight, max_weight) pairs"""
+        return list(zip(self.min_weights.tolist(), self.max_weights.tolist()))
+
+    @classmethod
+    def build(cls, asset_codes: Sequence[str], version: str) -> "MarketAssumptions":
+        assets = [ASSET_CLASS_LIBRARY[code] for code in asset_codes]
+        volatilities = np.array([asset.volatility for asset in assets])
+        correlation = np.array(get_default_correlation_matrix(list(asset_codes)), dtype=float)
+        correlation_cholesky = _square_root(correlation)
+
+        return cls(
+            asset_codes=tuple(asset_codes),
+            version=version,
+            expected_returns=_read_only(np.array([asset.expected_return for asset in assets])),
+            volatilities=_read_only(volatilities),
+            min_weights=_read_only(np.array([asset.min_weight for asset in assets])),
+            max_weights=_read_only(np.array([asset.max_weight for asset in assets])),
+            correlation=_read_only(correlation),
+            covariance=_read_only(np.outer(volatilities, volatilities) * correlation),
+            correlation_cholesky=_read_only(correlation_cholesky),
+            # Σ = D C D, so D L_C is a factor of Σ without a second decomposition
+            covariance_cholesky=_read_only(volatilities[:, None] * correlation_cholesky),
+        )
+
+    def reorder(self, asset_codes: Sequence[str]) -> "MarketAssumptions":
+        """Same assumptions indexed in ``asset_codes`` order"""
+        position = {code: i for i, code in enumerate(self.asset_codes)}
+        order = np.array([position[code] for code in asset_codes])
+        pairs = np.ix_(order, order)
+
+        return MarketAssumptions(
+            asset_codes=tuple(asset_codes),
+            version=self.version,
+            expected_returns=_read_only(self.expected_returns[order]),
+            volatilities=_read_only(self.volatilities[order]),
+            min_weights=_read_only(self.min_weights[order]),
+            max_weights=_read_only(self.max_weights[order]),
+            correlation=_read_only(self.correlation[pairs]),
+            covariance=_read_only(self.covariance[pairs]),
+            correlation_cholesky=_read_only(self.correlation_cholesky[order]),
+            covariance_cholesky=_read_only(self.covariance_cholesky[order]),
+        )
+
+
+class MarketAssumptionStore:
+    """
+    Size-bounded LRU of MarketAssumptions keyed by sorted asset-code tuple.
+
+    Thread-safe: sync endpoints reach the optimizers from the threadpool.
+    Each compute worker process holds its own store.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, ...], MarketAssumptions]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, asset_codes: Iterable[str]) -> MarketAssumptions:
+        """
+        Assumptions for ``asset_codes``, indexed in the order given.
+
+        Raises:
+            KeyError: If a code is not in the asset class library
+        """
+        asset_codes = tuple(asset_codes)
+        key = tuple(sorted(asset_codes))
+        version = get_cma_version()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version != version:
+                # Built from superseded assumptions
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            performance_metrics.increment_counter("market_assumptions.misses")
+            entry = MarketAssumptions.build(key, version)
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    performance_metrics.increment_counter("market_assumptions.evictions")
+        else:
+            performance_metrics.increment_counter("market_assumptions.hits")
+
+        return entry if asset_codes == key else entry.reorder(asset_codes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global store instance
+market_assumptions = MarketAssumptionStore()
@@ -13,16 +13,16 @@ delegates to the shared implementation.
 from __future__ import annotations
 
 from datetime import date
-from typing import Any
+from typing import Any, Sequence
 
 import numpy as np
 
 from app.tools.monte_carlo_engine import (
-    PortfolioProjection,
     SimulationParams,
     SimulationResult,
-    SimulationStatistics,
-    run_simulation as run_simulation_function,
+    draw_return_shocks,
+    run_simulation_sync,
+    success_probability_grid,
 )
 
 DEFAULT_TIME_HORIZON_YEARS = 30
@@ -34,8 +34,10 @@ DEFAULT_INFLATION = 0.02
 class MonteCarloEngine:
     """Class-compatible wrapper around the function-based simulation utilities."""
 
-    def __init__(self, *, default_iterations: int = 5000) -> None:
+    def __init__(self, *, default_iterations: int = 5000, low_memory: bool = True) -> None:
         self.default_iterations = default_iterations
+        # Services only read summary statistics, so paths are streamed by default.
+        self.low_memory = low_memory
 
     def run_simulation(
         self,
@@ -43,6 +45,7 @@ class MonteCarloEngine:
         goal: Any,
         iterations: int | None = None,
         monthly_withdrawal: float | None = None,
+        shocks: np.ndarray | None = None,
     ) -> SimulationResult:
         """
         Execute a Monte Carlo simulation using goal data.
@@ -53,12 +56,88 @@ class MonteCarloEngine:
             iterations: Optional override for simulation repetitions.
             monthly_withdrawal: Optional override for withdrawal amount; falls
                 back to goal attributes if present.
+            shocks: Optional common-random-numbers matrix from ``draw_shocks``.
+                The leading ``iterations`` rows and horizon months are used, so
+                one matrix can serve goals with different horizons.
         """
         params = self._build_params(goal, iterations, monthly_withdrawal)
-        # The shared implementation is async but purely CPU-bound; running it via
-        # ``np`` means no awaits.  To avoid mixing event loops we re-implement a
-        # synchronous variant here mirroring the tool behaviour.
-        return self._run(params)
+        if shocks is not None:
+            months = params.time_horizon * 12
+            if shocks.shape[0] < params.iterations or shocks.shape[1] < months:
+                raise ValueError(
+                    f"shocks of shape {shocks.shape} cannot cover "
+                    f"{params.iterations} iterations over {months} months"
+                )
+            shocks = shocks[: params.iterations, :months]
+        # Synchronous kernel; async callers go through SimulationService.
+        return self._run(params, shocks)
+
+    def draw_shocks(
+        self,
+        *,
+        years: int,
+        iterations: int | None = None,
+        seed: int | None = None,
+    ) -> np.ndarray:
+        """
+        Draw a reusable standard-normal shock matrix for common random numbers.
+
+        Passing the same matrix to every ``run_simulation`` call makes success
+        probability a deterministic, monotone function of contribution and
+        target amount, which is what root-finding solvers need.
+
+        Args:
+            years: Longest horizon the matrix must cover.
+            iterations: Number of paths; defaults to ``default_iterations``.
+            seed: Optional seed for reproducible draws.
+        """
+        return draw_return_shocks(
+            iterations or self.default_iterations,
+            max(int(years), 1) * 12,
+            rng=np.random.default_rng(seed),
+        )
+
+    def success_probabilities(
+        self,
+        goals: Sequence[Any],
+        *,
+        iterations: int | None = None,
+        shocks: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Success probability for many goal variants in one vectorized pass.
+
+        Every goal is evaluated against the same shocks, so differences
+        between variants reflect their parameters rather than sampling noise.
+
+        Args:
+            goals: Goal-like objects, e.g. clones with one or two fields swept.
+            iterations: Optional override for simulation repetitions.
+            shocks: Optional matrix from ``draw_shocks`` covering the longest
+                horizon; drawn fresh when omitted.
+        """
+        cells = [self._build_params(goal, iterations, None) for goal in goals]
+        if shocks is not None and cells:
+            shocks = shocks[: cells[0].iterations]
+        return success_probability_grid(cells, shocks)
+
+    def build_params(
+        self,
+        goal: Any,
+        iterations: int | None = None,
+        monthly_withdrawal: float | None = None,
+    ) -> SimulationParams:
+        """
+        Tool-level parameters ``run_simulation`` would use for ``goal``.
+
+        Unlike ORM goals, the result is picklable, so it is what crosses
+        into compute workers.
+        """
+        return self._build_params(goal, iterations, monthly_withdrawal)
+
+    def horizon_years(self, goal: Any) -> int:
+        """Simulation horizon in years that ``run_simulation`` would use for ``goal``."""
+        return self._build_params(goal, None, None).time_horizon
 
     # --------------------------------------------------------------------- #
     # Internal helpers
@@ -100,6 +179,7 @@ class MonteCarloEngine:
             goal_amount=goal_amount,
             iterations=iterations or self.default_iterations,
             inflation_rate=inflation,
+            low_memory=self.low_memory,
         )
 
     @staticmethod
@@ -123,78 +203,16 @@ class MonteCarloEngine:
         except Exception:
             return None
 
-    def _run(self, params: SimulationParams) -> SimulationResult:
+    def _run(
+        self,
+        params: SimulationParams,
+        shocks: np.ndarray | None = None,
+    ) -> SimulationResult:
         """
-        Synchronous Monte Carlo execution mirroring ``run_simulation`` while
-        avoiding async event-loop gymnastics inside services.
+        Synchronous Monte Carlo execution sharing the tool-level vectorized
+        kernel while avoiding async event-loop gymnastics inside services.
         """
-        months = params.time_horizon * 12
-        iterations = params.iterations
-
-        monthly_return = (1 + params.expected_return) ** (1 / 12) - 1
-        monthly_volatility = params.volatility / np.sqrt(12)
-        monthly_inflation = (1 + params.inflation_rate) ** (1 / 12) - 1
-
-        portfolio_paths = np.zeros((iterations, months + 1))
-        portfolio_paths[:, 0] = params.initial_portfolio_value
-
-        for month in range(1, months + 1):
-            random_returns = np.random.normal(
-                monthly_return - 0.5 * monthly_volatility**2,
-                monthly_volatility,
-                iterations,
-            )
-
-            previous_value = portfolio_paths[:, month - 1]
-            portfolio_value = previous_value * np.exp(random_returns)
-
-            inflation_adjustment = (1 + monthly_inflation) ** month
-            contribution = params.monthly_contribution * inflation_adjustment
-            portfolio_value += contribution
-
-            withdrawal = params.monthly_withdrawal * inflation_adjustment
-            portfolio_value = np.maximum(portfolio_value - withdrawal, 0)
-
-            portfolio_paths[:, month] = portfolio_value
-
-        final_values = portfolio_paths[:, -1]
-        goal_adjusted = params.goal_amount
-        success_count = np.sum(final_values >= goal_adjusted)
-        success_probability = success_count / iterations
-
-        statistics = SimulationStatistics(
-            median_final_value=float(np.median(final_values)),
-            percentile_10=float(np.percentile(final_values, 10)),
-            percentile_25=float(np.percentile(final_values, 25)),
-            percentile_75=float(np.percentile(final_values, 75)),
-            percentile_90=float(np.percentile(final_values, 90)),
-            best_case=float(np.max(final_values)),
-            worst_case=float(np.min(final_values)),
-            probability_of_loss=float(np.sum(final_values < params.initial_portfolio_value) / iterations),
-        )
-
-        projections = []
-        for year in range(params.time_horizon + 1):
-            month_idx = year * 12
-            year_values = portfolio_paths[:, month_idx]
-            projections.append(
-                PortfolioProjection(
-                    year=year,
-                    median=float(np.median(year_values)),
-                    p10=float(np.percentile(year_values, 10)),
-                    p25=float(np.percentile(year_values, 25)),
-                    p75=float(np.percentile(year_values, 75)),
-                    p90=float(np.percentile(year_values, 90)),
-                )
-            )
-
-        return SimulationResult(
-            success_probability=float(success_probability),
-            final_portfolio_distribution=final_values.tolist(),
-            portfolio_projections=projections,
-            statistics=statistics,
-            iterations_run=iterations,
-        )
+        return run_simulation_sync(params, shocks)
 
 
 __all__ = ["MonteCarloEngine"]
@@ -13,9 +13,10 @@ from pydantic import BaseModel
 from app.services.portfolio.asset_class_library import (
     AssetClass,
     ASSET_CLASS_LIBRARY,
-    get_default_correlation_matrix,
     AssetClassCategory
 )
+from app.services.portfolio.market_assumptions import market_assumptions
+from app.tools.portfolio_optimizer import solve_min_variance
 
 
 class OptimizationLevel(str):
@@ -87,8 +88,18 @@ class OptimizationResult(BaseModel):
 class MultiLevelOptimizer:
     """Multi-level portfolio optimizer"""
 
-    def __init__(self):
+    SOLVERS = ("qp", "slsqp")
+
+    def __init__(self, solver: str = "qp"):
+        """
+        Args:
+            solver: "qp" solves each goal's min-variance problem directly as a
+                convex QP; "slsqp" uses SLSQP with analytic Jacobians
+        """
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {self.SOLVERS}")
         self.risk_free_rate = 0.04
+        self.solver = solver
 
     def optimize_household(
         self,
@@ -341,18 +352,19 @@ class MultiLevelOptimizer:
             Optimal allocation and metrics
         """
         n_assets = len(asset_codes)
-        assets = [ASSET_CLASS_LIBRARY[code] for code in asset_codes]
-
-        # Get returns and volatilities
-        returns = np.array([asset.expected_return for asset in assets])
-        volatilities = np.array([asset.volatility for asset in assets])
 
-        # Correlation matrix
         if correlation_matrix is None:
-            correlation_matrix = get_default_correlation_matrix(asset_codes)
-
-        corr_matrix = np.array(correlation_matrix)
-        cov_matrix = np.outer(volatilities, volatilities) * corr_matrix
+            # Default correlations: shared, precomputed per asset universe
+            market = market_assumptions.get(asset_codes)
+            returns = market.expected_returns
+            cov_matrix = market.covariance
+            bounds = market.bounds
+        else:
+            assets = [ASSET_CLASS_LIBRARY[code] for code in asset_codes]
+            returns = np.array([asset.expected_return for asset in assets])
+            volatilities = np.array([asset.volatility for asset in assets])
+            cov_matrix = np.outer(volatilities, volatilities) * np.array(correlation_matrix)
+            bounds = [(asset.min_weight, asset.max_weight) for asset in assets]
 
         # Target return based on goal requirements and risk tolerance
         min_return = returns.min()
@@ -370,33 +382,19 @@ class MultiLevelOptimizer:
         def portfolio_return(weights):
             return np.dot(weights, returns)
 
-        # Constraints
-        constraints = [
-            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1},  # Weights sum to 1
-            {'type': 'ineq', 'fun': lambda w: portfolio_return(w) - target_return}  # Return >= target
-        ]
-
-        # Bounds (respect asset class constraints)
-        bounds = [(asset.min_weight, asset.max_weight) for asset in assets]
-
         # Initial guess
         initial_weights = np.array([1.0 / n_assets] * n_assets)
 
-        # Optimize
-        result = minimize(
-            portfolio_volatility,
-            initial_weights,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=constraints,
-            options={'maxiter': 1000, 'ftol': 1e-9}
-        )
+        if self.solver == "qp":
+            optimal_weights = solve_min_variance(returns, cov_matrix, target_return, bounds)
+        else:
+            optimal_weights = self._solve_slsqp(
+                cov_matrix, returns, target_return, bounds, initial_weights
+            )
 
-        if not result.success:
+        if optimal_weights is None:
             # Fallback: equal weights
             optimal_weights = initial_weights
-        else:
-            optimal_weights = result.x
 
         # Calculate metrics
         opt_return = portfolio_return(optimal_weights)
@@ -410,6 +408,41 @@ class MultiLevelOptimizer:
             "sharpe_ratio": float(sharpe_ratio)
         }
 
+    def _solve_slsqp(
+        self,
+        cov_matrix: np.ndarray,
+        returns: np.ndarray,
+        target_return: float,
+        bounds: List[Tuple[float, float]],
+        initial_weights: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """Minimize volatility with SLSQP using exact gradients; None if it fails."""
+        def portfolio_volatility(weights):
+            return np.sqrt(weights @ cov_matrix @ weights)
+
+        def portfolio_volatility_grad(weights):
+            volatility = portfolio_volatility(weights)
+            if volatility == 0:
+                return np.zeros_like(weights)
+            return cov_matrix @ weights / volatility
+
+        constraints = [
+            {'type': 'eq', 'fun': lambda w: np.sum(w) - 1, 'jac': lambda w: np.ones_like(w)},
+            {'type': 'ineq', 'fun': lambda w: w @ returns - target_return, 'jac': lambda w: returns}
+        ]
+
+        result = minimize(
+            portfolio_volatility,
+            initial_weights,
+            jac=portfolio_volatility_grad,
+            method='SLSQP',
+            bounds=bounds,
+            constraints=constraints,
+            options={'maxiter': 1000, 'ftol': 1e-9}
+        )
+
+        return result.x if result.success else None
+
     def _optimize_accounts(
         self,
         accounts: List[Account],
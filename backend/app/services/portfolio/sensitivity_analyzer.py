@@ -5,11 +5,11 @@ Provides one-way and two-way sensitivity analysis for financial planning variabl
 Generates tornado diagrams and heat maps showing impact on success probability.
 """
 
-import inspect
 from copy import deepcopy
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 from app.models.goal import Goal
+from app.services.simulation_service import run_engine_simulation
 from .monte_carlo_engine import MonteCarloEngine
 
 
@@ -38,10 +38,23 @@ class SensitivityAnalyzer:
         self.mc_engine = monte_carlo_engine
 
     async def _run_simulation(self, goal: Goal, iterations: int):
-        result = self.mc_engine.run_simulation(goal=goal, iterations=iterations)
-        if inspect.isawaitable(result):
-            return await result
-        return result
+        return await run_engine_simulation(self.mc_engine, goal, iterations)
+
+    async def _success_probabilities(self, goals: List[Goal], iterations: int) -> np.ndarray:
+        """
+        Success probability for each goal variant.
+
+        ``MonteCarloEngine`` evaluates the whole batch in one vectorized pass
+        against shared shocks; other engines are called once per variant.
+        """
+        if isinstance(self.mc_engine, MonteCarloEngine):
+            return self.mc_engine.success_probabilities(goals, iterations=iterations)
+
+        probabilities = []
+        for test_goal in goals:
+            result = await self._run_simulation(goal=test_goal, iterations=iterations)
+            probabilities.append(result.success_probability)
+        return np.array(probabilities, dtype=float)
 
     async def one_way_sensitivity(
         self,
@@ -109,19 +122,14 @@ class SensitivityAnalyzer:
             num_points
         )
 
-        probabilities = []
-
+        test_goals = []
         for test_value in test_values:
             # Create test goal with modified variable
             test_goal = _clone_goal(goal)
             self._set_variable_value(test_goal, variable, test_value)
+            test_goals.append(test_goal)
 
-            # Run simulation
-            result = await self._run_simulation(
-                goal=test_goal,
-                iterations=iterations,
-            )
-            probabilities.append(result.success_probability)
+        probabilities = (await self._success_probabilities(test_goals, iterations)).tolist()
 
         min_prob = min(probabilities)
         max_prob = max(probabilities)
@@ -204,21 +212,18 @@ class SensitivityAnalyzer:
             grid_size
         )
 
-        # Initialize result grid
-        probability_grid = np.zeros((grid_size, grid_size))
-
-        # Test all combinations
-        for i, val1 in enumerate(test_values1):
-            for j, val2 in enumerate(test_values2):
+        # Build every combination, then evaluate the whole surface at once
+        test_goals = []
+        for val1 in test_values1:
+            for val2 in test_values2:
                 test_goal = _clone_goal(goal)
                 self._set_variable_value(test_goal, var1, val1)
                 self._set_variable_value(test_goal, var2, val2)
+                test_goals.append(test_goal)
 
-                result = await self._run_simulation(
-                    goal=test_goal,
-                    iterations=iterations_per_point,
-                )
-                probability_grid[i, j] = result.success_probability
+        probability_grid = (
+            await self._success_probabilities(test_goals, iterations_per_point)
+        ).reshape(grid_size, grid_size)
 
         heat_map = probability_grid.tolist()
         result = {
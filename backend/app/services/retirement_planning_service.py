@@ -10,6 +10,11 @@ from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 import numpy as np
 
+from app.tools.monte_carlo_engine import (
+    withdrawal_success_probabilities,
+    withdrawal_survival_limits,
+)
+
 
 class RetirementPlanningService:
     """Service for retirement planning calculations."""
@@ -343,45 +348,31 @@ class RetirementPlanningService:
 
         # Test different withdrawal rates
         withdrawal_rates = np.arange(0.03, 0.06, 0.0025)  # 3.0% to 6.0% in 0.25% increments
-        results = []
-
-        for wr in withdrawal_rates:
-            initial_withdrawal = portfolio_value * wr
-            success_count = 0
-
-            for _ in range(iterations):
-                portfolio = portfolio_value
-                annual_withdrawal = initial_withdrawal
-
-                for year in range(years_in_retirement):
-                    # Random return for this year
-                    annual_return = np.random.normal(return_assumption, return_volatility)
-
-                    # Apply return
-                    portfolio = portfolio * (1 + annual_return)
-
-                    # Take withdrawal
-                    portfolio = portfolio - annual_withdrawal
-
-                    # Check if portfolio depleted
-                    if portfolio <= 0:
-                        break
-
-                    # Inflate withdrawal for next year
-                    annual_withdrawal = annual_withdrawal * (1 + inflation_rate)
-
-                # Check if portfolio lasted
-                if portfolio > 0:
-                    success_count += 1
-
-            success_rate = success_count / iterations
+        initial_withdrawals = portfolio_value * withdrawal_rates
+
+        # One set of simulated paths prices every candidate rate: each path's
+        # survival limit is the largest initial withdrawal it can sustain.
+        survival_limits = withdrawal_survival_limits(
+            portfolio_value,
+            years_in_retirement,
+            return_assumption,
+            return_volatility,
+            inflation_rate,
+            simulations=iterations,
+            withdraw_before_return=False,
+        )
+        success_rates = withdrawal_success_probabilities(initial_withdrawals, survival_limits)
 
+        results = []
+        for wr, initial_withdrawal, success_rate in zip(
+            withdrawal_rates, initial_withdrawals, success_rates
+        ):
             results.append({
-                "withdrawal_rate": round(wr, 4),
-                "initial_annual_withdrawal": round(initial_withdrawal, 2),
-                "initial_monthly_withdrawal": round(initial_withdrawal / 12, 2),
-                "success_probability": round(success_rate, 4),
-                "failure_probability": round(1 - success_rate, 4)
+                "withdrawal_rate": round(float(wr), 4),
+                "initial_annual_withdrawal": round(float(initial_withdrawal), 2),
+                "initial_monthly_withdrawal": round(float(initial_withdrawal) / 12, 2),
+                "success_probability": round(float(success_rate), 4),
+                "failure_probability": round(1 - float(success_rate), 4)
             })
 
         # Find sustainable rate (closest to desired probability)
@@ -7,10 +7,16 @@ REQ-RISK-004: Monte Carlo simulation integration
 """
 
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from enum import Enum
 
+from app.services.portfolio.asset_class_library import ASSET_CLASS_LIBRARY
+from app.services.portfolio.market_assumptions import market_assumptions
+
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_ASSET_VOLATILITY = 0.15
+
 
 class ScenarioType(str, Enum):
     """Types of stress test scenarios"""
@@ -373,56 +379,51 @@ class StressTestingService:
         allocation: Dict[str, float],
         asset_volatilities: Dict[str, float],
         n_simulations: int = 10000,
-        confidence_level: float = 0.05
+        confidence_level: float = 0.05,
+        seed: Optional[int] = None
     ) -> Dict:
         """
         Run Monte Carlo stress testing
 
+        Daily asset returns are drawn jointly from the asset covariance, so
+        diversification between correlated holdings is reflected in the tail.
+        Because ``w . (L z) = (L^T w) . z`` for the Cholesky factor ``L``, the
+        weights are folded into the factor once and every simulated portfolio
+        return comes from a single matrix-vector product.
+
         Args:
             portfolio_value: Current portfolio value
             allocation: Asset allocation weights
-            asset_volatilities: Volatility for each asset
+            asset_volatilities: Volatility for each asset (annualized); assets
+                not listed fall back to the asset class library, then 15%
             n_simulations: Number of Monte Carlo simulations
             confidence_level: Confidence level for VaR (default 5% = 95% VaR)
+            seed: Optional seed for reproducible draws
 
         Returns:
             Monte Carlo stress test results
         """
-        # Generate random returns for each asset
-        simulated_values = []
-
-        for _ in range(n_simulations):
-            portfolio_return = 0.0
-
-            for asset, weight in allocation.items():
-                # Get volatility for this asset
-                vol = asset_volatilities.get(asset, 0.15)  # Default 15%
-
-                # Generate random return (normal distribution)
-                asset_return = np.random.normal(0, vol / np.sqrt(252))  # Daily
-                portfolio_return += weight * asset_return
+        assets = list(allocation)
+        weights = np.array([allocation[asset] for asset in assets], dtype=float)
+        cholesky = self._daily_covariance_cholesky(assets, asset_volatilities)
 
-            simulated_value = portfolio_value * (1 + portfolio_return)
-            simulated_values.append(simulated_value)
-
-        simulated_values = np.array(simulated_values)
+        # Generate correlated daily portfolio returns
+        rng = np.random.default_rng(seed)
+        shocks = rng.standard_normal((n_simulations, len(assets)))
+        portfolio_returns = shocks @ (cholesky.T @ weights)
+        simulated_values = portfolio_value * (1 + portfolio_returns)
 
         # Calculate statistics
         mean_value = float(np.mean(simulated_values))
         median_value = float(np.median(simulated_values))
         std_value = float(np.std(simulated_values))
 
-        # VaR at confidence level
-        var_value = float(np.percentile(simulated_values, confidence_level * 100))
+        # VaR at confidence level, CVaR (expected value below VaR) and worst case
+        var_value, cvar_value, worst_case = self._tail_statistics(
+            simulated_values, confidence_level
+        )
         var_loss = portfolio_value - var_value
-
-        # CVaR (expected value below VaR)
-        tail_values = simulated_values[simulated_values <= var_value]
-        cvar_value = float(np.mean(tail_values)) if len(tail_values) > 0 else var_value
         cvar_loss = portfolio_value - cvar_value
-
-        # Worst case
-        worst_case = float(np.min(simulated_values))
         worst_loss = portfolio_value - worst_case
 
         return {
@@ -439,6 +440,66 @@ class StressTestingService:
             "confidence_level": confidence_level
         }
 
+    def _daily_covariance_cholesky(
+        self,
+        assets: List[str],
+        asset_volatilities: Dict[str, float]
+    ) -> np.ndarray:
+        """
+        Cholesky factor of the daily asset covariance matrix
+
+        Correlation factors come from the shared market assumption store;
+        assets outside the library are treated as uncorrelated with
+        everything else.
+        """
+        vols = np.array([
+            asset_volatilities.get(
+                asset,
+                ASSET_CLASS_LIBRARY[asset].volatility
+                if asset in ASSET_CLASS_LIBRARY else DEFAULT_ASSET_VOLATILITY
+            )
+            for asset in assets
+        ], dtype=float) / np.sqrt(TRADING_DAYS_PER_YEAR)
+
+        # Σ = D C D, so scaling the rows of a correlation factor by the daily
+        # vols gives a covariance factor without decomposing Σ per call
+        corr_factor = np.eye(len(assets))
+        known = [i for i, asset in enumerate(assets) if asset in ASSET_CLASS_LIBRARY]
+        if len(known) > 1:
+            corr_factor[np.ix_(known, known)] = market_assumptions.get(
+                [assets[i] for i in known]
+            ).correlation_cholesky
+
+        return vols[:, None] * corr_factor
+
+    @staticmethod
+    def _tail_statistics(
+        values: np.ndarray,
+        confidence_level: float
+    ) -> Tuple[float, float, float]:
+        """
+        VaR, CVaR and minimum of ``values`` using a partial sort
+
+        VaR matches ``np.percentile`` (linear interpolation) but only the two
+        order statistics around the quantile are placed; everything below
+        them lands in the leading block, which is all CVaR needs.
+        """
+        position = confidence_level * (len(values) - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, len(values) - 1)
+        partitioned = np.partition(values, [lower, upper])
+
+        fraction = position - lower
+        var_value = float(
+            partitioned[lower] + fraction * (partitioned[upper] - partitioned[lower])
+        )
+
+        head = partitioned[:upper + 1]
+        tail_values = head[head <= var_value]
+        cvar_value = float(np.mean(tail_values)) if len(tail_values) > 0 else var_value
+        worst_case = float(np.min(head))
+        return var_value, cvar_value, worst_case
+
     def _determine_severity(self, pct_change: float) -> str:
         """Determine severity level from percentage change"""
         abs_change = abs(pct_change)
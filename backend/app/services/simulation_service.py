@@ -0,0 +1,130 @@
+"""
+Simulation Service
+
+Single entry point for Monte Carlo runs: a synchronous kernel for code that
+is already off the event loop (solver threads, compute workers) and an async
+facade that runs the same kernel in the shared compute pool.
+"""
+
+import inspect
+from typing import Any, Optional
+
+import numpy as np
+
+from app.core.compute import ComputeExecutor, compute_executor, in_compute_worker
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.services.portfolio.monte_carlo_engine import MonteCarloEngine
+from app.tools.monte_carlo_engine import (
+    SimulationParams,
+    SimulationResult,
+    run_simulation_sync,
+)
+
+# Pool jobs are timed as compute.monte_carlo, which matches the
+# monte_carlo performance threshold
+SIMULATION_OPERATION = "monte_carlo"
+
+
+class SimulationService:
+    """
+    Monte Carlo simulations with sync and async entry points.
+
+    ``run_sync`` is the CPU-bound kernel and must not be called on the event
+    loop. ``run`` awaits the kernel in the compute pool; simulations of at
+    most ``inline_max_path_months`` path-months run inline because shipping
+    them to a worker costs more than computing them.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[MonteCarloEngine] = None,
+        executor: Optional[ComputeExecutor] = None,
+        inline_max_path_months: int = settings.SIMULATION_INLINE_MAX_PATH_MONTHS,
+    ):
+        self.engine = engine or MonteCarloEngine()
+        self.executor = executor or compute_executor
+        self.inline_max_path_months = inline_max_path_months
+
+    # ------------------------------------------------------------------ #
+    # Synchronous kernel
+    # ------------------------------------------------------------------ #
+
+    def run_sync(
+        self,
+        params: SimulationParams,
+        shocks: Optional[np.ndarray] = None,
+    ) -> SimulationResult:
+        """Run a simulation in the calling thread"""
+        return run_simulation_sync(params, shocks)
+
+    def run_goal_sync(
+        self,
+        goal: Any,
+        iterations: Optional[int] = None,
+        monthly_withdrawal: Optional[float] = None,
+    ) -> SimulationResult:
+        """Run a simulation for a goal-like object in the calling thread"""
+        return self.run_sync(self.engine.build_params(goal, iterations, monthly_withdrawal))
+
+    # ------------------------------------------------------------------ #
+    # Async facade
+    # ------------------------------------------------------------------ #
+
+    async def run(
+        self,
+        params: SimulationParams,
+        timeout: Optional[float] = None,
+    ) -> SimulationResult:
+        """
+        Run a simulation without blocking the event loop.
+
+        Raises:
+            ComputeQueueFullError: If the compute queue is at capacity
+            ComputeTimeoutError: If the simulation does not finish in time
+        """
+        small = params.iterations * params.time_horizon * 12 <= self.inline_max_path_months
+        if small or in_compute_worker():
+            # Already off the web loop inside a worker; never nest pools
+            performance_metrics.increment_counter("simulations.inline")
+            return self.run_sync(params)
+
+        performance_metrics.increment_counter("simulations.offloaded")
+        return await self.executor.run(
+            run_simulation_sync, params, timeout=timeout, operation=SIMULATION_OPERATION
+        )
+
+    async def run_goal(
+        self,
+        goal: Any,
+        iterations: Optional[int] = None,
+        monthly_withdrawal: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> SimulationResult:
+        """
+        Simulate a goal-like object without blocking the event loop.
+
+        Parameters are built here, so ORM goals never cross into a worker.
+        """
+        params = self.engine.build_params(goal, iterations, monthly_withdrawal)
+        return await self.run(params, timeout=timeout)
+
+
+async def run_engine_simulation(engine: Any, goal: Any, iterations: int) -> Any:
+    """
+    Run ``engine.run_simulation`` for a service that accepts any engine.
+
+    ``MonteCarloEngine`` runs through ``SimulationService`` so the loop stays
+    free; custom engines may be sync or async.
+    """
+    if isinstance(engine, MonteCarloEngine):
+        return await SimulationService(engine).run_goal(goal, iterations=iterations)
+
+    result = engine.run_simulation(goal=goal, iterations=iterations)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+# Global simulation service instance
+simulation_service = SimulationService()
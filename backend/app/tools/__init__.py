@@ -3,6 +3,9 @@ Financial Planning Tools
 
 Pre-built tools that agents can use for calculations and analysis.
 Agents should import and use these tools, NOT reimplement the logic.
+
+The exported tools are memoized across chat turns by content hash (see
+tool_cache); import from the submodules directly for uncached calls.
 """
 
 from .portfolio_optimizer import optimize_portfolio, calculate_efficient_frontier
@@ -16,6 +19,25 @@ from .retirement_income import (
     calculate_life_expectancy,
     project_retirement_income,
 )
+from .tool_cache import cached_tool
+
+optimize_portfolio = cached_tool(cma=True)(optimize_portfolio)
+calculate_efficient_frontier = cached_tool(cma=True)(calculate_efficient_frontier)
+# Unseeded simulations draw fresh shocks on every call, so only seeded runs
+# are reproducible enough to cache; calculate_success_probability is never seeded
+run_simulation = cached_tool(
+    cma=True, cache_if=lambda params: params.seed is not None
+)(run_simulation)
+analyze_goal = cached_tool(as_of_date=True)(analyze_goal)
+calculate_required_savings = cached_tool()(calculate_required_savings)
+assess_risk = cached_tool()(assess_risk)
+calculate_var = cached_tool()(calculate_var)
+optimize_asset_location = cached_tool()(optimize_asset_location)
+calculate_tax_alpha = cached_tool()(calculate_tax_alpha)
+calculate_social_security = cached_tool()(calculate_social_security)
+calculate_spending_by_age = cached_tool()(calculate_spending_by_age)
+calculate_life_expectancy = cached_tool()(calculate_life_expectancy)
+project_retirement_income = cached_tool()(project_retirement_income)
 
 __all__ = [
     "optimize_portfolio",
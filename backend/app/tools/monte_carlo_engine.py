@@ -4,9 +4,11 @@ Probabilistic modeling for goal success analysis
 """
 
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from pydantic import BaseModel
 
+PROJECTION_PERCENTILES = [10, 25, 50, 75, 90]
+
 
 class SimulationParams(BaseModel):
     """Parameters for Monte Carlo simulation"""
@@ -19,6 +21,10 @@ class SimulationParams(BaseModel):
     goal_amount: float
     iterations: int = 5000
     inflation_rate: float = 0.03
+    low_memory: bool = False  # stream year by year instead of keeping every path
+    max_distribution_points: Optional[int] = None  # downsample final distribution
+    histogram_bins: Optional[int] = None  # attach a histogram of final values
+    seed: Optional[int] = None  # fixed seed makes the run reproducible (and cacheable)
 
 
 class SimulationStatistics(BaseModel):
@@ -43,6 +49,12 @@ class PortfolioProjection(BaseModel):
     p90: float  # 90th percentile
 
 
+class DistributionHistogram(BaseModel):
+    """Histogram of final portfolio values"""
+    bin_edges: List[float]
+    counts: List[int]
+
+
 class SimulationResult(BaseModel):
     """Monte Carlo simulation result"""
     success_probability: float  # Probability of reaching goal
@@ -50,6 +62,7 @@ class SimulationResult(BaseModel):
     portfolio_projections: List[PortfolioProjection]
     statistics: SimulationStatistics
     iterations_run: int
+    distribution_histogram: Optional[DistributionHistogram] = None
 
 
 async def run_simulation(params: SimulationParams) -> SimulationResult:
@@ -60,54 +73,243 @@ async def run_simulation(params: SimulationParams) -> SimulationResult:
     with contributions/withdrawals. Runs thousands of scenarios to
     calculate probability of meeting financial goals.
 
+    The kernel is CPU-bound, so it runs in the compute pool via the
+    simulation service rather than on the caller's event loop.
+
     Args:
         params: Simulation parameters (returns, volatility, horizon, etc.)
 
     Returns:
         Simulation results including success probability and projections
     """
-    np.random.seed(None)  # Ensure randomness
+    # Imported here: the service builds on this module
+    from app.services.simulation_service import simulation_service
+
+    return await simulation_service.run(params)
+
+
+def run_simulation_sync(
+    params: SimulationParams,
+    shocks: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> SimulationResult:
+    """
+    Synchronous Monte Carlo simulation built on the vectorized path kernel.
+
+    With ``params.low_memory`` the paths are streamed one year at a time and
+    only the running state plus per-year percentiles are kept, so peak memory
+    is O(iterations * 12) rather than O(iterations * months).
+
+    Args:
+        params: Simulation parameters
+        shocks: Optional standard-normal shock matrix of shape
+            ``(iterations, time_horizon * 12)``; drawn fresh when omitted
+        rng: Optional generator used when ``shocks`` is omitted; defaults to
+            one seeded with ``params.seed`` when that is set
+
+    Returns:
+        Simulation results including success probability and projections
+    """
+    if shocks is None and rng is None and params.seed is not None:
+        rng = np.random.default_rng(params.seed)
+
+    if params.low_memory:
+        final_values, yearly_percentiles = stream_yearly_percentiles(params, shocks, rng)
+    else:
+        portfolio_paths = simulate_portfolio_paths(params, shocks, rng)
+        final_values = portfolio_paths[:, -1]
+        yearly_percentiles = np.percentile(
+            portfolio_paths[:, ::12], PROJECTION_PERCENTILES, axis=0
+        ).T
+    return summarize_simulation(params, final_values, yearly_percentiles)
+
+
+def draw_return_shocks(
+    iterations: int,
+    months: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Draw standard-normal monthly return shocks as one ``(iterations, months)`` block.
+
+    Args:
+        iterations: Number of simulated paths
+        months: Number of monthly steps per path
+        rng: Optional NumPy generator; a freshly seeded one is used when omitted
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.standard_normal((iterations, months))
 
+
+def simulate_portfolio_paths(
+    params: SimulationParams,
+    shocks: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Generate every portfolio path in a single vectorized pass.
+
+    Work happens in place on a month-major buffer (see ``_propagate_block``)
+    so every accumulation runs across contiguous rows of paths.
+
+    Args:
+        params: Simulation parameters
+        shocks: Optional standard-normal shock matrix of shape
+            ``(iterations, time_horizon * 12)``; drawn in one block when omitted
+        rng: Optional generator used when ``shocks`` is omitted
+
+    Returns:
+        Array of shape ``(iterations, months + 1)`` with the starting value in
+        column 0 (a transposed view of the month-major buffer).
+    """
     months = params.time_horizon * 12
     iterations = params.iterations
+    _check_shocks(params, shocks)
 
-    # Convert annual rates to monthly
-    monthly_return = (1 + params.expected_return) ** (1/12) - 1
-    monthly_volatility = params.volatility / np.sqrt(12)
-    monthly_inflation = (1 + params.inflation_rate) ** (1/12) - 1
-
-    # Initialize portfolio paths matrix
-    portfolio_paths = np.zeros((iterations, months + 1))
-    portfolio_paths[:, 0] = params.initial_portfolio_value
-
-    # Run simulations
-    for month in range(1, months + 1):
-        # Generate random returns using geometric Brownian motion
-        random_returns = np.random.normal(
-            monthly_return - 0.5 * monthly_volatility**2,
-            monthly_volatility,
-            iterations
-        )
+    buffer = np.empty((months + 1, iterations))
+    buffer[0] = params.initial_portfolio_value
+    _fill_shocks(buffer[1:], shocks, 0, rng)
+    _propagate_block(buffer[1:], params.initial_portfolio_value, params, 0)
 
-        # Update portfolio values
-        previous_value = portfolio_paths[:, month - 1]
+    return buffer.T
 
-        # Apply return
-        portfolio_value = previous_value * np.exp(random_returns)
 
-        # Add contributions (inflation-adjusted)
-        inflation_adjustment = (1 + monthly_inflation) ** month
-        contribution = params.monthly_contribution * inflation_adjustment
-        portfolio_value += contribution
+def stream_yearly_percentiles(
+    params: SimulationParams,
+    shocks: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Advance all paths one year at a time without materializing the path matrix.
 
-        # Subtract withdrawals (inflation-adjusted)
-        withdrawal = params.monthly_withdrawal * inflation_adjustment
-        portfolio_value = np.maximum(portfolio_value - withdrawal, 0)
+    Only the current state vector and a reusable ``(12, iterations)`` block
+    are held; the projection percentiles are taken at each year boundary.
+    Drawing order matches ``simulate_portfolio_paths``, so the same generator
+    state yields the same paths in both modes.
 
-        portfolio_paths[:, month] = portfolio_value
+    Returns:
+        Tuple of ``(final_values, yearly_percentiles)`` where the latter has
+        shape ``(time_horizon + 1, len(PROJECTION_PERCENTILES))``.
+    """
+    iterations = params.iterations
+    _check_shocks(params, shocks)
+    if shocks is None:
+        rng = rng if rng is not None else np.random.default_rng()
+
+    yearly_percentiles = np.empty((params.time_horizon + 1, len(PROJECTION_PERCENTILES)))
+    yearly_percentiles[0] = params.initial_portfolio_value
+
+    state = np.full(iterations, float(params.initial_portfolio_value))
+    block = np.empty((12, iterations))
+    for year in range(1, params.time_horizon + 1):
+        start_month = (year - 1) * 12
+        _fill_shocks(block, shocks, start_month, rng)
+        _propagate_block(block, state, params, start_month)
+        state[:] = block[-1]
+        yearly_percentiles[year] = np.percentile(state, PROJECTION_PERCENTILES)
+
+    return state, yearly_percentiles
+
+
+def _check_shocks(params: SimulationParams, shocks: Optional[np.ndarray]) -> None:
+    """Validate an explicitly supplied shock matrix against the parameters."""
+    expected = (params.iterations, params.time_horizon * 12)
+    if shocks is not None and shocks.shape != expected:
+        raise ValueError(f"shocks must have shape {expected}, got {shocks.shape}")
+
+
+def _fill_shocks(
+    block: np.ndarray,
+    shocks: Optional[np.ndarray],
+    start_month: int,
+    rng: Optional[np.random.Generator],
+) -> None:
+    """Fill a month-major block with standard-normal shocks."""
+    if shocks is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        rng.standard_normal(out=block)
+    else:
+        block[...] = shocks[:, start_month:start_month + block.shape[0]].T
+
+
+def _propagate_block(
+    block: np.ndarray,
+    start_values,
+    params: SimulationParams,
+    start_month: int,
+) -> None:
+    """
+    Turn the standard-normal shocks in ``block`` into portfolio values in place.
+
+    ``block`` is month-major with shape ``(months, iterations)`` and covers
+    months ``start_month + 1 .. start_month + months``; ``start_values`` is the
+    portfolio value (scalar or per path) entering the block.
+
+    The monthly recurrence ``V[t] = max(V[t-1] * g[t] + c[t] - w[t], 0)`` is
+    solved in closed form.  Dividing by cumulative growth ``G[t]`` turns it into
+    a reflected random walk ``W[t] = max(W[t-1] + d[t], 0)`` with increments
+    ``d[t] = (c[t] - w[t]) / G[t]``, whose solution is
+    ``W[t] = U[t] - min(0, min(U[1..t]))`` for ``U = V0 + cumsum(d)``.  Growth,
+    inflated cash flows and the zero floor therefore reduce to ``cumsum`` and
+    ``minimum.accumulate`` over the month axis.
+    """
+    months = block.shape[0]
 
-    # Calculate final values
-    final_values = portfolio_paths[:, -1]
+    # Convert annual rates to monthly
+    monthly_return = (1 + params.expected_return) ** (1 / 12) - 1
+    monthly_volatility = params.volatility / np.sqrt(12)
+    monthly_inflation = (1 + params.inflation_rate) ** (1 / 12) - 1
+    drift = monthly_return - 0.5 * monthly_volatility**2
+
+    # Cumulative log growth log(G[t]) for each path
+    log_growth = block
+    log_growth *= monthly_volatility
+    log_growth += drift
+    np.cumsum(log_growth, axis=0, out=log_growth)
+
+    # Inflation-adjusted net cash flow per month (contribution - withdrawal)
+    net_monthly = params.monthly_contribution - params.monthly_withdrawal
+    if net_monthly == 0:
+        np.exp(log_growth, out=log_growth)
+        log_growth *= start_values
+        return
+
+    inflation_index = (1 + monthly_inflation) ** np.arange(start_month + 1, start_month + months + 1)
+    net_flow = (net_monthly * inflation_index)[:, np.newaxis]
+
+    # U[t] = V0 + sum(net[s] / G[s]) in growth-discounted units
+    discounted = np.negative(log_growth)
+    np.exp(discounted, out=discounted)
+    discounted *= net_flow
+    np.cumsum(discounted, axis=0, out=discounted)
+    discounted += start_values
+
+    # Zero floor: subtract the running minimum of U (clamped at zero).  With a
+    # non-negative start and net inflows U never dips below zero.
+    if net_monthly < 0 or np.min(start_values) < 0:
+        floor = np.minimum.accumulate(discounted, axis=0)
+        np.minimum(floor, 0.0, out=floor)
+        discounted -= floor
+
+    np.exp(log_growth, out=log_growth)
+    log_growth *= discounted
+
+
+def summarize_simulation(
+    params: SimulationParams,
+    final_values: np.ndarray,
+    yearly_percentiles: np.ndarray,
+) -> SimulationResult:
+    """
+    Build a ``SimulationResult`` from final values and per-year percentiles.
+
+    Args:
+        params: Simulation parameters
+        final_values: Portfolio value of every path at the horizon
+        yearly_percentiles: Array of shape ``(time_horizon + 1, 5)`` holding
+            the ``PROJECTION_PERCENTILES`` for each year
+    """
+    iterations = final_values.shape[0]
 
     # Calculate success probability
     goal_adjusted = params.goal_amount  # Could inflation-adjust this too
@@ -126,30 +328,230 @@ async def run_simulation(params: SimulationParams) -> SimulationResult:
         probability_of_loss=float(np.sum(final_values < params.initial_portfolio_value) / iterations)
     )
 
-    # Calculate projections at each year
-    projections = []
-    for year in range(params.time_horizon + 1):
-        month_idx = year * 12
-        year_values = portfolio_paths[:, month_idx]
-
-        projections.append(PortfolioProjection(
+    projections = [
+        PortfolioProjection(
             year=year,
-            median=float(np.median(year_values)),
-            p10=float(np.percentile(year_values, 10)),
-            p25=float(np.percentile(year_values, 25)),
-            p75=float(np.percentile(year_values, 75)),
-            p90=float(np.percentile(year_values, 90))
-        ))
+            median=float(p50),
+            p10=float(p10),
+            p25=float(p25),
+            p75=float(p75),
+            p90=float(p90)
+        )
+        for year, (p10, p25, p50, p75, p90) in enumerate(yearly_percentiles)
+    ]
+
+    histogram = None
+    if params.histogram_bins:
+        counts, bin_edges = np.histogram(final_values, bins=params.histogram_bins)
+        histogram = DistributionHistogram(
+            bin_edges=bin_edges.tolist(),
+            counts=counts.tolist()
+        )
 
     return SimulationResult(
         success_probability=float(success_probability),
-        final_portfolio_distribution=final_values.tolist(),
+        final_portfolio_distribution=downsample_distribution(
+            final_values, params.max_distribution_points
+        ),
         portfolio_projections=projections,
         statistics=statistics,
-        iterations_run=iterations
+        iterations_run=iterations,
+        distribution_histogram=histogram
     )
 
 
+def downsample_distribution(values: np.ndarray, max_points: Optional[int]) -> List[float]:
+    """
+    Cap a sample at ``max_points`` evenly spaced quantiles.
+
+    Quantiles (rather than a random subsample) keep the tails and shape of the
+    distribution, so downstream percentile and histogram views stay faithful.
+    """
+    if not max_points or values.shape[0] <= max_points:
+        return values.tolist()
+    return np.quantile(values, np.linspace(0.0, 1.0, max_points)).tolist()
+
+
+def success_probability_grid(
+    cells: Sequence[SimulationParams],
+    shocks: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+    max_chunk_elements: int = 2_000_000,
+) -> np.ndarray:
+    """
+    Success probability for many parameter sets against shared shocks.
+
+    For a fixed return, volatility and horizon, each path's final value is a
+    closed-form function of the starting value, net monthly flow and
+    inflation (see ``_propagate_block``): with ``A(t) = sum(infl[s] / G[s])``
+    the growth-discounted balance is ``U(t) = V0 + net * A(t)``, which is
+    monotone in ``t``, so the zero floor only needs ``A`` at the first and
+    last month.  Paths are generated once per (return, volatility, horizon)
+    group, ``A`` for every distinct inflation rate comes from one matrix
+    product, and the cells are then evaluated as a ``(cells, iterations)``
+    broadcast in chunks of at most ``max_chunk_elements``.
+
+    Args:
+        cells: Parameter sets to evaluate; all must share ``iterations``
+        shocks: Optional standard-normal matrix of shape
+            ``(iterations, months)`` covering the longest horizon
+        rng: Optional generator used when ``shocks`` is omitted
+        max_chunk_elements: Upper bound on the size of each broadcast block
+
+    Returns:
+        Array of success probabilities aligned with ``cells``
+    """
+    if not cells:
+        return np.empty(0)
+
+    iterations = cells[0].iterations
+    if any(cell.iterations != iterations for cell in cells):
+        raise ValueError("All grid cells must use the same number of iterations")
+
+    max_months = max(cell.time_horizon for cell in cells) * 12
+    if shocks is None:
+        shocks = draw_return_shocks(iterations, max_months, rng)
+    elif shocks.shape[0] != iterations or shocks.shape[1] < max_months:
+        raise ValueError(
+            f"shocks of shape {shocks.shape} cannot cover {iterations} iterations "
+            f"over {max_months} months"
+        )
+
+    probabilities = np.empty(len(cells))
+    groups: Dict[tuple, List[int]] = {}
+    for index, cell in enumerate(cells):
+        key = (cell.expected_return, cell.volatility, cell.time_horizon)
+        groups.setdefault(key, []).append(index)
+
+    for (expected_return, volatility, horizon), indices in groups.items():
+        months = horizon * 12
+        monthly_return = (1 + expected_return) ** (1 / 12) - 1
+        monthly_volatility = volatility / np.sqrt(12)
+        drift = monthly_return - 0.5 * monthly_volatility**2
+
+        # Month-major cumulative log growth shared by every cell in the group
+        log_growth = np.multiply(shocks[:, :months].T, monthly_volatility)
+        log_growth += drift
+        np.cumsum(log_growth, axis=0, out=log_growth)
+        final_growth = np.exp(log_growth[-1])
+        inverse_growth = np.negative(log_growth, out=log_growth)
+        np.exp(inverse_growth, out=inverse_growth)
+
+        # Discounted inflation index sums for each distinct inflation rate
+        inflation_rates = sorted({cells[i].inflation_rate for i in indices})
+        monthly_inflation = (1 + np.asarray(inflation_rates)) ** (1 / 12) - 1
+        inflation_index = (1 + monthly_inflation[:, np.newaxis]) ** np.arange(1, months + 1)
+        total_discount = inflation_index @ inverse_growth  # A(T), (rates, iterations)
+        first_discount = inflation_index[:, :1] * inverse_growth[0]  # A(1)
+        rate_position = {rate: position for position, rate in enumerate(inflation_rates)}
+
+        chunk = max(max_chunk_elements // iterations, 1)
+        for start in range(0, len(indices), chunk):
+            batch = [cells[i] for i in indices[start:start + chunk]]
+            initial = np.array([c.initial_portfolio_value for c in batch])[:, np.newaxis]
+            net = np.array(
+                [c.monthly_contribution - c.monthly_withdrawal for c in batch]
+            )[:, np.newaxis]
+            goal = np.array([c.goal_amount for c in batch])[:, np.newaxis]
+            positions = [rate_position[c.inflation_rate] for c in batch]
+
+            balance = net * total_discount[positions]
+            balance += initial
+            # Running minimum of U sits at the first month for inflows and at
+            # the horizon for outflows
+            lowest = np.where(net >= 0, initial + net * first_discount[positions], balance)
+            np.minimum(lowest, 0.0, out=lowest)
+            balance -= lowest
+            balance *= final_growth
+
+            probabilities[indices[start:start + chunk]] = (
+                np.count_nonzero(balance >= goal, axis=1) / iterations
+            )
+
+    return probabilities
+
+
+def withdrawal_survival_limits(
+    portfolio_value: float,
+    years: int,
+    expected_return: float,
+    volatility: float,
+    inflation_rate: float,
+    simulations: int = 10000,
+    withdraw_before_return: bool = True,
+    shocks: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Largest initial annual withdrawal each simulated retirement path survives.
+
+    With annual returns ``R[t]`` and an inflation-indexed withdrawal
+    ``b * (1 + inflation) ** (t - 1)``, the balance is linear in ``b``:
+    ``P[t] = G[t] * (P0 - b * S[t])`` where ``G`` is cumulative growth and
+    ``S[t]`` sums the inflation index discounted by growth.  ``S`` only
+    increases, so a path stays solvent for every year exactly when
+    ``b < P0 / S[T]``.  That per-path limit is independent of ``b``, so one
+    pass over shared shocks prices any number of candidate withdrawal rates.
+
+    Args:
+        portfolio_value: Starting portfolio value
+        years: Years of withdrawals
+        expected_return: Expected annual return
+        volatility: Annual return volatility
+        inflation_rate: Annual withdrawal inflation
+        simulations: Number of simulated paths
+        withdraw_before_return: Take each year's withdrawal before applying
+            that year's return (otherwise after)
+        shocks: Optional standard-normal matrix of shape ``(simulations, years)``
+        rng: Optional generator used when ``shocks`` is omitted
+
+    Returns:
+        Sorted array of per-path withdrawal limits (length ``simulations``)
+    """
+    if shocks is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        shocks = rng.standard_normal((simulations, years))
+    elif shocks.shape != (simulations, years):
+        raise ValueError(f"shocks must have shape {(simulations, years)}, got {shocks.shape}")
+
+    # A loss can never exceed the whole balance
+    growth = np.maximum(1.0 + expected_return + volatility * shocks, 0.0)
+    np.cumprod(growth, axis=1, out=growth)
+
+    inflation_index = (1 + inflation_rate) ** np.arange(years)
+    if withdraw_before_return:
+        # Year t's withdrawal is discounted by growth through year t - 1
+        discount = np.ones_like(growth)
+        discount[:, 1:] = growth[:, :-1]
+    else:
+        discount = growth
+
+    with np.errstate(divide="ignore"):
+        discounted_withdrawals = np.divide(inflation_index, discount)
+        limits = portfolio_value / discounted_withdrawals.sum(axis=1)
+
+    limits.sort()
+    return limits
+
+
+def withdrawal_success_probabilities(
+    initial_withdrawals: np.ndarray,
+    survival_limits: np.ndarray,
+) -> np.ndarray:
+    """
+    Success probability for each candidate initial annual withdrawal.
+
+    Args:
+        initial_withdrawals: Candidate first-year withdrawals (any shape)
+        survival_limits: Sorted output of ``withdrawal_survival_limits``
+
+    Returns:
+        Fraction of paths whose limit exceeds each withdrawal
+    """
+    failures = np.searchsorted(survival_limits, initial_withdrawals, side="right")
+    return 1.0 - failures / survival_limits.shape[0]
+
+
 async def calculate_success_probability(
     current_value: float,
     goal_amount: float,
@@ -5,7 +5,7 @@ Modern Portfolio Theory (MPT) implementation using mean-variance optimization
 
 import numpy as np
 from scipy.optimize import minimize
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 
 
@@ -35,6 +35,57 @@ class OptimizationResult(BaseModel):
     max_drawdown_estimate: float
 
 
+# Risk-free rate (assume 4% for now - should come from market data)
+RISK_FREE_RATE = 0.04
+
+# Default pairwise correlation when none is supplied
+DEFAULT_CORRELATION = 0.3
+
+# Active-set tolerances for the frontier QP
+_ACTIVE_SET_TOL = 1e-10
+_ACTIVE_SET_MAX_ITER = 50
+
+
+def _covariance_matrix(
+    asset_classes: List[AssetClass],
+    correlation_matrix: Optional[List[List[float]]] = None
+) -> np.ndarray:
+    """Annual covariance matrix (moderate default correlation if none given)"""
+    n_assets = len(asset_classes)
+    volatilities = np.array([ac.volatility for ac in asset_classes])
+
+    if correlation_matrix:
+        corr_matrix = np.array(correlation_matrix)
+    else:
+        corr_matrix = np.full((n_assets, n_assets), DEFAULT_CORRELATION)
+        np.fill_diagonal(corr_matrix, 1.0)
+
+    return np.outer(volatilities, volatilities) * corr_matrix
+
+
+def _weight_bounds(
+    asset_classes: List[AssetClass],
+    constraints: Optional[Dict[str, float]] = None
+) -> List[tuple]:
+    """Per-asset (min, max) weights, 0% to 100% unless overridden"""
+    bounds = []
+    for ac in asset_classes:
+        if constraints and ac.name in constraints:
+            min_weight = constraints.get(f"{ac.name}_min", 0.0)
+            max_weight = constraints.get(f"{ac.name}_max", 1.0)
+        else:
+            min_weight, max_weight = 0.0, 1.0
+        bounds.append((min_weight, max_weight))
+    return bounds
+
+
+def _target_return(returns: np.ndarray, risk_tolerance: float) -> float:
+    """Map risk tolerance onto the [min, max] asset return range"""
+    min_return = returns.min()
+    max_return = returns.max()
+    return min_return + risk_tolerance * (max_return - min_return)
+
+
 async def optimize_portfolio(params: OptimizationParams) -> OptimizationResult:
     """
     Optimize portfolio allocation using Modern Portfolio Theory.
@@ -50,32 +101,14 @@ async def optimize_portfolio(params: OptimizationParams) -> OptimizationResult:
     """
     n_assets = len(params.asset_classes)
 
-    # Extract returns and volatilities
     returns = np.array([ac.expected_return for ac in params.asset_classes])
-    volatilities = np.array([ac.volatility for ac in params.asset_classes])
-
-    # Create correlation matrix (default to moderate correlation if not provided)
-    if params.correlation_matrix:
-        corr_matrix = np.array(params.correlation_matrix)
-    else:
-        # Default correlation matrix with moderate positive correlation
-        corr_matrix = np.eye(n_assets)
-        for i in range(n_assets):
-            for j in range(n_assets):
-                if i != j:
-                    corr_matrix[i, j] = 0.3  # Moderate correlation
+    cov_matrix = _covariance_matrix(params.asset_classes, params.correlation_matrix)
 
-    # Create covariance matrix
-    cov_matrix = np.outer(volatilities, volatilities) * corr_matrix
-
-    # Risk-free rate (assume 4% for now - should come from market data)
-    risk_free_rate = 0.04
+    risk_free_rate = RISK_FREE_RATE
 
     # Target return based on risk tolerance
     # Higher risk tolerance = target higher returns
-    min_return = returns.min()
-    max_return = returns.max()
-    target_return = min_return + params.risk_tolerance * (max_return - min_return)
+    target_return = _target_return(returns, params.risk_tolerance)
 
     # Objective function: minimize volatility for target return
     def portfolio_volatility(weights):
@@ -91,14 +124,7 @@ async def optimize_portfolio(params: OptimizationParams) -> OptimizationResult:
     ]
 
     # Bounds (default 0% to 100% per asset, can be overridden)
-    bounds = []
-    for ac in params.asset_classes:
-        if params.constraints and ac.name in params.constraints:
-            min_weight = params.constraints.get(f"{ac.name}_min", 0.0)
-            max_weight = params.constraints.get(f"{ac.name}_max", 1.0)
-        else:
-            min_weight, max_weight = 0.0, 1.0
-        bounds.append((min_weight, max_weight))
+    bounds = _weight_bounds(params.asset_classes, params.constraints)
 
     # Initial guess: equal weights
     initial_weights = np.array([1.0 / n_assets] * n_assets)
@@ -137,10 +163,221 @@ async def optimize_portfolio(params: OptimizationParams) -> OptimizationResult:
     )
 
 
+def _solve_active_set(
+    cov_matrix: np.ndarray,
+    eq_matrix: np.ndarray,
+    eq_values: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    at_lower: np.ndarray,
+    at_upper: np.ndarray,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, int]]:
+    """
+    Primal-dual active-set solve of min w'Σw s.t. Aw = b, lower <= w <= upper.
+
+    Starting from a guess of which weights sit on their bounds, each iteration
+    solves the KKT system over the free weights, then moves weights that broke
+    a bound onto it and releases bound weights whose multiplier has the wrong
+    sign. A warm-started guess from a neighbouring frontier point usually needs
+    one or two KKT solves.
+
+    Returns (weights, at_lower, at_upper, iterations), or None when the KKT
+    system is singular or the active set cycles so the caller can fall back.
+    """
+    n_eq = eq_matrix.shape[0]
+    seen = set()
+
+    for iteration in range(1, _ACTIVE_SET_MAX_ITER + 1):
+        fixed = at_lower | at_upper
+        free = ~fixed
+        n_free = int(free.sum())
+        if n_free == 0:
+            return None
+
+        weights = np.where(at_lower, lower, np.where(at_upper, upper, 0.0))
+        kkt = np.zeros((n_free + n_eq, n_free + n_eq))
+        kkt[:n_free, :n_free] = cov_matrix[np.ix_(free, free)]
+        kkt[:n_free, n_free:] = eq_matrix[:, free].T
+        kkt[n_free:, :n_free] = eq_matrix[:, free]
+        rhs = np.concatenate([
+            -cov_matrix[np.ix_(free, fixed)] @ weights[fixed],
+            eq_values - eq_matrix[:, fixed] @ weights[fixed],
+        ])
+        try:
+            solution = np.linalg.solve(kkt, rhs)
+        except np.linalg.LinAlgError:
+            return None
+
+        weights[free] = solution[:n_free]
+        if not np.all(np.isfinite(weights)) or np.abs(eq_matrix @ weights - eq_values).max() > 1e-8:
+            return None
+
+        # Bound multipliers: reduced gradient of the Lagrangian
+        multipliers = cov_matrix @ weights + eq_matrix.T @ solution[n_free:]
+
+        below = free & (weights < lower - _ACTIVE_SET_TOL)
+        above = free & (weights > upper + _ACTIVE_SET_TOL)
+        release_lower = at_lower & (multipliers < -_ACTIVE_SET_TOL)
+        release_upper = at_upper & (multipliers > _ACTIVE_SET_TOL)
+
+        if not (below.any() or above.any() or release_lower.any() or release_upper.any()):
+            return np.clip(weights, lower, upper), at_lower, at_upper, iteration
+
+        at_lower = below | (at_lower & ~release_lower)
+        at_upper = above | (at_upper & ~release_upper)
+        state = (at_lower.tobytes(), at_upper.tobytes())
+        if state in seen:
+            return None
+        seen.add(state)
+
+    return None
+
+
+def _solve_slsqp(
+    cov_matrix: np.ndarray,
+    returns: np.ndarray,
+    target_return: Optional[float],
+    bounds: List[tuple],
+    initial_weights: np.ndarray,
+) -> Tuple[np.ndarray, int]:
+    """Fallback SLSQP solve with analytic gradients, warm-started from a neighbour"""
+    def variance(weights):
+        return weights @ cov_matrix @ weights
+
+    def variance_grad(weights):
+        return 2.0 * cov_matrix @ weights
+
+    constraints = [{
+        'type': 'eq',
+        'fun': lambda w: np.sum(w) - 1,
+        'jac': lambda w: np.ones_like(w),
+    }]
+    if target_return is not None:
+        constraints.append({
+            'type': 'ineq',
+            'fun': lambda w: w @ returns - target_return,
+            'jac': lambda w: returns,
+        })
+
+    result = minimize(
+        variance,
+        initial_weights,
+        jac=variance_grad,
+        method='SLSQP',
+        bounds=bounds,
+        constraints=constraints,
+        options={'maxiter': 1000, 'ftol': 1e-12}
+    )
+    return result.x, int(result.nit)
+
+
+def efficient_frontier_weights(
+    returns: np.ndarray,
+    cov_matrix: np.ndarray,
+    target_returns: np.ndarray,
+    bounds: List[tuple],
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Minimum-variance weights for many target returns in one warm-started sweep.
+
+    The unconstrained minimum-variance portfolio is solved once and reused for
+    every target it already meets; above it the return constraint binds, so
+    targets are visited in ascending order and each active-set solve starts
+    from the previous point's set of bound weights.
+
+    Args:
+        returns: Expected annual return per asset
+        cov_matrix: Annual covariance matrix (built once by the caller)
+        target_returns: Minimum portfolio return for each frontier point
+        bounds: Per-asset (min, max) weights
+
+    Returns:
+        (weights of shape (len(target_returns), n_assets), solver stats with
+        total ``iterations`` and number of SLSQP ``fallbacks``)
+    """
+    target_returns = np.asarray(target_returns, dtype=float)
+    n_assets = len(returns)
+    lower = np.array([b[0] for b in bounds], dtype=float)
+    upper = np.array([b[1] for b in bounds], dtype=float)
+    ones = np.ones((1, n_assets))
+    stats = {"points": len(target_returns), "iterations": 0, "fallbacks": 0}
+    no_bounds_active = (np.zeros(n_assets, dtype=bool), np.zeros(n_assets, dtype=bool))
+
+    def solve(eq_matrix, eq_values, target, state, initial_weights):
+        # Warm start first; a degenerate carried-over set (e.g. one asset
+        # pinned at 100%) can leave the KKT system singular, so retry cold
+        for start in (state, no_bounds_active):
+            solved = _solve_active_set(cov_matrix, eq_matrix, eq_values, lower, upper, *start)
+            if solved is not None:
+                weights, at_lower, at_upper, iterations = solved
+                stats["iterations"] += iterations
+                return weights, (at_lower, at_upper)
+
+        weights, iterations = _solve_slsqp(cov_matrix, returns, target, bounds, initial_weights)
+        stats["iterations"] += iterations
+        stats["fallbacks"] += 1
+        at_lower = weights <= lower + 1e-9
+        at_upper = ~at_lower & (weights >= upper - 1e-9)
+        return weights, (at_lower, at_upper)
+
+    min_variance, state = solve(
+        ones, np.ones(1), None, no_bounds_active, np.full(n_assets, 1.0 / n_assets)
+    )
+    min_variance_return = float(min_variance @ returns)
+
+    frontier = np.empty((len(target_returns), n_assets))
+    previous = min_variance
+    eq_matrix = np.vstack([ones, returns])
+    for index in np.argsort(target_returns, kind="stable"):
+        target = float(target_returns[index])
+        if target <= min_variance_return:
+            frontier[index] = min_variance
+            continue
+
+        previous, state = solve(eq_matrix, np.array([1.0, target]), target, state, previous)
+        frontier[index] = previous
+
+    return frontier, stats
+
+
+def solve_min_variance(
+    returns: np.ndarray,
+    cov_matrix: np.ndarray,
+    target_return: float,
+    bounds: List[tuple],
+) -> Optional[np.ndarray]:
+    """
+    Minimum-variance weights with a return floor, solved as a convex QP.
+
+    Args:
+        returns: Expected annual return per asset
+        cov_matrix: Annual covariance matrix
+        target_return: Minimum portfolio return
+        bounds: Per-asset (min, max) weights
+
+    Returns:
+        Optimal weights, or None if no fully invested portfolio within the
+        bounds reaches the target return
+    """
+    frontier, _ = efficient_frontier_weights(returns, cov_matrix, [target_return], bounds)
+    weights = frontier[0]
+
+    lower = np.array([b[0] for b in bounds], dtype=float)
+    upper = np.array([b[1] for b in bounds], dtype=float)
+    feasible = (
+        abs(weights.sum() - 1.0) <= 1e-6
+        and np.all(weights >= lower - 1e-6)
+        and np.all(weights <= upper + 1e-6)
+        and weights @ returns >= target_return - 1e-6
+    )
+    return weights if feasible else None
+
+
 async def calculate_efficient_frontier(
     asset_classes: List[AssetClass],
     correlation_matrix: Optional[List[List[float]]] = None,
-    num_points: int = 50
+    num_points: int = 50,
+    method: str = "active_set"
 ) -> List[Dict[str, float]]:
     """
     Calculate the efficient frontier - set of optimal portfolios.
@@ -152,17 +389,59 @@ async def calculate_efficient_frontier(
         asset_classes: List of available asset classes
         correlation_matrix: Correlation between assets
         num_points: Number of points to calculate on the frontier
+        method: "active_set" sweeps all points with one covariance build and
+            warm-started QP solves; "slsqp" runs optimize_portfolio per point
 
     Returns:
         List of portfolios on the efficient frontier, each with
         risk, return, and allocation data
     """
+    risk_tolerances = [i / (num_points - 1) for i in range(num_points)]  # 0.0 to 1.0
+
+    if method == "slsqp":
+        return await _pointwise_frontier(asset_classes, correlation_matrix, risk_tolerances)
+    if method != "active_set":
+        raise ValueError(f"Unknown efficient frontier method: {method}")
+
+    returns = np.array([ac.expected_return for ac in asset_classes])
+    cov_matrix = _covariance_matrix(asset_classes, correlation_matrix)
+    target_returns = np.array([_target_return(returns, t) for t in risk_tolerances])
+
+    weights, _ = efficient_frontier_weights(
+        returns, cov_matrix, target_returns, _weight_bounds(asset_classes)
+    )
+
     frontier_portfolios = []
+    for risk_tolerance, point_weights in zip(risk_tolerances, weights):
+        expected_return = float(point_weights @ returns)
+        expected_volatility = float(np.sqrt(point_weights @ cov_matrix @ point_weights))
+        sharpe_ratio = (
+            (expected_return - RISK_FREE_RATE) / expected_volatility
+            if expected_volatility > 0 else 0
+        )
+        frontier_portfolios.append({
+            "risk_tolerance": risk_tolerance,
+            "expected_return": expected_return,
+            "expected_volatility": expected_volatility,
+            "sharpe_ratio": float(sharpe_ratio),
+            "allocation": {
+                ac.name: float(point_weights[i])
+                for i, ac in enumerate(asset_classes)
+            }
+        })
+
+    return frontier_portfolios
+
 
-    # Calculate portfolios across risk tolerance spectrum
-    for i in range(num_points):
-        risk_tolerance = i / (num_points - 1)  # 0.0 to 1.0
+async def _pointwise_frontier(
+    asset_classes: List[AssetClass],
+    correlation_matrix: Optional[List[List[float]]],
+    risk_tolerances: List[float]
+) -> List[Dict[str, float]]:
+    """One independent cold-started optimize_portfolio call per frontier point"""
+    frontier_portfolios = []
 
+    for risk_tolerance in risk_tolerances:
         params = OptimizationParams(
             asset_classes=asset_classes,
             risk_tolerance=risk_tolerance,
@@ -0,0 +1,137 @@
+"""
+Tool Result Cache
+Content-addressed memoization of agent tool calls across chat turns
+"""
+
+import hashlib
+import inspect
+import json
+from datetime import date, datetime
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, get_args, get_origin, get_type_hints
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.core.cache import CacheKeys, cache
+from app.core.performance import performance_metrics
+
+# Bump when a tool's output format or algorithm changes
+TOOL_CACHE_VERSION = 1
+
+
+def _canonical(value: Any) -> Any:
+    """Convert arguments to a JSON-stable form (sorted, no object identity)"""
+    if isinstance(value, BaseModel):
+        return _canonical(value.model_dump(mode="json"))
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: str(item[0]))
+        return {str(key): _canonical(item) for key, item in items}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def tool_cache_key(
+    name: str,
+    arguments: Dict[str, Any],
+    cma: bool = False,
+    as_of_date: bool = False,
+) -> str:
+    """
+    Content hash of a tool call.
+
+    Arguments are bound to parameter names first, so positional and keyword
+    calls with the same values share an entry. Tools are pure functions of
+    their arguments, so changed inputs (a goal or holding edit) produce a
+    new key and stale entries simply age out.
+    """
+    payload = {"tool": name, "version": TOOL_CACHE_VERSION, "arguments": _canonical(arguments)}
+    if cma:
+        # A CMA refresh ships as a new version stamp; keying on it keeps
+        # results computed from the old figures from being served after it
+        from app.services.portfolio.asset_class_library import get_cma_version
+
+        payload["cma_version"] = get_cma_version()
+    if as_of_date:
+        payload["as_of"] = date.today().isoformat()
+
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return CacheKeys.TOOL_RESULT.format(tool=name, hash=digest)
+
+
+def _restore(return_type: Any, value: Any) -> Any:
+    """Rebuild the annotated return type from its cached JSON-like form"""
+    origin = get_origin(return_type)
+    if origin is list and get_args(return_type):
+        (item_type,) = get_args(return_type)
+        return [_restore(item_type, item) for item in value]
+    if origin is dict and get_args(return_type):
+        key_type, value_type = get_args(return_type)
+        # _canonical stringifies keys; restore numeric ones
+        return {
+            (key_type(key) if key_type in (int, float) else key): _restore(value_type, item)
+            for key, item in value.items()
+        }
+    if inspect.isclass(return_type) and issubclass(return_type, BaseModel):
+        return return_type.model_validate(value)
+    return value
+
+
+def cached_tool(
+    ttl: int = CacheKeys.TOOL_RESULT_TTL,
+    cache_if: Optional[Callable[..., bool]] = None,
+    as_of_date: bool = False,
+    cma: bool = False,
+):
+    """
+    Memoize an async tool function in the shared cache.
+
+    Args:
+        ttl: Entry lifetime in seconds
+        cache_if: Predicate over the call arguments; calls for which it
+            returns False (e.g. unseeded simulations) always recompute
+        as_of_date: Key on today's date too, for tools that read the clock
+        cma: Key on the CMA version too, for tools that read the asset
+            class library
+    """
+
+    def decorator(func: Callable):
+        name = func.__name__
+        signature = inspect.signature(func)
+        return_type = get_type_hints(func).get("return")
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if cache_if is not None and not cache_if(*args, **kwargs):
+                performance_metrics.increment_counter(f"tool_cache.{name}.bypassed")
+                return await func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tool_cache_key(name, bound.arguments, cma, as_of_date)
+
+            cached_value = await cache.get(key)
+            if cached_value is not None:
+                performance_metrics.increment_counter(f"tool_cache.{name}.hits")
+                return _restore(return_type, cached_value)
+
+            performance_metrics.increment_counter(f"tool_cache.{name}.misses")
+            result = await func(*args, **kwargs)
+            await cache.set(key, _canonical(result), expire=ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
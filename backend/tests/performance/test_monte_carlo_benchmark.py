@@ -7,7 +7,67 @@ import pytest
 import time
 import numpy as np
 import asyncio
-from app.tools.monte_carlo_engine import run_simulation, SimulationParams
+from typing import Optional
+from app.tools.monte_carlo_engine import (
+    run_simulation,
+    run_simulation_sync,
+    SimulationParams,
+    draw_return_shocks,
+    simulate_portfolio_paths,
+)
+
+
+def _loop_paths(params: SimulationParams, shocks: Optional[np.ndarray] = None) -> np.ndarray:
+    """Original month-by-month kernel, kept as the benchmark baseline.
+
+    Draws one ``np.random.normal`` slice per month like the original
+    implementation unless explicit shocks are supplied.
+    """
+    months = params.time_horizon * 12
+    monthly_return = (1 + params.expected_return) ** (1/12) - 1
+    monthly_volatility = params.volatility / np.sqrt(12)
+    monthly_inflation = (1 + params.inflation_rate) ** (1/12) - 1
+    drift = monthly_return - 0.5 * monthly_volatility**2
+
+    portfolio_paths = np.zeros((params.iterations, months + 1))
+    portfolio_paths[:, 0] = params.initial_portfolio_value
+    for month in range(1, months + 1):
+        if shocks is None:
+            random_returns = np.random.normal(drift, monthly_volatility, params.iterations)
+        else:
+            random_returns = drift + monthly_volatility * shocks[:, month - 1]
+        portfolio_value = portfolio_paths[:, month - 1] * np.exp(random_returns)
+        inflation_adjustment = (1 + monthly_inflation) ** month
+        portfolio_value += params.monthly_contribution * inflation_adjustment
+        withdrawal = params.monthly_withdrawal * inflation_adjustment
+        portfolio_paths[:, month] = np.maximum(portfolio_value - withdrawal, 0)
+    return portfolio_paths
+
+
+def _loop_simulation(params: SimulationParams) -> tuple:
+    """Original end-to-end pipeline: per-month draws plus per-year percentile calls."""
+    portfolio_paths = _loop_paths(params)
+    projections = []
+    for year in range(params.time_horizon + 1):
+        year_values = portfolio_paths[:, year * 12]
+        projections.append((
+            float(np.median(year_values)),
+            float(np.percentile(year_values, 10)),
+            float(np.percentile(year_values, 25)),
+            float(np.percentile(year_values, 75)),
+            float(np.percentile(year_values, 90)),
+        ))
+    return portfolio_paths[:, -1].tolist(), projections
+
+
+def _best_of(runs: int, func, *args) -> float:
+    """Best wall-clock time over several runs to damp scheduler noise."""
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
 
 
 @pytest.fixture
@@ -149,6 +209,72 @@ class TestMonteCarloPerformance:
         print(f"  Median value variance: {median_diff:.2%}")
 
 
+class TestVectorizedKernelPerformance:
+    """Microbenchmark: vectorized path kernel vs. the month-by-month loop"""
+
+    @pytest.mark.parametrize("horizon", [5, 10, 20, 30, 40, 50])
+    @pytest.mark.parametrize("iterations", [1000, 5000])
+    def test_kernel_speedup_across_horizons(self, simulation_params, horizon, iterations):
+        """Block-drawn vectorized kernel vs. per-month draws, end to end"""
+        simulation_params.time_horizon = horizon
+        simulation_params.iterations = iterations
+
+        loop_time = _best_of(3, _loop_simulation, simulation_params)
+        kernel_time = _best_of(3, run_simulation_sync, simulation_params)
+        speedup = loop_time / kernel_time
+
+        assert kernel_time < loop_time, (
+            f"{horizon}y kernel took {kernel_time * 1000:.1f}ms vs loop {loop_time * 1000:.1f}ms"
+        )
+
+        print(
+            f"\n✓ {horizon}y x {iterations}: loop {loop_time * 1000:.1f}ms, "
+            f"vectorized {kernel_time * 1000:.1f}ms ({speedup:.1f}x)"
+        )
+
+    @pytest.mark.parametrize("monthly_withdrawal", [0, 4000])
+    def test_kernel_matches_loop_on_shared_shocks(self, simulation_params, monthly_withdrawal):
+        """Identical shocks must yield identical paths, including depletion"""
+        simulation_params.monthly_withdrawal = monthly_withdrawal
+        months = simulation_params.time_horizon * 12
+        shocks = draw_return_shocks(
+            simulation_params.iterations, months, rng=np.random.default_rng(42)
+        )
+
+        np.testing.assert_allclose(
+            simulate_portfolio_paths(simulation_params, shocks),
+            _loop_paths(simulation_params, shocks),
+            rtol=1e-9,
+            atol=1e-6,
+        )
+
+
+class TestLowMemoryPerformance:
+    """Peak memory of streaming mode vs. the full path matrix"""
+
+    def test_streaming_peak_memory(self, simulation_params):
+        """Streaming mode must not allocate the (iterations, months) matrix"""
+        import tracemalloc
+
+        def peak_bytes(params):
+            tracemalloc.start()
+            run_simulation_sync(params)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+
+        full_peak = peak_bytes(simulation_params)
+        lean_peak = peak_bytes(simulation_params.model_copy(update={"low_memory": True}))
+        path_matrix_bytes = simulation_params.iterations * (simulation_params.time_horizon * 12 + 1) * 8
+
+        assert full_peak >= path_matrix_bytes
+        assert lean_peak < path_matrix_bytes / 5, (
+            f"Streaming peak {lean_peak / 1e6:.1f}MB vs path matrix {path_matrix_bytes / 1e6:.1f}MB"
+        )
+
+        print(f"\n✓ Peak memory: full {full_peak / 1e6:.1f}MB, streaming {lean_peak / 1e6:.1f}MB")
+
+
 class TestPortfolioOptimizationPerformance:
     """Performance benchmarks for portfolio optimization"""
 
@@ -184,5 +310,151 @@ class TestPortfolioOptimizationPerformance:
         print(f"\n✓ Portfolio optimization: {execution_time:.2f}s")
 
 
+class TestEfficientFrontierPerformance:
+    """Warm-started active-set frontier sweep vs. one SLSQP solve per point"""
+
+    ASSET_CLASSES = [
+        ("US_LargeCap", 0.10, 0.15),
+        ("US_SmallCap", 0.12, 0.20),
+        ("International", 0.09, 0.17),
+        ("Emerging", 0.11, 0.24),
+        ("Bonds", 0.04, 0.06),
+        ("TIPS", 0.035, 0.05),
+        ("REITs", 0.08, 0.18),
+        ("Cash", 0.02, 0.01),
+    ]
+
+    @pytest.mark.parametrize("num_points", [10, 50, 200])
+    def test_sweep_vs_pointwise(self, num_points, monkeypatch):
+        from app.tools import portfolio_optimizer
+        from app.tools.portfolio_optimizer import AssetClass, calculate_efficient_frontier
+
+        asset_classes = [
+            AssetClass(name=name, expected_return=ret, volatility=vol)
+            for name, ret, vol in self.ASSET_CLASSES
+        ]
+
+        slsqp_iterations = []
+        minimize = portfolio_optimizer.minimize
+
+        def counting_minimize(*args, **kwargs):
+            result = minimize(*args, **kwargs)
+            slsqp_iterations.append(result.nit)
+            return result
+
+        monkeypatch.setattr(portfolio_optimizer, "minimize", counting_minimize)
+
+        def frontier(method):
+            return asyncio.run(
+                calculate_efficient_frontier(asset_classes, num_points=num_points, method=method)
+            )
+
+        pointwise = frontier("slsqp")
+        pointwise_iterations = sum(slsqp_iterations)
+        swept = frontier("active_set")
+
+        returns = np.array([ret for _, ret, _ in self.ASSET_CLASSES])
+        cov_matrix = portfolio_optimizer._covariance_matrix(asset_classes)
+        targets = [
+            portfolio_optimizer._target_return(returns, p["risk_tolerance"]) for p in pointwise
+        ]
+        _, stats = portfolio_optimizer.efficient_frontier_weights(
+            returns, cov_matrix, targets, portfolio_optimizer._weight_bounds(asset_classes)
+        )
+
+        for fast, slow in zip(swept, pointwise):
+            assert fast["expected_volatility"] <= slow["expected_volatility"] + 1e-8
+            assert fast["expected_volatility"] == pytest.approx(slow["expected_volatility"], abs=1e-4)
+
+        pointwise_time = _best_of(3, frontier, "slsqp")
+        sweep_time = _best_of(3, frontier, "active_set")
+
+        assert stats["iterations"] < pointwise_iterations / 3
+        assert sweep_time < pointwise_time
+
+        print(
+            f"\n✓ {num_points}-point frontier: pointwise {pointwise_time * 1000:.1f}ms "
+            f"({pointwise_iterations} SLSQP iterations), sweep {sweep_time * 1000:.1f}ms "
+            f"({stats['iterations']} active-set iterations, {stats['fallbacks']} fallbacks, "
+            f"{pointwise_time / sweep_time:.0f}x)"
+        )
+
+
+class TestGoalOptimizationPerformance:
+    """Goal-level solve: numeric-gradient SLSQP baseline vs. analytic SLSQP and QP"""
+
+    @staticmethod
+    def _numeric_gradient_goal(goal, asset_codes):
+        """Original solve: SLSQP on sqrt(w'Σw) with finite-difference gradients"""
+        from scipy.optimize import minimize
+        from app.services.portfolio.asset_class_library import (
+            ASSET_CLASS_LIBRARY,
+            get_default_correlation_matrix,
+        )
+
+        assets = [ASSET_CLASS_LIBRARY[code] for code in asset_codes]
+        returns = np.array([asset.expected_return for asset in assets])
+        volatilities = np.array([asset.volatility for asset in assets])
+        cov_matrix = np.outer(volatilities, volatilities) * np.array(
+            get_default_correlation_matrix(asset_codes)
+        )
+        target_return = returns.min() + goal.risk_tolerance * (returns.max() - returns.min())
+        target_return = min(max(target_return, goal.required_return), returns.max())
+
+        result = minimize(
+            lambda w: np.sqrt(w @ cov_matrix @ w),
+            np.full(len(assets), 1.0 / len(assets)),
+            method='SLSQP',
+            bounds=[(asset.min_weight, asset.max_weight) for asset in assets],
+            constraints=[
+                {'type': 'eq', 'fun': lambda w: np.sum(w) - 1},
+                {'type': 'ineq', 'fun': lambda w: w @ returns - target_return},
+            ],
+            options={'maxiter': 1000, 'ftol': 1e-9}
+        )
+        return result.x
+
+    # The asset class library holds 45 classes, so the largest universe is all of them
+    @pytest.mark.parametrize("n_assets", [5, 20, 45])
+    def test_goal_solvers_across_universe_sizes(self, n_assets):
+        from app.services.portfolio.asset_class_library import ASSET_CLASS_LIBRARY
+        from app.services.portfolio.multi_level_optimizer import Goal, MultiLevelOptimizer
+
+        asset_codes = list(ASSET_CLASS_LIBRARY)[:n_assets]
+        goals = [
+            Goal(id=f"goal{i}", name="Goal", target_amount=500000, current_amount=100000,
+                 years_to_goal=15, priority="important", risk_tolerance=risk_tolerance,
+                 success_threshold=0.85, required_return=0.05)
+            for i, risk_tolerance in enumerate([0.2, 0.5, 0.8])
+        ]
+        qp_optimizer = MultiLevelOptimizer(solver="qp")
+        slsqp_optimizer = MultiLevelOptimizer(solver="slsqp")
+
+        def numeric():
+            return [self._numeric_gradient_goal(goal, asset_codes) for goal in goals]
+
+        def analytic():
+            return [slsqp_optimizer._optimize_single_goal(goal, asset_codes) for goal in goals]
+
+        def qp():
+            return [qp_optimizer._optimize_single_goal(goal, asset_codes) for goal in goals]
+
+        for baseline, result in zip(numeric(), qp()):
+            weights = np.array([result["weights"][code] for code in asset_codes])
+            np.testing.assert_allclose(weights, baseline, atol=1e-3)
+
+        numeric_time = _best_of(3, numeric)
+        analytic_time = _best_of(3, analytic)
+        qp_time = _best_of(3, qp)
+
+        assert analytic_time < numeric_time
+        assert qp_time < numeric_time
+
+        print(
+            f"\n✓ {n_assets} assets x {len(goals)} goals: numeric SLSQP {numeric_time * 1000:.1f}ms, "
+            f"analytic SLSQP {analytic_time * 1000:.1f}ms, QP {qp_time * 1000:.1f}ms"
+        )
+
+
 # Run benchmarks with: pytest tests/performance/test_monte_carlo_benchmark.py -v -s
 # For quick test: pytest tests/performance/test_monte_carlo_benchmark.py::TestMonteCarloPerformance::test_1000_iterations_baseline -v -s
@@ -0,0 +1,177 @@
+"""
+Unit tests for CachedPortfolioOptimizer single-flight coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import CacheService
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.services.portfolio import cached_optimizer as cached_optimizer_module
+from app.services.portfolio.cached_optimizer import CachedPortfolioOptimizer
+from app.services.portfolio.multi_level_optimizer import (
+    Account,
+    Goal,
+    HouseholdPortfolio,
+)
+from tests.utils.fake_redis import FakeRedis, FakeRedisServer
+
+
+ASSET_CODES = ["US_LC_BLEND", "US_TREASURY_INTER", "INTL_DEV_BLEND"]
+
+
+@pytest.fixture
+def household():
+    return HouseholdPortfolio(
+        accounts=[
+            Account(id="acc1", name="401k", type="tax_deferred", balance=150000,
+                    goal_allocations={"goal1": 150000}),
+        ],
+        goals=[
+            Goal(id="goal1", name="Retirement", target_amount=1000000, current_amount=150000,
+                 years_to_goal=20, priority="essential", risk_tolerance=0.6,
+                 success_threshold=0.85),
+        ],
+        total_value=150000,
+    )
+
+
+class CountingExecutor:
+    """Runs jobs inline after a delay and counts how many were submitted"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+
+    async def run(self, func, *args, operation=None, timeout=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return func(*args, **kwargs)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = CountingExecutor()
+    monkeypatch.setattr(cached_optimizer_module, "compute_executor", executor)
+    return executor
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """CacheService backed by an in-memory Redis shared by all optimizers"""
+    service = CacheService(l1_enabled=False)
+    service.redis_client = FakeRedis(FakeRedisServer())
+    service._connected = True
+    monkeypatch.setattr(cached_optimizer_module, "cache", service)
+    return service
+
+
+@pytest.fixture
+def offline_cache(monkeypatch):
+    service = CacheService(l1_enabled=False)
+    monkeypatch.setattr(cached_optimizer_module, "cache", service)
+    return service
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_computation(self, household, executor, offline_cache):
+        performance_metrics.reset()
+        optimizer = CachedPortfolioOptimizer()
+
+        results = await asyncio.gather(*[
+            optimizer.optimize_household_cached("user1", household, ASSET_CODES)
+            for _ in range(5)
+        ])
+
+        assert executor.calls == 1
+        assert all(result == results[0] for result in results)
+        assert performance_metrics.counters["portfolio_optimization.coalesced"] == 4
+        assert optimizer._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_coalesced(self, household, executor, offline_cache):
+        optimizer = CachedPortfolioOptimizer()
+
+        await asyncio.gather(
+            optimizer.optimize_household_cached("user1", household, ASSET_CODES),
+            optimizer.optimize_household_cached("user2", household, ASSET_CODES),
+        )
+
+        assert executor.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_work(self, household, executor, offline_cache):
+        optimizer = CachedPortfolioOptimizer()
+
+        first = asyncio.create_task(optimizer.optimize_household_cached("user1", household, ASSET_CODES))
+        second = asyncio.create_task(optimizer.optimize_household_cached("user1", household, ASSET_CODES))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        result = await second
+        assert result.total_value == 150000
+        assert executor.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_propagate_and_are_not_cached(self, household, executor, offline_cache, monkeypatch):
+        optimizer = CachedPortfolioOptimizer()
+
+        def fail(**kwargs):
+            raise RuntimeError("solver failed")
+
+        monkeypatch.setattr(optimizer.optimizer, "optimize_household", fail)
+        outcomes = await asyncio.gather(
+            optimizer.optimize_household_cached("user1", household, ASSET_CODES),
+            optimizer.optimize_household_cached("user1", household, ASSET_CODES),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert optimizer._inflight == {}
+
+
+class TestCrossWorkerCoalescing:
+
+    @pytest.mark.asyncio
+    async def test_follower_worker_waits_for_leader_result(self, household, executor, shared_cache):
+        performance_metrics.reset()
+        # Separate instances stand in for separate worker processes
+        leader, follower = CachedPortfolioOptimizer(), CachedPortfolioOptimizer()
+
+        results = await asyncio.gather(
+            leader.optimize_household_cached("user1", household, ASSET_CODES),
+            follower.optimize_household_cached("user1", household, ASSET_CODES),
+        )
+
+        assert executor.calls == 1
+        assert results[0] == results[1]
+        assert performance_metrics.counters["portfolio_optimization.coalesced_remote"] == 1
+        # Only the two initial lookups count; polling for the leader does not
+        assert performance_metrics.counters["cache.l2.misses"] == 2
+        lock_key = f"lock:{leader._generate_cache_key('user1', household, ASSET_CODES)}"
+        assert not await shared_cache.exists(lock_key)
+
+    def test_lock_outlasts_compute_timeout(self):
+        assert cached_optimizer_module.LOCK_TTL_SECONDS > settings.COMPUTE_TIMEOUT_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_follower_computes_when_leader_fails(self, household, executor, shared_cache, monkeypatch):
+        leader, follower = CachedPortfolioOptimizer(), CachedPortfolioOptimizer()
+
+        def fail(**kwargs):
+            raise RuntimeError("leader crashed")
+
+        monkeypatch.setattr(leader.optimizer, "optimize_household", fail)
+        leader_outcome, follower_result = await asyncio.gather(
+            leader.optimize_household_cached("user1", household, ASSET_CODES),
+            follower.optimize_household_cached("user1", household, ASSET_CODES),
+            return_exceptions=True,
+        )
+
+        assert isinstance(leader_outcome, RuntimeError)
+        assert follower_result.total_value == 150000
+        assert executor.calls == 2
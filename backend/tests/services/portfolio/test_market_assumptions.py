@@ -0,0 +1,87 @@
+"""
+Unit tests for the memoized market assumption store
+"""
+
+import numpy as np
+import pytest
+
+from app.core.performance import performance_metrics
+from app.services.portfolio.asset_class_library import (
+    ASSET_CLASS_LIBRARY,
+    CMA_VERSION,
+    get_default_correlation_matrix,
+)
+from app.services.portfolio import market_assumptions as market_assumptions_module
+from app.services.portfolio.market_assumptions import MarketAssumptionStore
+
+
+ASSET_CODES = ["US_TREASURY_INTER", "US_LC_BLEND", "GOLD", "CASH", "US_REIT"]
+
+
+@pytest.fixture
+def store():
+    performance_metrics.reset()
+    return MarketAssumptionStore(max_entries=2)
+
+
+class TestMarketAssumptions:
+
+    def test_matrices_match_library_in_caller_order(self, store):
+        market = store.get(ASSET_CODES)
+
+        vols = np.array([ASSET_CLASS_LIBRARY[code].volatility for code in ASSET_CODES])
+        correlation = np.array(get_default_correlation_matrix(ASSET_CODES))
+
+        assert market.asset_codes == tuple(ASSET_CODES)
+        np.testing.assert_allclose(market.correlation, correlation)
+        np.testing.assert_allclose(market.covariance, np.outer(vols, vols) * correlation)
+        np.testing.assert_allclose(
+            market.covariance_cholesky @ market.covariance_cholesky.T, market.covariance
+        )
+        assert market.expected_returns[1] == ASSET_CLASS_LIBRARY["US_LC_BLEND"].expected_return
+        assert market.bounds[0] == (0.0, 1.0)
+
+    def test_any_ordering_shares_one_entry(self, store):
+        first = store.get(ASSET_CODES)
+        second = store.get(reversed(ASSET_CODES))
+        canonical = store.get(sorted(ASSET_CODES))
+
+        assert len(store) == 1
+        assert performance_metrics.counters["market_assumptions.misses"] == 1
+        assert performance_metrics.counters["market_assumptions.hits"] == 2
+        np.testing.assert_allclose(second.covariance, first.covariance[::-1, ::-1])
+        # Sorted-order requests get the cached lower-triangular factor itself
+        assert canonical.covariance_cholesky is store.get(sorted(ASSET_CODES)).covariance_cholesky
+        assert np.allclose(np.triu(canonical.correlation_cholesky, 1), 0.0)
+
+    def test_arrays_are_read_only(self, store):
+        market = store.get(ASSET_CODES)
+
+        with pytest.raises(ValueError):
+            market.covariance[0, 0] = 1.0
+
+    def test_least_recently_used_universe_is_evicted(self, store):
+        store.get(["US_LC_BLEND", "CASH"])
+        store.get(["GOLD", "CASH"])
+        store.get(["US_LC_BLEND", "CASH"])
+        store.get(["US_REIT", "CASH"])
+
+        assert set(store._entries) == {("CASH", "US_LC_BLEND"), ("CASH", "US_REIT")}
+        assert performance_metrics.counters["market_assumptions.evictions"] == 1
+
+    def test_entries_are_tagged_with_cma_version(self, store):
+        assert store.get(ASSET_CODES).version == CMA_VERSION
+
+    def test_cma_update_rebuilds_entries(self, store, monkeypatch):
+        store.get(ASSET_CODES)
+        monkeypatch.setattr(market_assumptions_module, "get_cma_version", lambda: "next")
+
+        market = store.get(ASSET_CODES)
+
+        assert market.version == "next"
+        assert len(store) == 1
+        assert performance_metrics.counters["market_assumptions.misses"] == 2
+
+    def test_unknown_codes_rejected(self, store):
+        with pytest.raises(KeyError):
+            store.get(["NOT_AN_ASSET"])
@@ -3,6 +3,7 @@ Unit tests for Multi-Level Portfolio Optimizer
 Tests goal-level, account-level, and household-level optimization
 """
 
+import numpy as np
 import pytest
 from app.services.portfolio.multi_level_optimizer import (
     MultiLevelOptimizer,
@@ -227,6 +228,26 @@ class TestGoalLevelOptimization:
         assert -1.0 < result["sharpe_ratio"] < 5.0
 
 
+    @pytest.mark.parametrize("risk_tolerance", [0.0, 0.3, 0.6, 1.0])
+    def test_qp_and_slsqp_solvers_agree(self, sample_goals, asset_codes, risk_tolerance):
+        """Direct QP path matches SLSQP with exact gradients"""
+        goal = sample_goals[0].model_copy(update={"risk_tolerance": risk_tolerance})
+
+        qp = MultiLevelOptimizer(solver="qp")._optimize_single_goal(goal, asset_codes)
+        slsqp = MultiLevelOptimizer(solver="slsqp")._optimize_single_goal(goal, asset_codes)
+
+        assert qp["expected_volatility"] <= slsqp["expected_volatility"] + 1e-8
+        assert qp["expected_return"] == pytest.approx(slsqp["expected_return"], abs=1e-5)
+        np.testing.assert_allclose(
+            [qp["weights"][code] for code in asset_codes],
+            [slsqp["weights"][code] for code in asset_codes],
+            atol=1e-3,
+        )
+
+    def test_unknown_solver_rejected(self):
+        with pytest.raises(ValueError):
+            MultiLevelOptimizer(solver="cvx")
+
 class TestAccountLevelOptimization:
     """Test account-level tax-aware optimization"""
 
@@ -0,0 +1,158 @@
+"""
+Unit tests for compact streamed analysis results
+"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from app.api import chat as chat_module
+from app.core.cache import CacheService
+from app.core.performance import performance_metrics
+from app.services import analysis_result_store as store_module
+from app.services.analysis_result_store import (
+    AnalysisResultStore,
+    compact_analysis_results,
+    summarize_distribution,
+)
+from tests.utils.fake_redis import FakeRedis
+
+
+DISTRIBUTION = np.random.default_rng(0).lognormal(13, 0.4, 5000).tolist()
+
+ANALYSIS = {
+    "monte_carlo": {
+        "success_probability": 0.82,
+        "final_portfolio_distribution": DISTRIBUTION,
+        "portfolio_projections": [{"year": 0, "median": 100000.0}],
+    },
+}
+
+
+@pytest.fixture
+def offline_cache(monkeypatch):
+    service = CacheService(l1_enabled=False)
+    monkeypatch.setattr(store_module, "cache", service)
+    return service
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    service = CacheService(l1_enabled=False)
+    service.redis_client = FakeRedis()
+    service._connected = True
+    monkeypatch.setattr(store_module, "cache", service)
+    return service
+
+
+@pytest.fixture
+def result_store(monkeypatch):
+    store = AnalysisResultStore()
+    monkeypatch.setattr(chat_module, "analysis_result_store", store)
+    return store
+
+
+class TestCompaction:
+
+    def test_summary_matches_distribution(self):
+        summary = summarize_distribution(DISTRIBUTION, bins=20, sample_points=50)
+
+        assert summary["count"] == 5000
+        assert sum(summary["histogram"]["counts"]) == 5000
+        assert len(summary["histogram"]["bin_edges"]) == 21
+        assert summary["percentiles"]["p50"] == pytest.approx(np.median(DISTRIBUTION))
+        assert len(summary["sample"]) == 50
+        assert summary["sample"][0] == summary["min"]
+        assert summary["sample"][-1] == summary["max"]
+
+    def test_long_numeric_arrays_are_replaced_by_summaries(self):
+        compact, arrays = compact_analysis_results(ANALYSIS)
+
+        distribution = compact["monte_carlo"]["final_portfolio_distribution"]
+        assert distribution["path"] == "monte_carlo.final_portfolio_distribution"
+        assert distribution["summary"]["count"] == 5000
+        assert arrays == {"monte_carlo.final_portfolio_distribution": DISTRIBUTION}
+        # Scalars, short lists and lists of records pass through unchanged
+        assert compact["monte_carlo"]["success_probability"] == 0.82
+        assert compact["monte_carlo"]["portfolio_projections"] == ANALYSIS["monte_carlo"]["portfolio_projections"]
+        assert len(json.dumps(compact)) < len(json.dumps(ANALYSIS)) / 10
+
+    def test_small_results_are_untouched(self):
+        results = {"goal_analysis": {"goal1": {"monthly_savings": [500.0, 750.0]}}}
+
+        assert compact_analysis_results(results) == (results, {})
+
+
+class TestAnalysisResultStore:
+
+    async def test_round_trip_through_cache(self, redis_cache):
+        store = AnalysisResultStore()
+        arrays = {"monte_carlo.final_portfolio_distribution": DISTRIBUTION}
+
+        result_id = await store.save("thread-1", arrays)
+
+        assert await store.load("thread-1", result_id) == arrays
+        assert len(store.local) == 0
+        assert await store.load("thread-2", result_id) is None
+
+    async def test_falls_back_to_local_store_without_redis(self, offline_cache):
+        performance_metrics.reset()
+        store = AnalysisResultStore()
+
+        result_id = await store.save("thread-1", {"values": [1.0, 2.0]})
+
+        assert await store.load("thread-1", result_id) == {"values": [1.0, 2.0]}
+        assert performance_metrics.counters["analysis_results.local_fallback"] == 1
+
+
+class _EmptyResult:
+
+    def scalar_one_or_none(self):
+        return None
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class _EmptySession:
+
+    async def execute(self, statement):
+        return _EmptyResult()
+
+
+async def test_stream_sends_compact_results_with_fetchable_arrays(
+    offline_cache, result_store, monkeypatch
+):
+    performance_metrics.reset()
+
+    async def workflow(**kwargs):
+        yield {"monte_carlo": {"analysis_results": ANALYSIS}}
+
+    monkeypatch.setattr(chat_module, "run_financial_planning_workflow", workflow)
+
+    events = [
+        event async for event in chat_module.stream_langgraph_events(
+            "Will I reach my goal?", "thread-1", "user-1", _EmptySession()
+        )
+    ]
+    result_event = next(event for event in events if event.startswith("event: result"))
+    payload = json.loads(result_event.split("data: ", 1)[1])
+
+    assert len(result_event) < 10_000
+    assert payload["data"]["monte_carlo"]["final_portfolio_distribution"]["summary"]["count"] == 5000
+    assert performance_metrics.counters["sse.result.events"] == 1
+    assert performance_metrics.counters["sse.result.bytes"] == len(result_event.encode("utf-8"))
+
+    fetched = await chat_module.get_analysis_result(
+        "thread-1", payload["result_id"], path="monte_carlo.final_portfolio_distribution"
+    )
+    assert fetched["values"] == DISTRIBUTION
+
+    with pytest.raises(HTTPException) as missing:
+        await chat_module.get_analysis_result("thread-1", "unknown")
+    assert missing.value.status_code == 404
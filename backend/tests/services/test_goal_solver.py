@@ -270,3 +270,113 @@ class TestIntegration:
         # Should suggest longer timeline for ambitious goal
         if result["status"] == "success":
             assert result["required_years"] > 15
+
+
+class TestCommonRandomNumbers:
+    """Solvers backed by the real engine reuse one shock matrix per solve"""
+
+    @pytest.fixture
+    def retirement_goal(self):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            current_amount=150000,
+            target_amount=900000,
+            monthly_contribution=800,
+            years_to_goal=20,
+            expected_return_annual=0.07,
+            volatility=0.15,
+            inflation_rate=0.02,
+            current_age=45,
+            retirement_age=65,
+        )
+
+    @pytest.fixture
+    def crn_solver(self):
+        from app.services.portfolio.monte_carlo_engine import MonteCarloEngine
+
+        return GoalSolver(MonteCarloEngine(), seed=1234)
+
+    def test_mock_engines_fall_back_to_independent_draws(self, goal_solver):
+        assert goal_solver.common_random_numbers is False
+
+    def test_objective_is_monotone_in_contribution(self, crn_solver, retirement_goal):
+        shocks = crn_solver._common_shocks(retirement_goal.years_to_goal)
+        probabilities = []
+        for contribution in range(0, 6000, 500):
+            retirement_goal.monthly_contribution = contribution
+            result = crn_solver._run_simulation_sync(
+                retirement_goal, iterations=1000, shocks=shocks
+            )
+            probabilities.append(result.success_probability)
+
+        assert probabilities == sorted(probabilities)
+        assert probabilities[0] < probabilities[-1]
+
+    @pytest.mark.asyncio
+    async def test_contribution_solve_is_deterministic(self, crn_solver, retirement_goal):
+        first = await crn_solver.solve_contribution(retirement_goal, target_success_probability=0.85)
+        second = await crn_solver.solve_contribution(retirement_goal, target_success_probability=0.85)
+
+        assert first == second
+        assert first["status"] == "success"
+        assert first["converged"] is True
+        assert first["iterations"] <= 20
+        assert first["achieved_probability_raw"] >= 0.80
+
+    @pytest.mark.asyncio
+    async def test_target_amount_solve_meets_probability(self, crn_solver, retirement_goal):
+        result = await crn_solver.solve_target_amount(retirement_goal, target_success_probability=0.75)
+
+        assert result["status"] == "success"
+        assert result["converged"] is True
+        assert 450000 <= result["required_target_amount"] <= 1800000
+        assert result["achieved_probability_raw"] >= 0.70
+
+    @pytest.mark.asyncio
+    async def test_timeline_solve_uses_shared_shocks(self, crn_solver, retirement_goal):
+        first = await crn_solver.solve_timeline(
+            retirement_goal, target_success_probability=0.80, min_years=5, max_years=35
+        )
+        second = await crn_solver.solve_timeline(
+            retirement_goal, target_success_probability=0.80, min_years=5, max_years=35
+        )
+
+        assert first == second
+        assert 50 <= first["required_retirement_age"] <= 80
+
+
+class TestBatchedWithdrawalSolver:
+    """Withdrawal solver prices a grid of rates against shared shocks"""
+
+    @pytest.mark.asyncio
+    async def test_seeded_solve_is_deterministic(self, mock_monte_carlo_engine):
+        solver = GoalSolver(mock_monte_carlo_engine, seed=7)
+
+        first = await solver.solve_withdrawal_rate(
+            portfolio_value=1_000_000, years_in_retirement=30, annual_expenses=1.0,
+            target_success_probability=0.90,
+        )
+        second = await solver.solve_withdrawal_rate(
+            portfolio_value=1_000_000, years_in_retirement=30, annual_expenses=1.0,
+            target_success_probability=0.90,
+        )
+
+        assert first == second
+        assert first["status"] == "success"
+        assert 0.02 <= first["required_withdrawal_rate"] <= 0.05
+        assert abs(first["achieved_probability_raw"] - 0.90) <= 0.01
+
+    @pytest.mark.asyncio
+    async def test_expense_floor_binds_across_grid(self, mock_monte_carlo_engine):
+        """Expenses above every candidate rate make the target unreachable"""
+        solver = GoalSolver(mock_monte_carlo_engine, seed=7)
+
+        result = await solver.solve_withdrawal_rate(
+            portfolio_value=1_000_000, years_in_retirement=30, annual_expenses=150_000,
+            target_success_probability=0.90,
+        )
+
+        assert result["status"] == "no_solution"
+        assert result["required_withdrawal_rate"] == 0.01
+        assert result["annual_withdrawal_amount"] == 150_000
@@ -9,6 +9,7 @@ Tests the sensitivity analysis engine:
 
 import pytest
 from unittest.mock import Mock, AsyncMock
+from app.services.portfolio.monte_carlo_engine import MonteCarloEngine
 from app.services.portfolio.sensitivity_analyzer import SensitivityAnalyzer
 from app.models.goal import Goal
 
@@ -311,6 +312,48 @@ class TestErrorHandling:
             )
 
 
+class TestBatchedGrid:
+    """Heat maps from the real engine are evaluated in one batched pass"""
+
+    @pytest.mark.asyncio
+    async def test_two_way_grid_is_monotone(self, mock_goal):
+        """Shared shocks make the surface monotone in contribution and target"""
+        analyzer = SensitivityAnalyzer(monte_carlo_engine=MonteCarloEngine(default_iterations=500))
+
+        result = await analyzer.two_way_sensitivity(
+            goal=mock_goal,
+            variable1="monthly_contribution",
+            variable2="target_amount",
+            grid_size=6,
+        )
+
+        grid = result["probability_grid"]
+        assert len(grid) == 6 and all(len(row) == 6 for row in grid)
+        # Success rises with contribution (rows) and falls with target (columns)
+        assert all(a <= b for col in zip(*grid) for a, b in zip(col, col[1:]))
+        assert all(a >= b for row in grid for a, b in zip(row, row[1:]))
+
+    @pytest.mark.asyncio
+    async def test_engine_batch_matches_single_runs(self, mock_goal):
+        """Batched probabilities equal per-goal runs on the same shocks"""
+        engine = MonteCarloEngine(default_iterations=300)
+        shocks = engine.draw_shocks(years=20, iterations=300, seed=4)
+        goals = []
+        for contribution in (500, 1500, 3000):
+            goal = Mock(spec=Goal)
+            goal.current_amount = 100000
+            goal.target_amount = 1000000
+            goal.monthly_contribution = contribution
+            goal.years_to_goal = 20
+            goal.inflation_rate = 0.03
+            goals.append(goal)
+
+        batched = engine.success_probabilities(goals, shocks=shocks)
+        single = [engine.run_simulation(goal=g, shocks=shocks).success_probability for g in goals]
+
+        assert batched.tolist() == pytest.approx(single)
+
+
 class TestPerformance:
     """Test performance characteristics"""
 
@@ -0,0 +1,147 @@
+"""
+Unit tests for the simulation service and event-loop lag monitor
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.core.loop_monitor import LOOP_LAG_OPERATION, EventLoopLagMonitor
+from app.core.performance import PerformanceMetrics, performance_metrics
+from app.services import simulation_service as simulation_module
+from app.services.portfolio.goal_solver import GoalSolver
+from app.services.portfolio.monte_carlo_engine import MonteCarloEngine
+from app.services.simulation_service import SimulationService, run_engine_simulation
+from app.tools.monte_carlo_engine import SimulationParams, SimulationResult
+
+
+class RecordingExecutor:
+    """Runs jobs inline and records what was submitted"""
+
+    def __init__(self):
+        self.jobs = []
+
+    async def run(self, func, *args, operation=None, timeout=None, **kwargs):
+        self.jobs.append((func, args, operation))
+        return func(*args, **kwargs)
+
+
+def _params(iterations):
+    return SimulationParams(
+        initial_portfolio_value=100_000,
+        monthly_contribution=1_000,
+        time_horizon=10,
+        expected_return=0.07,
+        volatility=0.15,
+        goal_amount=250_000,
+        iterations=iterations,
+        seed=7,
+    )
+
+
+@pytest.fixture
+def executor():
+    performance_metrics.reset()
+    return RecordingExecutor()
+
+
+@pytest.fixture
+def service(executor):
+    return SimulationService(executor=executor, inline_max_path_months=120_000)
+
+
+class TestSimulationService:
+
+    async def test_small_simulations_run_inline(self, service, executor):
+        result = await service.run(_params(1_000))
+
+        assert isinstance(result, SimulationResult)
+        assert executor.jobs == []
+        assert performance_metrics.counters["simulations.inline"] == 1
+
+    async def test_large_simulations_go_to_the_pool(self, service, executor):
+        params = _params(5_000)
+        result = await service.run(params)
+
+        ((_, args, operation),) = executor.jobs
+        assert args == (params,)
+        assert operation == "monte_carlo"
+        assert result.success_probability == service.run_sync(params).success_probability
+
+    async def test_goals_cross_as_params(self, service, executor):
+        goal = SimpleNamespace(
+            current_amount=50_000, monthly_contribution=500, target_amount=200_000,
+            years_to_goal=15,
+        )
+        await service.run_goal(goal, iterations=5_000)
+
+        ((_, (params,), _),) = executor.jobs
+        assert isinstance(params, SimulationParams)
+        assert params.time_horizon == 15
+
+    async def test_compute_workers_never_nest_pools(self, service, executor, monkeypatch):
+        monkeypatch.setattr(simulation_module, "in_compute_worker", lambda: True)
+
+        await service.run(_params(5_000))
+
+        assert executor.jobs == []
+
+    async def test_engine_adapter_accepts_sync_and_async_engines(self):
+        result = Mock(success_probability=0.8)
+        async_engine = Mock(run_simulation=AsyncMock(return_value=result))
+        sync_engine = Mock(run_simulation=Mock(return_value=result))
+
+        assert await run_engine_simulation(async_engine, Mock(), 100) is result
+        assert await run_engine_simulation(sync_engine, Mock(), 100) is result
+
+        goal = SimpleNamespace(current_amount=1_000, target_amount=2_000, years_to_goal=5)
+        simulated = await run_engine_simulation(MonteCarloEngine(), goal, 500)
+        assert isinstance(simulated, SimulationResult)
+
+
+class TestGoalSolverEngines:
+
+    async def test_async_engine_runs_on_the_callers_loop(self):
+        loop = asyncio.get_running_loop()
+        loops = []
+
+        async def run_simulation(goal, iterations):
+            loops.append(asyncio.get_running_loop())
+            return Mock(success_probability=0.95)
+
+        solver = GoalSolver(Mock(run_simulation=run_simulation))
+        goal = Mock(current_amount=100_000, target_amount=1_000_000, monthly_contribution=1_000)
+
+        await solver.solve_contribution(goal, target_success_probability=0.9)
+
+        assert loops and all(running is loop for running in loops)
+
+    def test_async_engine_rejected_outside_async_entry_points(self):
+        solver = GoalSolver(Mock(run_simulation=AsyncMock()))
+
+        with pytest.raises(TypeError):
+            solver._run_simulation_sync(Mock(), iterations=10)
+
+
+class TestEventLoopLagMonitor:
+
+    async def test_blocking_work_shows_up_as_lag(self):
+        metrics = PerformanceMetrics()
+        monitor = EventLoopLagMonitor(interval=0.01, metrics=metrics)
+        monitor.start()
+        await asyncio.sleep(0.02)
+
+        time.sleep(0.1)  # Hold the loop the way inline CPU work would
+        await asyncio.sleep(0.02)
+        await monitor.stop()
+
+        assert metrics.get_stats(LOOP_LAG_OPERATION)["max"] >= 0.05
+
+    async def test_zero_interval_disables_probe(self):
+        monitor = EventLoopLagMonitor(interval=0)
+        monitor.start()
+
+        assert monitor._task is None
@@ -83,7 +83,7 @@ class TestPlaidSyncService:
             last_successful_sync=None
         )
 
-        assert service._needs_sync(item) == True
+        assert service.needs_sync(item) == True
 
     def test_should_sync_item_old_sync(self):
         """Test that items with old sync should be synced"""
@@ -104,7 +104,7 @@ class TestPlaidSyncService:
             last_successful_sync=old_sync_time
         )
 
-        assert service._needs_sync(item) == True
+        assert service.needs_sync(item) == True
 
     def test_should_not_sync_recent_item(self):
         """Test that recently synced items should not be synced"""
@@ -125,7 +125,7 @@ class TestPlaidSyncService:
             last_successful_sync=recent_sync_time
         )
 
-        assert service._needs_sync(item) == False
+        assert service.needs_sync(item) == False
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,216 @@
+"""
+Unit tests for agent checkpointers and the shared compiled graph
+"""
+
+import asyncio
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.agents import checkpointer as checkpointer_module
+from app.agents import graph as graph_module
+from app.agents.checkpointer import (
+    BoundedMemorySaver,
+    DatabaseCheckpointSaver,
+    create_checkpointer,
+)
+from app.agents.state import create_initial_state
+from app.core.performance import performance_metrics
+from app.models.agent_checkpoint import AgentCheckpoint, AgentCheckpointWrite
+from app.models.base import Base
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'checkpoints.db'}")
+    tables = [AgentCheckpoint.__table__, AgentCheckpointWrite.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=tables)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def shared_graph(monkeypatch):
+    """Isolate the process-wide graph from other tests"""
+    monkeypatch.setattr(graph_module, "_financial_planning_graph", None)
+    performance_metrics.reset()
+
+
+async def _run_turn(graph, thread_id, query):
+    state = create_initial_state(thread_id=thread_id, user_id="user-1", user_query=query)
+    config = {"configurable": {"thread_id": thread_id}}
+    return await graph.ainvoke(state, config=config)
+
+
+class TestDatabaseCheckpointSaver:
+
+    async def test_conversation_state_persists_across_turns(self, session_factory):
+        saver = DatabaseCheckpointSaver(session_factory)
+        await saver.setup()
+        graph = graph_module.create_financial_planning_graph(checkpointer=saver)
+
+        first = await _run_turn(graph, "thread-1", "Help me plan for retirement")
+        second = await _run_turn(graph, "thread-1", "What about my risk tolerance?")
+
+        assert len(second["messages"]) > len(first["messages"])
+
+        # A fresh saver on the same database sees the stored conversation
+        reloaded = DatabaseCheckpointSaver(session_factory)
+        config = {"configurable": {"thread_id": "thread-1"}}
+        latest = await reloaded.aget_tuple(config)
+        assert latest.checkpoint["channel_values"]["messages"] == second["messages"]
+
+        history = [item async for item in reloaded.alist(config)]
+        assert history[0].checkpoint["id"] == latest.checkpoint["id"]
+        assert len([item async for item in reloaded.alist(config, limit=2)]) == 2
+
+    async def test_threads_are_isolated_and_deletable(self, session_factory):
+        saver = DatabaseCheckpointSaver(session_factory)
+        await saver.setup()
+        graph = graph_module.create_financial_planning_graph(checkpointer=saver)
+
+        await _run_turn(graph, "thread-a", "Help me plan for retirement")
+        await _run_turn(graph, "thread-b", "Help me save for college")
+        await saver.adelete_thread("thread-a")
+
+        assert await saver.aget_tuple({"configurable": {"thread_id": "thread-a"}}) is None
+        assert await saver.aget_tuple({"configurable": {"thread_id": "thread-b"}}) is not None
+
+    async def test_old_checkpoints_and_writes_are_pruned(self, session_factory):
+        performance_metrics.reset()
+        saver = DatabaseCheckpointSaver(session_factory, max_checkpoints=3)
+        await saver.setup()
+
+        other = await saver.aput({"configurable": {"thread_id": "thread-2"}}, empty_checkpoint(), {}, {})
+        config = {"configurable": {"thread_id": "thread-1"}}
+        for _ in range(5):
+            config = await saver.aput(config, empty_checkpoint(), {}, {})
+            await saver.aput_writes(config, [("messages", "hello")], task_id="task-1")
+
+        kept = [item.checkpoint["id"] async for item in saver.alist({"configurable": {"thread_id": "thread-1"}})]
+        assert len(kept) == 3
+        assert kept[0] == config["configurable"]["checkpoint_id"]
+        assert await saver.aget_tuple(other) is not None
+        assert performance_metrics.counters["agents.checkpoints.pruned"] == 2
+
+        async with session_factory() as session:
+            written_to = (await session.execute(
+                select(AgentCheckpointWrite.checkpoint_id)
+                .where(AgentCheckpointWrite.thread_id == "thread-1")
+            )).scalars().all()
+        assert sorted(written_to) == sorted(kept)
+
+    async def test_setup_requires_migrated_tables(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}")
+        saver = DatabaseCheckpointSaver(async_sessionmaker(engine))
+
+        with pytest.raises(OperationalError):
+            await saver.setup()
+        await engine.dispose()
+
+    async def test_sync_interface_runs_on_saver_loop(self, session_factory):
+        saver = DatabaseCheckpointSaver(session_factory)
+        await saver.setup()
+        graph = graph_module.create_financial_planning_graph(checkpointer=saver)
+        final = await _run_turn(graph, "thread-1", "Help me plan for retirement")
+        config = {"configurable": {"thread_id": "thread-1"}}
+
+        snapshot = await asyncio.to_thread(graph.get_state, config)
+        history = await asyncio.to_thread(lambda: list(saver.list(config, limit=2)))
+
+        assert snapshot.values["messages"] == final["messages"]
+        assert len(history) == 2
+
+    async def test_sync_call_on_event_loop_is_rejected(self, session_factory):
+        saver = DatabaseCheckpointSaver(session_factory)
+
+        with pytest.raises(asyncio.InvalidStateError):
+            saver.get_tuple({"configurable": {"thread_id": "thread-1"}})
+
+
+class TestBoundedMemorySaver:
+
+    async def test_least_recently_used_thread_is_evicted(self):
+        performance_metrics.reset()
+        saver = BoundedMemorySaver(max_threads=2)
+        graph = graph_module.create_financial_planning_graph(checkpointer=saver)
+
+        await _run_turn(graph, "thread-1", "Help me plan for retirement")
+        await _run_turn(graph, "thread-2", "Help me plan for retirement")
+        await _run_turn(graph, "thread-1", "And my taxes?")
+        await _run_turn(graph, "thread-3", "Help me plan for retirement")
+
+        assert set(saver.storage) == {"thread-1", "thread-3"}
+        assert performance_metrics.counters["agents.checkpoints.evictions"] == 1
+
+    def test_read_miss_does_not_allocate(self):
+        saver = BoundedMemorySaver(max_threads=2)
+
+        assert saver.get_tuple({"configurable": {"thread_id": "missing"}}) is None
+        assert "missing" not in saver.storage
+
+
+class TestCreateCheckpointer:
+
+    async def test_database_failure_falls_back_to_memory(self, monkeypatch):
+        performance_metrics.reset()
+
+        async def fail(self):
+            raise OSError("database unavailable")
+
+        monkeypatch.setattr(DatabaseCheckpointSaver, "setup", fail)
+        saver = await create_checkpointer("database")
+
+        assert isinstance(saver, BoundedMemorySaver)
+        assert performance_metrics.counters["agents.checkpoints.fallback"] == 1
+
+    async def test_memory_backend_uses_configured_bound(self, monkeypatch):
+        monkeypatch.setattr(checkpointer_module.settings, "AGENT_CHECKPOINT_MEMORY_MAX_THREADS", 7)
+
+        saver = await create_checkpointer("memory")
+
+        assert saver.max_threads == 7
+
+    async def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            await create_checkpointer("redis")
+
+
+class TestSharedGraph:
+
+    async def test_graph_is_compiled_once(self, shared_graph, session_factory):
+        saver = DatabaseCheckpointSaver(session_factory)
+        await saver.setup()
+        graph = await graph_module.init_financial_planning_graph(saver)
+
+        events = [
+            event
+            async for event in graph_module.run_financial_planning_workflow(
+                "Help me plan for retirement", "thread-1", "user-1", stream=False
+            )
+        ]
+
+        assert graph_module.get_financial_planning_graph() is graph
+        assert graph.checkpointer is saver
+        assert events[0]["final_response"]
+        assert performance_metrics.get_stats("agents.graph_build")["count"] == 1
+        assert performance_metrics.get_stats("agents.workflow_turn")["count"] == 1
+
+    def test_lazy_build_uses_memory_checkpointer(self, shared_graph):
+        graph = graph_module.get_financial_planning_graph()
+
+        assert isinstance(graph.checkpointer, BoundedMemorySaver)
+        assert graph_module.get_financial_planning_graph() is graph
+        assert performance_metrics.get_stats("agents.graph_build")["count"] == 1
+
+    def test_stats_do_not_build_graph(self, shared_graph):
+        assert graph_module.graph_stats()["checkpointer"] is None
+        assert graph_module._financial_planning_graph is None
+
+        graph_module.get_financial_planning_graph()
+
+        assert graph_module.graph_stats()["checkpointer"] == "BoundedMemorySaver"
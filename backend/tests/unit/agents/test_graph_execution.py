@@ -0,0 +1,198 @@
+"""
+Unit tests for parallel (fan-out/fan-in) agent graph execution
+"""
+
+import asyncio
+import json
+from graphlib import CycleError
+
+import pytest
+
+from app.agents import advanced_portfolio_agent, nodes
+from app.agents import graph as graph_module
+from app.agents import state as state_module
+from app.agents.state import (
+    append_messages,
+    create_initial_state,
+    merge_agent_ids,
+    merge_agent_responses,
+    merge_errors,
+    merge_results,
+)
+from app.api.chat import stream_langgraph_events
+from app.core.llm import _StubResponse
+
+
+class SlowChatModel:
+    """Chat model that takes a fixed time and records call overlap"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return _StubResponse(content="Stubbed response generated locally.")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    model = SlowChatModel()
+    monkeypatch.setattr(nodes, "llm", model)
+    monkeypatch.setattr(advanced_portfolio_agent, "llm", model)
+    return model
+
+
+async def _run_turn(graph, thread_id="thread-1", query="Help me plan for retirement"):
+    state = create_initial_state(thread_id=thread_id, user_id="user-1", user_query=query)
+    config = {"configurable": {"thread_id": thread_id}}
+    return [event async for event in graph.astream(state, config=config)]
+
+
+class TestSpecialistDependencies:
+
+    def test_dependencies_follow_state_reads_and_writes(self):
+        dependencies = graph_module.specialist_dependencies()
+
+        assert dependencies["goal_planner"] == set()
+        assert dependencies["portfolio_architect"] == set()
+        assert dependencies["monte_carlo"] == {"portfolio_architect"}
+        assert dependencies["advanced_portfolio"] == {"portfolio_architect"}
+
+    def test_cyclic_dependencies_rejected(self):
+        access = {
+            "a": {"reads": {"x"}, "writes": {"y"}},
+            "b": {"reads": {"y"}, "writes": {"x"}},
+        }
+
+        with pytest.raises(CycleError):
+            graph_module.specialist_dependencies(access)
+
+
+class TestParallelExecution:
+
+    async def test_independent_specialists_run_concurrently(self, llm):
+        graph = graph_module.create_financial_planning_graph(execution_mode="parallel")
+
+        events = await _run_turn(graph)
+        order = [node for event in events for node in event]
+
+        # goal_planner and portfolio_architect overlap their LLM calls
+        assert llm.max_running == 2
+        assert order[0] == "orchestrator"
+        assert order[-1] == "visualization"
+        assert order.count("visualization") == 1
+        assert order.index("monte_carlo") > order.index("portfolio_architect")
+
+    async def test_branch_results_are_merged_for_visualization(self, llm):
+        graph = graph_module.create_financial_planning_graph(execution_mode="parallel")
+
+        await _run_turn(graph)
+        state = (await graph.aget_state({"configurable": {"thread_id": "thread-1"}})).values
+
+        assert set(state["analysis_results"]) == {"goal_analysis", "portfolio_optimization"}
+        assert state["completed_agents"] == [
+            "orchestrator", "goal_planner", "portfolio_architect",
+            "monte_carlo_simulator", "visualization",
+        ]
+        assert state["workflow_status"] == "complete"
+
+    async def test_inactive_specialists_are_skipped(self, llm):
+        graph = graph_module.create_financial_planning_graph(execution_mode="parallel")
+
+        events = await _run_turn(graph)
+
+        # The orchestrator's default plan does not include advanced_portfolio
+        assert {"advanced_portfolio": None} in events
+        # orchestrator, goal_planner, portfolio_architect, visualization
+        assert llm.calls == 4
+
+    async def test_new_turn_resets_per_turn_fields(self, llm):
+        graph = graph_module.create_financial_planning_graph(execution_mode="parallel")
+
+        await _run_turn(graph)
+        await _run_turn(graph, query="What about taxes?")
+        state = (await graph.aget_state({"configurable": {"thread_id": "thread-1"}})).values
+
+        assert state["completed_agents"].count("orchestrator") == 1
+        assert state["error"] == "Insufficient data for simulation"
+        assert len([m for m in state["messages"] if m["role"] == "user"]) == 2
+        assert [r["agent_id"] for r in state["agent_responses"]].count("orchestrator") == 1
+
+    async def test_sequential_mode_runs_one_specialist_at_a_time(self, llm):
+        graph = graph_module.create_financial_planning_graph(execution_mode="sequential")
+
+        events = await _run_turn(graph)
+
+        assert llm.max_running == 1
+        assert [node for event in events for node in event] == [
+            "orchestrator", "goal_planner", "portfolio_architect", "monte_carlo", "visualization",
+        ]
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            graph_module.create_financial_planning_graph(execution_mode="distributed")
+
+
+class TestReducers:
+
+    def test_empty_update_starts_a_new_turn(self):
+        assert merge_results({"a": 1}, {"b": 2}) == {"a": 1, "b": 2}
+        assert merge_results({"a": 1}, {}) == {}
+        assert merge_agent_ids(["a", "b"], ["b", "c"]) == ["a", "b", "c"]
+        assert merge_agent_ids(["a"], []) == []
+        assert merge_errors("first", "second") == "first; second"
+        assert merge_errors("first", None) is None
+        assert merge_agent_responses([{"agent_id": "a"}], [{"agent_id": "b"}]) == [
+            {"agent_id": "a"}, {"agent_id": "b"},
+        ]
+        assert merge_agent_responses([{"agent_id": "a"}], []) == []
+
+    def test_message_history_is_capped(self, monkeypatch):
+        monkeypatch.setattr(state_module.settings, "AGENT_MAX_HISTORY_MESSAGES", 3)
+
+        assert append_messages([1, 2], [3]) == [1, 2, 3]
+        assert append_messages([1, 2, 3], [4, 5]) == [3, 4, 5]
+
+
+class _EmptyResult:
+
+    def scalar_one_or_none(self):
+        return None
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class _EmptySession:
+
+    async def execute(self, statement):
+        return _EmptyResult()
+
+
+async def test_sse_stream_reports_each_branch(llm, monkeypatch):
+    graph = graph_module.create_financial_planning_graph(execution_mode="parallel")
+    monkeypatch.setattr(graph_module, "_financial_planning_graph", graph)
+
+    events = [
+        event async for event in stream_langgraph_events(
+            "Help me plan for retirement", "thread-1", "user-1", _EmptySession()
+        )
+    ]
+    progress = [
+        json.loads(event.split("data: ", 1)[1])["agent_id"]
+        for event in events if event.startswith("event: agent_progress")
+    ]
+
+    assert progress[0] == "orchestrator"
+    assert sorted(progress[1:]) == ["goal_planner", "portfolio_architect"]
+    assert events[-1].startswith("event: done")
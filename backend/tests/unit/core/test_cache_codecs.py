@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.core import cache_codecs
+from app.core.cache import CacheService
+from app.core.cache_codecs import (
+    CodecError,
+    CodecPolicy,
+    decode_value,
+    encode_value,
+    policy_for_key,
+)
+from app.core.performance import performance_metrics
+from tests.utils.fake_redis import FakeRedis
+
+
+DISTRIBUTION = {
+    "success_probability": 0.83,
+    "percentiles": {"10": 412000.5, "50": 980000.25, "90": 1650000.0},
+    "final_values": np.random.default_rng(0).lognormal(13, 0.4, 5000).round(2).tolist(),
+}
+
+
+@pytest.fixture
+def cache_service():
+    service = CacheService(l1_enabled=False)
+    service.redis_client = FakeRedis()
+    service._connected = True
+    return service
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zstd", "lz4"])
+def test_round_trip_for_every_policy(codec, compression):
+    encoded = encode_value(DISTRIBUTION, CodecPolicy(codec, compression))
+
+    assert encoded.data[:1] == cache_codecs.MAGIC
+    assert decode_value(encoded.data) == DISTRIBUTION
+
+
+def test_legacy_json_entries_still_decode():
+    legacy = json.dumps(DISTRIBUTION)
+
+    assert decode_value(legacy) == DISTRIBUTION
+    assert decode_value(legacy.encode("utf-8")) == DISTRIBUTION
+
+
+def test_msgpack_embeds_numpy_arrays_as_raw_buffers():
+    values = np.random.default_rng(1).standard_normal((50, 12))
+    encoded = encode_value(
+        {"paths": values, "mean": np.float64(1.5)}, CodecPolicy("msgpack", "none")
+    )
+
+    decoded = decode_value(encoded.data)
+
+    np.testing.assert_array_equal(decoded["paths"], values)
+    assert decoded["paths"].dtype == values.dtype
+    assert decoded["mean"] == 1.5
+    # Raw float64 buffer plus a short header, not a list of decimal strings
+    assert encoded.encoded_bytes < values.nbytes + 100
+
+
+def test_numpy_codec_round_trips_single_arrays():
+    values = np.arange(24, dtype=np.int32).reshape(2, 3, 4)
+
+    decoded = decode_value(encode_value(values, CodecPolicy("numpy", "zstd")).data)
+
+    np.testing.assert_array_equal(decoded, values)
+    with pytest.raises(CodecError):
+        encode_value([1, 2, 3], CodecPolicy("numpy", "none"))
+
+
+def test_small_payloads_are_not_compressed():
+    encoded = encode_value({"ok": True}, CodecPolicy("msgpack", "zstd"))
+
+    assert encoded.data[2:3] == b"0"
+    assert decode_value(encoded.data) == {"ok": True}
+
+
+def test_policy_is_selected_by_key_namespace():
+    assert policy_for_key("simulation:abc") == CodecPolicy("msgpack", "zstd")
+    assert policy_for_key("user:42") == CodecPolicy("json", "none")
+    overrides = {"user": CodecPolicy("msgpack", "lz4")}
+    assert policy_for_key("user:42", overrides) == CodecPolicy("msgpack", "lz4")
+
+
+async def test_cache_service_encodes_per_namespace_and_reports_sizes(cache_service):
+    performance_metrics.reset()
+    cache_service.register_namespace("user", codec="json")
+
+    await cache_service.set("simulation:run-1", DISTRIBUTION, expire=60)
+    await cache_service.set("user:42", {"name": "Ada"})
+
+    assert await cache_service.get("simulation:run-1") == DISTRIBUTION
+    assert await cache_service.get("user:42") == {"name": "Ada"}
+    assert cache_service.redis_client.store["simulation:run-1"][1:3] == b"mz"
+
+    stats = cache_service.codec_stats()
+    assert stats["simulation"]["codec"] == "msgpack"
+    assert stats["simulation"]["writes"] == 1
+    assert stats["simulation"]["compression_ratio"] > 1.0
+    assert stats["simulation"]["stored_bytes"] < len(json.dumps(DISTRIBUTION)) / 2
+    assert stats["user"]["compression_ratio"] < 1.0  # header only, no compression
+
+
+async def test_unavailable_compression_falls_back_to_none(cache_service, monkeypatch):
+    monkeypatch.delitem(cache_codecs.COMPRESSORS, "zstd")
+
+    cache_service.register_namespace("report", codec="json", compression="zstd")
+    await cache_service.set("report:1", DISTRIBUTION)
+
+    assert cache_service._policies["report"] == CodecPolicy("json", "none")
+    assert await cache_service.get("report:1") == DISTRIBUTION
@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import CacheService
+from app.core.local_cache import LocalCache
+from app.core.performance import performance_metrics
+from tests.utils.fake_redis import FakeRedis, FakeRedisServer
+
+
+@pytest.fixture
+def server():
+    return FakeRedisServer()
+
+
+@pytest.fixture
+async def connect(server, monkeypatch):
+    """Connect CacheService instances (one per simulated worker) to the fake server"""
+    async def from_url(*args, **kwargs):
+        return FakeRedis(server)
+
+    monkeypatch.setattr(cache_module.redis, "from_url", from_url)
+    services = []
+
+    async def _connect(**kwargs):
+        service = CacheService(l1_enabled=True, **kwargs)
+        await service.connect()
+        services.append(service)
+        return service
+
+    yield _connect
+    for service in services:
+        await service.disconnect()
+
+
+async def _drain():
+    """Let the invalidation listeners process published messages"""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestLocalCache:
+
+    def test_evicts_least_recently_used(self):
+        local = LocalCache(max_entries=2)
+        local.set("a", b"1")
+        local.set("b", b"2")
+        local.get("a")
+        local.set("c", b"3")
+
+        assert local.get("b") is None
+        assert local.get("a") == b"1"
+        assert local.get("c") == b"3"
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        local = LocalCache(default_ttl=60)
+        local.set("short", b"x", ttl=5)
+        local.set("capped", b"y", ttl=3600)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+        assert local.get("short") is None
+        assert local.get("capped") == b"y"
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        assert local.get("capped") is None
+
+    def test_delete_pattern_uses_redis_glob(self):
+        local = LocalCache()
+        for key in ("portfolio:user:1:a", "portfolio:user:1:b", "portfolio:user:2:a"):
+            local.set(key, b"v")
+
+        assert local.delete_pattern("portfolio:user:1:*") == 2
+        assert len(local) == 1
+
+
+class TestTwoTierCache:
+
+    async def test_l1_hit_skips_redis(self, connect, server):
+        performance_metrics.reset()
+        service = await connect()
+        await service.set("market:symbol:VTI", {"price": 271.5}, expire=60)
+
+        commands = server.commands
+        for _ in range(5):
+            assert await service.get("market:symbol:VTI") == {"price": 271.5}
+
+        assert server.commands == commands
+        assert performance_metrics.counters["cache.l1.hits"] == 5
+        assert service.tier_stats()["l1"]["hit_rate"] == 1.0
+
+    async def test_l2_hit_fills_l1(self, connect, server):
+        performance_metrics.reset()
+        writer = await connect()
+        reader = await connect()
+        await writer.set("goal:1", {"target": 100}, expire=30)
+        await _drain()
+
+        assert await reader.get("goal:1") == {"target": 100}
+        assert await reader.get("goal:1") == {"target": 100}
+
+        stats = reader.tier_stats()
+        assert stats["l2"]["hits"] == 1
+        assert stats["l1"]["hits"] == 1
+        assert reader.local._entries["goal:1"][0] <= time.monotonic() + 30
+
+    async def test_returned_values_cannot_corrupt_l1(self, connect):
+        service = await connect()
+        await service.set("user:1", {"name": "Ada", "tags": []})
+
+        (await service.get("user:1"))["tags"].append("mutated")
+
+        assert await service.get("user:1") == {"name": "Ada", "tags": []}
+
+    async def test_writes_and_deletes_invalidate_other_workers(self, connect):
+        worker_a = await connect()
+        worker_b = await connect()
+        await worker_a.set("portfolio:user:7:summary", {"value": 1})
+        await worker_a.set("portfolio:user:7:risk", {"value": 2})
+        await _drain()
+        assert await worker_b.get("portfolio:user:7:summary") == {"value": 1}
+        assert await worker_b.get("portfolio:user:7:risk") == {"value": 2}
+
+        await worker_a.set("portfolio:user:7:summary", {"value": 3})
+        await _drain()
+        assert await worker_b.get("portfolio:user:7:summary") == {"value": 3}
+
+        await worker_a.delete("portfolio:user:7:summary")
+        await _drain()
+        assert await worker_b.get("portfolio:user:7:summary") is None
+
+        await worker_a.delete_pattern("portfolio:user:7:*")
+        await _drain()
+        assert await worker_b.get("portfolio:user:7:risk") is None
+        assert performance_metrics.counters["cache.invalidations.received"] >= 3
+
+    async def test_large_values_bypass_l1(self, connect, monkeypatch):
+        monkeypatch.setattr(cache_module.settings, "CACHE_L1_MAX_ENTRY_BYTES", 64)
+        service = await connect()
+
+        await service.set("analysis:big", {"values": list(range(200))})
+
+        assert "analysis:big" not in service.local._entries
+        assert await service.get("analysis:big") == {"values": list(range(200))}
+        assert "analysis:big" not in service.local._entries
+
+    async def test_disabled_l1_goes_straight_to_redis(self, server):
+        service = CacheService(l1_enabled=False)
+        service.redis_client = FakeRedis(server)
+        service._connected = True
+
+        await service.set("user:1", {"a": 1})
+        commands = server.commands
+        assert await service.get("user:1") == {"a": 1}
+
+        assert server.commands == commands + 1
+        assert service.tier_stats()["l1"]["enabled"] is False
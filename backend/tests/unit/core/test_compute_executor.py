@@ -0,0 +1,135 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.core.compute import (
+    ComputeExecutor,
+    ComputeQueueFullError,
+    ComputeTimeoutError,
+)
+from app.core.performance import performance_metrics
+
+
+def _square(x):
+    return x * x
+
+
+async def _async_double(x):
+    return 2 * x
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+def _die():
+    os._exit(1)
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=1, max_queue_depth=1, default_timeout=30.0)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+async def _wait_until(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+async def test_runs_sync_and_coroutine_functions(executor):
+    assert await executor.run(_square, 7) == 49
+    assert await executor.run(_async_double, x=21) == 42
+    assert executor.stats()["running"] == 0
+
+
+async def test_worker_exceptions_propagate(executor):
+    performance_metrics.reset()
+
+    with pytest.raises(ValueError, match="boom"):
+        await executor.run(_boom)
+
+    assert performance_metrics.counters["compute.failed"] == 1
+    assert executor.stats()["running"] == 0
+
+
+async def test_full_queue_rejects_new_jobs(executor):
+    running = asyncio.create_task(executor.run(_sleep, 0.5))
+    await _wait_until(lambda: executor.stats()["running"] == 1)
+    queued = asyncio.create_task(executor.run(_square, 3))
+    await _wait_until(lambda: executor.queue_depth == 1)
+
+    with pytest.raises(ComputeQueueFullError):
+        await executor.run(_square, 4)
+
+    assert await running == 0.5
+    assert await queued == 9
+    assert executor.stats() == {
+        "max_workers": 1,
+        "max_queue_depth": 1,
+        "running": 0,
+        "queued": 0,
+        "started": True,
+    }
+
+
+async def test_timeout_drops_queued_job_and_keeps_slot_until_worker_finishes(executor):
+    performance_metrics.reset()
+    running = asyncio.create_task(executor.run(_sleep, 0.5, timeout=0.1))
+    await _wait_until(lambda: executor.stats()["running"] == 1)
+
+    with pytest.raises(ComputeTimeoutError):
+        await executor.run(_square, 5, timeout=0.05)
+    assert executor.queue_depth == 0
+
+    with pytest.raises(ComputeTimeoutError):
+        await running
+    # The abandoned job still occupies the worker until it returns
+    assert executor.stats()["running"] == 1
+    await _wait_until(lambda: executor.stats()["running"] == 0)
+
+    assert performance_metrics.counters["compute.timeouts"] == 2
+    assert await executor.run(_square, 6) == 36
+
+
+async def test_cancelling_request_removes_queued_job(executor):
+    running = asyncio.create_task(executor.run(_sleep, 0.3))
+    await _wait_until(lambda: executor.stats()["running"] == 1)
+    queued = asyncio.create_task(executor.run(_square, 2))
+    await _wait_until(lambda: executor.queue_depth == 1)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    assert executor.queue_depth == 0
+    assert await running == 0.3
+    await _wait_until(lambda: executor.stats()["running"] == 0)
+
+
+async def test_broken_pool_handler_leaves_replacement_pool_running(executor):
+    executor.start()
+    broken = executor._pool
+    with pytest.raises(BrokenProcessPool):
+        await executor.run(_die)
+
+    healthy = asyncio.create_task(executor.run(_sleep, 0.3))
+    await _wait_until(lambda: executor._pool not in (None, broken))
+
+    # Another job of the dead pool reaching its BrokenProcessPool handler
+    # only now must not shut down the pool the new job runs on
+    executor._discard_pool(broken)
+
+    assert await healthy == 0.3
+    assert executor.stats()["started"]
@@ -0,0 +1,105 @@
+"""
+Unit tests for the OpenMetrics scrape output
+"""
+
+import re
+
+import pytest
+
+from app.core.metrics_exposition import (
+    DEFAULT_BUCKETS,
+    histogram_buckets,
+    render_openmetrics,
+)
+from app.core.performance import PerformanceMetrics, PerformanceWarnings
+
+
+SAMPLE_LINE = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)(\{[^}]*\})? (\S+)$')
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = SAMPLE_LINE.match(line)
+        assert match, f"Malformed sample line: {line}"
+        samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+@pytest.fixture
+def metrics():
+    metrics = PerformanceMetrics()
+    for duration in (0.1, 0.5, 1.0, 4.0, 9.0):
+        metrics.record_timing("compute.portfolio_optimization", duration)
+    metrics.record_timing("agents.workflow_turn", 0.2)
+    metrics.record_value("compute.queue_depth", 0)
+    metrics.record_value("compute.queue_depth", 3)
+    metrics.increment_counter("cache.l1.hits", 3)
+    metrics.increment_counter("cache.l1.misses", 1)
+    metrics.increment_counter("compute.submitted", 7)
+    return metrics
+
+
+class TestThresholdBuckets:
+
+    def test_threshold_matches_namespaced_operations(self):
+        assert PerformanceWarnings.threshold_for("monte_carlo") == 30.0
+        assert PerformanceWarnings.threshold_for("compute.monte_carlo_stress") == 30.0
+        assert PerformanceWarnings.threshold_for("portfolio_optimization_cached") == 5.0
+        assert PerformanceWarnings.threshold_for("cache_operation.get") == 0.1
+        assert PerformanceWarnings.threshold_for("agents.workflow_turn") is None
+
+    def test_buckets_scale_with_threshold(self):
+        buckets = histogram_buckets("database_query")
+
+        assert 0.5 in buckets
+        assert buckets == tuple(sorted(buckets))
+        assert histogram_buckets("agents.workflow_turn") == DEFAULT_BUCKETS
+
+
+class TestRenderOpenMetrics:
+
+    def test_histogram_buckets_are_cumulative(self, metrics):
+        samples = _samples(render_openmetrics(metrics))
+        name = "wealthnavigator_operation_duration_seconds"
+        labels = 'operation="compute.portfolio_optimization"'
+
+        assert samples[f'{name}_bucket{{{labels},le="0.5"}}'] == 2
+        assert samples[f'{name}_bucket{{{labels},le="5.0"}}'] == 4
+        assert samples[f'{name}_bucket{{{labels},le="+Inf"}}'] == 5
+        assert samples[f'{name}_count{{{labels}}}'] == 5
+        assert samples[f'{name}_sum{{{labels}}}'] == pytest.approx(14.6)
+
+    def test_queue_depth_is_not_a_duration(self, metrics):
+        text = render_openmetrics(metrics)
+        samples = _samples(text)
+
+        assert 'operation="compute.queue_depth"' not in text
+        assert samples['wealthnavigator_compute_queue_depth_at_submit_bucket{le="2.0"}'] == 1
+        assert samples['wealthnavigator_compute_queue_depth_at_submit_count'] == 2
+
+    def test_counters_ratios_and_gauges(self, metrics):
+        text = render_openmetrics(
+            metrics,
+            executor_stats={"running": 2, "queued": 1, "started": True},
+            pool_stats={"checked_out": 4},
+            worker_id="w1",
+        )
+        samples = _samples(text)
+
+        assert samples["wealthnavigator_compute_submitted_total"] == 7
+        assert samples['wealthnavigator_cache_hit_ratio{cache="cache.l1"}'] == 0.75
+        assert samples['wealthnavigator_compute_executor_queued{worker="w1"}'] == 1
+        assert samples['wealthnavigator_db_pool_checked_out{worker="w1"}'] == 4
+        assert samples['wealthnavigator_operation_threshold_seconds{operation="monte_carlo"}'] == 30.0
+        assert "# TYPE wealthnavigator_compute_submitted counter" in text
+        assert "started" not in text
+        assert text.endswith("# EOF\n")
+
+    def test_empty_families_are_omitted(self):
+        text = render_openmetrics(PerformanceMetrics())
+
+        assert "operation_duration_seconds" not in text
+        assert "compute_queue_depth_at_submit" not in text
@@ -0,0 +1,167 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.core.cache import CacheService
+from app.core.latency_histogram import LatencyHistogram
+from app.core.metrics_aggregation import MetricsPublisher
+from app.core.performance import PerformanceMetrics, get_performance_report
+from tests.utils.fake_redis import FakeRedis, FakeRedisServer
+
+
+SAMPLES = np.random.default_rng(0).lognormal(-3, 1.5, 100_000)
+
+
+def _recorded(values, accuracy=0.01):
+    histogram = LatencyHistogram(accuracy)
+    for value in values:
+        histogram.record(float(value))
+    return histogram
+
+
+class TestLatencyHistogram:
+
+    def test_quantiles_within_relative_accuracy(self):
+        histogram = _recorded(SAMPLES)
+        ordered = np.sort(SAMPLES)
+
+        qs = (0.5, 0.9, 0.95, 0.99, 0.999)
+        for q, value in zip(qs, histogram.quantiles(qs)):
+            exact = ordered[int(q * len(ordered))]
+            assert value == pytest.approx(exact, rel=0.01)
+
+        assert histogram.count == len(SAMPLES)
+        assert histogram.mean == pytest.approx(SAMPLES.mean())
+        assert histogram.quantile(0.0) == SAMPLES.min()
+        assert histogram.quantile(1.0) == SAMPLES.max()
+
+    def test_memory_is_bounded_by_value_range(self):
+        histogram = _recorded(SAMPLES)
+
+        # Range spans ~1e-5s..10s; bucket count is independent of sample count
+        assert len(histogram.buckets) < 1000
+        histogram.record(0.05)
+        assert len(histogram.buckets) < 1000
+
+    def test_zero_durations(self):
+        histogram = _recorded([0.0, 0.0, 0.0, 1.0])
+
+        assert histogram.quantile(0.5) == 0.0
+        assert histogram.quantile(0.99) == 1.0
+
+    def test_merge_matches_single_histogram(self):
+        first, second = SAMPLES[:40_000], SAMPLES[40_000:]
+        merged = _recorded(first)
+        merged.merge(_recorded(second))
+        combined = _recorded(SAMPLES)
+
+        assert merged.buckets == combined.buckets
+        assert merged.count == combined.count
+        assert merged.min == combined.min and merged.max == combined.max
+        with pytest.raises(ValueError):
+            merged.merge(LatencyHistogram(0.05))
+
+    def test_serialization_round_trip(self):
+        histogram = _recorded(SAMPLES[:1000])
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+
+        assert restored.quantiles((0.5, 0.99)) == histogram.quantiles((0.5, 0.99))
+        assert LatencyHistogram.from_dict(LatencyHistogram().to_dict()).quantile(0.5) is None
+
+
+class TestPerformanceMetrics:
+
+    def test_stats_shape_is_unchanged(self):
+        metrics = PerformanceMetrics()
+        for value in (0.1, 0.2, 0.3, 2.0):
+            metrics.record_timing("monte_carlo", value)
+
+        stats = metrics.get_stats("monte_carlo")
+
+        assert set(stats) == {"count", "mean", "min", "max", "p50", "p95", "p99"}
+        assert stats["count"] == 4
+        assert stats["p50"] == pytest.approx(0.3, rel=0.01)
+        assert stats["max"] == stats["p99"] == 2.0
+        assert metrics.get_stats("unknown") is None
+        assert get_performance_report(metrics)["slow_operations"][0]["operation"] == "monte_carlo"
+
+    def test_snapshot_merge_adds_timings_and_counters(self):
+        worker_a, worker_b = PerformanceMetrics(), PerformanceMetrics()
+        worker_a.record_timing("api_request", 0.1)
+        worker_b.record_timing("api_request", 0.3)
+        worker_a.increment_counter("cache.l1.hits", 2)
+        worker_b.increment_counter("cache.l1.hits", 3)
+
+        worker_b.record_value("compute.queue_depth", 4)
+
+        worker_a.merge_snapshot(json.loads(json.dumps(worker_b.snapshot())))
+
+        assert worker_a.get_stats("api_request")["count"] == 2
+        assert worker_a.counters["cache.l1.hits"] == 5
+        assert worker_a.get_value_stats("compute.queue_depth")["max"] == 4
+
+    def test_values_stay_out_of_timings(self):
+        metrics = PerformanceMetrics()
+        metrics.record_timing("api_request", 0.1)
+        for depth in (0, 8, 40):
+            metrics.record_value("compute.queue_depth", depth)
+
+        report = get_performance_report(metrics)
+
+        assert metrics.get_stats("compute.queue_depth") is None
+        assert metrics.get_value_stats("compute.queue_depth")["count"] == 3
+        assert report["total_operations"] == 1
+        assert report["slow_operations"] == []
+        assert report["values"]["compute.queue_depth"]["max"] == 40
+
+
+@pytest.fixture
+def server():
+    return FakeRedisServer()
+
+
+def _worker(server=None):
+    service = CacheService(l1_enabled=False)
+    if server is not None:
+        service.redis_client = FakeRedis(server)
+        service._connected = True
+    return MetricsPublisher(PerformanceMetrics(), service, interval=10)
+
+
+class TestMetricsPublisher:
+
+    async def test_collect_merges_all_live_workers(self, server):
+        workers = [_worker(server) for _ in range(3)]
+        for index, worker in enumerate(workers):
+            worker.metrics.record_timing("api_request", 0.1 * (index + 1))
+            await worker.publish()
+
+        # Recorded after publishing: still visible to its own worker
+        workers[0].metrics.record_timing("api_request", 0.4)
+        merged, count = await workers[0].collect()
+
+        assert count == 3
+        assert merged.get_stats("api_request")["count"] == 4
+        assert merged.get_stats("api_request")["max"] == pytest.approx(0.4)
+
+    async def test_stopped_worker_is_dropped(self, server):
+        leaving, staying = _worker(server), _worker(server)
+        leaving.metrics.record_timing("api_request", 0.1)
+        await leaving.publish()
+
+        await leaving.stop()
+        merged, count = await staying.collect()
+
+        assert count == 1
+        assert merged.get_stats("api_request") is None
+
+    async def test_without_redis_reports_local_worker(self):
+        worker = _worker()
+        worker.metrics.record_timing("api_request", 0.1)
+
+        assert await worker.publish() is False
+        merged, count = await worker.collect()
+        assert count == 1
+        assert merged.get_stats("api_request")["count"] == 1
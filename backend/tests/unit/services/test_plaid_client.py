@@ -0,0 +1,197 @@
+"""
+Async Plaid Client Tests
+
+Runs the real Plaid SDK against a local fake Plaid server.
+"""
+
+import asyncio
+import time
+from datetime import date
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.api import plaid as plaid_api
+from app.core.config import settings
+from app.core.performance import performance_metrics
+from app.models.plaid import PlaidAccount, PlaidItem, PlaidTransaction
+from app.main import app
+from app.services.encryption_service import encryption_service
+from app.services.plaid_client import QUEUE_WAIT_OPERATION, AsyncPlaidClient
+from app.services.plaid_fleet_sync import is_transient_sync_error
+from app.services.plaid_service import PlaidService
+from app.services.plaid_sync_service import PlaidSyncService
+from tests.utils.fake_plaid import FakePlaidServer, account, holding, security, transaction
+
+
+@pytest.fixture
+def fake_plaid():
+    server = FakePlaidServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(fake_plaid, monkeypatch):
+    monkeypatch.setattr(settings, "PLAID_CLIENT_ID", "client-id")
+    monkeypatch.setattr(settings, "PLAID_SECRET", "secret")
+    performance_metrics.reset()
+
+    client = AsyncPlaidClient(PlaidService(host=fake_plaid.url, pool_size=4), max_workers=4)
+    yield client
+    client.shutdown()
+
+
+class TestAsyncPlaidClient:
+
+    async def test_returns_plaid_service_results(self, client, fake_plaid):
+        fake_plaid.accounts = [account("acct-1", current=250.0, type="investment", subtype="ira")]
+        fake_plaid.transactions = {
+            "": {"added": [transaction("txn-1", "acct-1")], "next_cursor": "c1", "has_more": True},
+        }
+        fake_plaid.holdings = [holding("acct-1", "sec-1", quantity=3.0)]
+        fake_plaid.securities = [security("sec-1", "VTI")]
+
+        accounts = await client.get_accounts("token")
+        page = await client.sync_transactions("token")
+        holdings = await client.get_investments_holdings("token")
+
+        assert accounts[0]["balances"]["current"] == 250.0
+        assert accounts[0]["type"] == "investment"
+        assert [t["transaction_id"] for t in page["added"]] == ["txn-1"]
+        assert page["cursor"] == "c1" and page["has_more"] is True
+        assert holdings["holdings"][0]["quantity"] == 3.0
+        assert holdings["securities"]["sec-1"]["ticker_symbol"] == "VTI"
+        assert "cursor" not in fake_plaid.requests[1][1]
+
+    async def test_calls_do_not_block_the_event_loop(self, client, fake_plaid):
+        fake_plaid.delay = 0.2
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await client.get_accounts("token")
+        task.cancel()
+
+        assert ticks >= 10
+
+    async def test_pipeline_overlaps_requests_on_pooled_connections(self, client, fake_plaid):
+        fake_plaid.delay = 0.05
+        tokens = [(f"token-{n}",) for n in range(12)]
+
+        start = time.perf_counter()
+        results = await client.pipeline(client.get_accounts, tokens)
+        elapsed = time.perf_counter() - start
+        await client.pipeline(client.get_accounts, tokens)
+
+        assert len(results) == 12
+        assert elapsed < 12 * 0.05 / 2
+        assert fake_plaid.peak_in_flight == 4  # Bounded by the thread pool
+        assert fake_plaid.connections <= 4  # Keep-alive connections are reused
+
+    async def test_pipeline_keeps_results_of_other_items_on_failure(self, client, fake_plaid):
+        fake_plaid.errors["expired"] = (400, "ITEM_LOGIN_REQUIRED")
+
+        results = await client.pipeline(client.get_accounts, [("token-1",), ("expired",), ("token-2",)])
+
+        assert results[0][0]["account_id"] == "acct-1"
+        assert isinstance(results[1], Exception)
+        assert results[2][0]["account_id"] == "acct-1"
+
+    async def test_records_timings_per_endpoint(self, client, fake_plaid):
+        fake_plaid.errors["expired"] = (400, "ITEM_LOGIN_REQUIRED")
+        fake_plaid.errors["down"] = (500, "INSTITUTION_DOWN")
+
+        await client.get_accounts("token")
+        await client.sync_transactions("token")
+        with pytest.raises(Exception) as expired:
+            await client.get_accounts("expired")
+        with pytest.raises(Exception) as down:
+            await client.get_accounts("down")
+
+        assert performance_metrics.get_stats("plaid.accounts_get")["count"] == 3
+        assert performance_metrics.get_stats("plaid.transactions_sync")["count"] == 1
+        assert performance_metrics.get_stats(QUEUE_WAIT_OPERATION)["count"] == 4
+        assert performance_metrics.counters["plaid.accounts_get.errors"] == 2
+        assert not is_transient_sync_error(expired.value)
+        assert is_transient_sync_error(down.value)
+
+
+async def test_transaction_sync_over_the_sdk(client, fake_plaid, async_session):
+    item = PlaidItem(user_id="user-1", item_id="item-1", access_token="token")
+    async_session.add(item)
+    await async_session.flush()
+    async_session.add(
+        PlaidAccount(account_id="acct-1", item_id=item.id, user_id="user-1", name="Checking", type="depository")
+    )
+    await async_session.commit()
+
+    fake_plaid.transactions = {
+        "": {"added": [transaction("txn-1", "acct-1")], "next_cursor": "c1", "has_more": True},
+        "c1": {"added": [transaction("txn-2", "acct-1")], "next_cursor": "c2"},
+        "c2": {"removed": ["txn-1"], "next_cursor": "c3"},
+    }
+    sync_service = PlaidSyncService(client)
+
+    assert await sync_service.sync_transactions(async_session, item) == {
+        "added": 2, "modified": 0, "removed": 0,
+    }
+    assert await sync_service.sync_transactions(async_session, item) == {
+        "added": 0, "modified": 0, "removed": 1,
+    }
+
+    stored = (await async_session.execute(select(PlaidTransaction))).scalars().all()
+    assert [(txn.transaction_id, txn.date) for txn in stored] == [("txn-2", date(2024, 1, 15))]
+    assert item.cursor == "c3"
+    assert [body.get("cursor") for _, body in fake_plaid.requests] == [None, "c1", "c2"]
+
+
+async def test_sync_item_decrypts_the_stored_token(client, fake_plaid, async_session):
+    item = PlaidItem(
+        user_id="user-1", item_id="item-1",
+        access_token=encryption_service.encrypt_access_token("token"),
+    )
+    async_session.add(item)
+    await async_session.commit()
+    fake_plaid.transactions = {
+        "": {"added": [transaction("txn-1", "acct-1")], "next_cursor": "c1"},
+    }
+
+    summary = await PlaidSyncService(client).sync_item(async_session, item)
+
+    assert summary == {"accounts_updated": 1, "transactions_synced": 1, "holdings_updated": 0}
+    assert {body["access_token"] for _, body in fake_plaid.requests} == {"token"}
+    assert item.cursor == "c1"
+
+
+async def test_account_sync_endpoint_reports_failed_items(
+    client, fake_plaid, async_session, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(plaid_api, "plaid_client", client)
+    fake_plaid.errors["expired"] = (400, "ITEM_LOGIN_REQUIRED")
+    good = PlaidItem(
+        user_id="test-user-123", item_id="item-1",
+        access_token=encryption_service.encrypt_access_token("token"),
+    )
+    expired = PlaidItem(
+        user_id="test-user-123", item_id="item-2",
+        access_token=encryption_service.encrypt_access_token("expired"),
+    )
+    async_session.add_all([good, expired])
+    await async_session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http:
+        response = await http.post("/api/v1/plaid/accounts/sync", headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["accounts_synced"] == 1
+    assert [error["item_id"] for error in body["errors"]] == [expired.id]
+    stored = (await async_session.execute(select(PlaidAccount))).scalars().all()
+    assert [(acc.account_id, acc.item_id) for acc in stored] == [("acct-1", good.id)]
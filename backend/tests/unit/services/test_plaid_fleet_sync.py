@@ -0,0 +1,197 @@
+"""
+Plaid Fleet Sync Tests
+
+Covers concurrency bounds, staleness ordering, retries, and per-institution
+rate limiting of the scheduled sync.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import select
+
+from app.models.plaid import PlaidItem, PlaidSyncJob
+from app.services.plaid_fleet_sync import (
+    FleetSyncScheduler,
+    InstitutionRateLimiter,
+    is_transient_sync_error,
+)
+from app.services.plaid_sync_queue import claim_jobs, enqueue_sync, requeue_stale_jobs
+from app.services.plaid_sync_service import PlaidSyncService
+
+RESULT = {"accounts_updated": 1, "transactions_synced": 2, "holdings_updated": 0}
+
+
+def _hours_ago(hours):
+    return (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+
+
+@pytest.fixture
+async def items(async_session):
+    items = [
+        PlaidItem(user_id="u1", item_id="fresh", access_token="t", institution_id="ins_1",
+                  last_successful_sync=_hours_ago(1)),
+        PlaidItem(user_id="u2", item_id="stale", access_token="t", institution_id="ins_1",
+                  last_successful_sync=_hours_ago(72)),
+        PlaidItem(user_id="u3", item_id="never", access_token="t", institution_id="ins_2"),
+        PlaidItem(user_id="u4", item_id="older", access_token="t", institution_id="ins_2",
+                  last_successful_sync=_hours_ago(30)),
+    ]
+    async_session.add_all(items)
+    await async_session.commit()
+    return items
+
+
+def _scheduler(async_session_maker, sync_item, **kwargs):
+    sync_service = PlaidSyncService(plaid_service=Mock(), session_factory=async_session_maker)
+    sync_service.sync_item = sync_item
+    kwargs.setdefault("rate_limiter", InstitutionRateLimiter(rate=1000, burst=100))
+    kwargs.setdefault("retry_base_delay", 0.001)
+    return FleetSyncScheduler(sync_service, async_session_maker, **kwargs)
+
+
+class TestFleetSyncScheduler:
+
+    async def test_stalest_items_sync_first(self, items, async_session_maker):
+        order = []
+
+        async def sync_item(db, item):
+            order.append(item.item_id)
+            return RESULT
+
+        scheduler = _scheduler(async_session_maker, sync_item, concurrency=1)
+        summary = await scheduler.run(items)
+
+        assert order == ["never", "stale", "older", "fresh"]
+        assert summary["successful"] == 4
+        assert summary["transactions_synced"] == 8
+
+    async def test_concurrency_is_bounded(self, items, async_session_maker):
+        running = peak = 0
+
+        async def sync_item(db, item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return RESULT
+
+        summary = await _scheduler(async_session_maker, sync_item, concurrency=2).run(items)
+
+        assert peak == 2
+        assert summary["successful"] == 4
+
+    async def test_transient_errors_are_retried(self, items, async_session_maker):
+        attempts = {}
+
+        async def sync_item(db, item):
+            attempts[item.item_id] = attempts.get(item.item_id, 0) + 1
+            if item.item_id == "stale" and attempts["stale"] < 3:
+                raise Exception("Failed to sync: INSTITUTION_NOT_RESPONDING")
+            if item.item_id == "never":
+                raise Exception("Failed to sync: ITEM_LOGIN_REQUIRED")
+            return RESULT
+
+        summary = await _scheduler(async_session_maker, sync_item, max_retries=3).run(items)
+
+        assert attempts["stale"] == 3
+        assert attempts["never"] == 1  # Not transient: no retry
+        assert summary["successful"] == 3
+        assert summary["retries"] == 2
+        assert [error["item_id"] for error in summary["errors"]] == [items[2].id]
+
+    async def test_retries_give_up_after_limit(self, items, async_session_maker):
+        async def sync_item(db, item):
+            raise ConnectionError("reset by peer")
+
+        summary = await _scheduler(async_session_maker, sync_item, max_retries=2).run(items[:1])
+
+        assert summary["failed"] == 1
+        assert summary["retries"] == 2
+
+    async def test_items_being_synced_by_the_queue_are_skipped(self, items, async_session, async_session_maker):
+        async_session.add(PlaidSyncJob(plaid_item_id="stale", status="running", locked_by="queue-worker"))
+        await async_session.commit()
+        held = []
+
+        async def sync_item(db, item):
+            result = await db.execute(
+                select(PlaidSyncJob.plaid_item_id).where(PlaidSyncJob.status == "running")
+            )
+            held.append(sorted(result.scalars().all()))
+            return RESULT
+
+        summary = await _scheduler(async_session_maker, sync_item, concurrency=1).run(items)
+
+        assert summary["skipped"] == 1
+        assert summary["successful"] == 3
+        # The item being synced is held against the queue, then released
+        assert held[0] == ["never", "stale"]
+        remaining = (await async_session.execute(select(PlaidSyncJob.plaid_item_id))).scalars().all()
+        assert remaining == ["stale"]
+
+    async def test_queue_claim_and_fleet_hold_exclude_each_other(self, items, async_session, async_session_maker):
+        scheduler = _scheduler(async_session_maker, None)
+
+        # Fleet first: the queue's follow-up job waits
+        job_id = await scheduler._hold_item("stale")
+        assert job_id is not None
+        await enqueue_sync(async_session, "stale", ("transactions",))
+        assert await claim_jobs(async_session, limit=5, worker_id="queue") == []
+        await async_session.commit()
+        await scheduler._release_item(job_id)
+
+        # Queue first: the fleet hold is refused by the running-job index,
+        # with no check of its own that a claim could slip past
+        (claimed,) = await claim_jobs(async_session, limit=5, worker_id="queue")
+        await async_session.commit()
+        assert claimed.plaid_item_id == "stale"
+        assert await scheduler._hold_item("stale") is None
+
+    async def test_hold_lease_is_renewed_during_long_syncs(self, items, async_session_maker):
+        requeued = []
+
+        async def sync_item(db, item):
+            await asyncio.sleep(0.3)
+            async with async_session_maker() as other:
+                requeued.append(await requeue_stale_jobs(other, lease_seconds=0.2))
+                await other.commit()
+            return RESULT
+
+        scheduler = _scheduler(async_session_maker, sync_item, lease_seconds=0.15)
+        summary = await scheduler.run(items[:1])
+
+        assert summary["successful"] == 1
+        assert requeued == [0]
+
+
+class TestInstitutionRateLimiter:
+
+    async def test_spaces_calls_per_institution(self):
+        limiter = InstitutionRateLimiter(rate=20, burst=1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire("ins_1") for _ in range(4)))
+        same_institution = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire(f"ins_{n}") for n in range(2, 6)))
+        different_institutions = time.perf_counter() - start
+
+        assert same_institution >= 0.14
+        assert different_institutions < 0.05
+
+    def test_rejects_invalid_settings(self):
+        with pytest.raises(ValueError):
+            InstitutionRateLimiter(rate=0)
+
+
+def test_transient_error_classification():
+    assert is_transient_sync_error(asyncio.TimeoutError())
+    assert is_transient_sync_error(Exception("error_code: RATE_LIMIT_EXCEEDED"))
+    assert not is_transient_sync_error(Exception("error_code: INVALID_ACCESS_TOKEN"))
+    assert not is_transient_sync_error(ValueError("bad data"))
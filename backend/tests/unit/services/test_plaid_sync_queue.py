@@ -0,0 +1,301 @@
+"""
+Plaid Sync Queue Tests
+
+Covers webhook coalescing, claiming, bounded workers, retries and lease
+recovery of the durable sync job queue.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import select
+
+from app.api.plaid import handle_webhook
+from app.core.performance import performance_metrics
+from app.models.plaid import PlaidItem, PlaidSyncJob
+from app.schemas.plaid import PlaidWebhookRequest
+from app.services import plaid_sync_queue as queue_module
+from app.services.encryption_service import encryption_service
+from app.services.plaid_fleet_sync import InstitutionRateLimiter
+from app.services.plaid_sync_queue import (
+    FAILED,
+    PENDING,
+    RUNNING,
+    PlaidSyncQueueWorker,
+    claim_jobs,
+    enqueue_sync,
+    purge_failed_jobs,
+    renew_lease,
+    requeue_stale_jobs,
+)
+
+
+@pytest.fixture
+async def items(async_session):
+    items = [
+        PlaidItem(
+            user_id=f"user-{n}",
+            item_id=f"item-{n}",
+            access_token=encryption_service.encrypt_access_token(f"token-{n}"),
+            institution_id=f"ins_{n}",
+        )
+        for n in range(4)
+    ]
+    async_session.add_all(items)
+    await async_session.commit()
+    return items
+
+
+@pytest.fixture
+def sync_service():
+    service = Mock()
+    service.sync_accounts = AsyncMock(return_value=1)
+    service.sync_transactions = AsyncMock(return_value={"added": 1, "modified": 0, "removed": 0})
+    service.sync_holdings = AsyncMock(return_value=1)
+    return service
+
+
+@pytest.fixture
+def worker(async_session_maker, sync_service):
+    performance_metrics.reset()
+    return PlaidSyncQueueWorker(
+        session_factory=async_session_maker,
+        sync_service=sync_service,
+        concurrency=2,
+        retry_base_delay=0,
+        rate_limiter=InstitutionRateLimiter(rate=1000, burst=100),
+    )
+
+
+async def _jobs(session):
+    session.expire_all()
+    return (await session.execute(select(PlaidSyncJob).order_by(PlaidSyncJob.plaid_item_id))).scalars().all()
+
+
+class TestEnqueue:
+
+    async def test_events_coalesce_into_one_pending_job_per_item(self, async_session):
+        for _ in range(3):
+            await enqueue_sync(async_session, "item-0", ("transactions",))
+        await enqueue_sync(async_session, "item-0", ("holdings",))
+        await enqueue_sync(async_session, "item-1", ("transactions",))
+        await async_session.commit()
+
+        job_0, job_1 = await _jobs(async_session)
+        assert job_0.event_count == 4
+        assert (job_0.sync_transactions, job_0.sync_holdings, job_0.sync_accounts) == (True, True, False)
+        assert job_1.event_count == 1
+        assert (job_1.sync_transactions, job_1.sync_holdings) == (True, False)
+
+    async def test_events_for_a_running_job_queue_a_follow_up(self, async_session):
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        (claimed,) = await claim_jobs(async_session, limit=5, worker_id="w1")
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await async_session.commit()
+
+        statuses = sorted(job.status for job in await _jobs(async_session))
+        assert statuses == [PENDING, RUNNING]
+        assert claimed.attempts == 1
+
+        # The follow-up waits until the running sync of the same item ends
+        assert await claim_jobs(async_session, limit=5, worker_id="w2") == []
+        await async_session.delete(await async_session.get(PlaidSyncJob, claimed.id))
+        await async_session.commit()
+        (follow_up,) = await claim_jobs(async_session, limit=5, worker_id="w2")
+        assert follow_up.plaid_item_id == "item-0"
+
+
+class TestPlaidSyncQueueWorker:
+
+    async def test_drain_runs_one_sync_per_item(self, worker, sync_service, items, async_session):
+        for _ in range(5):
+            await enqueue_sync(async_session, "item-0", ("transactions",))
+        await enqueue_sync(async_session, "item-1", ("holdings",))
+        await enqueue_sync(async_session, "unknown-item", ("transactions",))
+        await async_session.commit()
+
+        await worker.drain()
+
+        sync_service.sync_transactions.assert_awaited_once()
+        assert sync_service.sync_transactions.await_args.kwargs["access_token"] == "token-0"
+        sync_service.sync_holdings.assert_awaited_once()
+        sync_service.sync_accounts.assert_not_awaited()
+        assert await _jobs(async_session) == []
+        assert performance_metrics.counters["plaid_sync_queue.succeeded"] == 3
+        assert performance_metrics.get_stats("plaid_sync_queue.job")["count"] == 3
+
+    async def test_concurrency_is_bounded(self, worker, sync_service, items, async_session):
+        running = peak = 0
+
+        async def sync_transactions(db, item, access_token=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        sync_service.sync_transactions = sync_transactions
+        for item in items:
+            await enqueue_sync(async_session, item.item_id, ("transactions",))
+        await async_session.commit()
+
+        await worker.drain()
+
+        assert peak == 2
+        assert await _jobs(async_session) == []
+
+    async def test_transient_failures_retry(self, worker, sync_service, items, async_session):
+        sync_service.sync_transactions.side_effect = [
+            Exception("Failed to sync transactions: INSTITUTION_NOT_RESPONDING"),
+            {"added": 0, "modified": 0, "removed": 0},
+        ]
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await async_session.commit()
+
+        await worker.drain()
+
+        assert sync_service.sync_transactions.await_count == 2
+        assert await _jobs(async_session) == []
+        assert performance_metrics.counters["plaid_sync_queue.retried"] == 1
+
+    async def test_permanent_failures_are_kept(self, worker, sync_service, items, async_session):
+        sync_service.sync_transactions.side_effect = Exception("ITEM_LOGIN_REQUIRED")
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await async_session.commit()
+
+        await worker.drain()
+
+        (job,) = await _jobs(async_session)
+        assert job.status == FAILED
+        assert "ITEM_LOGIN_REQUIRED" in job.last_error
+        sync_service.sync_transactions.assert_awaited_once()
+
+    async def test_expired_leases_are_requeued(self, async_session):
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await enqueue_sync(async_session, "item-1", ("holdings",))
+        await claim_jobs(async_session, limit=5, worker_id="crashed")
+        # item-1 got a new event while its job was stuck
+        await enqueue_sync(async_session, "item-1", ("accounts",))
+        stuck = datetime.now(timezone.utc) - timedelta(hours=1)
+        for job in await _jobs(async_session):
+            if job.status == RUNNING:
+                job.locked_at = stuck
+        await async_session.commit()
+
+        assert await requeue_stale_jobs(async_session, lease_seconds=60) == 2
+        await async_session.commit()
+
+        job_0, job_1 = await _jobs(async_session)
+        assert job_0.status == PENDING and job_0.locked_by is None
+        assert job_1.status == PENDING
+        assert (job_1.sync_holdings, job_1.sync_accounts) == (True, True)
+        assert job_1.event_count == 2
+
+    async def test_running_jobs_renew_their_lease(self, async_session):
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        (claimed,) = await claim_jobs(async_session, limit=5, worker_id="w1")
+        (job,) = await _jobs(async_session)
+        job.locked_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        await async_session.commit()
+
+        assert await renew_lease(async_session, claimed.id, "w2") is False
+        assert await renew_lease(async_session, claimed.id, "w1") is True
+        await async_session.commit()
+
+        assert await requeue_stale_jobs(async_session, lease_seconds=60) == 0
+
+    async def test_finishing_after_losing_the_lease_keeps_the_job(self, worker, sync_service, items, async_session):
+        async def sync_transactions(db, item, access_token=None):
+            # The lease expires mid-sync and another worker claims the job
+            async with worker.session_factory() as other:
+                job = (await other.execute(select(PlaidSyncJob))).scalar_one()
+                job.locked_by = "other-worker"
+                await other.commit()
+
+        sync_service.sync_transactions = sync_transactions
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await async_session.commit()
+
+        await worker.run_pending()
+        await asyncio.gather(*worker._jobs)
+
+        (job,) = await _jobs(async_session)
+        assert job.status == RUNNING and job.locked_by == "other-worker"
+        assert performance_metrics.counters["plaid_sync_queue.lease_lost"] == 1
+
+    async def test_stop_requeues_running_jobs(self, worker, sync_service, items, async_session):
+        started = asyncio.Event()
+
+        async def sync_transactions(db, item, access_token=None):
+            started.set()
+            await asyncio.sleep(3600)
+
+        sync_service.sync_transactions = sync_transactions
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await async_session.commit()
+
+        await worker.run_pending()
+        await started.wait()
+        await worker.stop()
+
+        (job,) = await _jobs(async_session)
+        assert job.status == PENDING and job.locked_by is None
+        assert job.last_error == "worker stopped"
+
+    async def test_old_failed_jobs_are_purged(self, async_session):
+        await enqueue_sync(async_session, "item-0", ("transactions",))
+        await enqueue_sync(async_session, "item-1", ("transactions",))
+        await async_session.commit()
+        job_0, job_1 = await _jobs(async_session)
+        job_0.status = job_1.status = FAILED
+        job_0.updated_at = datetime.now(timezone.utc) - timedelta(days=30)
+        await async_session.commit()
+
+        assert await purge_failed_jobs(async_session, retention_seconds=3600) == 1
+        await async_session.commit()
+
+        (job,) = await _jobs(async_session)
+        assert job.plaid_item_id == "item-1"
+
+
+class TestWebhookEndpoint:
+
+    async def test_sync_webhooks_are_queued(self, async_session, monkeypatch):
+        notify = Mock()
+        monkeypatch.setattr(queue_module.plaid_sync_worker, "notify", notify)
+
+        for code in ("SYNC_UPDATES_AVAILABLE", "DEFAULT_UPDATE"):
+            response = await handle_webhook(
+                PlaidWebhookRequest(webhook_type="TRANSACTIONS", webhook_code=code, item_id="item-0"),
+                db=async_session,
+            )
+            assert response == {"status": "queued"}
+
+        ignored = await handle_webhook(
+            PlaidWebhookRequest(webhook_type="TRANSACTIONS", webhook_code="RECURRING_TRANSACTIONS_UPDATE", item_id="item-0"),
+            db=async_session,
+        )
+
+        assert ignored == {"status": "ignored"}
+        (job,) = await _jobs(async_session)
+        assert job.event_count == 2
+        assert notify.call_count == 2
+
+    async def test_item_errors_are_recorded_inline(self, items, async_session):
+        response = await handle_webhook(
+            PlaidWebhookRequest(
+                webhook_type="ITEM",
+                webhook_code="ERROR",
+                item_id="item-2",
+                error={"error_code": "ITEM_LOGIN_REQUIRED", "error_message": "login required"},
+            ),
+            db=async_session,
+        )
+
+        assert response == {"status": "processed"}
+        item = await async_session.get(PlaidItem, items[2].id)
+        await async_session.refresh(item)
+        assert item.error_code == "ITEM_LOGIN_REQUIRED"
+        assert await _jobs(async_session) == []
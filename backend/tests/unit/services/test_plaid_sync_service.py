@@ -1,7 +1,7 @@
 """
 Plaid Sync Service Tests
 
-Validates summary accounting, transactional inserts, and holding updates.
+Validates summary accounting, cursor-based transaction sync, and holding updates.
 """
 
 from datetime import datetime, timedelta
@@ -10,6 +10,7 @@ from typing import Any, List
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from sqlalchemy import select
 
 from app.models.plaid import (
     PlaidAccount,
@@ -17,6 +18,7 @@ from app.models.plaid import (
     PlaidItem,
     PlaidTransaction,
 )
+from app.services.encryption_service import encryption_service
 from app.services.plaid_sync_service import PlaidSyncService
 
 
@@ -69,10 +71,15 @@ async def test_sync_item_compiles_subtask_results(monkeypatch):
     sync_service = PlaidSyncService(plaid_service=plaid_service)
 
     item = build_item()
+    item.access_token = encryption_service.encrypt_access_token("access-token")
     session = FakeSession([])
 
     monkeypatch.setattr(sync_service, "sync_accounts", AsyncMock(return_value=2))
-    monkeypatch.setattr(sync_service, "sync_transactions", AsyncMock(return_value=5))
+    monkeypatch.setattr(
+        sync_service,
+        "sync_transactions",
+        AsyncMock(return_value={"added": 3, "modified": 1, "removed": 1}),
+    )
     monkeypatch.setattr(sync_service, "sync_holdings", AsyncMock(return_value=3))
 
     summary = await sync_service.sync_item(session, item)
@@ -82,30 +89,38 @@ async def test_sync_item_compiles_subtask_results(monkeypatch):
         "transactions_synced": 5,
         "holdings_updated": 3,
     }
-    sync_service.sync_accounts.assert_awaited_once()
-    sync_service.sync_transactions.assert_awaited_once()
-    sync_service.sync_holdings.assert_awaited_once()
+    sync_service.sync_accounts.assert_awaited_once_with(session, item, "access-token")
+    sync_service.sync_transactions.assert_awaited_once_with(session, item, "access-token")
+    sync_service.sync_holdings.assert_awaited_once_with(session, item, "access-token")
     session.commit.assert_awaited()
     assert item.last_successful_sync is not None
 
 
-@pytest.mark.asyncio
-async def test_sync_transactions_inserts_new_records():
-    plaid_service = Mock()
-    sync_service = PlaidSyncService(plaid_service=plaid_service)
+async def _seed_item(session, account_ids=("acct-123",)):
+    """Persist an item with one account per Plaid account id."""
+    item = build_item()
+    session.add(item)
+    await session.flush()
+    accounts = [
+        PlaidAccount(
+            account_id=account_id,
+            item_id=item.id,
+            user_id=item.user_id,
+            name=f"Account {account_id}",
+            type="investment",
+        )
+        for account_id in account_ids
+    ]
+    session.add_all(accounts)
+    await session.commit()
+    return item, accounts
 
-    account = PlaidAccount(
-        account_id="acct-123",
-        item_id="item-abc",
-        user_id="user-123",
-        name="Primary Checking",
-        type="depository",
-    )
 
-    transaction_payload = {
-        "transaction_id": "txn-001",
+def transaction_payload(transaction_id: str, amount: float = -120.33, **overrides):
+    payload = {
+        "transaction_id": transaction_id,
         "account_id": "acct-123",
-        "amount": -120.33,
+        "amount": amount,
         "date": "2024-01-15",
         "name": "Coffee Shop",
         "merchant_name": "Caffeine Hub",
@@ -113,30 +128,194 @@ async def test_sync_transactions_inserts_new_records():
         "pending": False,
         "payment_channel": "card",
     }
+    payload.update(overrides)
+    return payload
 
-    plaid_service.get_transactions = AsyncMock(
-        return_value={"transactions": [transaction_payload]}
+
+def account_payload(account_id: str, current: float = 250.0):
+    return {
+        "account_id": account_id,
+        "name": f"Account {account_id}",
+        "type": "depository",
+        "subtype": "checking",
+        "balances": {"available": current, "current": current, "limit": None},
+    }
+
+
+def sync_page(added=(), modified=(), removed=(), cursor="cursor-1", has_more=False):
+    return {
+        "added": list(added),
+        "modified": list(modified),
+        "removed": list(removed),
+        "cursor": cursor,
+        "has_more": has_more,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sync_transactions_applies_cursor_deltas(async_session):
+    plaid_service = Mock()
+    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    item, (account,) = await _seed_item(async_session)
+
+    # Initial sync: two pages, followed until has_more is false
+    plaid_service.sync_transactions = AsyncMock(
+        side_effect=[
+            sync_page(added=[transaction_payload("txn-001")], cursor="c1", has_more=True),
+            sync_page(
+                added=[
+                    transaction_payload("txn-002", pending=True),
+                    transaction_payload("txn-unknown", account_id="acct-other"),
+                ],
+                cursor="c2",
+            ),
+        ]
     )
+    # acct-other was opened after linking; it is created rather than skipped
+    plaid_service.get_accounts = AsyncMock(
+        return_value=[account_payload("acct-123"), account_payload("acct-other")]
+    )
+    counts = await sync_service.sync_transactions(async_session, item)
+
+    assert counts == {"added": 3, "modified": 0, "removed": 0}
+    assert [call.kwargs["cursor"] for call in plaid_service.sync_transactions.await_args_list] == [None, "c1"]
+    assert item.cursor == "c2"
+    new_account = (await async_session.execute(
+        select(PlaidAccount).where(PlaidAccount.account_id == "acct-other")
+    )).scalar_one()
+    assert new_account.item_id == item.id
+    assert new_account.current_balance == pytest.approx(250.0)
+
+    stored = await async_session.get(PlaidTransaction, await _transaction_pk(async_session, "txn-001"))
+    stored.user_category = "Coffee"
+    await async_session.commit()
+
+    # Incremental sync from the stored cursor: one posted, one removed, one new
+    plaid_service.sync_transactions = AsyncMock(
+        return_value=sync_page(
+            added=[transaction_payload("txn-003", amount=42.0)],
+            modified=[transaction_payload("txn-001", amount=-99.0)],
+            removed=["txn-002"],
+            cursor="c3",
+        )
+    )
+    counts = await sync_service.sync_transactions(async_session, item)
+
+    assert counts == {"added": 1, "modified": 1, "removed": 1}
+    plaid_service.sync_transactions.assert_awaited_once_with("access-token", cursor="c2")
+
+    account_pk, user_id, item_pk = account.id, item.user_id, item.id
+    async_session.expire_all()
+    rows = {
+        txn.transaction_id: txn
+        for txn in (await async_session.execute(select(PlaidTransaction))).scalars()
+    }
+    assert set(rows) == {"txn-001", "txn-003", "txn-unknown"}
+    assert rows["txn-001"].amount == pytest.approx(-99.0)
+    assert rows["txn-003"].account_id == account_pk
+    assert rows["txn-003"].user_id == user_id
+    # Plaid data never overwrites user edits
+    assert rows["txn-001"].user_category == "Coffee"
+    assert (await async_session.get(PlaidItem, item_pk)).cursor == "c3"
+
+
+@pytest.mark.asyncio
+async def test_sync_transactions_quiet_item_costs_one_call(async_session, monkeypatch):
+    plaid_service = Mock()
+    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    item, _ = await _seed_item(async_session)
+    item.cursor = "c1"
+    await async_session.commit()
+
+    write_rows = AsyncMock()
+    monkeypatch.setattr(sync_service, "_write_rows", write_rows)
+    plaid_service.sync_transactions = AsyncMock(return_value=sync_page(cursor="c1"))
 
-    session = FakeSession(
-        [
-            FakeScalarResult(account),
-            FakeScalarResult(None),
+    assert await sync_service.sync_transactions(async_session, item) == {
+        "added": 0, "modified": 0, "removed": 0,
+    }
+    plaid_service.sync_transactions.assert_awaited_once()
+    assert write_rows.await_args.args[3] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_transactions_restarts_pagination_on_mutation(async_session):
+    plaid_service = Mock()
+    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    item, _ = await _seed_item(async_session)
+    item.cursor = "c0"
+    await async_session.commit()
+
+    plaid_service.sync_transactions = AsyncMock(
+        side_effect=[
+            sync_page(added=[transaction_payload("txn-stale")], cursor="c1", has_more=True),
+            Exception("Failed to sync transactions: TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION"),
+            sync_page(added=[transaction_payload("txn-001")], cursor="c2"),
         ]
     )
 
-    item = build_item()
+    counts = await sync_service.sync_transactions(async_session, item)
 
-    synced = await sync_service.sync_transactions(session, item, days=7)
+    assert counts["added"] == 1
+    assert plaid_service.sync_transactions.await_args_list[2].kwargs["cursor"] == "c0"
+    stored = (await async_session.execute(select(PlaidTransaction.transaction_id))).scalars().all()
+    assert stored == ["txn-001"]
+    assert item.cursor == "c2"
 
-    assert synced == 1
-    assert len(session.added) == 1
-    stored_txn: PlaidTransaction = session.added[0]
-    assert stored_txn.transaction_id == "txn-001"
-    assert stored_txn.account_id == account.id
-    assert stored_txn.user_id == item.user_id
-    assert stored_txn.amount == transaction_payload["amount"]
-    session.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_sync_transactions_failure_keeps_stored_cursor(async_session):
+    plaid_service = Mock()
+    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    item, _ = await _seed_item(async_session)
+    item.cursor = "c0"
+    await async_session.commit()
+
+    plaid_service.sync_transactions = AsyncMock(
+        side_effect=[
+            sync_page(added=[transaction_payload("txn-001")], cursor="c1", has_more=True),
+            Exception("Failed to sync transactions: INTERNAL_SERVER_ERROR"),
+        ]
+    )
+
+    with pytest.raises(Exception):
+        await sync_service.sync_transactions(async_session, item)
+
+    assert item.cursor == "c0"
+    assert (await async_session.execute(select(PlaidTransaction))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_sync_transactions_unknown_account_keeps_stored_cursor(async_session):
+    plaid_service = Mock()
+    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    item, _ = await _seed_item(async_session)
+    item.cursor = "c0"
+    await async_session.commit()
+
+    plaid_service.sync_transactions = AsyncMock(
+        return_value=sync_page(
+            added=[
+                transaction_payload("txn-001"),
+                transaction_payload("txn-orphan", account_id="acct-missing"),
+            ],
+            cursor="c1",
+        )
+    )
+    plaid_service.get_accounts = AsyncMock(return_value=[account_payload("acct-123")])
+
+    with pytest.raises(ValueError):
+        await sync_service.sync_transactions(async_session, item)
+
+    assert item.cursor == "c0"
+    assert (await async_session.execute(select(PlaidTransaction))).first() is None
+
+
+async def _transaction_pk(session, transaction_id):
+    result = await session.execute(
+        select(PlaidTransaction.id).where(PlaidTransaction.transaction_id == transaction_id)
+    )
+    return result.scalar_one()
 
 
 @pytest.mark.asyncio
@@ -153,18 +332,16 @@ async def test_sync_accounts_updates_existing_record(monkeypatch):
     )
 
     plaid_service.get_accounts = AsyncMock(
-        return_value={
-            "accounts": [
-                {
-                    "account_id": "acct-001",
-                    "balances": {
-                        "available": 1500.0,
-                        "current": 1650.0,
-                        "limit": None,
-                    },
-                }
-            ]
-        }
+        return_value=[
+            {
+                "account_id": "acct-001",
+                "balances": {
+                    "available": 1500.0,
+                    "current": 1650.0,
+                    "limit": None,
+                },
+            }
+        ]
     )
 
     session = FakeSession([FakeScalarResult(existing_account)])
@@ -184,103 +361,92 @@ async def test_sync_accounts_updates_existing_record(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_sync_holdings_updates_and_creates(monkeypatch):
+async def test_sync_holdings_updates_and_creates(async_session):
     plaid_service = Mock()
     sync_service = PlaidSyncService(plaid_service=plaid_service)
 
-    existing_account = PlaidAccount(
-        account_id="acct-001",
-        item_id="item-abc",
-        user_id="user-123",
-        name="Investment",
-        type="investment",
+    item, (existing_account, other_account) = await _seed_item(
+        async_session, ("acct-001", "acct-002")
     )
-    other_account = PlaidAccount(
-        account_id="acct-002",
-        item_id="item-abc",
-        user_id="user-123",
-        name="401k",
-        type="investment",
-    )
-
-    existing_holding = PlaidHolding(
-        account_id=existing_account.id,
-        user_id=existing_account.user_id,
-        security_id="sec-001",
-        name="Existing ETF",
-        quantity=10.0,
-    )
-
-    plaid_service.get_holdings = AsyncMock(
-        return_value={
-            "holdings": [
-                {
-                    "account_id": "acct-001",
-                    "security_id": "sec-001",
-                    "quantity": 12.5,
-                    "institution_price": 110.0,
-                    "institution_value": 1375.0,
-                    "cost_basis": 900.0,
-                },
-                {
-                    "account_id": "acct-002",
-                    "security_id": "sec-XYZ",
-                    "quantity": 5.0,
-                    "institution_price": 80.0,
-                    "institution_value": 400.0,
-                    "cost_basis": 350.0,
-                    "iso_currency_code": "USD",
-                },
-            ]
-        }
-    )
-
-    session = FakeSession(
-        [
-            FakeScalarResult(existing_account),
-            FakeScalarResult(existing_holding),
-            FakeScalarResult(other_account),
-            FakeScalarResult(None),
-        ]
+    async_session.add(
+        PlaidHolding(
+            account_id=existing_account.id,
+            user_id=existing_account.user_id,
+            security_id="sec-001",
+            name="Existing ETF",
+            quantity=10.0,
+        )
     )
+    await async_session.commit()
+
+    holdings = {
+        "holdings": [
+            {
+                "account_id": "acct-001",
+                "security_id": "sec-001",
+                "quantity": 12.5,
+                "institution_price": 110.0,
+                "institution_value": 1375.0,
+                "cost_basis": 900.0,
+            },
+            {
+                "account_id": "acct-002",
+                "security_id": "sec-XYZ",
+                "quantity": 5.0,
+                "institution_price": 80.0,
+                "institution_value": 400.0,
+                "cost_basis": 350.0,
+                "iso_currency_code": "USD",
+            },
+        ],
+        "securities": {"sec-XYZ": {"name": "Total Market Fund", "ticker_symbol": "VTI"}},
+    }
+    plaid_service.get_investments_holdings = AsyncMock(return_value=holdings)
 
-    updated = await sync_service.sync_holdings(session, build_item())
+    assert await sync_service.sync_holdings(async_session, item) == 2
 
-    assert updated == 2
-    assert existing_holding.quantity == pytest.approx(12.5)
-    assert existing_holding.institution_value == pytest.approx(1375.0)
+    other_pk, user_id = other_account.id, item.user_id
+    async_session.expire_all()
+    stored = {
+        holding.security_id: holding
+        for holding in (await async_session.execute(select(PlaidHolding))).scalars()
+    }
+    assert len(stored) == 2
+    assert stored["sec-001"].quantity == pytest.approx(12.5)
+    assert stored["sec-001"].institution_value == pytest.approx(1375.0)
+    assert stored["sec-XYZ"].account_id == other_pk
+    assert stored["sec-XYZ"].user_id == user_id
+    assert stored["sec-XYZ"].name == "Total Market Fund"
+    assert stored["sec-XYZ"].institution_price == pytest.approx(80.0)
 
-    # A new holding instance should have been staged for insert
-    assert len(session.added) == 1
-    new_holding: PlaidHolding = session.added[0]
-    assert new_holding.account_id == other_account.id
-    assert new_holding.user_id == other_account.user_id
-    assert new_holding.security_id == "sec-XYZ"
-    assert new_holding.institution_price == pytest.approx(80.0)
-    session.commit.assert_awaited_once()
+    # Nothing changed: no writes
+    await async_session.refresh(item)
+    assert await sync_service.sync_holdings(async_session, item) == 0
 
 
 @pytest.mark.asyncio
-async def test_sync_all_users_handles_mixed_results(monkeypatch):
+async def test_sync_all_users_handles_mixed_results(async_session, async_session_maker, monkeypatch):
     plaid_service = Mock()
-    sync_service = PlaidSyncService(plaid_service=plaid_service)
+    sync_service = PlaidSyncService(plaid_service=plaid_service, session_factory=async_session_maker)
 
     active_items = [
         PlaidItem(user_id="user-1", item_id="item-1", access_token="token-1"),
         PlaidItem(user_id="user-2", item_id="item-2", access_token="token-2"),
+        PlaidItem(user_id="user-3", item_id="item-3", access_token="token-3", is_active=False),
     ]
-
-    session = FakeSession([FakeScalarResult(active_items)])
+    async_session.add_all(active_items)
+    await async_session.commit()
 
     first_result = {"accounts_updated": 2, "transactions_synced": 5, "holdings_updated": 1}
 
-    monkeypatch.setattr(
-        sync_service,
-        "sync_item",
-        AsyncMock(side_effect=[first_result, RuntimeError("sync failure")]),
-    )
+    async def sync_item(db, item):
+        if item.item_id == "item-2":
+            raise RuntimeError("sync failure")
+        return first_result
+
+    monkeypatch.setattr(sync_service, "sync_item", sync_item)
 
-    summary = await sync_service.sync_all_users(session)
+    summary = await sync_service.sync_all_users(async_session)
 
     assert summary["total_items"] == 2
     assert summary["successful"] == 1
@@ -350,6 +516,6 @@ def test_needs_sync_logic():
     stale_item = PlaidItem(user_id="user-1", item_id="item-2", access_token="t2")
     stale_item.last_successful_sync = (datetime.utcnow() - timedelta(hours=48)).isoformat()
 
-    assert sync_service._needs_sync(fresh_item) is False
-    assert sync_service._needs_sync(stale_item) is True
-    assert sync_service._needs_sync(PlaidItem(user_id="u", item_id="item-3", access_token="t3")) is True
+    assert sync_service.needs_sync(fresh_item) is False
+    assert sync_service.needs_sync(stale_item) is True
+    assert sync_service.needs_sync(PlaidItem(user_id="u", item_id="item-3", access_token="t3")) is True
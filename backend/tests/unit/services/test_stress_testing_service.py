@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from app.services.portfolio.asset_class_library import (
+    ASSET_CLASS_LIBRARY,
+    get_default_correlation_matrix,
+)
+from app.services.risk.stress_testing import StressTestingService
+
+
+service = StressTestingService()
+
+ALLOCATION = {
+    "US_LC_BLEND": 0.4,
+    "EM_BLEND": 0.2,
+    "US_TREASURY_INTER": 0.3,
+    "PRIVATE_FUND": 0.1,  # not in the asset class library
+}
+VOLATILITIES = {"US_LC_BLEND": 0.18, "EM_BLEND": 0.24, "US_TREASURY_INTER": 0.05}
+
+
+@pytest.mark.parametrize("confidence_level", [0.01, 0.05, 0.25])
+def test_tail_statistics_match_full_sort(confidence_level):
+    values = np.random.default_rng(5).standard_normal(10_001)
+
+    var_value, cvar_value, worst_case = service._tail_statistics(values, confidence_level)
+
+    expected_var = np.percentile(values, confidence_level * 100)
+    assert var_value == pytest.approx(expected_var)
+    assert cvar_value == pytest.approx(values[values <= expected_var].mean())
+    assert worst_case == values.min()
+
+
+def test_monte_carlo_stress_uses_library_correlations():
+    assets = list(ALLOCATION)
+    weights = np.array(list(ALLOCATION.values()))
+    vols = np.array([VOLATILITIES.get(asset, 0.15) for asset in assets]) / np.sqrt(252)
+    corr = np.eye(len(assets))
+    corr[:3, :3] = get_default_correlation_matrix(assets[:3])
+    expected_std = 1_000_000 * np.sqrt(weights @ (np.outer(vols, vols) * corr) @ weights)
+
+    result = service.run_monte_carlo_stress(
+        portfolio_value=1_000_000,
+        allocation=ALLOCATION,
+        asset_volatilities=VOLATILITIES,
+        n_simulations=200_000,
+        seed=11,
+    )
+
+    assert result["std_deviation"] == pytest.approx(expected_std, rel=0.01)
+    # Normal tail: 95% VaR ~ 1.645 sigma, CVaR ~ 2.063 sigma
+    assert result["var_loss"] == pytest.approx(1.645 * expected_std, rel=0.03)
+    assert result["cvar_loss"] == pytest.approx(2.063 * expected_std, rel=0.03)
+    assert result["worst_loss"] >= result["cvar_loss"] >= result["var_loss"]
+
+
+def test_monte_carlo_stress_is_reproducible_with_seed():
+    kwargs = dict(
+        portfolio_value=500_000,
+        allocation=ALLOCATION,
+        asset_volatilities=VOLATILITIES,
+        n_simulations=5_000,
+    )
+
+    assert service.run_monte_carlo_stress(seed=3, **kwargs) == service.run_monte_carlo_stress(seed=3, **kwargs)
+
+
+def test_cholesky_factor_reproduces_covariance_for_full_library():
+    assets = list(ASSET_CLASS_LIBRARY)
+    factor = service._daily_covariance_cholesky(assets, {})
+    covariance = factor @ factor.T
+
+    vols = np.sqrt(np.diag(covariance) * 252)
+    expected = [ASSET_CLASS_LIBRARY[asset].volatility for asset in assets]
+    np.testing.assert_allclose(vols, expected, rtol=1e-6)
@@ -2,15 +2,40 @@
 Unit tests for Monte Carlo Engine
 """
 
+import numpy as np
 import pytest
 from datetime import date, timedelta
 from app.tools.monte_carlo_engine import (
     run_simulation,
+    run_simulation_sync,
     calculate_success_probability,
+    draw_return_shocks,
+    simulate_portfolio_paths,
+    success_probability_grid,
+    withdrawal_success_probabilities,
+    withdrawal_survival_limits,
     SimulationParams,
 )
 
 
+def _reference_paths(params: SimulationParams, shocks: np.ndarray) -> np.ndarray:
+    """Month-by-month recurrence the vectorized kernel must reproduce."""
+    months = params.time_horizon * 12
+    monthly_return = (1 + params.expected_return) ** (1 / 12) - 1
+    monthly_volatility = params.volatility / np.sqrt(12)
+    monthly_inflation = (1 + params.inflation_rate) ** (1 / 12) - 1
+
+    paths = np.zeros((params.iterations, months + 1))
+    paths[:, 0] = params.initial_portfolio_value
+    for month in range(1, months + 1):
+        log_return = (monthly_return - 0.5 * monthly_volatility**2) + monthly_volatility * shocks[:, month - 1]
+        value = paths[:, month - 1] * np.exp(log_return)
+        inflation_adjustment = (1 + monthly_inflation) ** month
+        value += params.monthly_contribution * inflation_adjustment
+        paths[:, month] = np.maximum(value - params.monthly_withdrawal * inflation_adjustment, 0)
+    return paths
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestMonteCarloEngine:
@@ -185,3 +210,244 @@ class TestMonteCarloEngine:
         # With low returns and high volatility, should have some probability of loss
         assert result.statistics.probability_of_loss >= 0
         assert result.statistics.probability_of_loss <= 1
+
+
+@pytest.mark.unit
+class TestVectorizedKernel:
+    """The closed-form path kernel must match the monthly recurrence."""
+
+    @pytest.mark.parametrize(
+        "initial,contribution,withdrawal",
+        [
+            (100000, 1000, 0),  # accumulation
+            (500000, 0, 4000),  # decumulation with depletion
+            (50000, 500, 2500),  # net outflow
+            (0, 0, 0),  # degenerate
+            (-5000, 800, 0),  # negative start recovers via contributions
+        ],
+    )
+    def test_matches_monthly_recurrence(self, initial, contribution, withdrawal):
+        params = SimulationParams(
+            initial_portfolio_value=initial,
+            monthly_contribution=contribution,
+            monthly_withdrawal=withdrawal,
+            time_horizon=15,
+            expected_return=0.06,
+            volatility=0.22,
+            goal_amount=250000,
+            iterations=400,
+        )
+        shocks = draw_return_shocks(400, 180, rng=np.random.default_rng(7))
+
+        expected = _reference_paths(params, shocks)
+        actual = simulate_portfolio_paths(params, shocks)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-6)
+        # Depleted paths stay exactly at zero once the floor binds
+        assert np.array_equal(actual == 0, expected == 0)
+
+    def test_shared_shocks_are_deterministic(self):
+        params = SimulationParams(
+            initial_portfolio_value=100000,
+            monthly_contribution=1000,
+            time_horizon=10,
+            expected_return=0.07,
+            volatility=0.15,
+            goal_amount=250000,
+            iterations=300,
+        )
+        shocks = draw_return_shocks(300, 120, rng=np.random.default_rng(11))
+
+        first = run_simulation_sync(params, shocks)
+        second = run_simulation_sync(params, shocks)
+
+        assert first.success_probability == second.success_probability
+        assert first.final_portfolio_distribution == second.final_portfolio_distribution
+
+    def test_rejects_mismatched_shocks(self):
+        params = SimulationParams(
+            initial_portfolio_value=100000,
+            monthly_contribution=1000,
+            time_horizon=10,
+            expected_return=0.07,
+            volatility=0.15,
+            goal_amount=250000,
+            iterations=300,
+        )
+
+        with pytest.raises(ValueError):
+            simulate_portfolio_paths(params, np.zeros((300, 12)))
+
+
+@pytest.mark.unit
+class TestLowMemoryMode:
+    """Streaming mode must reproduce full-matrix results with bounded output."""
+
+    @staticmethod
+    def _params(**overrides) -> SimulationParams:
+        values = dict(
+            initial_portfolio_value=250000,
+            monthly_contribution=500,
+            monthly_withdrawal=1500,
+            time_horizon=20,
+            expected_return=0.06,
+            volatility=0.18,
+            goal_amount=200000,
+            iterations=800,
+        )
+        values.update(overrides)
+        return SimulationParams(**values)
+
+    def test_streaming_matches_full_paths(self):
+        full = run_simulation_sync(self._params(), rng=np.random.default_rng(3))
+        lean = run_simulation_sync(self._params(low_memory=True), rng=np.random.default_rng(3))
+
+        assert lean.success_probability == full.success_probability
+        np.testing.assert_allclose(
+            lean.final_portfolio_distribution, full.final_portfolio_distribution, rtol=1e-9
+        )
+        for lean_year, full_year in zip(lean.portfolio_projections, full.portfolio_projections):
+            assert lean_year.year == full_year.year
+            assert lean_year.median == pytest.approx(full_year.median, rel=1e-9)
+            assert lean_year.p10 == pytest.approx(full_year.p10, rel=1e-9, abs=1e-6)
+            assert lean_year.p90 == pytest.approx(full_year.p90, rel=1e-9)
+
+    def test_streaming_accepts_explicit_shocks(self):
+        params = self._params(low_memory=True)
+        shocks = draw_return_shocks(800, 240, rng=np.random.default_rng(5))
+
+        lean = run_simulation_sync(params, shocks)
+        full = run_simulation_sync(self._params(), shocks)
+
+        assert lean.statistics.median_final_value == pytest.approx(
+            full.statistics.median_final_value, rel=1e-9
+        )
+
+    def test_distribution_is_capped_and_histogram_attached(self):
+        params = self._params(
+            low_memory=True, max_distribution_points=100, histogram_bins=20
+        )
+
+        result = run_simulation_sync(params, rng=np.random.default_rng(9))
+
+        assert result.iterations_run == 800
+        assert len(result.final_portfolio_distribution) == 100
+        assert result.final_portfolio_distribution == sorted(result.final_portfolio_distribution)
+        assert result.final_portfolio_distribution[0] == result.statistics.worst_case
+        assert result.final_portfolio_distribution[-1] == result.statistics.best_case
+
+        histogram = result.distribution_histogram
+        assert histogram is not None
+        assert len(histogram.counts) == 20
+        assert len(histogram.bin_edges) == 21
+        assert sum(histogram.counts) == 800
+
+    def test_defaults_keep_full_distribution(self):
+        result = run_simulation_sync(self._params(), rng=np.random.default_rng(1))
+
+        assert len(result.final_portfolio_distribution) == 800
+        assert result.distribution_histogram is None
+
+
+@pytest.mark.unit
+class TestWithdrawalSurvivalLimits:
+    """Batched withdrawal engine must match year-by-year depletion loops."""
+
+    @staticmethod
+    def _loop_success(shocks, initial_withdrawal, withdraw_before_return):
+        successes = 0
+        for path in shocks:
+            portfolio = 1_000_000.0
+            for year, shock in enumerate(path):
+                annual_return = 0.06 + 0.12 * shock
+                withdrawal = initial_withdrawal * (1.025 ** year)
+                if withdraw_before_return:
+                    portfolio = (portfolio - withdrawal) * (1 + annual_return)
+                else:
+                    portfolio = portfolio * (1 + annual_return) - withdrawal
+                if portfolio <= 0:
+                    break
+            successes += portfolio > 0
+        return successes / len(shocks)
+
+    @pytest.mark.parametrize("withdraw_before_return", [True, False])
+    def test_matches_loop_for_every_candidate(self, withdraw_before_return):
+        shocks = np.random.default_rng(21).standard_normal((500, 30))
+        limits = withdrawal_survival_limits(
+            1_000_000, 30, 0.06, 0.12, 0.025,
+            simulations=500,
+            withdraw_before_return=withdraw_before_return,
+            shocks=shocks,
+        )
+        candidates = np.array([30000.0, 40000.0, 50000.0, 60000.0])
+
+        batched = withdrawal_success_probabilities(candidates, limits)
+        expected = [
+            self._loop_success(shocks, candidate, withdraw_before_return)
+            for candidate in candidates
+        ]
+
+        np.testing.assert_allclose(batched, expected)
+
+    def test_probabilities_fall_as_withdrawals_rise(self):
+        limits = withdrawal_survival_limits(
+            1_000_000, 25, 0.06, 0.12, 0.025, rng=np.random.default_rng(2)
+        )
+        probabilities = withdrawal_success_probabilities(
+            np.linspace(10000, 120000, 50), limits
+        )
+
+        assert np.all(np.diff(probabilities) <= 0)
+        assert probabilities[0] > 0.99
+        assert probabilities[-1] < 0.05
+
+
+class TestSuccessProbabilityGrid:
+    """Grid evaluation must match one simulation per cell on shared shocks."""
+
+    @staticmethod
+    def _cells():
+        cells = []
+        for contribution in (0.0, 500.0, 1500.0):
+            for inflation in (0.02, 0.03, 0.05):
+                cells.append(SimulationParams(
+                    initial_portfolio_value=100000,
+                    monthly_contribution=contribution,
+                    monthly_withdrawal=800.0 if contribution == 0.0 else 0.0,
+                    time_horizon=20,
+                    expected_return=0.07,
+                    volatility=0.15,
+                    goal_amount=600000,
+                    iterations=400,
+                    inflation_rate=inflation,
+                ))
+        cells.append(SimulationParams(
+            initial_portfolio_value=-5000,
+            monthly_contribution=300,
+            time_horizon=12,
+            expected_return=0.05,
+            volatility=0.10,
+            goal_amount=50000,
+            iterations=400,
+        ))
+        return cells
+
+    @pytest.mark.parametrize("max_chunk_elements", [2_000_000, 1000])
+    def test_matches_per_cell_simulation(self, max_chunk_elements):
+        cells = self._cells()
+        shocks = np.random.default_rng(8).standard_normal((400, 240))
+
+        grid = success_probability_grid(cells, shocks, max_chunk_elements=max_chunk_elements)
+        expected = [
+            run_simulation_sync(cell, shocks[:, : cell.time_horizon * 12]).success_probability
+            for cell in cells
+        ]
+
+        np.testing.assert_allclose(grid, expected)
+
+    def test_rejects_mixed_iterations(self):
+        cells = self._cells()[:2]
+        cells[1] = cells[1].model_copy(update={"iterations": 100})
+
+        with pytest.raises(ValueError):
+            success_probability_grid(cells)
@@ -2,10 +2,12 @@
 Unit tests for Portfolio Optimizer
 """
 
+import numpy as np
 import pytest
 from app.tools.portfolio_optimizer import (
     optimize_portfolio,
     calculate_efficient_frontier,
+    efficient_frontier_weights,
     AssetClass,
     OptimizationParams,
 )
@@ -161,3 +163,42 @@ class TestPortfolioOptimizer:
         # Should be approximately -2 * volatility (per implementation)
         expected_drawdown = -2.0 * result.expected_volatility
         assert abs(result.max_drawdown_estimate - expected_drawdown) < 0.01
+
+    async def test_active_set_frontier_matches_pointwise_optimization(self):
+        """Warm-started sweep returns the same portfolios as per-point SLSQP."""
+        asset_classes = self.get_sample_asset_classes()
+
+        swept = await calculate_efficient_frontier(asset_classes, num_points=12)
+        pointwise = await calculate_efficient_frontier(
+            asset_classes, num_points=12, method="slsqp"
+        )
+
+        for fast, slow in zip(swept, pointwise):
+            assert fast["risk_tolerance"] == slow["risk_tolerance"]
+            # The exact QP is never worse than SLSQP's 1e-6 stopping tolerance
+            assert fast["expected_volatility"] <= slow["expected_volatility"] + 1e-8
+            assert fast["expected_volatility"] == pytest.approx(slow["expected_volatility"], abs=1e-5)
+            assert fast["expected_return"] == pytest.approx(slow["expected_return"], abs=1e-4)
+            for name, weight in slow["allocation"].items():
+                assert fast["allocation"][name] == pytest.approx(weight, abs=5e-3)
+
+    async def test_frontier_respects_bounds_and_targets(self):
+        """Every point is fully invested, within bounds, and meets its target."""
+        returns = np.array([0.10, 0.12, 0.09, 0.04, 0.08])
+        vols = np.array([0.15, 0.20, 0.17, 0.06, 0.18])
+        cov_matrix = np.outer(vols, vols) * (0.7 * np.eye(5) + 0.3)
+        targets = np.linspace(0.03, 0.115, 25)[::-1]  # Unsorted input order is preserved
+        bounds = [(0.0, 0.5), (0.0, 1.0), (0.05, 1.0), (0.0, 1.0), (0.0, 0.3)]
+
+        weights, stats = efficient_frontier_weights(returns, cov_matrix, targets, bounds)
+
+        assert weights.shape == (25, 5)
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0, atol=1e-9)
+        assert np.all(weights >= np.array([b[0] for b in bounds]) - 1e-9)
+        assert np.all(weights <= np.array([b[1] for b in bounds]) + 1e-9)
+        assert np.all(weights @ returns >= targets - 1e-9)
+        assert stats["iterations"] < 3 * len(targets)
+
+    async def test_unknown_frontier_method_rejected(self):
+        with pytest.raises(ValueError):
+            await calculate_efficient_frontier(self.get_sample_asset_classes(), method="newton")
@@ -0,0 +1,141 @@
+"""
+Unit tests for the content-addressed tool result cache
+"""
+
+from typing import Dict, List
+
+import pytest
+
+import app.tools as tools
+from app.core.cache import CacheService
+from app.core.performance import performance_metrics
+from app.services.portfolio import asset_class_library
+from app.tools import tool_cache as tool_cache_module
+from app.tools.monte_carlo_engine import SimulationParams, SimulationResult, run_simulation_sync
+from app.tools.portfolio_optimizer import AssetClass, OptimizationParams, OptimizationResult
+from app.tools.tool_cache import cached_tool
+from tests.utils.fake_redis import FakeRedis
+
+
+SEEDED = SimulationParams(
+    initial_portfolio_value=100000,
+    monthly_contribution=1000,
+    time_horizon=10,
+    expected_return=0.07,
+    volatility=0.15,
+    goal_amount=300000,
+    iterations=500,
+    seed=42,
+)
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(monkeypatch):
+    performance_metrics.reset()
+    service = CacheService(l1_enabled=False)
+    service.redis_client = FakeRedis()
+    service._connected = True
+    monkeypatch.setattr(tool_cache_module, "cache", service)
+    return service
+
+
+def _counter(name):
+    return performance_metrics.counters.get(name, 0)
+
+
+class TestToolCache:
+
+    async def test_seeded_simulation_is_served_from_cache(self, shared_cache):
+        first = await tools.run_simulation(SEEDED)
+        second = await tools.run_simulation(SEEDED.model_copy())
+
+        assert isinstance(second, SimulationResult)
+        assert second == first
+        assert _counter("tool_cache.run_simulation.misses") == 1
+        assert _counter("tool_cache.run_simulation.hits") == 1
+
+    async def test_unseeded_simulation_always_recomputes(self, shared_cache):
+        params = SEEDED.model_copy(update={"seed": None})
+
+        await tools.run_simulation(params)
+        await tools.run_simulation(params)
+
+        assert _counter("tool_cache.run_simulation.bypassed") == 2
+        assert shared_cache.redis_client.store == {}
+
+    async def test_changed_params_miss(self):
+        await tools.run_simulation(SEEDED)
+        await tools.run_simulation(SEEDED.model_copy(update={"goal_amount": 350000}))
+
+        assert _counter("tool_cache.run_simulation.misses") == 2
+
+    async def test_positional_and_keyword_calls_share_an_entry(self):
+        first = await tools.calculate_required_savings(500000, 20)
+        second = await tools.calculate_required_savings(
+            target_amount=500000, years_to_goal=20, current_savings=0.0
+        )
+
+        assert first == second
+        assert _counter("tool_cache.calculate_required_savings.hits") == 1
+
+    async def test_return_types_are_rebuilt(self):
+        @cached_tool()
+        async def spending_by_age(base: float) -> Dict[int, float]:
+            return {65: base, 75: base * 0.9}
+
+        @cached_tool()
+        async def results(count: int) -> List[OptimizationResult]:
+            return [
+                OptimizationResult(
+                    allocation={"Bonds": 1.0}, expected_return=0.04,
+                    expected_volatility=0.06, sharpe_ratio=0.0, max_drawdown_estimate=0.1,
+                )
+            ] * count
+
+        await spending_by_age(100.0)
+        await results(2)
+
+        assert await spending_by_age(100.0) == {65: 100.0, 75: 90.0}
+        cached = await results(2)
+        assert isinstance(cached[0], OptimizationResult)
+        assert _counter("tool_cache.results.hits") == 1
+
+    async def test_cma_version_changes_the_key(self, monkeypatch):
+        params = OptimizationParams(
+            asset_classes=[
+                AssetClass(name="Stocks", expected_return=0.10, volatility=0.18),
+                AssetClass(name="Bonds", expected_return=0.04, volatility=0.06),
+            ],
+            risk_tolerance=0.5,
+            time_horizon=10,
+        )
+
+        await tools.optimize_portfolio(params)
+        monkeypatch.setattr(asset_class_library, "CMA_VERSION", "2099-01")
+        await tools.optimize_portfolio(params)
+
+        assert _counter("tool_cache.optimize_portfolio.misses") == 2
+
+    async def test_changed_holdings_get_a_new_entry(self):
+        await tools.calculate_var(100000, 0.15)
+        await tools.calculate_var(120000, 0.15)
+        await tools.calculate_var(100000, 0.15)
+
+        assert _counter("tool_cache.calculate_var.misses") == 2
+        assert _counter("tool_cache.calculate_var.hits") == 1
+
+    async def test_offline_cache_just_computes(self, monkeypatch):
+        monkeypatch.setattr(tool_cache_module, "cache", CacheService(l1_enabled=False))
+
+        result = await tools.run_simulation(SEEDED)
+
+        assert result.iterations_run == 500
+
+
+def test_seed_makes_simulation_reproducible():
+    first = run_simulation_sync(SEEDED)
+    second = run_simulation_sync(SEEDED)
+    unseeded = run_simulation_sync(SEEDED.model_copy(update={"seed": None}))
+
+    assert first.final_portfolio_distribution == second.final_portfolio_distribution
+    assert first.final_portfolio_distribution != unseeded.final_portfolio_distribution
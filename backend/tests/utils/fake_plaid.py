@@ -0,0 +1,224 @@
+"""
+Local fake Plaid API for client tests.
+
+Serves the handful of endpoints the Plaid client uses over real HTTP on
+127.0.0.1, so tests exercise the SDK, its connection pool and the thread
+pool end to end.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def account(account_id, current=100.0, type="depository", subtype="checking"):
+    return {
+        "account_id": account_id,
+        "balances": {
+            "available": current,
+            "current": current,
+            "limit": None,
+            "iso_currency_code": "USD",
+            "unofficial_currency_code": None,
+            "margin_loan_amount": None,
+        },
+        "mask": "0000",
+        "name": f"Account {account_id}",
+        "official_name": None,
+        "type": type,
+        "subtype": subtype,
+    }
+
+
+def transaction(transaction_id, account_id, amount=12.5):
+    return {
+        "transaction_id": transaction_id,
+        "account_id": account_id,
+        "amount": amount,
+        "iso_currency_code": "USD",
+        "unofficial_currency_code": None,
+        "date": "2024-01-15",
+        "name": f"Purchase {transaction_id}",
+        "pending": False,
+        "pending_transaction_id": None,
+        "account_owner": None,
+        "payment_channel": "online",
+        "category": None,
+        "category_id": None,
+        "merchant_name": None,
+        "authorized_date": None,
+        "authorized_datetime": None,
+        "datetime": None,
+        "location": dict.fromkeys(
+            ("address", "city", "region", "postal_code", "country", "lat", "lon", "store_number")
+        ),
+        "payment_meta": dict.fromkeys(
+            ("reference_number", "ppd_id", "payee", "by_order_of", "payer",
+             "payment_method", "payment_processor", "reason")
+        ),
+        "transaction_code": None,
+    }
+
+
+def holding(account_id, security_id, quantity=1.0, price=100.0):
+    return {
+        "account_id": account_id,
+        "security_id": security_id,
+        "institution_price": price,
+        "institution_value": price * quantity,
+        "cost_basis": None,
+        "quantity": quantity,
+        "iso_currency_code": "USD",
+        "unofficial_currency_code": None,
+    }
+
+
+def security(security_id, ticker_symbol):
+    fields = dict.fromkeys((
+        "isin", "cusip", "sedol", "institution_security_id", "institution_id",
+        "proxy_security_id", "close_price", "close_price_as_of", "unofficial_currency_code",
+        "market_identifier_code", "sector", "industry", "cfi_code", "figi",
+        "option_contract", "fixed_income",
+    ))
+    fields.update(
+        security_id=security_id,
+        name=ticker_symbol,
+        ticker_symbol=ticker_symbol,
+        is_cash_equivalent=False,
+        type="etf",
+        iso_currency_code="USD",
+    )
+    return fields
+
+
+def _item(item_id):
+    return {
+        "item_id": item_id,
+        "institution_id": "ins_1",
+        "webhook": None,
+        "error": None,
+        "available_products": [],
+        "billed_products": ["transactions"],
+        "consent_expiration_time": None,
+        "update_type": "background",
+    }
+
+
+class FakePlaidServer:
+    """
+    Threaded HTTP server speaking enough of the Plaid API for the client.
+
+    Every access token gets the same accounts, transactions and holdings
+    unless overridden. ``delay`` holds each response to simulate network
+    latency; ``requests``, ``connections`` and ``peak_in_flight`` record
+    what the client did.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.accounts = [account("acct-1")]
+        self.transactions = {}  # cursor -> transactions/sync page
+        self.holdings = []
+        self.securities = []
+        self.errors = {}  # access token -> (status, error_code)
+        self.requests = []
+        self.connections = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def respond(self, path: str, body: dict):
+        access_token = body.get("access_token")
+        if access_token in self.errors:
+            status, code = self.errors[access_token]
+            return status, {
+                "error_type": "API_ERROR",
+                "error_code": code,
+                "error_message": code,
+                "display_message": None,
+                "request_id": "req",
+            }
+
+        if path == "/accounts/get":
+            return 200, {"accounts": self.accounts, "item": _item("item-1"), "request_id": "req"}
+        if path == "/item/get":
+            return 200, {"item": _item("item-1"), "request_id": "req"}
+        if path == "/transactions/sync":
+            page = self.transactions.get(body.get("cursor", ""), {})
+            return 200, {
+                "added": page.get("added", []),
+                "modified": page.get("modified", []),
+                "removed": [
+                    {"transaction_id": t, "account_id": self.accounts[0]["account_id"]}
+                    for t in page.get("removed", [])
+                ],
+                "next_cursor": page.get("next_cursor", body.get("cursor", "")),
+                "has_more": page.get("has_more", False),
+                "transactions_update_status": "HISTORICAL_UPDATE_COMPLETE",
+                "accounts": [],
+                "request_id": "req",
+            }
+        if path == "/investments/holdings/get":
+            return 200, {
+                "accounts": self.accounts,
+                "holdings": self.holdings,
+                "securities": self.securities,
+                "item": _item("item-1"),
+                "request_id": "req",
+            }
+        return 404, {"error_code": "NOT_FOUND", "request_id": "req"}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooling is observable
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                with server._lock:
+                    server.requests.append((self.path, body))
+                    server._in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server._in_flight)
+                try:
+                    if server.delay:
+                        time.sleep(server.delay)
+                    status, payload = server.respond(self.path, body)
+                finally:
+                    with server._lock:
+                        server._in_flight -= 1
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,146 @@
+"""
+In-memory async Redis stand-in for cache tests.
+"""
+
+import asyncio
+import time
+from fnmatch import fnmatchcase
+
+
+class FakeRedisServer:
+    """Shared keyspace and pub/sub broker for FakeRedis clients"""
+
+    def __init__(self):
+        self.store = {}
+        self.subscribers = []
+        self.commands = 0
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.client.server.commands += 1  # one round trip for the batch
+        results = []
+        for name, args, kwargs in self.calls:
+            results.append(await getattr(self.client, name)(*args, _count=False, **kwargs))
+        self.calls = []
+        return results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.subscribers.append((channel, self.queue))
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.server.subscribers = [s for s in self.server.subscribers if s[1] is not self.queue]
+
+
+class FakeRedis:
+    """In-memory async stand-in for the redis client used by CacheService"""
+
+    def __init__(self, server=None):
+        self.server = server or FakeRedisServer()
+
+    @property
+    def store(self):
+        return {key: value for key, (value, _) in self.server.store.items()}
+
+    def _count(self, count):
+        if count:
+            self.server.commands += 1
+
+    def _live(self, key):
+        entry = self.server.store.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.server.store[key]
+            return None
+        return entry
+
+    async def get(self, key, _count=True):
+        self._count(_count)
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def set(self, key, value, nx=False, px=None, _count=True):
+        self._count(_count)
+        if nx and self._live(key):
+            return None
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.server.store[key] = (value, expires_at)
+        return True
+
+    async def setex(self, key, expire, value, _count=True):
+        self._count(_count)
+        self.server.store[key] = (value, time.monotonic() + expire)
+        return True
+
+    async def ttl(self, key, _count=True):
+        self._count(_count)
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int(entry[1] - time.monotonic())
+
+    async def delete(self, *keys, _count=True):
+        self._count(_count)
+        return sum(self.server.store.pop(key, None) is not None for key in keys)
+
+    async def exists(self, *keys, _count=True):
+        self._count(_count)
+        return sum(self._live(key) is not None for key in keys)
+
+    async def eval(self, script, numkeys, key, token, _count=True):
+        """Only the compare-and-delete lock release script is supported"""
+        self._count(_count)
+        entry = self._live(key)
+        if entry and entry[0] == token:
+            del self.server.store[key]
+            return 1
+        return 0
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.server.store):
+            if fnmatchcase(key, match):
+                yield key
+
+    async def publish(self, channel, message, _count=True):
+        self._count(_count)
+        for subscribed, queue in self.server.subscribers:
+            if subscribed == channel:
+                queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.server.subscribers)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self.server)
+
+    async def ping(self):
+        return True
+
+    async def close(self):
+        pass